@@ -10,22 +10,30 @@ The only agent with full context, responsible for:
 v4: Prompt stratification — instructions/schema → system_prompt, data → user_prompt.
 """
 
+import inspect
 import json
 import logging
+from contextlib import aclosing
+from itertools import chain
 from typing import Any, Callable, Awaitable, Dict, List, Optional, Tuple
 
+from pydantic import ValidationError
+
 from ripple.primitives.models import (
     OmniscientVerdict, AgentActivation, AgentSkip,
     PhaseVector, Ripple,
 )
 from ripple.prompts import (
-    RETRY_JSON_PREFIX,
-    RETRY_JSON_PREFIX_SHORT,
+    RETRY_HINT_SEPARATOR,
+    RETRY_JSON_HINT,
+    RETRY_JSON_HINT_SHORT,
     OMNISCIENT_INIT_DYNAMICS,
     OMNISCIENT_INIT_DYNAMICS_HORIZON_LINE,
     OMNISCIENT_INIT_AGENTS,
     OMNISCIENT_INIT_TOPOLOGY,
     OMNISCIENT_RIPPLE_TIME_PROGRESS,
+    OMNISCIENT_RIPPLE_AGENT_LINE_ACTIVE,
+    OMNISCIENT_RIPPLE_AGENT_LINE_IDLE,
     OMNISCIENT_RIPPLE_CAS_PRINCIPLES,
     OMNISCIENT_RIPPLE_WAVE0_HINT,
     OMNISCIENT_RIPPLE_VERDICT,
@@ -48,24 +56,28 @@ from ripple.prompts import (
     OMNISCIENT_SYNTHESIZE_ANCHORED_SYSTEM,
     OMNISCIENT_SYNTHESIZE_ANCHORED_USER,
 )
+from ripple.agents.schemas import VERDICT_ADAPTER, VerdictPayload, _safe_float
+from ripple.utils.fast_json import dumps_compact, loads
+from ripple.utils.json_parser import JsonStreamAccumulator, strip_code_fence
+from ripple.utils.prompt_template import compile_template
+from ripple.utils.time_utils import parse_hours
 
 logger = logging.getLogger(__name__)
 
+# RIPPLE 裁决的 system_prompt 完全静态，模块加载时渲染一次
+# / The RIPPLE verdict system_prompt is fully static; render it once at import
+_RIPPLE_VERDICT_SYSTEM = OMNISCIENT_RIPPLE_VERDICT_SYSTEM.format(
+    cas_principles=OMNISCIENT_RIPPLE_CAS_PRINCIPLES,
+)
 
-def _safe_float(value: Any, default: float = 0.0) -> float:
-    """从 LLM JSON 输出中安全提取浮点数。 / Safely extract float from LLM JSON output."""
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        try:
-            return float(value)
-        except ValueError:
-            return default
-    if isinstance(value, dict):
-        for key in ("value", "score", "energy"):
-            if key in value and isinstance(value[key], (int, float)):
-                return float(value[key])
-    return default
+# 每个 wave / 阶段都要渲染的 user 模板与 Agent 行模板，导入时预编译
+# / User and agent-line templates rendered every wave/phase, precompiled at import
+_RIPPLE_USER_TPL = compile_template(OMNISCIENT_RIPPLE_VERDICT_USER)
+_AGENT_LINE_ACTIVE_TPL = compile_template(OMNISCIENT_RIPPLE_AGENT_LINE_ACTIVE)
+_AGENT_LINE_IDLE_TPL = compile_template(OMNISCIENT_RIPPLE_AGENT_LINE_IDLE)
+_OBSERVE_USER_TPL = compile_template(OMNISCIENT_OBSERVE_USER)
+_SYNTH_RELATIVE_USER_TPL = compile_template(OMNISCIENT_SYNTHESIZE_RELATIVE_USER)
+_SYNTH_ANCHORED_USER_TPL = compile_template(OMNISCIENT_SYNTHESIZE_ANCHORED_USER)
 
 
 # 全视者 INIT 输出必须包含的字段 / Required fields in Omniscient INIT output
@@ -78,6 +90,19 @@ INIT_REQUIRED_FIELDS = {
 # / Output fields defined by Skill prompts, engine no longer hardcodes validation.
 
 
+def _default_observation() -> Dict[str, Any]:
+    """OBSERVE 失败或跳过时的默认观测。 / Default observation when OBSERVE fails or is skipped."""
+    return {
+        "phase_vector": {
+            "heat": "unknown", "sentiment": "unknown",
+            "coherence": "unknown",
+        },
+        "phase_transition_detected": False,
+        "emergence_events": [],
+        "topology_recommendations": [],
+    }
+
+
 class OmniscientAgent:
     """全视者 Agent，Ripple 的全知裁决者。 / Omniscient Agent, Ripple's all-knowing arbiter."""
 
@@ -88,6 +113,10 @@ class OmniscientAgent:
         max_retries: int = 2,
     ):
         self._llm_caller = llm_caller
+        # 调用器可选提供 astream 异步生成器，用于边接收边解析 JSON
+        # / The caller may expose an `astream` async generator for parse-while-receiving
+        astream = getattr(llm_caller, "astream", None)
+        self._astream = astream if inspect.isasyncgenfunction(astream) else None
         self._system_prompt = system_prompt
         self._max_retries = max_retries
         self._init_result: Optional[Dict[str, Any]] = None
@@ -97,6 +126,7 @@ class OmniscientAgent:
         user_prompt: str,
         phase: str = "",
         phase_system_prompt: str = "",
+        retry_hint: Optional[str] = None,
     ) -> str:
         """调用 LLM，由引擎注入的 caller 处理实际路由。 / Call LLM; routing handled by injected caller.
 
@@ -104,36 +134,92 @@ class OmniscientAgent:
         送入 system_prompt 可信区。运行时数据仅出现在 user_prompt 非可信区。
         / phase_system_prompt contains phase instructions/schema, merged with self._system_prompt
         into the trusted system_prompt zone. Runtime data only in user_prompt untrusted zone.
+
+        retry_hint 仅在发送时追加到 user_prompt 尾部，调用方的 user_prompt 保持不变。
+        / retry_hint is appended to the user_prompt tail only at send time; the
+        caller's user_prompt is never modified.
         """
         if phase:
-            logger.info(f"Omniscient 调用 LLM: {phase}")
+            logger.info("Omniscient 调用 LLM: %s", phase)
+
+        combined_system, user_prompt = self._compose_prompts(
+            user_prompt, phase_system_prompt, retry_hint,
+        )
+        return await self._llm_caller(
+            system_prompt=combined_system,
+            user_prompt=user_prompt,
+        )
 
+    def _compose_prompts(
+        self,
+        user_prompt: str,
+        phase_system_prompt: str,
+        retry_hint: Optional[str],
+    ) -> Tuple[str, str]:
         # Merge base system_prompt (may include skill context) with phase instructions
         parts = [p for p in (self._system_prompt, phase_system_prompt) if p]
         combined_system = "\n\n".join(parts)
 
-        return await self._llm_caller(
-            system_prompt=combined_system,
-            user_prompt=user_prompt,
+        if retry_hint:
+            user_prompt = user_prompt + RETRY_HINT_SEPARATOR + retry_hint
+        return combined_system, user_prompt
+
+    async def _call_llm_json(
+        self,
+        user_prompt: str,
+        phase: str = "",
+        phase_system_prompt: str = "",
+        retry_hint: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """调用 LLM 并解码 JSON。 / Call the LLM and decode JSON."""
+        return loads(await self._call_llm_text(
+            user_prompt, phase=phase,
+            phase_system_prompt=phase_system_prompt, retry_hint=retry_hint,
+        ))
+
+    async def _call_llm_text(
+        self,
+        user_prompt: str,
+        phase: str = "",
+        phase_system_prompt: str = "",
+        retry_hint: Optional[str] = None,
+    ) -> str:
+        """调用 LLM 并返回去掉围栏的 JSON 文本；调用器支持流式时边接收边检查。
+        / Call the LLM and return fence-stripped JSON text, checking while
+        receiving when the caller streams.
+
+        顶层 JSON 闭合即停止接收；输出开头不是 JSON 时立即抛出 ValueError，
+        尽早进入重试。传输失败的回退由调用器在同一次预占额度内处理。
+        / Receiving stops as soon as the top-level JSON closes; output not
+        starting as JSON raises ValueError at once so retries start early.
+        Transport-failure fallback is handled by the caller under the same
+        budget reservation.
+        """
+        if self._astream is not None:
+            if phase:
+                logger.info("Omniscient 流式调用 LLM: %s", phase)
+            system_prompt, full_user_prompt = self._compose_prompts(
+                user_prompt, phase_system_prompt, retry_hint,
+            )
+            accumulator = JsonStreamAccumulator()
+            async with aclosing(self._astream(
+                system_prompt=system_prompt, user_prompt=full_user_prompt,
+            )) as chunks:
+                async for chunk in chunks:
+                    if accumulator.feed(chunk):
+                        break
+            return strip_code_fence(accumulator.text.strip())
+
+        raw = await self._call_llm(
+            user_prompt, phase=phase,
+            phase_system_prompt=phase_system_prompt, retry_hint=retry_hint,
         )
+        return strip_code_fence(raw.strip())
 
     def _parse_json(self, raw: str) -> Dict[str, Any]:
         """从 LLM 输出中提取 JSON。支持 markdown code block 包裹。 / Extract JSON from LLM output; supports markdown code blocks."""
-        text = raw.strip()
-        if text.startswith("```"):
-            lines = text.split("\n")
-            json_lines = []
-            in_block = False
-            for line in lines:
-                if line.strip().startswith("```") and not in_block:
-                    in_block = True
-                    continue
-                elif line.strip() == "```" and in_block:
-                    break
-                elif in_block:
-                    json_lines.append(line)
-            text = "\n".join(json_lines)
-        return json.loads(text)
+        text = strip_code_fence(raw.strip())
+        return loads(text)
 
     # =========================================================================
     # Phase INIT
@@ -158,33 +244,25 @@ class OmniscientAgent:
             初始化结果 / Init result with star_configs, sea_configs, topology,
             dynamic_parameters, seed_ripple
         """
+        # 输入只序列化一次，三个 sub-call 共享 / Serialize input once, shared by all three sub-calls
+        input_json = dumps_compact(simulation_input)
+
         # Sub-call 1: 场景分析 + 时间参数 / Scene analysis + time params
-        dynamic_parameters = await self._init_sub_call(
-            self._build_init_dynamics_prompt(skill_profile, simulation_input),
-            phase="INIT:dynamics",
-            required_fields={"wave_time_window"},
-            error_label="INIT:dynamics",
+        dynamic_parameters = await self.init_dynamics(
+            skill_profile, simulation_input, input_json=input_json,
         )
+        dp_json = dumps_compact(dynamic_parameters)
 
         # Sub-call 2: Agent 配置 / Agent configs
-        agents_result = await self._init_sub_call(
-            self._build_init_agents_prompt(
-                skill_profile, simulation_input, dynamic_parameters,
-            ),
-            phase="INIT:agents",
-            required_fields={"star_configs", "sea_configs"},
-            error_label="INIT:agents",
+        agents_result = await self.init_agents(
+            skill_profile, simulation_input, dynamic_parameters,
+            input_json=input_json, dp_json=dp_json,
         )
 
         # Sub-call 3: 拓扑 + 种子 / Topology + seed
-        topology_result = await self._init_sub_call(
-            self._build_init_topology_prompt(
-                skill_profile, simulation_input, dynamic_parameters,
-                agents_result,
-            ),
-            phase="INIT:topology",
-            required_fields={"topology", "seed_ripple"},
-            error_label="INIT:topology",
+        topology_result = await self.init_topology(
+            skill_profile, simulation_input, dynamic_parameters, agents_result,
+            input_json=input_json, dp_json=dp_json,
         )
 
         # 合并为统一结果 / Merge into unified result
@@ -200,6 +278,88 @@ class OmniscientAgent:
         self._init_result = result
         return result
 
+    # -------------------------------------------------------------------------
+    # INIT 分步接口：引擎可按依赖关系单独调度每一步（如 asyncio.create_task
+    # 与其他 I/O 重叠）。input_json/dp_json 为可选的预序列化结果。
+    # / Step-wise INIT API: the engine may schedule each step separately
+    # (e.g. asyncio.create_task to overlap with other I/O). input_json and
+    # dp_json are optional pre-serialized forms.
+    # -------------------------------------------------------------------------
+
+    async def init_dynamics(
+        self,
+        skill_profile: str,
+        simulation_input: Dict[str, Any],
+        *,
+        input_json: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """INIT 第 1 步：场景分析 + 时间参数。 / INIT step 1: scene analysis + time params.
+
+        Returns: dynamic_parameters
+        """
+        if input_json is None:
+            input_json = dumps_compact(simulation_input)
+        return await self._init_sub_call(
+            self._build_init_dynamics_prompt(
+                skill_profile, input_json,
+                horizon=simulation_input.get("simulation_horizon", ""),
+            ),
+            phase="INIT:dynamics",
+            required_fields={"wave_time_window"},
+            error_label="INIT:dynamics",
+        )
+
+    async def init_agents(
+        self,
+        skill_profile: str,
+        simulation_input: Dict[str, Any],
+        dynamic_parameters: Dict[str, Any],
+        *,
+        input_json: Optional[str] = None,
+        dp_json: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """INIT 第 2 步：Agent 配置（依赖第 1 步）。 / INIT step 2: agent configs (needs step 1).
+
+        Returns: {"star_configs": [...], "sea_configs": [...], ...}
+        """
+        if input_json is None:
+            input_json = dumps_compact(simulation_input)
+        if dp_json is None:
+            dp_json = dumps_compact(dynamic_parameters)
+        return await self._init_sub_call(
+            self._build_init_agents_prompt(skill_profile, input_json, dp_json),
+            phase="INIT:agents",
+            required_fields={"star_configs", "sea_configs"},
+            error_label="INIT:agents",
+        )
+
+    async def init_topology(
+        self,
+        skill_profile: str,
+        simulation_input: Dict[str, Any],
+        dynamic_parameters: Dict[str, Any],
+        agents_result: Dict[str, Any],
+        *,
+        input_json: Optional[str] = None,
+        dp_json: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """INIT 第 3 步：拓扑 + 种子（依赖第 1、2 步）。 / INIT step 3: topology + seed (needs steps 1 and 2).
+
+        Returns: {"topology": {...}, "seed_ripple": {...}, ...}
+        """
+        if input_json is None:
+            input_json = dumps_compact(simulation_input)
+        if dp_json is None:
+            dp_json = dumps_compact(dynamic_parameters)
+        return await self._init_sub_call(
+            self._build_init_topology_prompt(
+                skill_profile, input_json, dp_json, agents_result,
+            ),
+            phase="INIT:topology",
+            required_fields={"topology", "seed_ripple"},
+            error_label="INIT:topology",
+        )
+
     async def _init_sub_call(
         self,
         prompts: Tuple[str, str],
@@ -213,29 +373,27 @@ class OmniscientAgent:
         """
         phase_system_prompt, user_prompt = prompts
         last_error = None
-        current_user = user_prompt
+        retry_hint = None
         for attempt in range(1 + self._max_retries):
             try:
                 raw = await self._call_llm(
-                    current_user,
+                    user_prompt,
                     phase=phase,
                     phase_system_prompt=phase_system_prompt,
+                    retry_hint=retry_hint,
                 )
                 result = self._parse_json(raw)
-                missing = required_fields - set(result.keys())
+                missing = required_fields.difference(result)
                 if missing:
                     raise ValueError(f"{error_label} 输出缺少必要字段: {missing}")
                 return result
             except (json.JSONDecodeError, ValueError, KeyError) as e:
                 last_error = e
                 logger.warning(
-                    f"全视者 {error_label} 第 {attempt + 1} 次尝试失败: {e}"
+                    "全视者 %s 第 %d 次尝试失败: %s", error_label, attempt + 1, e,
                 )
                 if attempt < self._max_retries:
-                    current_user = (
-                        RETRY_JSON_PREFIX.format(error=e)
-                        + user_prompt
-                    )
+                    retry_hint = RETRY_JSON_HINT.format(error=e)
 
         raise RuntimeError(
             f"全视者 {error_label} 在 {1 + self._max_retries} 次尝试后仍然失败: "
@@ -245,14 +403,15 @@ class OmniscientAgent:
     def _build_init_dynamics_prompt(
         self,
         skill_profile: str,
-        simulation_input: Dict[str, Any],
+        input_json: str,
+        horizon: str = "",
     ) -> Tuple[str, str]:
         """Sub-call 1: 场景分析 + 时间参数。 / Scene analysis + time params.
 
+        input_json 为已序列化的 simulation_input。 / input_json is the pre-serialized simulation_input.
+
         Returns: (phase_system_prompt, user_prompt)
         """
-        input_json = json.dumps(simulation_input, ensure_ascii=False, indent=2)
-        horizon = simulation_input.get("simulation_horizon", "")
         horizon_line = (
             OMNISCIENT_INIT_DYNAMICS_HORIZON_LINE.format(horizon=horizon)
             if horizon else ""
@@ -267,15 +426,13 @@ class OmniscientAgent:
     def _build_init_agents_prompt(
         self,
         skill_profile: str,
-        simulation_input: Dict[str, Any],
-        dynamic_parameters: Dict[str, Any],
+        input_json: str,
+        dp_json: str,
     ) -> Tuple[str, str]:
         """Sub-call 2: Agent 配置。 / Agent configs.
 
         Returns: (phase_system_prompt, user_prompt)
         """
-        input_json = json.dumps(simulation_input, ensure_ascii=False, indent=2)
-        dp_json = json.dumps(dynamic_parameters, ensure_ascii=False, indent=2)
         system = OMNISCIENT_INIT_AGENTS_SYSTEM
         user = OMNISCIENT_INIT_AGENTS_USER.format(
             skill_profile=skill_profile,
@@ -287,23 +444,18 @@ class OmniscientAgent:
     def _build_init_topology_prompt(
         self,
         skill_profile: str,
-        simulation_input: Dict[str, Any],
-        dynamic_parameters: Dict[str, Any],
+        input_json: str,
+        dp_json: str,
         agents_result: Dict[str, Any],
     ) -> Tuple[str, str]:
         """Sub-call 3: 拓扑 + 种子。 / Topology + seed.
 
         Returns: (phase_system_prompt, user_prompt)
         """
-        input_json = json.dumps(simulation_input, ensure_ascii=False, indent=2)
-        dp_json = json.dumps(dynamic_parameters, ensure_ascii=False, indent=2)
-        agents_json = json.dumps(
-            {
+        agents_json = dumps_compact({
                 "star_configs": agents_result["star_configs"],
                 "sea_configs": agents_result["sea_configs"],
-            },
-            ensure_ascii=False, indent=2,
-        )
+            })
         system = OMNISCIENT_INIT_TOPOLOGY_SYSTEM
         user = OMNISCIENT_INIT_TOPOLOGY_USER.format(
             skill_profile=skill_profile,
@@ -315,7 +467,7 @@ class OmniscientAgent:
 
     def _validate_init_result(self, result: Dict[str, Any]) -> None:
         """校验 INIT 输出的必要字段。 / Validate required fields in INIT output."""
-        missing = INIT_REQUIRED_FIELDS - set(result.keys())
+        missing = INIT_REQUIRED_FIELDS.difference(result)
         if missing:
             raise ValueError(f"INIT 输出缺少必要字段: {missing}")
         if not result.get("star_configs"):
@@ -354,28 +506,26 @@ class OmniscientAgent:
         )
 
         last_error = None
+        retry_hint = None
         for attempt in range(1 + self._max_retries):
             try:
-                raw = await self._call_llm(
+                text = await self._call_llm_text(
                     user_prompt,
                     phase=f"RIPPLE verdict (wave {wave_number})",
                     phase_system_prompt=phase_system,
+                    retry_hint=retry_hint,
                 )
-                data = self._parse_json(raw)
-                return self._parse_verdict(data)
+                return self._parse_verdict_json(text)
             except (json.JSONDecodeError, ValueError, KeyError) as e:
                 last_error = e
                 logger.warning(
-                    f"全视者 RIPPLE 裁决第 {attempt + 1} 次尝试失败: {e}"
+                    "全视者 RIPPLE 裁决第 %d 次尝试失败: %s", attempt + 1, e,
                 )
                 if attempt < self._max_retries:
-                    user_prompt = (
-                        RETRY_JSON_PREFIX_SHORT.format(error=e)
-                        + user_prompt
-                    )
+                    retry_hint = RETRY_JSON_HINT_SHORT.format(error=e)
 
         # 安全降级：终止传播 / Safe fallback: stop propagation
-        logger.error(f"全视者 RIPPLE 裁决失败，安全降级为终止传播: {last_error}")
+        logger.error("全视者 RIPPLE 裁决失败，安全降级为终止传播: %s", last_error)
         return OmniscientVerdict(
             wave_number=wave_number,
             simulated_time_elapsed="unknown",
@@ -385,6 +535,7 @@ class OmniscientAgent:
             activated_agents=[],
             skipped_agents=[],
             global_observation="裁决失败，安全终止",
+            failed_verdict=True,
         )
 
     def _build_ripple_prompt(
@@ -399,50 +550,33 @@ class OmniscientAgent:
 
         Returns: (phase_system_prompt, user_prompt)
         """
-        snapshot_json = json.dumps(
-            field_snapshot, ensure_ascii=False, indent=2, default=str,
-        )
+        snapshot_json = dumps_compact(field_snapshot)
 
         # 显式列出可用 Agent 及其激活统计 / Explicitly list available agents with activation stats
-        agent_lines = []
-        for sid, info in field_snapshot.get("stars", {}).items():
-            desc = info.get('description', '')
-            act_count = info.get('activation_count', 0)
-            last_e = info.get('last_energy', 0.0)
-            last_resp = info.get('last_response')
-            if act_count > 0:
-                agent_lines.append(
-                    f"  - agent_id: \"{sid}\" (Star/KOL): {desc} "
-                    f"| 已激活{act_count}次, 上次能量={last_e:.2f}, "
-                    f"上次响应={last_resp}"
-                )
-            else:
-                agent_lines.append(
-                    f"  - agent_id: \"{sid}\" (Star/KOL): {desc} | 尚未激活"
-                )
-        for sid, info in field_snapshot.get("seas", {}).items():
-            desc = info.get('description', '')
-            act_count = info.get('activation_count', 0)
-            last_e = info.get('last_energy', 0.0)
-            last_resp = info.get('last_response')
-            if act_count > 0:
-                agent_lines.append(
-                    f"  - agent_id: \"{sid}\" (Sea/群体): {desc} "
-                    f"| 已激活{act_count}次, 上次能量={last_e:.2f}, "
-                    f"上次响应={last_resp}"
-                )
-            else:
-                agent_lines.append(
-                    f"  - agent_id: \"{sid}\" (Sea/群体): {desc} | 尚未激活"
-                )
+        get = dict.get  # 循环外绑定 / Bind once outside the loop
+        active_fmt = _AGENT_LINE_ACTIVE_TPL.format
+        idle_fmt = _AGENT_LINE_IDLE_TPL.format
+        agent_lines = [
+            active_fmt(
+                sid=sid, kind=kind, desc=get(info, "description", ""), n=n,
+                e=get(info, "last_energy", 0.0), r=get(info, "last_response"),
+            )
+            if (n := get(info, "activation_count", 0)) > 0
+            else idle_fmt(sid=sid, kind=kind, desc=get(info, "description", ""))
+            for kind, sid, info in chain(
+                (("Star/KOL", sid, info)
+                 for sid, info in get(field_snapshot, "stars", {}).items()),
+                (("Sea/群体", sid, info)
+                 for sid, info in get(field_snapshot, "seas", {}).items()),
+            )
+        ]
         agent_list = "\n".join(agent_lines) if agent_lines else "  （无可用 Agent）"
 
         # 构建时间进度段 / Build time progress section
         time_progress = ""
         if wave_time_window and simulation_horizon:
-            from ripple.engine.runtime import _parse_hours
-            wtw_h = _parse_hours(wave_time_window)
-            horizon_h = _parse_hours(simulation_horizon)
+            wtw_h = parse_hours(wave_time_window)
+            horizon_h = parse_hours(simulation_horizon)
             if wtw_h > 0 and horizon_h > 0:
                 elapsed_h = wave_number * wtw_h
                 remaining_h = max(0, horizon_h - elapsed_h)
@@ -454,40 +588,62 @@ class OmniscientAgent:
                     remaining_h=remaining_h,
                 )
 
-        # Wave 0: 注入首轮 Sea 优先提示 / Wave 0: inject first-wave hint for Sea priority
+        # Wave 0: 首轮 Sea 优先提示放在 user_prompt 尾部，system_prompt 跨 wave 不变
+        # / Wave 0: the first-wave Sea hint goes to the user_prompt tail so the
+        #   system_prompt stays identical across waves
         wave0_hint = OMNISCIENT_RIPPLE_WAVE0_HINT if wave_number == 0 else ""
 
         # v4: Split — instructions → system, data → user
-        system = OMNISCIENT_RIPPLE_VERDICT_SYSTEM.format(
-            cas_principles=OMNISCIENT_RIPPLE_CAS_PRINCIPLES + wave0_hint,
-            wave_number=wave_number,
-        )
-        user = OMNISCIENT_RIPPLE_VERDICT_USER.format(
+        user = _RIPPLE_USER_TPL.format(
             wave_number=wave_number,
             time_progress=time_progress,
             snapshot_json=snapshot_json,
             propagation_history=propagation_history,
             agent_list=agent_list,
+            wave0_hint=wave0_hint,
         )
-        return system, user
-
-    def _parse_verdict(self, data: Dict[str, Any]) -> OmniscientVerdict:
-        """将 LLM JSON 输出解析为 OmniscientVerdict。 / Parse LLM JSON output into OmniscientVerdict."""
-        activated = [
-            AgentActivation(
-                agent_id=a["agent_id"],
-                incoming_ripple_energy=_safe_float(a.get("incoming_ripple_energy", 0.5)),
-                activation_reason=a["activation_reason"],
-            )
-            for a in data.get("activated_agents", [])
-        ]
-        skipped = [
-            AgentSkip(
-                agent_id=s["agent_id"],
-                skip_reason=s["skip_reason"],
-            )
-            for s in data.get("skipped_agents", [])
-        ]
+        return _RIPPLE_VERDICT_SYSTEM, user
+
+    def _parse_verdict_json(self, text: str) -> OmniscientVerdict:
+        """一次完成 JSON 解码与结构校验并生成 OmniscientVerdict。
+        / Decode and validate JSON text in one pass into an OmniscientVerdict.
+
+        结构校验不通过时回退为原有的宽松解析（先解码再按字段读取），原先能接受
+        的输出仍被接受；宽松解析也失败时抛出 pydantic.ValidationError
+        （ValueError 子类），由调用方重试。
+        / When schema validation fails this falls back to the previous lenient
+        parse (decode, then read fields), so output accepted before is still
+        accepted; if the lenient parse fails too, pydantic.ValidationError (a
+        ValueError subclass) is raised for the caller to retry.
+        """
+        try:
+            payload = VERDICT_ADAPTER.validate_json(text)
+        except ValidationError as strict_error:
+            try:
+                data = loads(text)
+                if not isinstance(data, dict):
+                    raise strict_error
+                verdict = self._verdict_from_payload(data)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                raise strict_error from None
+            logger.debug("RIPPLE 裁决未通过结构校验，已按宽松解析接受: %s", strict_error)
+            return verdict
+        return self._verdict_from_payload(payload)
+
+    @staticmethod
+    def _verdict_from_payload(data: VerdictPayload) -> OmniscientVerdict:
+        # 局部化全局名，减少每个元素的全局查找 / Localize globals to avoid per-element lookups
+        _aa, _as, _sf = AgentActivation, AgentSkip, _safe_float
+        activated = []
+        append = activated.append
+        for a in data.get("activated_agents", ()):
+            e = a.get("incoming_ripple_energy", 0.5)
+            # 常见情况已是数值，直接转换 / Common case is already numeric
+            append(_aa(
+                a["agent_id"],
+                float(e) if e.__class__ in (int, float) else _sf(e),
+                a["activation_reason"],
+            ))
         return OmniscientVerdict(
             wave_number=data.get("wave_number", 0),
             simulated_time_elapsed=data.get("simulated_time_elapsed", ""),
@@ -495,7 +651,10 @@ class OmniscientAgent:
             continue_propagation=bool(data.get("continue_propagation", False)),
             termination_reason=data.get("termination_reason"),
             activated_agents=activated,
-            skipped_agents=skipped,
+            skipped_agents=[
+                _as(s["agent_id"], s["skip_reason"])
+                for s in data.get("skipped_agents", ())
+            ],
             global_observation=data.get("global_observation", ""),
         )
 
@@ -518,41 +677,37 @@ class OmniscientAgent:
             观测结果 / Observation with phase_vector, phase_transition_detected,
             emergence_events, topology_recommendations
         """
+        # 首个裁决即失败时没有可观测的传播，跳过 LLM 调用
+        # / When the first verdict failed there is no propagation to observe; skip the LLM call
+        if field_snapshot.get("last_verdict_failed"):
+            logger.warning("全视者裁决已失败，OBSERVE 直接返回默认观测")
+            return _default_observation()
+
         phase_system, user_prompt = self._build_observe_prompt(field_snapshot, full_history)
 
         last_error = None
+        retry_hint = None
         for attempt in range(1 + self._max_retries):
             try:
-                raw = await self._call_llm(
+                result = await self._call_llm_json(
                     user_prompt,
                     phase="OBSERVE",
                     phase_system_prompt=phase_system,
+                    retry_hint=retry_hint,
                 )
-                result = self._parse_json(raw)
                 self._validate_observe_result(result)
                 return result
             except (json.JSONDecodeError, ValueError, KeyError) as e:
                 last_error = e
                 logger.warning(
-                    f"全视者 OBSERVE 第 {attempt + 1} 次尝试失败: {e}"
+                    "全视者 OBSERVE 第 %d 次尝试失败: %s", attempt + 1, e,
                 )
                 if attempt < self._max_retries:
-                    user_prompt = (
-                        RETRY_JSON_PREFIX_SHORT.format(error=e)
-                        + user_prompt
-                    )
+                    retry_hint = RETRY_JSON_HINT_SHORT.format(error=e)
 
         # 安全降级：返回默认观测 / Safe fallback: return default observation
-        logger.error(f"全视者 OBSERVE 失败，返回默认观测: {last_error}")
-        return {
-            "phase_vector": {
-                "heat": "unknown", "sentiment": "unknown",
-                "coherence": "unknown",
-            },
-            "phase_transition_detected": False,
-            "emergence_events": [],
-            "topology_recommendations": [],
-        }
+        logger.error("全视者 OBSERVE 失败，返回默认观测: %s", last_error)
+        return _default_observation()
 
     def _build_observe_prompt(
         self,
@@ -563,11 +718,9 @@ class OmniscientAgent:
 
         Returns: (phase_system_prompt, user_prompt)
         """
-        snapshot_json = json.dumps(
-            field_snapshot, ensure_ascii=False, indent=2, default=str,
-        )
+        snapshot_json = dumps_compact(field_snapshot)
         system = OMNISCIENT_OBSERVE_SYSTEM
-        user = OMNISCIENT_OBSERVE_USER.format(
+        user = _OBSERVE_USER_TPL.format(
             snapshot_json=snapshot_json,
             full_history=full_history,
         )
@@ -599,17 +752,33 @@ class OmniscientAgent:
             预测结果 / Prediction with prediction, timeline, bifurcation_points,
             agent_insights
         """
+        # 同上：没有完成任何 wave 时无可合成的内容
+        # / Likewise: with no completed wave there is nothing to synthesize
+        if field_snapshot.get("last_verdict_failed"):
+            logger.warning("全视者裁决已失败，跳过结果合成")
+            return {
+                "prediction": {
+                    "degraded": True,
+                    "error": "全视者裁决失败，跳过结果合成",
+                },
+                "timeline": [],
+                "bifurcation_points": [],
+                "agent_insights": {},
+            }
+
         phase_system, user_prompt = self._build_synth_prompt(
             field_snapshot, observation, simulation_input,
         )
 
         last_error = None
+        retry_hint = None
         for attempt in range(1 + self._max_retries):
             try:
                 raw = await self._call_llm(
                     user_prompt,
                     phase="SYNTHESIZE",
                     phase_system_prompt=phase_system,
+                    retry_hint=retry_hint,
                 )
                 result = self._parse_json(raw)
                 self._validate_synth_result(result)
@@ -617,15 +786,12 @@ class OmniscientAgent:
             except (json.JSONDecodeError, ValueError, KeyError) as e:
                 last_error = e
                 logger.warning(
-                    f"全视者结果合成第 {attempt + 1} 次尝试失败: {e}"
+                    "全视者结果合成第 %d 次尝试失败: %s", attempt + 1, e,
                 )
                 if attempt < self._max_retries:
-                    user_prompt = (
-                        RETRY_JSON_PREFIX_SHORT.format(error=e)
-                        + user_prompt
-                    )
+                    retry_hint = RETRY_JSON_HINT_SHORT.format(error=e)
 
-        logger.error(f"全视者结果合成失败: {last_error}")
+        logger.error("全视者结果合成失败: %s", last_error)
         return {
             "prediction": {"error": str(last_error)},
             "timeline": [],
@@ -643,15 +809,9 @@ class OmniscientAgent:
 
         Returns: (phase_system_prompt, user_prompt)
         """
-        snapshot_json = json.dumps(
-            field_snapshot, ensure_ascii=False, indent=2, default=str,
-        )
-        obs_json = json.dumps(
-            observation, ensure_ascii=False, indent=2, default=str,
-        )
-        input_json = json.dumps(
-            simulation_input, ensure_ascii=False, indent=2, default=str,
-        )
+        snapshot_json = dumps_compact(field_snapshot)
+        obs_json = dumps_compact(observation)
+        input_json = dumps_compact(simulation_input)
 
         has_historical = bool(simulation_input.get("historical"))
         system = (
@@ -659,8 +819,8 @@ class OmniscientAgent:
             else OMNISCIENT_SYNTHESIZE_RELATIVE_SYSTEM
         )
         user_template = (
-            OMNISCIENT_SYNTHESIZE_ANCHORED_USER if has_historical
-            else OMNISCIENT_SYNTHESIZE_RELATIVE_USER
+            _SYNTH_ANCHORED_USER_TPL if has_historical
+            else _SYNTH_RELATIVE_USER_TPL
         )
         user = user_template.format(
             snapshot_json=snapshot_json,
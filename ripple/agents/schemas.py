@@ -0,0 +1,121 @@
+"""全视者 LLM 输出的校验模型。 / Validation models for Omniscient LLM output.
+
+RIPPLE 裁决每个 wave 都要解析，结构固定，因此用 Pydantic TypeAdapter 通过
+`validate_json` 一次完成 JSON 解码与校验。OBSERVE / SYNTHESIZE 的字段
+由 Skill prompt 定义，不在此建模。
+/ RIPPLE verdicts are parsed every wave and have a fixed shape, so a Pydantic
+TypeAdapter decodes and validates them in one `validate_json` pass. OBSERVE /
+SYNTHESIZE fields are defined by Skill prompts and are not modelled here.
+
+校验保持原有宽松语义：能量值经 `_safe_float` 容错，continue_propagation 按
+真值判断，文本字段接受数字；缺少 agent_id / 原因字段仍视为输出无效（触发重试）。
+模型不挂 Python 校验器，热路径全部在 pydantic-core 中完成。
+/ Validation keeps the previous lenient semantics: energies go through
+`_safe_float`, continue_propagation uses truthiness, text fields accept
+numbers; a missing agent_id / reason still makes the output invalid
+(triggering a retry). No Python validators are attached, so the hot path
+stays inside pydantic-core.
+"""
+
+from typing import Any, List, Optional
+
+from pydantic import ConfigDict, TypeAdapter
+from typing_extensions import NotRequired, TypedDict
+
+
+_NUMERIC_TYPES = (int, float, bool)
+_ENERGY_KEYS = ("value", "score", "energy")
+
+
+def _safe_float(value: Any, default: float = 0.0) -> float:
+    """从 LLM JSON 输出中安全提取浮点数。 / Safely extract float from LLM JSON output.
+
+    按 JSON 解码结果的常见类型精确分支（float → int/bool → str → dict），
+    子类实例走末尾的 isinstance 回退；bool 仍按 int 转换为 0.0/1.0。
+    / Branches on the exact types JSON decoding produces (float → int/bool →
+    str → dict); subclass instances take the trailing isinstance fallback.
+    bool still converts like int to 0.0/1.0.
+    """
+    cls = value.__class__
+    if cls is float:
+        return value
+    if cls is int or cls is bool:
+        return float(value)
+    if cls is str:
+        try:
+            return float(value)
+        except ValueError:
+            return default
+    if cls is dict:
+        for key in _ENERGY_KEYS:
+            inner = value.get(key)
+            if inner.__class__ in _NUMERIC_TYPES:
+                return float(inner)
+        return default
+    # 罕见的子类实例 / Rare subclass instances
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return default
+    if isinstance(value, dict):
+        for key in _ENERGY_KEYS:
+            if key in value and isinstance(value[key], (int, float)):
+                return float(value[key])
+    return default
+
+
+# 数字输入按字符串接收（如 "simulated_time_elapsed": 4）
+# / Numeric input is accepted for text fields (e.g. "simulated_time_elapsed": 4)
+_LENIENT = ConfigDict(coerce_numbers_to_str=True)
+
+
+class ActivationPayload(TypedDict):
+    """裁决中的单个激活项。 / A single activation in a verdict.
+
+    incoming_ripple_energy 保留原始值，由调用方经 `_safe_float` 容错转换。
+    / incoming_ripple_energy keeps the raw value for the caller to convert
+    leniently through `_safe_float`.
+    """
+
+    __pydantic_config__ = _LENIENT  # type: ignore[misc]
+
+    agent_id: str
+    incoming_ripple_energy: NotRequired[Any]
+    activation_reason: str
+
+
+class SkipPayload(TypedDict):
+    """裁决中的单个跳过项。 / A single skip in a verdict."""
+
+    __pydantic_config__ = _LENIENT  # type: ignore[misc]
+
+    agent_id: str
+    skip_reason: str
+
+
+class VerdictPayload(TypedDict, total=False):
+    """RIPPLE 裁决的 LLM 输出（字段均可缺省）。 / LLM output of a RIPPLE verdict (all fields optional).
+
+    continue_propagation 保留原始值，按真值判断。 / continue_propagation keeps
+    the raw value and is read by truthiness.
+    """
+
+    __pydantic_config__ = _LENIENT  # type: ignore[misc]
+
+    wave_number: int
+    simulated_time_elapsed: Optional[str]
+    simulated_time_remaining: Optional[str]
+    continue_propagation: Any
+    termination_reason: Optional[str]
+    activated_agents: List[ActivationPayload]
+    skipped_agents: List[SkipPayload]
+    global_observation: Optional[str]
+
+
+# 校验结果为普通 dict（不构造模型实例），解码与校验在 pydantic-core 中一次完成
+# / Validates into plain dicts (no model instances); decoding and validation
+#   happen in one pydantic-core pass
+VERDICT_ADAPTER: TypeAdapter[VerdictPayload] = TypeAdapter(VerdictPayload)
@@ -12,9 +12,11 @@ Prompt 中显式引入群体内部差异性，避免 LLM 从众倾向过强（
 / Explicitly introduces intra-group diversity in prompts to counter LLM conformity bias (per OASIS findings).
 """
 
-import json
+import asyncio
 import logging
-from typing import Any, Callable, Awaitable, Dict, List
+import os
+from collections import deque
+from typing import Any, Callable, Awaitable, Deque, Dict, List, Optional, Sequence, Tuple
 
 from ripple.prompts import (
     SEA_SYSTEM_PROMPT,
@@ -22,12 +24,27 @@ from ripple.prompts import (
     SEA_MEMORY_LINE,
     SEA_MEMORY_HEADER,
 )
+from ripple.utils.fast_json import loads
+from ripple.utils.json_parser import strip_code_fence
+from ripple.utils.prompt_template import compile_template
 
 logger = logging.getLogger(__name__)
 
-VALID_SEA_RESPONSE_TYPES = {
+# 单波次内并发的 Sea LLM 调用上限 / Max concurrent Sea LLM calls within one wave
+SEA_CONCURRENCY = int(os.getenv("RIPPLE_SEA_CONCURRENCY", "16"))
+
+# 每次响应都会渲染，导入时预编译 / Rendered on every response; precompiled at import
+_SEA_USER_TPL = compile_template(SEA_USER_PROMPT)
+
+# 重复涟漪命中这些历史响应时直接复用，不再调用 LLM
+# / A repeated ripple whose earlier response was one of these is answered from memory
+_REUSABLE_RESPONSE_TYPES = frozenset({"ignore", "suppress"})
+# 去重键只取内容前缀 / Dedupe keys use only a content prefix
+_RIPPLE_KEY_CHARS = 256
+
+VALID_SEA_RESPONSE_TYPES = frozenset({
     "amplify", "absorb", "mutate", "suppress", "ignore",
-}
+})
 FALLBACK_SEA_RESPONSE = {
     "response_type": "ignore",
     "cluster_reaction": "",
@@ -48,6 +65,19 @@ class SeaAgent:
         system_prompt_template: str = "",
         max_retries: int = 1,
         memory_window: int = 5,
+        # 低于该能量的涟漪不调用 LLM、直接忽略；默认 0 即关闭。调高可省下弱涟漪
+        # 的调用，代价是群体对弱信号的反应不再由模型判断（速度/质量权衡，显式启用）
+        # / Ripples below this energy are ignored without an LLM call; the
+        #   default 0 disables it. Raising it saves calls on weak ripples at the
+        #   cost of the model no longer judging reactions to weak signals (an
+        #   opt-in speed/quality tradeoff)
+        ignore_threshold: float = 0.0,
+        # 为 True 时，重复涟漪若曾被 ignore/suppress 且本次能量不高于当时，
+        # 直接复用历史响应；默认关闭，重复涟漪照常交给模型判断
+        # / When True, a repeated ripple previously answered ignore/suppress at
+        #   no lower energy reuses that response without an LLM call; off by
+        #   default so repeats are judged by the model as usual
+        reuse_ignored_responses: bool = False,
     ):
         self.agent_id = agent_id
         self.description = description
@@ -55,7 +85,10 @@ class SeaAgent:
         self._system_prompt_template = system_prompt_template
         self._max_retries = max_retries
         self._memory_window = memory_window
-        self.memory: List[Dict[str, Any]] = []
+        self._ignore_threshold = ignore_threshold
+        self._reuse_ignored_responses = reuse_ignored_responses
+        # 滑动窗口记忆，超出窗口自动淘汰最旧条目 / Sliding-window memory; oldest entries evicted automatically
+        self.memory: Deque[Dict[str, Any]] = deque(maxlen=memory_window)
 
     async def respond(
         self,
@@ -63,6 +96,32 @@ class SeaAgent:
         ripple_energy: float,
         ripple_source: str,
     ) -> Dict[str, Any]:
+        # 能量过低的涟漪不足以触发群体反应，直接忽略
+        # / Ripples too weak to move the crowd are ignored without an LLM call
+        if ripple_energy < self._ignore_threshold:
+            logger.debug(
+                "海 Agent %s 跳过低能量涟漪 (能量=%.2f)", self.agent_id, ripple_energy,
+            )
+            return dict(FALLBACK_SEA_RESPONSE, reasoning="below activation threshold")
+
+        ripple_key = (ripple_source, ripple_content[:_RIPPLE_KEY_CHARS])
+        if self._reuse_ignored_responses:
+            # 同一涟漪以更高能量回来时（被再次放大）仍交给 LLM 重新判断
+            # / A repeat that comes back at higher energy (re-amplified) still goes to the LLM
+            for m in reversed(self.memory):
+                if (
+                    m.get("ripple_key") == ripple_key
+                    and m["response"]["response_type"] in _REUSABLE_RESPONSE_TYPES
+                    and ripple_energy <= m.get("ripple_energy", 0.0)
+                ):
+                    logger.debug("海 Agent %s 复用重复涟漪的历史响应", self.agent_id)
+                    response = dict(m["response"])
+                    # 重复曝光同样计入记忆 / The repeat exposure is still recorded in memory
+                    self._remember(
+                        ripple_content, ripple_energy, ripple_source, ripple_key, response,
+                    )
+                    return response
+
         system_prompt = self._build_system_prompt()
         user_prompt = self._build_user_prompt(
             ripple_content, ripple_energy, ripple_source,
@@ -71,56 +130,116 @@ class SeaAgent:
         for attempt in range(1 + self._max_retries):
             try:
                 logger.info(
-                    f"Sea Agent {self.agent_id} 调用 LLM "
-                    f"(能量={ripple_energy:.2f}, 来源={ripple_source})"
+                    "Sea Agent %s 调用 LLM (能量=%.2f, 来源=%s)",
+                    self.agent_id, ripple_energy, ripple_source,
                 )
                 raw = await self._llm_caller(
                     system_prompt=system_prompt,
                     user_prompt=user_prompt,
                 )
                 response = self._parse_response(raw)
-                self.memory.append({
-                    "ripple_content": ripple_content,
-                    "ripple_source": ripple_source,
-                    "response": response,
-                })
-                # 滑动窗口 / Sliding window
-                if len(self.memory) > self._memory_window:
-                    self.memory = self.memory[-self._memory_window:]
+                self._remember(
+                    ripple_content, ripple_energy, ripple_source, ripple_key, response,
+                )
                 return response
             except Exception as e:
                 logger.warning(
-                    f"海 Agent {self.agent_id} 第 {attempt+1} 次失败: {e}"
+                    "海 Agent %s 第 %d 次失败: %s", self.agent_id, attempt + 1, e,
                 )
 
         return dict(FALLBACK_SEA_RESPONSE)
 
-    def _build_system_prompt(self) -> str:
-        memory_context = ""
-        if self.memory:
-            lines = []
-            for m in self.memory:
-                lines.append(
-                    SEA_MEMORY_LINE.format(
-                        ripple_source=m['ripple_source'],
-                        response_type=m['response']['response_type'],
-                    )
-                )
-            memory_context = SEA_MEMORY_HEADER + "\n".join(lines)
+    @classmethod
+    async def respond_batch(
+        cls,
+        agents: Sequence["SeaAgent"],
+        ripples: Sequence[Dict[str, Any]],
+        *,
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """并发响应一批涟漪，按输入顺序返回。 / Respond to a batch of ripples concurrently, in input order.
+
+        ripples[i] 为传给 agents[i].respond 的关键字参数。同时进行的 LLM 调用
+        不超过 concurrency（默认 RIPPLE_SEA_CONCURRENCY）；单个失败降级为
+        FALLBACK_SEA_RESPONSE，不影响其余响应。return_exceptions=True 时改为
+        在对应位置返回异常，由调用方自行记录。
+        / ripples[i] holds the keyword arguments for agents[i].respond. At most
+        `concurrency` LLM calls (default RIPPLE_SEA_CONCURRENCY) run at once;
+        a single failure degrades to FALLBACK_SEA_RESPONSE without affecting
+        the rest. With return_exceptions=True the exception is returned in its
+        place instead, for the caller to record.
+        """
+        if len(agents) != len(ripples):
+            raise ValueError(
+                "agents 与 ripples 数量不一致 / agents and ripples length mismatch"
+            )
+        # 每次调用新建信号量，绑定当前事件循环 / New semaphore per call, bound to the running loop
+        semaphore = asyncio.Semaphore(max(1, concurrency or SEA_CONCURRENCY))
 
-        base = SEA_SYSTEM_PROMPT.format(
-            description=self.description,
-            memory_context=memory_context,
+        async def _bounded(agent: "SeaAgent", ripple: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await agent.respond(**ripple)
+
+        done = await asyncio.gather(
+            *(_bounded(a, r) for a, r in zip(agents, ripples)),
+            return_exceptions=True,
         )
+        results: List[Any] = []
+        for agent, result in zip(agents, done):
+            if isinstance(result, Exception):
+                if not return_exceptions:
+                    logger.error("海 Agent %s 响应失败: %s", agent.agent_id, result)
+                    result = dict(FALLBACK_SEA_RESPONSE)
+            elif isinstance(result, BaseException):
+                raise result
+            results.append(result)
+        return results
+
+    def _remember(
+        self,
+        content: str,
+        energy: float,
+        source: str,
+        key: Tuple[str, str],
+        response: Dict[str, Any],
+    ) -> None:
+        self.memory.append({
+            "ripple_content": content,
+            "ripple_energy": energy,
+            "ripple_source": source,
+            "ripple_key": key,
+            "response": response,
+        })
+
+    def _build_system_prompt(self) -> str:
+        # 只含静态内容（Skill 上下文 + 群体画像），记忆放在用户提示词中，
+        # 保证同一 Agent 各轮的 system 前缀一致以命中提示词缓存
+        # / Static content only (skill context + crowd profile); memory goes
+        #   into the user prompt so the system prefix stays cacheable across turns
+        base = SEA_SYSTEM_PROMPT.format(description=self.description)
         # v4: Prepend skill context (if injected via system_prompt_template)
         if self._system_prompt_template:
             return self._system_prompt_template + base
         return base
 
+    def _build_memory_context(self) -> str:
+        if not self.memory:
+            return ""
+        lines = [
+            SEA_MEMORY_LINE.format(
+                ripple_source=m['ripple_source'],
+                response_type=m['response']['response_type'],
+            )
+            for m in self.memory
+        ]
+        return SEA_MEMORY_HEADER + "\n".join(lines) + "\n\n"
+
     def _build_user_prompt(
         self, content: str, energy: float, source: str,
     ) -> str:
-        return SEA_USER_PROMPT.format(
+        return _SEA_USER_TPL.format(
+            memory_context=self._build_memory_context(),
             source=source,
             energy=energy,
             content=content,
@@ -136,26 +255,17 @@ class SeaAgent:
                 f"SeaAgent expected str response, got {type(raw).__name__}"
             )
 
-        text = raw.strip()
-        if text.startswith("```"):
-            lines = text.split("\n")
-            json_lines = []
-            in_block = False
-            for line in lines:
-                if line.strip().startswith("```") and not in_block:
-                    in_block = True
-                    continue
-                elif line.strip() == "```" and in_block:
-                    break
-                elif in_block:
-                    json_lines.append(line)
-            text = "\n".join(json_lines)
-
-        data = json.loads(text)
+        text = strip_code_fence(raw.strip())
+
+        data = loads(text)
         rtype = data.get("response_type", "ignore")
         if rtype not in VALID_SEA_RESPONSE_TYPES:
             rtype = "ignore"
-        energy = max(0.0, min(1.0, float(data.get("outgoing_energy", 0.0))))
+        # 内联钳制到 [0, 1]；NaN 与原 max/min 写法一致落到 1.0
+        # / Inline clamp to [0, 1]; NaN lands on 1.0 as with the former max/min
+        energy = float(data.get("outgoing_energy", 0.0))
+        if not 0.0 <= energy <= 1.0:
+            energy = 0.0 if energy < 0.0 else 1.0
 
         return {
             "response_type": rtype,
@@ -9,10 +9,16 @@
 / Unaware of: global state, other agents, propagation overview, platform params.
 """
 
-import json
 import logging
-from typing import Any, Callable, Awaitable, Dict, List
-
+from collections import deque
+from types import MappingProxyType
+from typing import Any, Callable, Awaitable, Deque, Dict, List, Mapping, Optional, Union
+
+from ripple.llm.backoff import backoff_before_retry
+from ripple.llm.cache import NullCache, ResponseCache
+from ripple.utils.fast_json import loads
+from ripple.utils.json_parser import strip_code_fence
+from ripple.utils.prompt_template import compile_template
 from ripple.prompts import (
     STAR_SYSTEM_PROMPT,
     STAR_USER_PROMPT,
@@ -22,13 +28,24 @@ from ripple.prompts import (
 
 logger = logging.getLogger(__name__)
 
-VALID_RESPONSE_TYPES = {"amplify", "create", "comment", "ignore"}
-FALLBACK_RESPONSE = {
+# 系统提示词按记忆段拆成头尾：头部只依赖画像，每个 Agent 渲染一次
+# / The system prompt is split around the memory block: the head depends
+#   only on the profile and is rendered once per agent
+_STAR_SYSTEM_HEAD, _STAR_SYSTEM_TAIL = STAR_SYSTEM_PROMPT.split("{memory_context}")
+_STAR_USER_TPL = compile_template(STAR_USER_PROMPT)
+# 提示词中回顾的记忆条数 / Memory entries recalled in the prompt
+_RECENT_MEMORY = 5
+
+VALID_RESPONSE_TYPES = frozenset({"amplify", "create", "comment", "ignore"})
+# 只读的降级响应：记忆中直接引用，返回给调用方时复制（结果会被记录并序列化）
+# / Read-only fallback: referenced as-is in memory, copied for callers
+#   (results are recorded and serialized downstream)
+FALLBACK_RESPONSE = MappingProxyType({
     "response_type": "ignore",
     "response_content": "",
     "outgoing_energy": 0.0,
     "reasoning": "LLM 调用失败，安全降级",
-}
+})
 
 
 class StarAgent:
@@ -41,13 +58,38 @@ class StarAgent:
         llm_caller: Callable[..., Awaitable[str]],
         system_prompt_template: str = "",
         max_retries: int = 1,
+        response_cache: Optional[Union[ResponseCache, NullCache]] = None,
+        similarity_threshold: Optional[float] = None,
+        keep_full_history: bool = False,
     ):
         self.agent_id = agent_id
         self.description = description
         self._llm_caller = llm_caller
         self._system_prompt_template = system_prompt_template
         self._max_retries = max_retries
-        self.memory: List[Dict[str, Any]] = []
+        # 默认不缓存：模拟依赖输出多样性 / No caching by default: simulations rely on output variance
+        self._response_cache = response_cache if response_cache is not None else NullCache()
+        # 语义命中默认关闭：近似提示词也应得到独立响应
+        # / Semantic hits are off by default: near-duplicate prompts still get their own response
+        self._similarity_threshold = similarity_threshold
+        # 默认只保留提示词用到的近期窗口；需要完整历史时显式开启
+        # / Only the recent window used in prompts is kept by default;
+        #   opt in to the full history explicitly
+        self.memory: Union[List[Dict[str, Any]], Deque[Dict[str, Any]]] = (
+            [] if keep_full_history else deque(maxlen=_RECENT_MEMORY)
+        )
+        self._memory_count = 0
+        self._system_head = system_prompt_template + _STAR_SYSTEM_HEAD.format(
+            description=description,
+        )
+        # 近期记忆行在写入时格式化一次 / Recent memory lines are formatted once on write
+        self._memory_lines: Deque[str] = deque(maxlen=_RECENT_MEMORY)
+        self._memory_block = ""
+
+    @property
+    def memory_count(self) -> int:
+        """累计记忆条数（不受窗口截断影响）。 / Total memories recorded (unaffected by the window)."""
+        return self._memory_count
 
     async def respond(
         self,
@@ -60,92 +102,94 @@ class StarAgent:
         user_prompt = self._build_user_prompt(
             ripple_content, ripple_energy, ripple_source,
         )
+        cache = self._response_cache
 
         for attempt in range(1 + self._max_retries):
             try:
-                logger.info(
-                    f"Star Agent {self.agent_id} 调用 LLM "
-                    f"(能量={ripple_energy:.2f}, 来源={ripple_source})"
-                )
-                raw = await self._llm_caller(
-                    system_prompt=system_prompt,
-                    user_prompt=user_prompt,
-                )
+                # 缓存中只存解析成功的响应，仅首次尝试读取
+                # / Only successfully parsed responses are cached; read on the first attempt only
+                raw = None
+                if attempt == 0:
+                    raw = await cache.lookup(
+                        system_prompt, user_prompt,
+                        similarity_threshold=self._similarity_threshold,
+                    )
+                if raw is None:
+                    logger.info(
+                        "Star Agent %s 调用 LLM (能量=%.2f, 来源=%s)",
+                        self.agent_id, ripple_energy, ripple_source,
+                    )
+                    raw = await self._llm_caller(
+                        system_prompt=system_prompt,
+                        user_prompt=user_prompt,
+                    )
                 response = self._parse_response(raw)
-                self.memory.append({
-                    "ripple_content": ripple_content,
-                    "ripple_energy": ripple_energy,
-                    "ripple_source": ripple_source,
-                    "my_response": response,
-                })
+                await cache.store(system_prompt, user_prompt, raw)
+                self._remember(ripple_content, ripple_energy, ripple_source, response)
                 return response
             except Exception as e:
                 logger.warning(
-                    f"星 Agent {self.agent_id} 第 {attempt+1} 次失败: {e}"
+                    "星 Agent %s 第 %d 次失败: %s", self.agent_id, attempt + 1, e,
                 )
+                # 限流/网络错误退避后重试，解析失败立即重试
+                # / Back off on rate-limit/network errors; retry parse failures at once
+                if attempt < self._max_retries:
+                    await backoff_before_retry(e, attempt)
+
+        self._remember(ripple_content, ripple_energy, ripple_source, FALLBACK_RESPONSE)
+        return dict(FALLBACK_RESPONSE)
 
+    def _remember(
+        self,
+        ripple_content: str,
+        ripple_energy: float,
+        ripple_source: str,
+        response: Mapping[str, Any],
+    ) -> None:
         self.memory.append({
             "ripple_content": ripple_content,
             "ripple_energy": ripple_energy,
             "ripple_source": ripple_source,
-            "my_response": FALLBACK_RESPONSE,
+            "my_response": response,
         })
-        return dict(FALLBACK_RESPONSE)
+        self._memory_count += 1
+        self._memory_lines.append(
+            STAR_MEMORY_LINE.format(
+                ripple_source=ripple_source,
+                ripple_content_preview=ripple_content[:50],
+                response_type=response['response_type'],
+            )
+        )
+        # 记忆段随写入重建，构建提示词时直接复用 / The memory block is rebuilt on write and reused as-is
+        self._memory_block = STAR_MEMORY_HEADER + "\n".join(self._memory_lines)
 
     def _build_system_prompt(self) -> str:
-        memory_context = ""
-        if self.memory:
-            recent = self.memory[-5:]  # 最近5条 / Last 5 entries
-            memory_lines = []
-            for m in recent:
-                memory_lines.append(
-                    STAR_MEMORY_LINE.format(
-                        ripple_source=m['ripple_source'],
-                        ripple_content_preview=m['ripple_content'][:50],
-                        response_type=m['my_response']['response_type'],
-                    )
-                )
-            memory_context = STAR_MEMORY_HEADER + "\n".join(memory_lines)
-
-        base = STAR_SYSTEM_PROMPT.format(
-            description=self.description,
-            memory_context=memory_context,
-        )
-        # v4: Prepend skill context (if injected via system_prompt_template)
-        if self._system_prompt_template:
-            return self._system_prompt_template + base
-        return base
+        # v4: Skill context (system_prompt_template) is already prepended to the head
+        return self._system_head + self._memory_block + _STAR_SYSTEM_TAIL
 
     def _build_user_prompt(
         self, content: str, energy: float, source: str,
     ) -> str:
-        return STAR_USER_PROMPT.format(
+        return _STAR_USER_TPL.format(
             source=source,
             energy=energy,
             content=content,
         )
 
     def _parse_response(self, raw: str) -> Dict[str, Any]:
-        text = raw.strip()
-        if text.startswith("```"):
-            lines = text.split("\n")
-            json_lines = []
-            in_block = False
-            for line in lines:
-                if line.strip().startswith("```") and not in_block:
-                    in_block = True
-                    continue
-                elif line.strip() == "```" and in_block:
-                    break
-                elif in_block:
-                    json_lines.append(line)
-            text = "\n".join(json_lines)
-
-        data = json.loads(text)
+        # 干净 JSON（常见情况）直接解析；围栏由预编译正则一次剥离
+        # / Clean JSON (the common case) parses directly; fences are stripped
+        #   by one precompiled regex match
+        text = strip_code_fence(raw.strip())
+        data = loads(text)
         rtype = data.get("response_type", "ignore")
         if rtype not in VALID_RESPONSE_TYPES:
             rtype = "ignore"
-        energy = max(0.0, min(1.0, float(data.get("outgoing_energy", 0.0))))
+        # 内联钳制到 [0, 1]；NaN 与原 max/min 写法一致落到 1.0
+        # / Inline clamp to [0, 1]; NaN lands on 1.0 as with the former max/min
+        energy = float(data.get("outgoing_energy", 0.0))
+        if not 0.0 <= energy <= 1.0:
+            energy = 0.0 if energy < 0.0 else 1.0
 
         return {
             "response_type": rtype,
@@ -6,17 +6,71 @@ TribunalAgent 扮演专业角色（市场分析师、魔鬼代言人等），
 for structured evaluation and debate of product proposals.
 """
 
+import asyncio
 import json
 import logging
-from typing import Any, Callable, Awaitable, Dict, List
+from contextlib import nullcontext
+from typing import (
+    Any, AsyncContextManager, Callable, Awaitable, Dict, Iterable, List, Optional,
+    Sequence, Tuple, TypeVar, Union,
+)
 
+from ripple.llm.backoff import backoff_before_retry, is_transient_error
+from ripple.llm.cache import NullCache, ResponseCache
 from ripple.primitives.pmf_models import TribunalOpinion
-from ripple.utils.json_parser import parse_json_from_llm
+from ripple.utils.fast_json import dumps_compact
+from ripple.utils.json_parser import parse_json_from_llm, parse_partial_json
 
 logger = logging.getLogger(__name__)
 
 FALLBACK_SCORES: Dict[str, int] = {}  # Empty fallback
 
+_T = TypeVar("_T")
+
+# 提示词固定结尾 / Fixed prompt tails
+_EVALUATE_TAIL = (
+    "Respond with JSON: {\"scores\": {dimension: 1-5}, \"narrative\": \"your analysis\"}"
+)
+_CHALLENGE_TAIL = (
+    "Respond with JSON: {\"challenge\": \"your specific challenge to their assessment\"}"
+)
+_REVISE_TAIL = (
+    "Revise your assessment. You may keep, raise, or lower scores.\n"
+    "Respond with JSON: {\"scores\": {dimension: 1-5}, \"narrative\": \"revised analysis\"}"
+)
+
+
+def _render_rubric(dimensions: Sequence[str], rubric: str) -> str:
+    """渲染评分标准与维度段落（评估提示词中的静态部分）。
+    / Render the rubric and dimensions section (the static part of the evaluate prompt)."""
+    return (
+        f"## Scoring rubric\n{rubric}\n\n"
+        f"## Dimensions to evaluate\n{', '.join(dimensions)}\n\n"
+    )
+
+
+def _parse_scored_json(raw: str, expected: Iterable[str]) -> Dict[str, Any]:
+    """解析评分 JSON；常规解析失败时先尝试本地修复截断输出，省去一次 LLM 重调。
+    / Parse scored JSON; when regular parsing fails, try repairing truncated
+    output locally first to save an LLM re-call.
+
+    修复结果必须覆盖全部期望维度的评分，否则仍抛出 ValueError 触发重试。
+    / A repaired result must score every expected dimension, otherwise
+    ValueError is still raised to trigger a retry.
+    """
+    try:
+        return parse_json_from_llm(raw)
+    except ValueError as e:
+        try:
+            data = parse_partial_json(raw)
+        except ValueError:
+            raise e from None
+        scores = data.get("scores")
+        if not isinstance(scores, dict) or not scores or any(d not in scores for d in expected):
+            raise e from None
+        logger.info("已本地修复截断的评分 JSON / Repaired truncated scored JSON locally")
+        return data
+
 
 class TribunalAgent:
     """合议庭评审员：专业角色评估器。 / Tribunal Agent: professional role evaluator."""
@@ -29,6 +83,9 @@ class TribunalAgent:
         llm_caller: Callable[..., Awaitable[str]],
         system_prompt: str = "",
         max_retries: int = 2,
+        response_cache: Optional[Union[ResponseCache, NullCache]] = None,
+        similarity_threshold: Optional[float] = None,
+        challenge_similarity_threshold: Optional[float] = 0.95,
     ):
         self.role = role
         self.perspective = perspective
@@ -36,35 +93,99 @@ class TribunalAgent:
         self._llm_caller = llm_caller
         self._system_prompt = system_prompt
         self._max_retries = max_retries
+        self._response_cache = response_cache if response_cache is not None else NullCache()
+        # 语义命中阈值（需缓存提供 embed_fn）：质疑轮次措辞常有改写，默认开启
+        # / Semantic hit thresholds (need an embed_fn on the cache): on by
+        #   default for challenges, whose wording is often rephrased
+        self._similarity_threshold = similarity_threshold
+        self._challenge_similarity_threshold = challenge_similarity_threshold
+        # 角色相关的提示词开头在构造时生成，各轮次只拼接变化部分
+        # / Role-dependent prompt headers are built once; rounds only append the varying parts
+        self._evaluate_header = (
+            f"You are a {role} with expertise in {expertise}.\n"
+            f"Your evaluation perspective: {perspective}\n\n"
+        )
+        self._debate_header = f"You are a {role}. Your perspective: {perspective}\n\n"
+        # 由 prebind_rubric 绑定的评分标准 / Rubric bound by prebind_rubric
+        self._dimensions: Optional[List[str]] = None
+        self._rubric: Optional[str] = None
+        self._rubric_section: Optional[str] = None
 
-    async def _call_llm(self, user_prompt: str) -> str:
+    def prebind_rubric(self, dimensions: List[str], rubric: str) -> None:
+        """预先绑定一次模拟内不变的维度与评分标准，并渲染好对应提示词段落。
+        / Bind the dimensions and rubric, constant within a run, and pre-render their prompt section.
+
+        绑定后 evaluate 可省略 dimensions / rubric。 / Once bound, evaluate may omit dimensions / rubric.
+        """
+        self._dimensions = list(dimensions)
+        self._rubric = rubric
+        self._rubric_section = _render_rubric(self._dimensions, rubric)
+
+    async def _call_llm(
+        self,
+        user_prompt: str,
+        use_cache: bool = True,
+        similarity_threshold: Optional[float] = None,
+    ) -> str:
+        if use_cache:
+            cached = await self._response_cache.lookup(
+                self._system_prompt, user_prompt,
+                similarity_threshold=similarity_threshold,
+            )
+            if cached is not None:
+                return cached
         return await self._llm_caller(
             system_prompt=self._system_prompt,
             user_prompt=user_prompt,
         )
 
+    async def _remember(self, user_prompt: str, raw: str) -> None:
+        """解析成功后写入响应缓存。 / Store a successfully parsed response in the cache."""
+        await self._response_cache.store(self._system_prompt, user_prompt, raw)
+
     async def evaluate(
         self,
         evidence: str,
-        dimensions: List[str],
-        rubric: str,
+        dimensions: Optional[List[str]] = None,
+        rubric: Optional[str] = None,
         round_number: int = 0,
     ) -> TribunalOpinion:
-        """独立评估：基于证据输出评分卡和叙事。 / Independent evaluation: output scorecard and narrative based on evidence."""
+        """独立评估：基于证据输出评分卡和叙事。 / Independent evaluation: output scorecard and narrative based on evidence.
+
+        dimensions / rubric 缺省时使用 prebind_rubric 绑定的值。
+        / dimensions / rubric default to the values bound by prebind_rubric.
+        """
+        if dimensions is None and rubric is None and self._rubric_section is not None:
+            dimensions, section = self._dimensions, self._rubric_section
+        else:
+            if dimensions is None:
+                dimensions = self._dimensions
+            if rubric is None:
+                rubric = self._rubric
+            if dimensions is None or rubric is None:
+                raise ValueError(
+                    "缺少 dimensions / rubric，请传入或先调用 prebind_rubric "
+                    "/ dimensions / rubric missing; pass them or call prebind_rubric first"
+                )
+            section = _render_rubric(dimensions, rubric)
         prompt = (
-            f"You are a {self.role} with expertise in {self.expertise}.\n"
-            f"Your evaluation perspective: {self.perspective}\n\n"
-            f"## Evidence from simulation\n{evidence}\n\n"
-            f"## Scoring rubric\n{rubric}\n\n"
-            f"## Dimensions to evaluate\n{', '.join(dimensions)}\n\n"
-            "Respond with JSON: {\"scores\": {dimension: 1-5}, \"narrative\": \"your analysis\"}"
+            self._evaluate_header
+            + f"## Evidence from simulation\n{evidence}\n\n"
+            + section
+            + _EVALUATE_TAIL
         )
         last_error = None
         for attempt in range(1 + self._max_retries):
             try:
-                raw = await self._call_llm(prompt)
-                data = parse_json_from_llm(raw)
+                # 重试时绕过缓存 / Bypass the cache on retries
+                raw = await self._call_llm(
+                    prompt,
+                    use_cache=attempt == 0,
+                    similarity_threshold=self._similarity_threshold,
+                )
+                data = _parse_scored_json(raw, dimensions)
                 scores = {k: int(v) for k, v in data.get("scores", {}).items()}
+                await self._remember(prompt, raw)
                 return TribunalOpinion(
                     member_role=self.role,
                     scores=scores,
@@ -74,6 +195,17 @@ class TribunalAgent:
             except (json.JSONDecodeError, ValueError, KeyError) as e:
                 last_error = e
                 logger.warning(f"TribunalAgent {self.role} evaluate attempt {attempt + 1} failed: {e}")
+            except Exception as e:
+                # 限流/网络错误退避后重试，其他调用错误照常上抛
+                # / Back off and retry on rate-limit/network errors; other call errors propagate
+                if not is_transient_error(e) or attempt >= self._max_retries:
+                    raise
+                last_error = e
+                logger.warning(
+                    "TribunalAgent %s evaluate attempt %d hit a transient error: %s",
+                    self.role, attempt + 1, e,
+                )
+                await backoff_before_retry(e, attempt)
 
         logger.error(f"TribunalAgent {self.role} evaluate failed after retries: {last_error}")
         return TribunalOpinion(
@@ -89,18 +221,28 @@ class TribunalAgent:
     ) -> str:
         """质疑其他评审员的观点。 / Challenge another tribunal member's opinion."""
         prompt = (
-            f"You are a {self.role}. Your perspective: {self.perspective}\n\n"
-            f"Another evaluator ({other_opinion.member_role}) gave this assessment:\n"
-            f"Scores: {json.dumps(other_opinion.scores)}\n"
+            self._debate_header
+            + f"Another evaluator ({other_opinion.member_role}) gave this assessment:\n"
+            f"Scores: {dumps_compact(other_opinion.scores)}\n"
             f"Narrative: {other_opinion.narrative}\n\n"
-            "Respond with JSON: {\"challenge\": \"your specific challenge to their assessment\"}"
+            + _CHALLENGE_TAIL
         )
         try:
-            raw = await self._call_llm(prompt)
+            raw = await self._call_llm(
+                prompt, similarity_threshold=self._challenge_similarity_threshold,
+            )
             data = parse_json_from_llm(raw)
+            await self._remember(prompt, raw)
             return data.get("challenge", raw)
         except (json.JSONDecodeError, ValueError):
-            return raw if isinstance(raw, str) else ""
+            if not isinstance(raw, str):
+                return ""
+            # 截断输出中已写出的 challenge 字段优先于原文 / A challenge field already written in truncated output beats the raw text
+            try:
+                challenge = parse_partial_json(raw).get("challenge")
+            except ValueError:
+                challenge = None
+            return challenge if isinstance(challenge, str) and challenge else raw
 
     async def revise(
         self,
@@ -111,20 +253,25 @@ class TribunalAgent:
         """基于质疑修正立场。 / Revise position based on challenges received."""
         challenges_text = "\n".join(f"- {c}" for c in challenges)
         prompt = (
-            f"You are a {self.role}. Your perspective: {self.perspective}\n\n"
-            f"Your previous assessment (round {original_opinion.round_number}):\n"
-            f"Scores: {json.dumps(original_opinion.scores)}\n"
+            self._debate_header
+            + f"Your previous assessment (round {original_opinion.round_number}):\n"
+            f"Scores: {dumps_compact(original_opinion.scores)}\n"
             f"Narrative: {original_opinion.narrative}\n\n"
             f"Challenges received:\n{challenges_text}\n\n"
-            "Revise your assessment. You may keep, raise, or lower scores.\n"
-            "Respond with JSON: {\"scores\": {dimension: 1-5}, \"narrative\": \"revised analysis\"}"
+            + _REVISE_TAIL
         )
         last_error = None
         for attempt in range(1 + self._max_retries):
             try:
-                raw = await self._call_llm(prompt)
-                data = parse_json_from_llm(raw)
+                # 重试时绕过缓存 / Bypass the cache on retries
+                raw = await self._call_llm(
+                    prompt,
+                    use_cache=attempt == 0,
+                    similarity_threshold=self._similarity_threshold,
+                )
+                data = _parse_scored_json(raw, original_opinion.scores)
                 scores = {k: int(v) for k, v in data.get("scores", {}).items()}
+                await self._remember(prompt, raw)
                 return TribunalOpinion(
                     member_role=self.role,
                     scores=scores,
@@ -134,6 +281,17 @@ class TribunalAgent:
             except (json.JSONDecodeError, ValueError, KeyError) as e:
                 last_error = e
                 logger.warning(f"TribunalAgent {self.role} revise attempt {attempt + 1} failed: {e}")
+            except Exception as e:
+                # 限流/网络错误退避后重试，其他调用错误照常上抛
+                # / Back off and retry on rate-limit/network errors; other call errors propagate
+                if not is_transient_error(e) or attempt >= self._max_retries:
+                    raise
+                last_error = e
+                logger.warning(
+                    "TribunalAgent %s revise attempt %d hit a transient error: %s",
+                    self.role, attempt + 1, e,
+                )
+                await backoff_before_retry(e, attempt)
 
         return TribunalOpinion(
             member_role=self.role,
@@ -141,3 +299,75 @@ class TribunalAgent:
             narrative=f"Revision failed: {last_error}. Keeping original.",
             round_number=round_number,
         )
+
+
+# =============================================================================
+# 合议庭扇出 / Panel fan-out
+# =============================================================================
+
+async def _gated(semaphore: Optional[asyncio.Semaphore], coro: Awaitable[_T]) -> _T:
+    gate: AsyncContextManager[Any] = semaphore if semaphore is not None else nullcontext()
+    async with gate:
+        return await coro
+
+
+async def evaluate_panel(
+    members: Sequence[TribunalAgent],
+    *,
+    evidence: str,
+    dimensions: Optional[List[str]] = None,
+    rubric: Optional[str] = None,
+    round_number: int = 0,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> List[TribunalOpinion]:
+    """并发执行全体评审员的独立评估，结果与 members 顺序一致。
+    / Run every member's independent evaluation concurrently, in member order.
+
+    dimensions / rubric 缺省时各评审员使用 prebind_rubric 绑定的值。
+    / When dimensions / rubric are omitted each member uses its prebound values.
+
+    semaphore 可由调用方跨多个合议庭共享，以限制全局并发。
+    / Callers may share one semaphore across tribunals to cap global concurrency.
+    """
+    return list(await asyncio.gather(*(
+        _gated(semaphore, member.evaluate(
+            evidence=evidence,
+            dimensions=dimensions,
+            rubric=rubric,
+            round_number=round_number,
+        ))
+        for member in members
+    )))
+
+
+async def challenge_panel(
+    pairs: Sequence[Tuple[TribunalAgent, TribunalOpinion]],
+    *,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> List[str]:
+    """并发执行 (评审员, 被质疑意见) 的质疑，结果与 pairs 顺序一致。
+    / Run challenges for (member, targeted opinion) concurrently, in pair order.
+    """
+    return list(await asyncio.gather(*(
+        _gated(semaphore, member.challenge(target))
+        for member, target in pairs
+    )))
+
+
+async def revise_panel(
+    items: Sequence[Tuple[TribunalAgent, TribunalOpinion, List[str]]],
+    *,
+    round_number: int,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> List[TribunalOpinion]:
+    """并发执行 (评审员, 原意见, 质疑列表) 的修正，结果与 items 顺序一致。
+    / Run revisions for (member, original opinion, challenges) concurrently, in item order.
+    """
+    return list(await asyncio.gather(*(
+        _gated(semaphore, member.revise(
+            original_opinion=original,
+            challenges=challenges,
+            round_number=round_number,
+        ))
+        for member, original, challenges in items
+    )))
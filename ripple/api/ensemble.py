@@ -1,31 +1,57 @@
 # ripple/api/ensemble.py
 """集成运行器 — PMF 验证的多次模拟与统计聚合。 / Ensemble runner — multiple simulation runs with statistical aggregation for PMF validation."""
 
+import asyncio
 import logging
-import statistics
+from collections import Counter
+from pathlib import Path
 from typing import Any, Callable, Awaitable, Dict, List, Optional, Tuple
 
+from ripple.llm.http_pool import PooledHTTPClient
+from ripple.llm.rate_limit import TokenBucket
+from ripple.utils.fast_json import dumps_compact, loads
+
 logger = logging.getLogger(__name__)
 
+# 评分类别（1-5 分） / Rating categories (scores 1-5)
+_CATEGORIES = (1, 2, 3, 4, 5)
+
+
+def _median_of(sorted_v: List[float], start: int, length: int) -> float:
+    """已排序序列中 [start, start+length) 段的中位数。 / Median of a slice of a sorted list."""
+    mid = start + length // 2
+    if length % 2:
+        return sorted_v[mid]
+    return (sorted_v[mid - 1] + sorted_v[mid]) / 2
+
+
+def _fused_stats(values: List[float]) -> Tuple[float, float, float, float]:
+    """一次排序得到中位数、四分位距、最小值、最大值。 / Median, IQR, min and max from a single sort.
+
+    values 非空；所有统计量都按下标从排序结果读取，不复制半区切片。
+    / values must be non-empty; every statistic is read by index from the
+    sorted list without copying halves.
+    """
+    sorted_v = sorted(values)
+    n = len(sorted_v)
+    median = _median_of(sorted_v, 0, n)
+    lo, hi = sorted_v[0], sorted_v[-1]
+    if n < 2:
+        return median, 0.0, lo, hi
+    # 偶数取上下半区；奇数两半都包含中位数（inclusive quartiles）
+    # / Even: lower/upper halves; odd: both halves include the median
+    half = (n + 1) // 2
+    q1 = _median_of(sorted_v, 0, half)
+    q3 = _median_of(sorted_v, n // 2, half)
+    return median, q3 - q1, lo, hi
+
 
 def compute_median_iqr(values: List[float]) -> Tuple[float, float]:
     """计算中位数和四分位距。 / Compute median and interquartile range."""
     if not values:
         return 0.0, 0.0
-    sorted_v = sorted(values)
-    median = statistics.median(sorted_v)
-    if len(sorted_v) < 2:
-        return median, 0.0
-    n = len(sorted_v)
-    mid = n // 2
-    if n % 2 == 0:
-        q1 = statistics.median(sorted_v[:mid])
-        q3 = statistics.median(sorted_v[mid:])
-    else:
-        # Inclusive quartiles: include median in both halves
-        q1 = statistics.median(sorted_v[:mid + 1])
-        q3 = statistics.median(sorted_v[mid:])
-    return median, q3 - q1
+    median, iqr, _, _ = _fused_stats(values)
+    return median, iqr
 
 
 def compute_fleiss_kappa(ratings_matrix: List[List[int]]) -> float:
@@ -36,32 +62,40 @@ def compute_fleiss_kappa(ratings_matrix: List[List[int]]) -> float:
 
     Returns:
         Kappa coefficient (-1.0 to 1.0). 1.0 = perfect agreement, 0 = chance, <0 = below chance.
+        Rows whose counts do not sum to the same rater total return 0.0.
     """
     if not ratings_matrix or not ratings_matrix[0]:
         return 0.0
 
     n_items = len(ratings_matrix)
-    n_categories = len(ratings_matrix[0])
     n_raters = sum(ratings_matrix[0])
 
     if n_raters <= 1 or n_items == 0:
         return 0.0
 
-    # P_i for each item
-    p_items = []
+    # 同一遍内校验形状：行和不等于评分者数视为畸形；每行全票一致时 kappa 恒为 1
+    # / Shape checks in the same pass: a row summing to anything but n_raters is
+    #   malformed; when every row is unanimous kappa is exactly 1
+    # P_bar: mean of per-item agreement P_i, folded into one sum of squares
+    sum_sq = 0
+    unanimous = True
     for row in ratings_matrix:
-        sum_sq = sum(r * r for r in row)
-        p_i = (sum_sq - n_raters) / (n_raters * (n_raters - 1)) if n_raters > 1 else 0
-        p_items.append(p_i)
-
-    p_bar = sum(p_items) / n_items
+        if sum(row) != n_raters:
+            return 0.0
+        if unanimous and max(row) != n_raters:
+            unanimous = False
+        for r in row:
+            sum_sq += r * r
+    if unanimous:
+        return 1.0
+    p_bar = (sum_sq / n_items - n_raters) / (n_raters * (n_raters - 1))
 
-    # P_e: expected agreement by chance
-    p_j = []
-    for j in range(n_categories):
-        col_sum = sum(ratings_matrix[i][j] for i in range(n_items))
-        p_j.append(col_sum / (n_items * n_raters))
-    p_e = sum(pj * pj for pj in p_j)
+    # P_e: expected agreement by chance (column totals via zip)
+    total = n_items * n_raters
+    p_e = 0.0
+    for col_sum in map(sum, zip(*ratings_matrix)):
+        p_j = col_sum / total
+        p_e += p_j * p_j
 
     if p_e == 1.0:
         return 1.0
@@ -70,6 +104,53 @@ def compute_fleiss_kappa(ratings_matrix: List[List[int]]) -> float:
     return kappa
 
 
+def build_ratings_matrix(
+    score_dicts: List[Dict[str, Any]],
+    dimensions: List[str],
+) -> List[List[int]]:
+    """构建 Fleiss' kappa 评分矩阵（条目=维度，评分者=运行，类别=1..5）。
+    / Build the Fleiss' kappa ratings matrix (items=dimensions, raters=runs, categories=1..5).
+
+    任一运行在某维度上的评分缺失、无法转为整数或超出 1-5 时，该维度整行跳过。
+    / A dimension is skipped when any run's score for it is missing,
+    non-integer or outside 1-5.
+    """
+    n_runs = len(score_dicts)
+    matrix: List[List[int]] = []
+    for dim in dimensions:
+        # 快路径：各运行的评分已是 1-5 整数时直接由 Counter 计数（C 实现）
+        # / Fast path: when every run's score is already an integer 1-5, tally with Counter (in C)
+        try:
+            counts = Counter([s.get(dim) for s in score_dicts])
+        except TypeError:
+            counts = Counter()  # 不可哈希的值 / Unhashable values
+        row = [counts.get(category, 0) for category in _CATEGORIES]
+        if sum(row) != n_runs:
+            row = _coerce_ratings_row(score_dicts, dim)
+            if row is None:
+                continue
+        matrix.append(row)
+    return matrix
+
+
+def _coerce_ratings_row(
+    score_dicts: List[Dict[str, Any]], dim: str,
+) -> Optional[List[int]]:
+    """逐个转换评分并计数（慢路径，处理 "4"、4.5 等值）；任一无效时返回 None。
+    / Coerce and tally scores one by one (slow path for values like "4" or
+    4.5); returns None when any is invalid."""
+    row = [0, 0, 0, 0, 0]
+    try:
+        for s in score_dicts:
+            iv = int(s.get(dim))  # type: ignore[arg-type]
+            if not 1 <= iv <= 5:
+                return None
+            row[iv - 1] += 1
+    except (TypeError, ValueError):
+        return None
+    return row
+
+
 def _kappa_to_consistency(kappa: float) -> str:
     """将 kappa 值转换为一致性等级。 / Convert kappa to consistency level."""
     if kappa >= 0.8:
@@ -87,22 +168,21 @@ def aggregate_ordinal_scores(
     if not all_scores:
         return {}
 
-    dimensions = set()
+    # 单次遍历按维度收集取值（保持运行顺序） / Collect values per dimension in one pass (run order kept)
+    columns: Dict[str, List[float]] = {}
     for s in all_scores:
-        dimensions.update(s.keys())
+        for dim, score in s.items():
+            column = columns.get(dim)
+            if column is None:
+                columns[dim] = [float(score)]
+            else:
+                column.append(float(score))
 
     result: Dict[str, Dict[str, Any]] = {}
-    for dim in sorted(dimensions):
-        values = [float(s[dim]) for s in all_scores if dim in s]
-        if not values:
-            continue
-        median, iqr = compute_median_iqr(values)
-        disp_range = max(values) - min(values)
-        # Build ratings matrix for this dimension (1-5 scale -> 5 categories)
-        ratings_row = [0, 0, 0, 0, 0]
-        for v in values:
-            idx = max(0, min(4, int(v) - 1))
-            ratings_row[idx] += 1
+    for dim in sorted(columns):
+        values = columns[dim]
+        median, iqr, lo, hi = _fused_stats(values)
+        disp_range = hi - lo
         # v4.1: 1-5 ordinal 的分散度主指标用 range(max-min)（离散可解释且实现一致）
         stability_level = "high" if disp_range <= 1 else ("medium" if disp_range <= 2 else "low")
         result[dim] = {
@@ -116,47 +196,116 @@ def aggregate_ordinal_scores(
 
 
 class EnsembleRunner:
-    """集成运行器：多次模拟 + 统计聚合。 / Ensemble runner: multiple runs + statistical aggregation."""
+    """集成运行器：多次模拟 + 统计聚合。 / Ensemble runner: multiple runs + statistical aggregation.
+
+    默认串行执行；`concurrent=True` 时各次运行经 asyncio.gather 并发调度，
+    并由 `max_concurrency` 个槽位的信号量限流（默认等于运行次数）。
+    / Runs serially by default; with `concurrent=True` the runs are scheduled
+    concurrently via asyncio.gather, gated by a semaphore with
+    `max_concurrency` slots (defaults to the number of runs).
+
+    `share_connections=True`（或显式传入 `http_pool`）时，所有运行共用同一个
+    PooledHTTPClient，经 `http_pool=` 注入 simulate_fn，避免每次运行重新握手；
+    设置 `qps` 后所有运行共享一个 TokenBucket（经 `rate_limiter=` 注入），
+    并发运行的 LLM 调用合计仍受上游限流约束。
+    / With `share_connections=True` (or an explicit `http_pool`) every run
+    shares one PooledHTTPClient injected into simulate_fn as `http_pool=`, so
+    runs skip repeated handshakes; with `qps` every run shares one TokenBucket
+    (injected as `rate_limiter=`) so concurrent runs together still honour
+    provider rate limits.
+    """
 
     def __init__(
         self,
         simulate_fn: Callable[..., Awaitable[Dict[str, Any]]],
         num_runs: int = 3,
+        *,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        share_connections: bool = False,
+        http_pool: Optional[PooledHTTPClient] = None,
+        qps: Optional[float] = None,
     ):
         self._simulate_fn = simulate_fn
         self._num_runs = num_runs
+        self._concurrent = concurrent
+        self._max_concurrency = max_concurrency
+        self._share_connections = share_connections or http_pool is not None
+        self._http_pool = http_pool
+        self._qps = qps
 
     async def run(
         self,
         *,
         seeds: Optional[List[int]] = None,
         seed_key: str = "random_seed",
+        output_jsonl: Optional[str] = None,
         **simulate_kwargs,
     ) -> List[Dict[str, Any]]:
         """运行 N 次模拟并返回所有结果。 / Run N simulations and return all results.
 
         注意：默认**串行执行**。PMF v4.1 要求单次 simulate() 共享同一个 BudgetState.max_calls，
         并且 Variant Isolation 依赖 seed 控制顺序随机化；并发会放大不确定性且不利于共享预算。
+        需要缩短墙钟时间且各次运行预算独立时，以 `concurrent=True` 构造运行器。
+        / Serial by default; construct with `concurrent=True` to cut wall-clock
+        time when runs do not share a budget. Results keep seed order either way.
+
+        指定 `output_jsonl` 时每次成功运行立即追加一行检查点；重新运行同一任务
+        会读取该文件，跳过已完成的运行并直接使用其结果。
+        / With `output_jsonl` each successful run is appended as a checkpoint
+        line at once; re-running the same job reads the file, skips completed
+        runs and reuses their results.
         """
         seeds_to_use: List[Optional[int]] = (
             list(seeds) if seeds is not None else [None] * self._num_runs
         )
 
+        checkpoint = _RunCheckpoint(output_jsonl) if output_jsonl else None
+        restored = checkpoint.load() if checkpoint is not None else {}
+        pending = [
+            (index, seed) for index, seed in enumerate(seeds_to_use)
+            if (index, seed) not in restored
+        ]
+        if restored:
+            logger.info(
+                "Ensemble: resuming with %d of %d runs restored from %s",
+                len(seeds_to_use) - len(pending), len(seeds_to_use), output_jsonl,
+            )
+
+        # 外部传入的连接池由调用方关闭；自建的在本次 run 结束时关闭
+        # / An injected pool is closed by its owner; one created here is closed after this run
+        owned_pool: Optional[PooledHTTPClient] = None
+        if pending and self._share_connections:
+            pool = self._http_pool
+            if pool is None:
+                pool = owned_pool = PooledHTTPClient()
+            simulate_kwargs["http_pool"] = pool
+        if self._qps is not None:
+            simulate_kwargs["rate_limiter"] = TokenBucket(self._qps)
+
+        try:
+            fresh = await self._run_all(pending, seed_key, simulate_kwargs, checkpoint)
+        finally:
+            if owned_pool is not None:
+                await owned_pool.aclose()
+
+        by_slot = dict(zip(pending, fresh))
+        outcomes = [
+            restored[slot] if slot in restored else by_slot[slot]
+            for slot in enumerate(seeds_to_use)
+        ]
+
         valid: List[Dict[str, Any]] = []
         error_count = 0
-        for seed in seeds_to_use:
-            kwargs = dict(simulate_kwargs)
-            if seed is not None:
-                kwargs[seed_key] = seed
-            try:
-                result = await self._simulate_fn(**kwargs)
-                if isinstance(result, dict):
-                    valid.append(result)
-                else:
-                    error_count += 1
-            except Exception as exc:
-                error_count += 1
-                logger.warning("Ensemble run failed: %s", exc)
+        for outcome in outcomes:
+            if isinstance(outcome, dict):
+                valid.append(outcome)
+                continue
+            error_count += 1
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome
+                logger.warning("Ensemble run failed: %s", outcome)
 
         if error_count:
             logger.warning(
@@ -164,3 +313,104 @@ class EnsembleRunner:
                 error_count, len(seeds_to_use),
             )
         return valid
+
+    async def _run_all(
+        self,
+        slots: List[Tuple[int, Optional[int]]],
+        seed_key: str,
+        simulate_kwargs: Dict[str, Any],
+        checkpoint: Optional["_RunCheckpoint"],
+    ) -> List[Any]:
+        """串行或并发执行给定运行，返回结果或异常。 / Run the given slots serially or concurrently, returning results or exceptions."""
+        if self._concurrent and len(slots) > 1:
+            sem = asyncio.Semaphore(
+                max(1, self._max_concurrency or len(slots))
+            )
+
+            async def _gated(index: int, seed: Optional[int]) -> Dict[str, Any]:
+                async with sem:
+                    return await self._run_one(
+                        index, seed, seed_key, simulate_kwargs, checkpoint,
+                    )
+
+            outcomes: List[Any] = await asyncio.gather(
+                *(_gated(index, seed) for index, seed in slots),
+                return_exceptions=True,
+            )
+        else:
+            outcomes = []
+            for index, seed in slots:
+                try:
+                    outcomes.append(await self._run_one(
+                        index, seed, seed_key, simulate_kwargs, checkpoint,
+                    ))
+                except Exception as exc:
+                    outcomes.append(exc)
+        return outcomes
+
+    async def _run_one(
+        self,
+        index: int,
+        seed: Optional[int],
+        seed_key: str,
+        simulate_kwargs: Dict[str, Any],
+        checkpoint: Optional["_RunCheckpoint"] = None,
+    ) -> Dict[str, Any]:
+        """以给定 seed 执行单次模拟，成功后写入检查点。 / Run one simulation with the given seed and checkpoint it on success."""
+        kwargs = dict(simulate_kwargs)
+        if seed is not None:
+            kwargs[seed_key] = seed
+        result = await self._simulate_fn(**kwargs)
+        if checkpoint is not None and isinstance(result, dict):
+            checkpoint.append(index, seed, result)
+        return result
+
+
+class _RunCheckpoint:
+    """Ensemble 运行结果的追加写 JSONL 检查点。 / Append-only JSONL checkpoint of ensemble run results.
+
+    每行是一次成功运行的结果，附带 `_run`（运行序号）与 `_seed` 两个字段；
+    两者都匹配时才视为同一次运行。写入是同步的，同一事件循环中的并发运行
+    不会交错写出半行，因此无需加锁。
+    / Each line is one successful run's result plus `_run` (run index) and
+    `_seed`; a line matches a run only when both agree. Writes are
+    synchronous, so concurrent runs on one event loop never interleave
+    partial lines and no lock is needed.
+    """
+
+    def __init__(self, path: str):
+        self._path = Path(path)
+        # 末行被截断时，下一次追加先补换行 / After a truncated last line, the next append starts a new line
+        self._needs_newline = False
+
+    def load(self) -> Dict[Tuple[int, Optional[int]], Dict[str, Any]]:
+        restored: Dict[Tuple[int, Optional[int]], Dict[str, Any]] = {}
+        if not self._path.exists():
+            return restored
+        skipped = 0
+        line = ""
+        with self._path.open(encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = loads(line)
+                    slot = (record.pop("_run"), record.pop("_seed"))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    # 崩溃时可能留下半行 / A crash may leave a truncated line
+                    skipped += 1
+                    continue
+                restored[slot] = record
+            self._needs_newline = bool(line) and not line.endswith("\n")
+        if skipped:
+            logger.warning("Ensemble 检查点跳过 %d 条损坏记录: %s", skipped, self._path)
+        return restored
+
+    def append(self, index: int, seed: Optional[int], result: Dict[str, Any]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        line = dumps_compact({**result, "_run": index, "_seed": seed})
+        if self._needs_newline:
+            line = "\n" + line
+            self._needs_newline = False
+        # 逐条 flush，崩溃后已完成的运行仍可恢复 / Flush per run so completed runs survive a crash
+        with self._path.open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+            fh.flush()
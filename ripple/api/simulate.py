@@ -10,17 +10,32 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import time
 import uuid
-from contextlib import suppress
-from datetime import datetime
+from collections import Counter
+from contextlib import aclosing, suppress
+from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 
+from ripple.api.ensemble import (
+    aggregate_ordinal_scores,
+    build_ratings_matrix,
+    compute_fleiss_kappa,
+)
+from ripple.api.variant_isolation import compute_variant_seeds
+from ripple.engine.deliberation import DeliberationOrchestrator
 from ripple.engine.recorder import SimulationRecorder
 from ripple.engine.runtime import SimulationRuntime, ProgressCallback
+from ripple.llm.cache import ResponseCache
+from ripple.llm.circuit_breaker import CircuitOpenError
 from ripple.llm.router import ModelRouter
 from ripple.primitives.events import SimulationEvent
+from ripple.primitives.pmf_models import TribunalMember
+from ripple.prompts import SKILL_CONTEXT_END, SKILL_CONTEXT_SEPARATOR
 from ripple.runtime_paths import resolve_output_dir
 from ripple.skills.manager import SkillManager
 
@@ -36,6 +51,32 @@ _DISCLAIMER = (
 # deliberation_rounds 服务端硬上限 / Server-side hard cap
 _MAX_DELIBERATION_ROUNDS = 4
 
+# 集成模式下同时进行的 run 数上限，默认 1（串行）。各 run 共享同一调用预算，
+# 并发时预算耗尽会让所有进行中的 run 一起失败，而串行只损失当前 run，
+# 因此并发需显式开启（RIPPLE_ENSEMBLE_CONCURRENCY > 1）
+# / Max ensemble runs in flight at once, default 1 (serial). Runs share one
+#   call budget: when it runs out, every run in flight fails together, while
+#   serial execution only loses the current run, so concurrency is opt-in
+#   (RIPPLE_ENSEMBLE_CONCURRENCY > 1)
+ENSEMBLE_CONCURRENCY = int(os.getenv("RIPPLE_ENSEMBLE_CONCURRENCY", "1"))
+
+
+# 输出文件名中的时间戳格式 / Timestamp layout used in output file names
+_TS_FORMAT = "%Y%m%d_%H%M%S"
+
+# historical 超过该条数时整体脱敏，不逐条遍历 / Above this many records historical is redacted wholesale
+_BULK_REDACT_THRESHOLD = 64
+
+# 本进程内已确认存在的输出目录，避免每次模拟重复 mkdir
+# / Output directories already ensured in this process, so each simulation skips mkdir
+_OUTPUT_DIR_READY: Set[str] = set()
+
+# 脱敏时保留的安全字段（结构化枚举标签） / Fields kept by redaction (structured enum labels)
+_REDACT_SAFE_KEYS = frozenset({
+    "skill", "platform", "channel", "vertical", "product_type", "name",
+    "simulation_horizon", "random_seed",
+})
+
 # Skill-specific tribunal configurations / 各 Skill 的合议庭配置
 _TRIBUNAL_CONFIGS: Dict[str, Dict[str, Any]] = {
     "pmf-validation": {
@@ -96,21 +137,122 @@ def _make_llm_caller(router, role: str):
 
     所有 adapter 均暴露统一接口 async call(system_prompt, user_message) -> str，
     因此只需单一代码路径。
+
+    返回的函数另带 `astream` 属性（异步生成器），供需要边接收边解析的
+    调用方使用。
+    / The returned function also carries an `astream` attribute (async
+    generator) for callers that parse while receiving.
     """
 
-    async def caller(*, system_prompt: str = "", user_prompt: str = "") -> str:
-        if not router.check_budget(role):
+    # 预绑定的适配器：[缓存版本, 适配器]。角色固定，非降级状态下直接复用，
+    # 省去每次调用的路由查找；降级期间或缓存被清除后回到路由器解析
+    # / Prebound adapter: [cache epoch, adapter]. The role is fixed, so outside
+    #   degradation the adapter is reused without a per-call router lookup;
+    #   during degradation or after a cache clear the router resolves it again
+    bound: List[Any] = [None, None]
+    # 角色配置了轻量模型时，用户提示词短于阈值的调用走轻量模型（另行预绑定）
+    # / When the role has a light model, calls whose user prompt is under the
+    #   threshold go to it (prebound separately)
+    light_threshold = router.light_model_threshold(role)
+    bound_light: List[Any] = [None, None]
+
+    def _backend(prompt_chars: int):
+        light = light_threshold is not None and prompt_chars < light_threshold
+        slot = bound_light if light else bound
+        if slot[0] == router.backend_epoch and not router.should_degrade():
+            return slot[1]
+        if light_threshold is None:
+            adapter = router.get_model_backend(role)
+        else:
+            adapter = router.get_model_backend(role, complexity_hint=prompt_chars)
+        slot[0], slot[1] = router.backend_epoch, adapter
+        return adapter
+
+    # 熔断器：上游持续故障时快速失败，不再逐个等满超时
+    # / Circuit breaker: fail fast during a provider outage instead of each call timing out
+    breaker = router.circuit_breaker(role)
+
+    async def _throttle():
+        limiter = router.rate_limiter
+        if limiter is not None:
+            await limiter.acquire()
+
+    def _begin_call(prompt_chars: int):
+        if not breaker.allow():
+            raise CircuitOpenError(f"LLM 熔断中，快速失败（角色: {role}）")
+        # 预占额度：并发调用（并行评审员、并发 ensemble）不会超出上限
+        # / Reserve budget so concurrent calls (parallel members, concurrent ensembles) cannot overshoot
+        if not router.reserve_call(role):
+            breaker.release()
             raise RuntimeError(f"LLM 调用次数已达上限（角色: {role}）")
-        router.record_attempt(role)
-        budget = router.budget
-        call_num = budget.total_attempts
-        limit_str = str(budget.max_calls) if not budget.is_unlimited else "∞"
-        logger.info(f"[{role}] LLM 调用 #{call_num}/{limit_str}")
-        adapter = router.get_model_backend(role)
-        content = await adapter.call(system_prompt, user_prompt)
-        router.record_call(role)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[%s] LLM 调用 #%s/%s",
+                role, router.budget.total_attempts, router.limit_label,
+            )
+        return _backend(prompt_chars)
+
+    async def caller(*, system_prompt: str = "", user_prompt: str = "") -> str:
+        # 瞬时错误的重试由适配器负责（max_retries），此处不再叠加一层
+        # / Transient-error retries belong to the adapter (max_retries); no second layer here
+        adapter = _begin_call(len(user_prompt))
+        try:
+            async with router.call_limiter(role):
+                await _throttle()
+                content = await adapter.call(system_prompt, user_prompt)
+        except BaseException as exc:
+            breaker.record_failure(exc)
+            router.finish_call(role, succeeded=False)
+            raise
+        breaker.record_success()
+        router.finish_call(role, succeeded=True)
         return content
 
+    async def astream(
+        *, system_prompt: str = "", user_prompt: str = "",
+    ) -> AsyncIterator[str]:
+        """流式变体：逐块产出文本；适配器不支持流式时一次性产出。
+        / Streaming variant: yields text chunks, or the whole text at once
+        when the adapter cannot stream.
+
+        流在产出任何内容前失败时，在同一次预占额度内改为完整调用；
+        已产出内容后失败则直接抛出，避免重复调用与重复计费。
+        / If the stream fails before yielding anything, fall back to a
+        complete call under the same budget reservation; a failure after
+        content was yielded is raised, so nothing is called or billed twice.
+        """
+        adapter = _begin_call(len(user_prompt))
+        try:
+            async with router.call_limiter(role):
+                await _throttle()
+                stream = getattr(adapter, "astream", None)
+                if stream is None:
+                    yield await adapter.call(system_prompt, user_prompt)
+                else:
+                    consumed = False
+                    try:
+                        async with aclosing(stream(system_prompt, user_prompt)) as chunks:
+                            async for chunk in chunks:
+                                consumed = True
+                                yield chunk
+                    except Exception as exc:
+                        if consumed:
+                            raise
+                        logger.warning("[%s] 流式调用失败，回退为完整调用: %s", role, exc)
+                        yield await adapter.call(system_prompt, user_prompt)
+        except GeneratorExit:
+            # 调用方已取得完整内容并提前结束 / Caller got what it needed and stopped early
+            breaker.record_success()
+            router.finish_call(role, succeeded=True)
+            raise
+        except BaseException as exc:
+            breaker.record_failure(exc)
+            router.finish_call(role, succeeded=False)
+            raise
+        breaker.record_success()
+        router.finish_call(role, succeeded=True)
+
+    caller.astream = astream
     return caller
 
 
@@ -219,6 +361,14 @@ def _serialize_llm_budget(budget: Any, *, requested_max_calls: Optional[int] = N
     return payload
 
 
+def _ensure_dir(path: Path) -> None:
+    """创建目录（每个路径每进程只执行一次）。 / Create a directory (once per path per process)."""
+    key = str(path)
+    if key not in _OUTPUT_DIR_READY:
+        path.mkdir(parents=True, exist_ok=True)
+        _OUTPUT_DIR_READY.add(key)
+
+
 def _resolve_output_path(
     output_path: Optional[str], run_id: str,
 ) -> Path:
@@ -231,20 +381,32 @@ def _resolve_output_path(
         p = Path(output_path)
         # 如果指定的是目录，则在其中自动命名
         if p.is_dir() or str(output_path).endswith("/"):
-            p.mkdir(parents=True, exist_ok=True)
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+            _ensure_dir(p)
+            ts = time.strftime(_TS_FORMAT)
             return p / f"{ts}_{run_id}.json"
         # 确保父目录存在
-        p.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(p.parent)
         return p
 
     # 默认：源码开发态写入当前目录；安装态写入 ~/.ripple/data/ripple_outputs/
     out_dir = Path(resolve_output_dir())
-    out_dir.mkdir(parents=True, exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    _ensure_dir(out_dir)
+    ts = time.strftime(_TS_FORMAT)
     return out_dir / f"{ts}_{run_id}.json"
 
 
+async def _offload(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """在工作线程中执行同步的记录器落盘调用。 / Run a synchronous recorder write in a worker thread.
+
+    仅用于没有并发运行在修改记录器状态的时刻（模拟开始前 / 全部运行结束后），
+    避免线程内序列化时与事件循环上的写入交错。
+    / Only used while no concurrent run is mutating recorder state (before the
+    runs start / after they all finish), so serialization in the thread never
+    interleaves with writes on the event loop.
+    """
+    return await asyncio.to_thread(method, *args, **kwargs)
+
+
 async def simulate(
     event: Dict[str, Any],
     skill: str = "social-media",
@@ -270,6 +432,13 @@ async def simulate(
     ensemble_runs: int = 1,
     deliberation_rounds: int = 3,
     redact_input: bool = False,
+    # --- 连接与限速共享（由 EnsembleRunner 注入） / Shared connections & rate limit (injected by EnsembleRunner) ---
+    http_pool: Optional[Any] = None,
+    rate_limiter: Optional[Any] = None,
+    # --- 跨调用复用（可选） / Reuse across calls (optional) ---
+    router: Optional[ModelRouter] = None,
+    skill_manager: Optional[SkillManager] = None,
+    response_cache: Optional[ResponseCache] = None,
 ) -> Dict[str, Any]:
     """一键模拟（通用输入协议）。
 
@@ -313,6 +482,30 @@ async def simulate(
         ensemble_runs: 集成运行次数（默认 1）。共享同一 BudgetState，不倍增预算。
         deliberation_rounds: 合议庭总轮数（含 Round 1 独立评估），服务端上限 4。
         redact_input: 是否对落盘输入进行脱敏（默认 False）。
+        http_pool: 共享的 PooledHTTPClient（可选）。多次调用传入同一连接池可复用
+            热连接；连接池由调用方关闭。
+            / Shared PooledHTTPClient (optional). Passing one pool to several
+            calls reuses warm connections; the caller closes it.
+        rate_limiter: 共享限速器（可选，如 TokenBucket），每次 LLM 调用前等待。
+            / Shared rate limiter (optional, e.g. TokenBucket) awaited before
+            every LLM call.
+        router: 复用的 ModelRouter（可选）。传入时忽略 llm_config / max_llm_calls /
+            config_file / stream / llm_timeout / http_pool / rate_limiter，预算在
+            多次调用间累计；路由器由调用方关闭。
+            / Reused ModelRouter (optional). When given, llm_config /
+            max_llm_calls / config_file / stream / llm_timeout / http_pool /
+            rate_limiter are ignored and the budget accumulates across calls;
+            the caller closes the router.
+        skill_manager: 复用的 SkillManager（可选），重复加载同一 Skill 时命中缓存。
+            / Reused SkillManager (optional); repeated loads of one Skill hit
+            its cache.
+        response_cache: 响应缓存（可选，显式启用）。注入星 Agent 与合议庭，
+            重放或崩溃恢复时跳过已完成的相同调用；集成运行依赖输出随机性，
+            启用后各 run 的相同调用会复用同一响应。
+            / Response cache (optional, opt-in). Injected into Star agents and
+            the tribunal so replays and crash recovery skip identical
+            completed calls; ensemble runs rely on output variance, so with it
+            enabled identical calls across runs reuse one response.
 
     返回：
         模拟结果字典，包含 output_file 和 disclaimer 字段。
@@ -320,7 +513,8 @@ async def simulate(
     logger.info(f"开始模拟: skill={skill}, platform={platform}, channel={channel}")
 
     # 1. 加载 Skill
-    skill_manager = SkillManager()
+    if skill_manager is None:
+        skill_manager = SkillManager()
     if skill_path:
         loaded_skill = skill_manager.load(skill, skill_path=Path(skill_path))
     else:
@@ -331,13 +525,20 @@ async def simulate(
     deliberation_rounds = min(deliberation_rounds, _MAX_DELIBERATION_ROUNDS)
 
     # 4. 创建 LLM 路由器（单实例，共享预算 — ensemble 不倍增）
-    router = ModelRouter(
-        llm_config=llm_config,
-        max_llm_calls=max_llm_calls,
-        config_file=config_file,
-        stream=stream,
-        timeout_override=llm_timeout,
-    )
+    owns_router = router is None
+    if owns_router:
+        router = ModelRouter(
+            llm_config=llm_config,
+            max_llm_calls=max_llm_calls,
+            config_file=config_file,
+            stream=stream,
+            timeout_override=llm_timeout,
+            http_pool=http_pool,
+            rate_limiter=rate_limiter,
+        )
+    else:
+        # 复用的路由器沿用其自身上限 / A reused router keeps its own cap
+        max_llm_calls = router.budget.max_calls
 
     def _forward_progress_with_budget(event: SimulationEvent):
         if on_progress is None:
@@ -391,42 +592,44 @@ async def simulate(
             loaded_skill.name, _DEFAULT_TRIBUNAL_CONFIG
         )
 
-        async def _deliberate_handler(context: Dict[str, Any]) -> Dict[str, Any]:
-            """DELIBERATE phase handler — delegates to DeliberationOrchestrator."""
-            from dataclasses import asdict
-            from ripple.engine.deliberation import DeliberationOrchestrator
-            from ripple.primitives.pmf_models import TribunalMember
-
-            # Extract rubric from skill (skill-aware key)
-            rubric_key = tribunal_config["rubric_key"]
-            scorecard_rubric = getattr(loaded_skill, "rubrics", {}).get(
-                rubric_key, ""
+        # 合议庭系统提示与成员只依赖 Skill 配置，每次 simulate() 构建一次，
+        # 集成模式下各 run 的 DELIBERATE 阶段共享
+        # / The tribunal system prompt and members depend only on the skill
+        #   config, so they are built once per simulate() and shared by every
+        #   ensemble run's DELIBERATE phase
+
+        # Extract rubric from skill (skill-aware key)
+        rubric_key = tribunal_config["rubric_key"]
+        scorecard_rubric = getattr(loaded_skill, "rubrics", {}).get(
+            rubric_key, ""
+        )
+        dimensions = tribunal_config["dimensions"]
+
+        # Inject tribunal skill context into system_prompt (trusted zone)
+        tribunal_system = ""
+        tribunal_prompt = loaded_skill.prompts.get("tribunal", "")
+        if tribunal_prompt:
+            tribunal_system += (
+                SKILL_CONTEXT_SEPARATOR + tribunal_prompt + SKILL_CONTEXT_END
+            )
+        if scorecard_rubric:
+            tribunal_system += (
+                "\n\n===== SCORING RUBRIC =====\n\n"
+                + scorecard_rubric
+                + "\n\n===== END SCORING RUBRIC =====\n\n"
             )
-            dimensions = tribunal_config["dimensions"]
-
-            # Inject tribunal skill context into system_prompt (trusted zone)
-            from ripple.prompts import SKILL_CONTEXT_SEPARATOR, SKILL_CONTEXT_END
-            tribunal_system = ""
-            tribunal_prompt = loaded_skill.prompts.get("tribunal", "")
-            if tribunal_prompt:
-                tribunal_system += (
-                    SKILL_CONTEXT_SEPARATOR + tribunal_prompt + SKILL_CONTEXT_END
-                )
-            if scorecard_rubric:
-                tribunal_system += (
-                    "\n\n===== SCORING RUBRIC =====\n\n"
-                    + scorecard_rubric
-                    + "\n\n===== END SCORING RUBRIC =====\n\n"
-                )
 
-            members = [
-                TribunalMember(
-                    role=m["role"],
-                    perspective=m["perspective"],
-                    expertise=m["expertise"],
-                )
-                for m in tribunal_config["members"]
-            ]
+        members = [
+            TribunalMember(
+                role=m["role"],
+                perspective=m["perspective"],
+                expertise=m["expertise"],
+            )
+            for m in tribunal_config["members"]
+        ]
+
+        async def _deliberate_handler(context: Dict[str, Any]) -> Dict[str, Any]:
+            """DELIBERATE phase handler — delegates to DeliberationOrchestrator."""
 
             emit_progress = context.get("emit_progress")
 
@@ -455,6 +658,8 @@ async def simulate(
                 max_rounds=deliberation_rounds,
                 system_prompt=tribunal_system,
                 on_progress=_on_deliberation_progress,
+                response_cache=response_cache,
+                parallel_members=True,
             )
 
             evidence_pack = context.get("evidence_pack", {})
@@ -488,21 +693,22 @@ async def simulate(
         }
 
     # 8. 构造 simulation_input
-    simulation_input: Dict[str, Any] = {"event": event, "skill": skill}
-    if platform:
-        simulation_input["platform"] = platform
-    if channel:
-        simulation_input["channel"] = channel
-    if vertical:
-        simulation_input["vertical"] = vertical
-    if source:
-        simulation_input["source"] = source
-    if historical:
-        simulation_input["historical"] = historical
-    if environment:
-        simulation_input["environment"] = environment
-    if simulation_horizon:
-        simulation_input["simulation_horizon"] = simulation_horizon
+    # 可选字段为空时省略；max_waves 允许为 0，按 None 判断
+    # / Optional fields are omitted when empty; max_waves may be 0, so it checks None
+    optional_fields = {
+        "platform": platform,
+        "channel": channel,
+        "vertical": vertical,
+        "source": source,
+        "historical": historical,
+        "environment": environment,
+        "simulation_horizon": simulation_horizon,
+    }
+    simulation_input: Dict[str, Any] = {
+        "event": event,
+        "skill": skill,
+        **{key: value for key, value in optional_fields.items() if value},
+    }
     if max_waves is not None:
         simulation_input["max_waves"] = max_waves
 
@@ -514,9 +720,9 @@ async def simulate(
     # 输入脱敏：记录器落盘使用脱敏版本，LLM 调用使用完整版本
     if redact_input:
         redacted_input = _redact_simulation_input(simulation_input)
-        recorder.record_simulation_input(redacted_input)
+        await _offload(recorder.record_simulation_input, redacted_input)
     else:
-        recorder.record_simulation_input(simulation_input)
+        await _offload(recorder.record_simulation_input, simulation_input)
 
     # 10. 执行模拟（单次或集成模式）
     try:
@@ -533,6 +739,7 @@ async def simulate(
                 extra_phases=extra_phases,
                 simulation_input=simulation_input,
                 run_id=run_id,
+                response_cache=response_cache,
             )
         else:
             # 集成模式 — 共享预算，不倍增 / Ensemble mode — shared budget, no multiplication
@@ -547,21 +754,27 @@ async def simulate(
                 extra_phases=extra_phases,
                 simulation_input=simulation_input,
                 run_id=run_id,
+                response_cache=response_cache,
                 ensemble_runs=ensemble_runs,
                 random_seed=random_seed,
             )
 
         # 记录器完成最终写入
         total_waves = result.get("total_waves", 0)
-        recorder.finalize(total_waves)
+        await _offload(recorder.finalize, total_waves)
 
     except Exception as exc:
-        recorder.mark_failed(str(exc))
+        await _offload(recorder.mark_failed, str(exc))
         logger.error(f"模拟失败: run_id={run_id}, error={exc}")
         raise
-
-    result["output_file"] = str(file_path.resolve())
-    result["compact_log_file"] = str(recorder.compact_log_path.resolve())
+    finally:
+        # 释放适配器的持久 HTTP 连接（复用的路由器由调用方关闭）
+        # / Release adapters' persistent HTTP connections (a reused router is closed by its caller)
+        if owns_router:
+            await router.aclose()
+
+    result["output_file"] = recorder.resolved_output_path
+    result["compact_log_file"] = recorder.resolved_compact_log_path
     result["llm_budget"] = _serialize_llm_budget(
         router.budget,
         requested_max_calls=max_llm_calls,
@@ -571,7 +784,7 @@ async def simulate(
     result["disclaimer"] = _DISCLAIMER
 
     logger.info(
-        f"模拟完成: run_id={run_id}, 结果已保存至 {file_path.resolve()}"
+        f"模拟完成: run_id={run_id}, 结果已保存至 {recorder.resolved_output_path}"
     )
     return result
 
@@ -588,6 +801,7 @@ async def _run_single_simulation(
     extra_phases,
     simulation_input,
     run_id,
+    response_cache: Optional[ResponseCache] = None,
 ) -> Dict[str, Any]:
     """执行单次模拟。 / Run a single simulation."""
     runtime = SimulationRuntime(
@@ -599,6 +813,7 @@ async def _run_single_simulation(
         on_progress=on_progress,
         recorder=recorder,
         extra_phases=extra_phases,
+        response_cache=response_cache,
     )
     return await runtime.run(simulation_input, run_id=run_id)
 
@@ -617,18 +832,18 @@ async def _run_ensemble(
     run_id,
     ensemble_runs: int,
     random_seed: Optional[int],
+    response_cache: Optional[ResponseCache] = None,
 ) -> Dict[str, Any]:
     """执行集成模拟（多次运行 + 聚合）。 / Run ensemble simulation (multiple runs + aggregation).
 
     共享同一 BudgetState（通过 callers），不倍增预算。
-    预算不足时允许提前终止后续 run。
+    默认逐个执行；ENSEMBLE_CONCURRENCY > 1 时最多同时进行该数量的 run，
+    结果保持 seed 顺序；预算不足时允许提前终止后续 run。
     / Shares one BudgetState (via callers), no budget multiplication.
-    Allows early termination if budget is exhausted.
+    Runs one at a time by default; with ENSEMBLE_CONCURRENCY > 1 up to that
+    many runs proceed concurrently. Results keep seed order. Allows early
+    termination if budget is exhausted.
     """
-    from ripple.api.variant_isolation import compute_variant_seeds
-    from ripple.api.ensemble import aggregate_ordinal_scores, compute_fleiss_kappa
-    from collections import Counter
-
     seeds = compute_variant_seeds("default", random_seed or 42, ensemble_runs)
 
     def _extract_grade(res: Dict[str, Any]) -> Optional[str]:
@@ -638,19 +853,23 @@ async def _run_ensemble(
         return None
 
     def _extract_scores(res: Dict[str, Any]) -> Optional[Dict[str, int]]:
-        candidates: List[Dict[str, Any]] = []
+        # 边遍历边保留键最多的候选（并列取先出现者）
+        # / Track the candidate with the most keys while walking (ties keep the first)
+        best: Optional[Dict[str, Any]] = None
+        best_len = 0
+
+        def _consider(v: Any) -> None:
+            nonlocal best, best_len
+            if isinstance(v, dict) and (best is None or len(v) > best_len):
+                best, best_len = v, len(v)
 
         for k in ("scores", "dimension_scores"):
-            v = res.get(k)
-            if isinstance(v, dict):
-                candidates.append(v)
+            _consider(res.get(k))
 
         sc = res.get("scorecard")
         if isinstance(sc, dict):
             for k in ("scores", "dimension_scores"):
-                v = sc.get(k)
-                if isinstance(v, dict):
-                    candidates.append(v)
+                _consider(sc.get(k))
             dims = sc.get("dimensions")
             if isinstance(dims, dict):
                 extracted: Dict[str, Any] = {}
@@ -658,13 +877,11 @@ async def _run_ensemble(
                     if isinstance(payload, dict) and "score" in payload:
                         extracted[dim] = payload.get("score")
                 if extracted:
-                    candidates.append(extracted)
+                    _consider(extracted)
 
-        if not candidates:
+        if best is None:
             return None
 
-        # Prefer the candidate with the most keys
-        best = max(candidates, key=lambda d: len(d.keys()))
         cleaned: Dict[str, int] = {}
         for dim, val in best.items():
             try:
@@ -676,60 +893,99 @@ async def _run_ensemble(
 
         return cleaned or None
 
+    # 各 run 经 ENSEMBLE_CONCURRENCY 个槽位调度（默认 1，按 seed 顺序逐个执行），
+    # 共享同一预算；任一 run 耗尽预算后，尚未开始的 run 直接跳过（开启并发时，
+    # 进行中的 run 会在下次调用时同样失败）
+    # / Runs are scheduled through ENSEMBLE_CONCURRENCY slots (default 1: one
+    #   at a time in seed order) and share one budget; once a run exhausts it,
+    #   runs not yet started are skipped (with concurrency enabled, in-flight
+    #   runs fail the same way on their next call)
+    sem = asyncio.Semaphore(max(1, ENSEMBLE_CONCURRENCY))
+    budget_exhausted = False
+    has_boundaries = recorder is not None and hasattr(recorder, "begin_ensemble_run")
+
+    async def _one_run(i: int, seed: int) -> Optional[Dict[str, Any]]:
+        nonlocal budget_exhausted
+        async with sem:
+            if budget_exhausted:
+                return None
+            sub_run_id = f"{run_id}r{i + 1}"
+            # 每个 run 是独立任务，记录器的活动 run 按任务隔离；边界写入留在
+            # 事件循环上同步执行，天然串行，不与其他 run 的写入交错
+            # / Each run is its own task, so the recorder's active run is per
+            #   task; boundary writes stay synchronous on the event loop, which
+            #   serializes them without interleaving with other runs' writes
+            if has_boundaries:
+                recorder.begin_ensemble_run(
+                    run_index=i,
+                    run_id=sub_run_id,
+                    random_seed=seed,
+                )
+            try:
+                # 运行时持有单次模拟的状态（Agent、拓扑、波次记录），且各 run
+                # 并发执行，因此每个 run 各建一个，不能复用
+                # / The runtime holds per-simulation state (agents, topology,
+                #   wave records) and runs overlap, so each run builds its own
+                runtime = SimulationRuntime(
+                    omniscient_caller=omniscient_caller,
+                    star_caller=star_caller,
+                    sea_caller=sea_caller,
+                    skill_profile=skill_profile,
+                    skill_prompts=skill_prompts,
+                    on_progress=on_progress,
+                    recorder=recorder,
+                    extra_phases=extra_phases,
+                    response_cache=response_cache,
+                )
+                inp = {**simulation_input, "random_seed": seed}
+                result = await runtime.run(inp, run_id=sub_run_id)
+            except Exception as exc:
+                logger.warning("Ensemble run failed (idx=%d, seed=%s): %s", i, seed, exc)
+                # Budget exhaustion should stop further runs (shared budget);
+                # so should an open circuit breaker (provider outage).
+                msg = str(exc)
+                if (
+                    "LLM 调用次数已达上限" in msg
+                    or "budget" in msg.lower()
+                    or isinstance(exc, CircuitOpenError)
+                    or "LLM 熔断中" in msg
+                ):
+                    budget_exhausted = True
+                if has_boundaries and hasattr(recorder, "end_ensemble_run"):
+                    recorder.end_ensemble_run(error=msg)
+                raise
+            if has_boundaries and hasattr(recorder, "end_ensemble_run"):
+                recorder.end_ensemble_run()
+            return result
+
+    outcomes = await asyncio.gather(
+        *(_one_run(i, seed) for i, seed in enumerate(seeds)),
+        return_exceptions=True,
+    )
     all_results: List[Dict[str, Any]] = []
     failed = 0
-
-    for i, seed in enumerate(seeds):
-        sub_run_id = f"{run_id}r{i + 1}"
-        if recorder is not None and hasattr(recorder, "begin_ensemble_run"):
-            recorder.begin_ensemble_run(
-                run_index=i,
-                run_id=sub_run_id,
-                random_seed=seed,
-            )
-        try:
-            runtime = SimulationRuntime(
-                omniscient_caller=omniscient_caller,
-                star_caller=star_caller,
-                sea_caller=sea_caller,
-                skill_profile=skill_profile,
-                skill_prompts=skill_prompts,
-                on_progress=on_progress,
-                recorder=recorder,
-                extra_phases=extra_phases,
-            )
-            inp = dict(simulation_input)
-            inp["random_seed"] = seed
-            result = await runtime.run(inp, run_id=sub_run_id)
-            all_results.append(result)
-        except Exception as exc:
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            if not isinstance(outcome, Exception):
+                raise outcome
             failed += 1
-            logger.warning("Ensemble run failed (idx=%d, seed=%s): %s", i, seed, exc)
-            # Budget exhaustion should stop further runs (shared budget).
-            msg = str(exc)
-            if "LLM 调用次数已达上限" in msg or "budget" in msg.lower():
-                if recorder is not None and hasattr(recorder, "end_ensemble_run"):
-                    recorder.end_ensemble_run(error=msg)
-                break
-            if recorder is not None and hasattr(recorder, "end_ensemble_run"):
-                recorder.end_ensemble_run(error=msg)
-            continue
-        else:
-            if recorder is not None and hasattr(recorder, "end_ensemble_run"):
-                recorder.end_ensemble_run()
+        elif outcome is not None:
+            all_results.append(outcome)
 
     completed = len(all_results)
     last = all_results[-1] if all_results else {}
 
     # Aggregate PMF-like ordinal outputs when available
-    grades = [g for g in (_extract_grade(r) for r in all_results) if g]
-    grade_counts = Counter(grades)
-    grade_mode = grade_counts.most_common(1)[0][0] if grade_counts else None
-    grade_agreement = (
-        (grade_counts[grade_mode] / len(grades)) if grade_mode and grades else 0.0
-    )
-
-    score_dicts = [s for s in (_extract_scores(r) for r in all_results) if s]
+    # 每个结果只遍历一次，同时取出评级与分数 / Walk each result once for both grade and scores
+    extracted_pairs = [(_extract_grade(r), _extract_scores(r)) for r in all_results]
+    grades = [g for g, _ in extracted_pairs if g]
+    grade_mode: Optional[str] = None
+    grade_agreement = 0.0
+    if grades:
+        grade_mode, top_count = Counter(grades).most_common(1)[0]
+        grade_agreement = top_count / len(grades)
+
+    score_dicts = [s for _, s in extracted_pairs if s]
     score_agg = aggregate_ordinal_scores(score_dicts) if score_dicts else {}
 
     # Fleiss' kappa agreement across dimensions (items=dimensions, raters=runs, categories=1..5).
@@ -738,28 +994,10 @@ async def _run_ensemble(
     dimension_kappa_level: Optional[str] = None
     kappa_dimensions: List[str] = []
     if len(score_dicts) >= 2:
-        common_dims = set(score_dicts[0].keys())
-        for s in score_dicts[1:]:
-            common_dims &= set(s.keys())
+        common_dims = set(score_dicts[0]).intersection(*score_dicts[1:])
         kappa_dimensions = sorted(common_dims)
         if len(kappa_dimensions) >= 2:
-            ratings_matrix: List[List[int]] = []
-            for dim in kappa_dimensions:
-                row = [0, 0, 0, 0, 0]
-                ok = True
-                for s in score_dicts:
-                    v = s.get(dim)
-                    try:
-                        iv = int(v)
-                    except (TypeError, ValueError):
-                        ok = False
-                        break
-                    if not (1 <= iv <= 5):
-                        ok = False
-                        break
-                    row[iv - 1] += 1
-                if ok and sum(row) == len(score_dicts):
-                    ratings_matrix.append(row)
+            ratings_matrix = build_ratings_matrix(score_dicts, kappa_dimensions)
             if len(ratings_matrix) >= 2:
                 dimension_kappa = float(compute_fleiss_kappa(ratings_matrix))
                 if dimension_kappa >= 0.8:
@@ -791,7 +1029,7 @@ async def _run_ensemble(
 
     # Persist the aggregated view as the synthesis output (top-level keys)
     if recorder is not None:
-        recorder.record_synthesis(merged)
+        await _offload(recorder.record_synthesis, merged)
 
     return merged
 
@@ -802,22 +1040,45 @@ def _redact_simulation_input(simulation_input: Dict[str, Any]) -> Dict[str, Any]
     保留结构化枚举字段（product_type、channel、platform、name 等），
     替换字符串类型的描述字段为 [REDACTED]。
     / Preserves structured enum fields, replaces string description fields with [REDACTED].
-    """
-    # 不需要脱敏的安全字段（结构化枚举标签） / Safe fields (structured enum labels)
-    _SAFE_KEYS = {
-        "skill", "platform", "channel", "vertical", "product_type", "name",
-        "simulation_horizon", "random_seed",
-    }
 
-    def _redact_value(key: str, value: Any) -> Any:
-        if key in _SAFE_KEYS:
-            return value
-        if isinstance(value, str):
-            return "[REDACTED]"
-        if isinstance(value, dict):
-            return {k: _redact_value(k, v) for k, v in value.items()}
-        if isinstance(value, list):
-            return [_redact_value(key, item) for item in value]
-        return value
+    用显式工作栈单遍构建副本，大型 historical 列表不会产生逐节点的递归调用。
+    / Builds the copy in one pass with an explicit work stack, so large
+    historical lists do not cost a recursive call per node.
 
-    return {k: _redact_value(k, v) for k, v in simulation_input.items()}
+    超过 _BULK_REDACT_THRESHOLD 条的 historical 列表整体替换为一个计数标记，
+    不再逐条遍历。 / A historical list longer than _BULK_REDACT_THRESHOLD is
+    replaced wholesale by a single count marker instead of being walked.
+    """
+    historical = simulation_input.get("historical")
+    bulk_marker: Optional[str] = None
+    if isinstance(historical, list) and len(historical) > _BULK_REDACT_THRESHOLD:
+        bulk_marker = f"[REDACTED x{len(historical)}]"
+        simulation_input = {**simulation_input, "historical": []}
+    root: Dict[str, Any] = {}
+    # 工作栈：(源容器, 目标容器, 列表元素沿用的父键)
+    # / Work stack: (source container, target container, parent key list items inherit)
+    stack: List[Tuple[Any, Any, Any]] = [(simulation_input, root, None)]
+    while stack:
+        source, target, list_key = stack.pop()
+        is_dict = isinstance(target, dict)
+        pairs = source.items() if is_dict else ((list_key, item) for item in source)
+        for key, value in pairs:
+            if key in _REDACT_SAFE_KEYS:
+                redacted = value
+            elif isinstance(value, str):
+                redacted = "[REDACTED]"
+            elif isinstance(value, dict):
+                redacted = {}
+                stack.append((value, redacted, None))
+            elif isinstance(value, list):
+                redacted = []
+                stack.append((value, redacted, key))
+            else:
+                redacted = value
+            if is_dict:
+                target[key] = redacted
+            else:
+                target.append(redacted)
+    if bulk_marker is not None:
+        root["historical"] = [bulk_marker]
+    return root
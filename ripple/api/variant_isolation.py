@@ -4,6 +4,8 @@
 - Agent config 锁定：一次 INIT，所有 variant 共享 / Single INIT, shared across variants
 - Random seed 传递：同一 run_idx 跨 variant 使用相同 seed / Same seed for same run_idx across variants
 - Evaluation order shuffling：DELIBERATE 呈现顺序随机化 / Randomized variant order for tribunal
+- 并发扫描：simulate_variants 在有界并发下运行全部 (variant, run_idx)
+  / Concurrent sweep: simulate_variants runs every (variant, run_idx) under bounded concurrency
 
 v4 明确：seed 作用域 / v4 clarification: seed scope:
 - seed 用于呈现顺序随机化（Tribunal variant 排列）和内部洗牌（Agent 激活顺序）
@@ -12,8 +14,12 @@ v4 明确：seed 作用域 / v4 clarification: seed scope:
 - 用户不应期望"相同 seed = 完全相同结果"
 """
 
+import asyncio
+import logging
 import random
-from typing import List
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 def compute_variant_seeds(variant_name: str, base_seed: int, ensemble_runs: int) -> List[int]:
@@ -32,3 +38,62 @@ def shuffle_variant_order(variants: List[str], seed: int) -> List[str]:
     shuffled = list(variants)
     rng.shuffle(shuffled)
     return shuffled
+
+
+async def simulate_variants(
+    simulate_fn: Callable[..., Awaitable[Dict[str, Any]]],
+    variants: Dict[str, Dict[str, Any]],
+    *,
+    base_seed: int,
+    runs: int,
+    max_parallel_sims: int = 4,
+    seed_key: str = "random_seed",
+    **common_kwargs: Any,
+) -> Dict[Tuple[str, int], Dict[str, Any]]:
+    """并发运行全部 (variant, run_idx) 模拟。 / Run every (variant, run_idx) simulation concurrently.
+
+    每个 variant 的参数与 common_kwargs 合并后传给 simulate_fn，seed 由
+    compute_variant_seeds 给出（同一 run_idx 跨 variant 相同）。任务按
+    shuffle_variant_order 的顺序启动，在 asyncio.TaskGroup 中调度，同时进行的
+    模拟不超过 max_parallel_sims 个。单个模拟失败只记录日志，不取消其他模拟。
+    / Each variant's kwargs are merged over common_kwargs and passed to
+    simulate_fn with seeds from compute_variant_seeds (same seed for the same
+    run_idx across variants). Tasks start in shuffle_variant_order order under
+    an asyncio.TaskGroup, with at most max_parallel_sims in flight. A failed
+    simulation is only logged and does not cancel the others.
+
+    Returns:
+        {(variant, run_idx): 结果}，只含成功的模拟，按 variants 与 run_idx 排序。
+        / {(variant, run_idx): result} for successful simulations, ordered by
+        variants and run_idx.
+    """
+    if max_parallel_sims < 1:
+        raise ValueError(
+            f"max_parallel_sims 必须 >= 1 / max_parallel_sims must be >= 1: {max_parallel_sims}"
+        )
+    sem = asyncio.Semaphore(max_parallel_sims)
+    seeds = compute_variant_seeds("", base_seed, runs)
+    outcomes: Dict[Tuple[str, int], Any] = {}
+
+    async def _one(name: str, run_idx: int, seed: int) -> None:
+        kwargs = {**common_kwargs, **variants[name], seed_key: seed}
+        async with sem:
+            try:
+                outcomes[(name, run_idx)] = await simulate_fn(**kwargs)
+            except Exception as exc:
+                logger.warning(
+                    "Variant run failed (variant=%s, idx=%d, seed=%s): %s",
+                    name, run_idx, seed, exc,
+                )
+
+    async with asyncio.TaskGroup() as tg:
+        for name in shuffle_variant_order(list(variants), base_seed):
+            for run_idx, seed in enumerate(seeds):
+                tg.create_task(_one(name, run_idx, seed))
+
+    return {
+        (name, run_idx): outcomes[(name, run_idx)]
+        for name in variants
+        for run_idx in range(runs)
+        if (name, run_idx) in outcomes
+    }
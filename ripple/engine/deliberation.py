@@ -4,16 +4,23 @@ Implements the DELIBERATE phase: multi-round structured debate with
 dual-gate convergence (threshold + round limit).
 """
 
-import json
+import asyncio
 import logging
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from ripple.agents.tribunal import TribunalAgent
+from ripple.agents.tribunal import (
+    TribunalAgent,
+    challenge_panel,
+    evaluate_panel,
+    revise_panel,
+)
+from ripple.llm.cache import ResponseCache
 from ripple.primitives.pmf_models import (
     DeliberationRecord,
     TribunalMember,
     TribunalOpinion,
 )
+from ripple.utils.fast_json import dumps_compact
 
 logger = logging.getLogger(__name__)
 
@@ -45,12 +52,22 @@ class DeliberationOrchestrator:
         max_rounds: int = 4,
         system_prompt: str = "",
         on_progress: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+        response_cache: Optional[ResponseCache] = None,
+        # 可跨多个合议庭共享的并发上限 / Concurrency cap that may be shared across tribunals
+        semaphore: Optional[asyncio.Semaphore] = None,
+        # 每轮评审员并发发起 LLM 调用；False 时按成员顺序逐个调用
+        # / Members call the LLM concurrently each round; False calls them one by one in member order
+        parallel_members: bool = True,
     ):
         self.members = members
         self.dimensions = dimensions
         self.rubric = rubric
         self.max_rounds = max_rounds
         self._on_progress = on_progress
+        if semaphore is None and not parallel_members:
+            # 单槽信号量按 gather 的启动顺序放行，即成员顺序 / A one-slot semaphore admits in gather start order, i.e. member order
+            semaphore = asyncio.Semaphore(1)
+        self._semaphore = semaphore
 
         # Create TribunalAgent instances from member configs
         self._agents: List[TribunalAgent] = [
@@ -60,9 +77,14 @@ class DeliberationOrchestrator:
                 expertise=m.expertise,
                 llm_caller=llm_caller,
                 system_prompt=system_prompt,
+                response_cache=response_cache,
             )
             for m in members
         ]
+        # 维度与评分标准在整场辩论中不变，预先渲染到各评审员
+        # / Dimensions and rubric are fixed for the whole deliberation; pre-render them per member
+        for agent in self._agents:
+            agent.prebind_rubric(dimensions, rubric)
 
     async def _emit_progress(self, event_type: str, detail: Dict[str, Any]) -> None:
         if self._on_progress is None:
@@ -95,7 +117,10 @@ class DeliberationOrchestrator:
         Returns:
             List of DeliberationRecord, one per round executed.
         """
-        evidence_str = json.dumps(evidence_pack, ensure_ascii=False, default=str)
+        # 证据只序列化一次，各轮次复用；紧凑格式减少每次评估提示词的 token 数
+        # / Evidence is serialized once and reused every round; the compact
+        #   form cuts tokens in every evaluate prompt
+        evidence_str = dumps_compact(evidence_pack)
         records: List[DeliberationRecord] = []
         previous_opinions: List[TribunalOpinion] = []
         consecutive_stable = 0
@@ -109,12 +134,13 @@ class DeliberationOrchestrator:
             if round_num == 0:
                 # Round 0: evaluate only
                 opinions = await self._evaluate_all(evidence_str, round_num)
+                consensus, dissent = self._split_consensus(opinions)
                 record = DeliberationRecord(
                     round_number=round_num,
                     opinions=opinions,
                     challenges=[],
-                    consensus_points=self._find_consensus(opinions),
-                    dissent_points=self._find_dissent(opinions),
+                    consensus_points=consensus,
+                    dissent_points=dissent,
                     converged=False,
                 )
                 records.append(record)
@@ -149,12 +175,13 @@ class DeliberationOrchestrator:
 
                 converged = consecutive_stable >= self.CONSECUTIVE_STABLE_REQUIRED
 
+                consensus, dissent = self._split_consensus(opinions)
                 record = DeliberationRecord(
                     round_number=round_num,
                     opinions=opinions,
                     challenges=challenges,
-                    consensus_points=self._find_consensus(opinions),
-                    dissent_points=self._find_dissent(opinions),
+                    consensus_points=consensus,
+                    dissent_points=dissent,
                     converged=converged,
                 )
                 records.append(record)
@@ -188,38 +215,35 @@ class DeliberationOrchestrator:
     async def _evaluate_all(
         self, evidence: str, round_number: int
     ) -> List[TribunalOpinion]:
-        """All agents evaluate independently."""
-        opinions = []
-        for agent in self._agents:
-            opinion = await agent.evaluate(
-                evidence=evidence,
-                dimensions=self.dimensions,
-                rubric=self.rubric,
-                round_number=round_number,
-            )
-            opinions.append(opinion)
-        return opinions
+        """All agents evaluate independently (concurrently, in member order)."""
+        return await evaluate_panel(
+            self._agents,
+            evidence=evidence,
+            round_number=round_number,
+            semaphore=self._semaphore,
+        )
 
     async def _challenge_round(
         self, opinions: List[TribunalOpinion]
     ) -> List[Dict[str, Any]]:
         """Each member challenges ONE opponent (the one with max score gap).
 
+        Challenges are issued concurrently; results keep member order.
         Returns a list of challenge dicts, one per member.
         """
-        challenges: List[Dict[str, Any]] = []
-
-        for i, agent in enumerate(self._agents):
-            # Find opponent with max score gap
-            target_idx = self._find_max_gap_opponent(i, opinions)
-            challenge_text = await agent.challenge(opinions[target_idx])
-            challenges.append({
+        # Find each member's opponent with max score gap
+        targets = [opinions[j] for j in self._find_max_gap_opponents(opinions)]
+        texts = await challenge_panel(
+            list(zip(self._agents, targets)), semaphore=self._semaphore,
+        )
+        return [
+            {
                 "challenger": agent.role,
-                "target": opinions[target_idx].member_role,
-                "challenge": challenge_text,
-            })
-
-        return challenges
+                "target": target.member_role,
+                "challenge": text,
+            }
+            for agent, target, text in zip(self._agents, targets, texts)
+        ]
 
     async def _revise_all(
         self,
@@ -227,48 +251,46 @@ class DeliberationOrchestrator:
         challenges: List[Dict[str, Any]],
         round_number: int,
     ) -> List[TribunalOpinion]:
-        """All agents revise based on challenges received."""
-        revised = []
-        for i, agent in enumerate(self._agents):
-            # Collect challenges targeted at this member
-            received = [
-                c["challenge"]
-                for c in challenges
-                if c["target"] == agent.role
-            ]
-            # If no challenges targeted at this member, include all challenges
-            # as context so they still have opportunity to revise
-            if not received:
-                received = [c["challenge"] for c in challenges]
-
-            opinion = await agent.revise(
-                original_opinion=previous_opinions[i],
-                challenges=received,
-                round_number=round_number,
-            )
-            revised.append(opinion)
-        return revised
-
-    def _find_max_gap_opponent(
-        self, member_idx: int, opinions: List[TribunalOpinion]
-    ) -> int:
-        """Find the opponent with the largest total score gap from this member."""
-        my_scores = opinions[member_idx].scores
-        max_gap = -1
-        target = -1
-
-        for j, other_opinion in enumerate(opinions):
-            if j == member_idx:
-                continue
-            gap = sum(
-                abs(my_scores.get(d, 0) - other_opinion.scores.get(d, 0))
-                for d in self.dimensions
-            )
-            if gap > max_gap:
-                max_gap = gap
-                target = j
+        """All agents revise based on challenges received (concurrently, in member order)."""
+        # Group challenges by target in one pass instead of rescanning per member
+        by_target: Dict[str, List[str]] = {}
+        for c in challenges:
+            by_target.setdefault(c["target"], []).append(c["challenge"])
+        everything = [c["challenge"] for c in challenges]
+
+        # If no challenges targeted a member, they get all challenges as
+        # context so they still have the opportunity to revise
+        items = [
+            (agent, previous_opinions[i], by_target.get(agent.role) or list(everything))
+            for i, agent in enumerate(self._agents)
+        ]
+
+        return await revise_panel(
+            items, round_number=round_number, semaphore=self._semaphore,
+        )
 
-        return target
+    def _find_max_gap_opponents(self, opinions: List[TribunalOpinion]) -> List[int]:
+        """For every member, the opponent with the largest total score gap.
+
+        Score rows are built once and each pairwise gap is computed once (the
+        gap is symmetric). Ties go to the earliest opponent; a lone member
+        gets -1.
+        """
+        rows = self._score_rows(opinions)
+        n = len(rows)
+        best_gap = [-1] * n
+        targets = [-1] * n
+        for i in range(n):
+            row_i = rows[i]
+            for j in range(i + 1, n):
+                gap = sum(abs(a - b) for a, b in zip(row_i, rows[j]))
+                # 每个成员的候选按下标递增出现，严格大于即保持最早者优先
+                # / Each member sees candidates in increasing index order, so strict > keeps the earliest
+                if gap > best_gap[i]:
+                    best_gap[i], targets[i] = gap, j
+                if gap > best_gap[j]:
+                    best_gap[j], targets[j] = gap, i
+        return targets
 
     def _check_threshold_convergence(
         self,
@@ -284,20 +306,36 @@ class DeliberationOrchestrator:
                     return False
         return True
 
+    def _score_rows(self, opinions: List[TribunalOpinion]) -> List[List[int]]:
+        """Member x dimension score rows (missing scores count as 0)."""
+        dims = self.dimensions
+        return [[op.scores.get(dim, 0) for dim in dims] for op in opinions]
+
+    def _split_consensus(
+        self, opinions: List[TribunalOpinion],
+    ) -> Tuple[List[str], List[str]]:
+        """Split dimensions into (consensus, dissent) in one pass over the scores.
+
+        A dimension is consensus when every member's score is within ≤1 of the
+        others, dissent when they differ by >1.
+        """
+        if not opinions:
+            return [], []
+        dims = self.dimensions
+        rows = self._score_rows(opinions)
+        consensus: List[str] = []
+        dissent: List[str] = []
+        for dim, column in zip(dims, zip(*rows)):
+            if max(column) - min(column) <= 1:
+                consensus.append(dim)
+            else:
+                dissent.append(dim)
+        return consensus, dissent
+
     def _find_consensus(self, opinions: List[TribunalOpinion]) -> List[str]:
         """Identify dimensions where all members agree (scores within ≤1)."""
-        consensus = []
-        for dim in self.dimensions:
-            scores = [op.scores.get(dim, 0) for op in opinions]
-            if scores and (max(scores) - min(scores)) <= 1:
-                consensus.append(dim)
-        return consensus
+        return self._split_consensus(opinions)[0]
 
     def _find_dissent(self, opinions: List[TribunalOpinion]) -> List[str]:
         """Identify dimensions where members disagree (scores differ by >1)."""
-        dissent = []
-        for dim in self.dimensions:
-            scores = [op.scores.get(dim, 0) for op in opinions]
-            if scores and (max(scores) - min(scores)) > 1:
-                dissent.append(dim)
-        return dissent
+        return self._split_consensus(opinions)[1]
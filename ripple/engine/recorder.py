@@ -6,10 +6,26 @@
 # 设计目标 / Design goals:
 # 1. 细粒度记录：初始化、种子、每轮 wave、裁决、响应、观测、合成。
 #    / Fine-grained recording: init, seed, per-wave snapshots, verdicts, responses, observation, synthesis.
-# 2. 动态写入：关键节点后立即刷盘，不等模拟结束。
-#    / Eager flush: write to disk at each checkpoint, don't wait for completion.
+# 2. 动态写入：关键节点后刷盘，不等模拟结束；两次落盘至少间隔
+#    MIN_FLUSH_INTERVAL 秒，期间的变更合并到下一次写入，结束/失败时强制写入。
+#    / Eager flush: write at checkpoints without waiting for completion; writes
+#    are at least MIN_FLUSH_INTERVAL seconds apart, changes in between are
+#    coalesced into the next write, and finish/failure always force a write.
 # 3. 崩溃安全：临时文件 + 原子重命名，任意时刻文件都是合法 JSON。
 #    / Crash-safe: temp file + atomic rename; file is always valid JSON.
+#    每个事件追加到 .events.jsonl 事件日志（每个事件一行，wave 结束只记增量）；
+#    完整 JSON 在 wave 结束时按间隔合并写出，并在里程碑（合成、run 结束、
+#    完成/失败）时强制写出，崩溃后主 JSON 至多落后一个 wave。
+#    / Every event is appended to the .events.jsonl log (one line per event;
+#    a wave end logs only its delta). The full JSON is written, coalesced, at
+#    wave ends and forced at milestones (synthesis, run end, finish/failure),
+#    so after a crash the main JSON lags by at most one wave.
+#    事件循环上发起的写入只在循环线程序列化快照，文件 I/O 交给单线程写入器；
+#    尚未开始的旧快照会被新快照取代；flush() / finalize / mark_failed 会等待写入完成。
+#    / Writes issued on the event loop only serialize the snapshot on the loop
+#    thread and hand the file I/O to a single-thread writer; a queued snapshot
+#    that has not started is replaced by the newer one; flush() / finalize /
+#    mark_failed wait for it to finish.
 # 4. 向后兼容：合成结果保持顶层键，过程数据放在 process 键下。
 #    / Backward compat: synthesis at top-level keys; process data under "process".
 # =============================================================================
@@ -18,27 +34,71 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import atexit
+import io
 import logging
 import os
 import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import IO, Any, Callable, Dict, List, Optional, TextIO, Tuple
 
 from ripple.primitives.models import OmniscientVerdict
+from ripple.utils.fast_json import dump_pretty, dumps_compact
 from ripple.version import VERSION
 
 logger = logging.getLogger(__name__)
 
 
+# 尚未关闭的记录器；解释器退出时写出其挂起的变更（弱引用，不延长生命周期）
+# / Recorders not yet closed; their pending changes are written at interpreter
+#   exit (weak references, so lifetimes are not extended)
+_OPEN_RECORDERS: "weakref.WeakSet[SimulationRecorder]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_recorders() -> None:
+    """退出时写出所有未关闭记录器的挂起变更。 / Flush pending changes of every unclosed recorder at exit."""
+    for recorder in list(_OPEN_RECORDERS):
+        try:
+            recorder.flush()
+        except Exception as e:
+            logger.warning(f"退出时记录器写入失败: {e}")
+
+
+def _on_event_loop() -> bool:
+    """当前线程是否正在运行事件循环。 / Whether the current thread is running an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
 class SimulationRecorder:
     """模拟过程增量记录器。 / Incremental simulation recorder.
 
-    在模拟的每个关键节点动态写入 JSON 文件。确保文件在任意时刻都是合法 JSON，
-    即使模拟中途失败也能保留已完成阶段的完整记录。
-    / Writes JSON at each key checkpoint. File is always valid JSON,
-    preserving completed phases even if simulation fails midway.
+    每个事件立即追加到 `<输出>.events.jsonl`（每行一个
+    `{"kind", "ts", "run_index", "data"}`），中途失败也能从事件日志恢复已完成
+    阶段；完整 JSON 保留在内存中，只在里程碑处整份写出。
+    / Every event is appended to `<output>.events.jsonl` right away (one
+    `{"kind", "ts", "run_index", "data"}` per line), so completed phases survive
+    a midway failure; the full JSON stays in memory and is written out whole
+    only at milestones.
+
+    INIT / SEED / wave 开始 / OBSERVE / process.* 只追加事件并标记挂起；输入、
+    run 开始与 wave 结束按 MIN_FLUSH_INTERVAL 合并写出（wave 边界保持主 JSON
+    最新）；合成、run 结束、finalize / mark_failed 强制写入，flush() 可随时写出
+    挂起的变更。
+    / INIT / SEED / wave start / OBSERVE / process.* only append an event and
+    mark the snapshot pending; the input, run starts and wave ends are written
+    coalesced by MIN_FLUSH_INTERVAL (keeping the main JSON current at wave
+    boundaries); synthesis, run end and finalize / mark_failed force a write,
+    and flush() writes pending changes at any time.
 
     输出 JSON 结构 / Output JSON structure:
         {
@@ -70,6 +130,12 @@ class SimulationRecorder:
         }
     """
 
+    # 两次落盘的最小间隔（秒）；0 表示每个事件都落盘。可用 RIPPLE_FLUSH_INTERVAL_MS 覆盖
+    # / Minimum seconds between writes; 0 writes on every event. Override with RIPPLE_FLUSH_INTERVAL_MS
+    MIN_FLUSH_INTERVAL = float(os.getenv("RIPPLE_FLUSH_INTERVAL_MS", "250")) / 1000
+    # 设置 RIPPLE_SKIP_MD 时不生成压缩 Markdown 日志 / RIPPLE_SKIP_MD disables the compact markdown log
+    SKIP_MARKDOWN = bool(os.getenv("RIPPLE_SKIP_MD"))
+
     def __init__(self, output_path: Path, run_id: str):
         """初始化记录器，立即创建输出文件。 / Initialize recorder and create output file immediately.
 
@@ -79,10 +145,52 @@ class SimulationRecorder:
         """
         self._path = output_path
         self._run_id = run_id
+        # 绝对路径只解析一次（resolve 需多次 stat，网络文件系统上开销明显）
+        # / Resolve absolute paths once (resolve costs several stats, noticeable on network filesystems)
+        resolved = output_path.resolve()
+        self._resolved_output = str(resolved)
+        self._resolved_compact_log = str(resolved.with_suffix(".md"))
         self._start_time = time.monotonic()
         self._start_datetime = datetime.now()
-        self._active_ensemble_run: Optional[Dict[str, Any]] = None
-        self._active_ensemble_run_start: Optional[float] = None
+        self._last_flush = float("-inf")
+        self._dirty = False
+        # 挂起的写入是否需要重建 Markdown / Whether the pending write should rebuild the markdown
+        self._markdown_pending = False
+        # 事件循环上的落盘交给单线程写入器（惰性创建），保证写入顺序
+        # / Writes issued on the event loop go to a lazily created
+        #   single-thread writer, which keeps them in order
+        self._writer: Optional[ThreadPoolExecutor] = None
+        # wave 条目索引，键为 (所属 waves 列表的 id, wave_number)；列表由 _data
+        # 持有、生命周期与记录器相同，id 不会复用
+        # / Wave entry index keyed by (id of the owning waves list, wave_number);
+        #   the lists are held by _data for the recorder's lifetime, so ids are never reused
+        self._wave_index: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self._pending: Optional[Future] = None
+        self._pending_markdown = False
+        # 已结束 run 的序列化缓存（键为 run 条目 id）：结束后条目不再变化，只序列化
+        # 一次，之后的整份写入把缓存拼接进占位符的位置
+        # / Serialized cache of ended runs (keyed by run entry id): an entry no
+        #   longer changes once ended, so it is serialized once and later full
+        #   writes splice the cache in where a placeholder stands
+        self._run_cache: Dict[int, bytes] = {}
+        self._placeholder_nonce = os.urandom(8).hex()
+        # 压缩 Markdown 的片段缓存：已结束的 wave / run 渲染一次后复用
+        # （键为条目 id；wave 条目在 record_wave_end 时失效）
+        # / Fragment caches for the compact markdown: ended waves / runs are
+        #   rendered once and reused (keyed by entry id; a wave entry is
+        #   invalidated by record_wave_end)
+        self._md_wave_cache: Dict[int, List[str]] = {}
+        self._md_run_cache: Dict[int, List[str]] = {}
+        # 追加式事件日志（行缓冲，每个事件一次写入）
+        # / Append-only event log (line-buffered, one write per event)
+        self._events_path = output_path.with_suffix(".events.jsonl")
+        self._events_fp: Optional[TextIO] = self._open_events()
+        # 活动 run 按 asyncio 上下文隔离：并发 ensemble 的每个任务写入各自的 run
+        # / The active run is scoped to the asyncio context, so each task of a
+        #   concurrent ensemble writes into its own run
+        self._active_run: ContextVar[Optional[Tuple[Dict[str, Any], float]]] = ContextVar(
+            f"ripple_recorder_active_run_{run_id}", default=None,
+        )
 
         # 核心数据结构 — 与输出 JSON 一一对应 / Core data structure — mirrors output JSON
         self._data: Dict[str, Any] = {
@@ -112,6 +220,7 @@ class SimulationRecorder:
         }
         # 创建文件，标记模拟已启动 / Create file, mark simulation as started
         self._flush()
+        _OPEN_RECORDERS.add(self)
 
     # -----------------------------------------------------------------
     # Ensemble run boundaries / 集成运行边界
@@ -127,14 +236,17 @@ class SimulationRecorder:
         """Begin a new ensemble run section inside this output file.
 
         When active, all subsequent record_* calls will write to this run's
-        process/result instead of the top-level process keys.
+        process/result instead of the top-level process keys. The active run
+        is tracked per asyncio context, so concurrent runs begun in separate
+        tasks do not interfere.
         """
+        now = datetime.now().isoformat()
         run_entry: Dict[str, Any] = {
             "run_index": int(run_index),
             "run_id": str(run_id),
             "random_seed": int(random_seed) if random_seed is not None else None,
             "meta": {
-                "start_time": datetime.now().isoformat(),
+                "start_time": now,
                 "end_time": None,
                 "elapsed_seconds": 0.0,
                 "status": "running",
@@ -152,27 +264,38 @@ class SimulationRecorder:
             "wave_records_count": 0,
         }
         self._data["process"]["ensemble_runs"].append(run_entry)
-        self._active_ensemble_run = run_entry
-        self._active_ensemble_run_start = time.monotonic()
-        self._flush()
+        self._active_run.set((run_entry, time.monotonic()))
+        self._append_event("run_begin", {
+            "run_id": run_entry["run_id"], "random_seed": run_entry["random_seed"],
+        }, ts=now)
+        self._flush(markdown=False)
 
     def end_ensemble_run(self, *, error: Optional[str] = None) -> None:
         """End the current ensemble run section."""
-        if self._active_ensemble_run is None:
+        active = self._active_run.get()
+        if active is None:
             return
-        elapsed = 0.0
-        if self._active_ensemble_run_start is not None:
-            elapsed = time.monotonic() - self._active_ensemble_run_start
-        self._active_ensemble_run["meta"]["end_time"] = datetime.now().isoformat()
-        self._active_ensemble_run["meta"]["elapsed_seconds"] = round(elapsed, 2)
+        run_entry, started = active
+        elapsed = time.monotonic() - started
+        now = datetime.now().isoformat()
+        run_entry["meta"]["end_time"] = now
+        run_entry["meta"]["elapsed_seconds"] = round(elapsed, 2)
         if error:
-            self._active_ensemble_run["meta"]["status"] = "failed"
-            self._active_ensemble_run["meta"]["error"] = str(error)
+            run_entry["meta"]["status"] = "failed"
+            run_entry["meta"]["error"] = str(error)
         else:
-            self._active_ensemble_run["meta"]["status"] = "completed"
-        self._active_ensemble_run = None
-        self._active_ensemble_run_start = None
-        self._flush()
+            run_entry["meta"]["status"] = "completed"
+        self._append_event("run_end", run_entry["meta"], ts=now)
+        self._active_run.set(None)
+        self._cache_ended_run(run_entry)
+        # run 边界每个 run 只有一次，强制写入 / A run boundary happens once per run; force the write
+        self._flush(force=True)
+
+    @property
+    def _active_ensemble_run(self) -> Optional[Dict[str, Any]]:
+        """当前上下文中的活动 run 条目。 / The active run entry in the current context."""
+        active = self._active_run.get()
+        return active[0] if active is not None else None
 
     def _process_root(self) -> Dict[str, Any]:
         """Return the process dict to write into (active run or top-level)."""
@@ -199,7 +322,8 @@ class SimulationRecorder:
     ) -> None:
         """记录模拟输入参数（供复现追溯）。 / Record simulation input (for reproducibility)."""
         self._data["simulation_input"] = simulation_input
-        self._flush()
+        self._append_event("simulation_input", simulation_input)
+        self._flush(markdown=False)
 
     def record_init(
         self,
@@ -214,9 +338,10 @@ class SimulationRecorder:
         包含 Agent 配置、动态参数、种子涟漪、预估 wave 数。
         / Contains agent configs, dynamic params, seed ripple, estimated waves.
         """
+        now = datetime.now().isoformat()
         root = self._process_root()
-        root["init"] = {
-            "timestamp": datetime.now().isoformat(),
+        root["init"] = entry = {
+            "timestamp": now,
             "star_configs": init_result.get("star_configs", []),
             "sea_configs": init_result.get("sea_configs", []),
             "dynamic_parameters": init_result.get("dynamic_parameters", {}),
@@ -226,31 +351,46 @@ class SimulationRecorder:
             "requested_max_waves": requested_max_waves,
             "seed_ripple_raw": init_result.get("seed_ripple", {}),
         }
-        self._flush()
+        self._record_event("init", entry, ts=now)
 
     def record_seed(
         self, seed_content: str, seed_energy: float,
     ) -> None:
         """记录 SEED 阶段结果 — 种子涟漪注入。 / Record SEED phase — seed ripple injection."""
+        now = datetime.now().isoformat()
         root = self._process_root()
-        root["seed"] = {
-            "timestamp": datetime.now().isoformat(),
+        root["seed"] = entry = {
+            "timestamp": now,
             "content": seed_content,
             "energy": seed_energy,
         }
-        self._flush()
+        self._record_event("seed", entry, ts=now)
 
     def record_wave_start(
         self, wave_number: int, pre_snapshot: Dict[str, Any],
     ) -> None:
         """记录 wave 启动前的场快照。 / Record field snapshot before wave starts.
 
-        在全视者发出裁决之前调用，捕获场的当前状态作为 pre_snapshot。
-        / Called before Omniscient verdict; captures current field state as pre_snapshot.
+        在全视者发出裁决之前调用，捕获场的当前状态作为 pre_snapshot。快照按引用
+        保存，调用方每次传入新构建的字典，之后不再修改。
+        / Called before Omniscient verdict; captures current field state as
+        pre_snapshot. Snapshots are kept by reference: callers pass a freshly
+        built dict and do not mutate it afterwards.
         """
+        now = datetime.now().isoformat()
+        root = self._process_root()
+        # 上一 wave 的 post_snapshot 与本 wave 的 pre_snapshot 通常内容相同，
+        # 相同时共享同一对象，内存中每个 wave 只保留一份快照
+        # / The previous wave's post_snapshot usually equals this wave's
+        #   pre_snapshot; when it does the object is shared, so memory holds
+        #   one snapshot per wave
+        if root["waves"]:
+            previous_post = root["waves"][-1].get("post_snapshot")
+            if previous_post is not None and previous_post == pre_snapshot:
+                pre_snapshot = previous_post
         wave_entry: Dict[str, Any] = {
             "wave_number": wave_number,
-            "timestamp_start": datetime.now().isoformat(),
+            "timestamp_start": now,
             "timestamp_end": None,
             "pre_snapshot": pre_snapshot,
             "verdict": None,
@@ -258,13 +398,13 @@ class SimulationRecorder:
             "post_snapshot": None,
             "terminated": False,
         }
-        root = self._process_root()
         root["waves"].append(wave_entry)
+        self._index_wave_entry(root["waves"], wave_entry)
         if self._active_ensemble_run is not None:
             self._active_ensemble_run["wave_records_count"] = len(root["waves"])
         else:
             self._data["wave_records_count"] = len(root["waves"])
-        self._flush()
+        self._record_event("wave_start", wave_entry, ts=now)
 
     def record_wave_end(
         self,
@@ -282,6 +422,7 @@ class SimulationRecorder:
         terminated=True means Omniscient decided to stop propagation.
         """
         # 查找对应的 wave 条目（由 record_wave_start 创建） / Find matching wave entry (created by record_wave_start)
+        now = datetime.now().isoformat()
         root = self._process_root()
         wave_entry = self._find_wave_entry(wave_number, waves=root["waves"])
         if wave_entry is None:
@@ -291,12 +432,14 @@ class SimulationRecorder:
             )
             wave_entry = {
                 "wave_number": wave_number,
-                "timestamp_start": datetime.now().isoformat(),
+                "timestamp_start": now,
                 "pre_snapshot": None,
             }
             root["waves"].append(wave_entry)
+            self._index_wave_entry(root["waves"], wave_entry)
 
-        wave_entry["timestamp_end"] = datetime.now().isoformat()
+        self._md_wave_cache.pop(id(wave_entry), None)
+        wave_entry["timestamp_end"] = now
         wave_entry["verdict"] = self._serialize_verdict(verdict)
         wave_entry["agent_responses"] = agent_responses
         wave_entry["post_snapshot"] = post_snapshot
@@ -308,16 +451,29 @@ class SimulationRecorder:
         else:
             self._data["total_waves"] = len(root["waves"])
             self._data["wave_records_count"] = len(root["waves"])
-        self._flush()
+        # pre_snapshot 已由 wave_start 记录，事件只记本次新增的字段
+        # / pre_snapshot was logged by wave_start; the event carries only the new fields
+        self._append_event("wave_end", {
+            "wave_number": wave_entry["wave_number"],
+            "verdict": wave_entry["verdict"],
+            "agent_responses": agent_responses,
+            "post_snapshot": post_snapshot,
+            "terminated": terminated,
+        }, ts=now)
+        # wave 边界让主 JSON 跟上进度（按间隔合并，Markdown 留待阶段边界）
+        # / Bring the main JSON up to date at the wave boundary (coalesced;
+        #   markdown waits for a phase boundary)
+        self._flush(markdown=False)
 
     def record_observation(self, observation: str) -> None:
         """记录 OBSERVE 阶段结果 — 全视者的全局观测。 / Record OBSERVE phase — Omniscient's global observation."""
+        now = datetime.now().isoformat()
         root = self._process_root()
-        root["observation"] = {
-            "timestamp": datetime.now().isoformat(),
+        root["observation"] = entry = {
+            "timestamp": now,
             "content": observation,
         }
-        self._flush()
+        self._record_event("observation", entry, ts=now)
 
     def record_process(self, key: str, data: Any) -> None:
         """记录任意 process.* 节点（用于可选 phase 扩展）。 / Record an arbitrary process.* node.
@@ -328,12 +484,22 @@ class SimulationRecorder:
         这样 JSON Pointer（如 #/process/deliberation）始终指向实际数据结构，
         避免消费者在不同 process.* 键之间需要额外解引用层级。
         / This keeps JSON Pointer references (e.g. #/process/deliberation) pointing to the actual data.
+
+        这里只追加事件并标记挂起，不写主 JSON：文件中的 process[key] 会滞后，
+        直到下一次写入（wave 结束、合成、run 结束）完成。需要立即按 JSON
+        Pointer 读取文件的调用方应先调用 flush()（或 finalize()），它们也会等待
+        后台写入线程完成。
+        / This only appends an event and marks the snapshot pending; the main
+        JSON is not written here, so process[key] in the file lags until the
+        next write (wave end, synthesis, run end) completes. Callers that need
+        to read the file through a JSON Pointer right away should call flush()
+        (or finalize()) first, which also wait for the background writer.
         """
         if not key or not isinstance(key, str):
             raise ValueError("process key must be a non-empty string")
         root = self._process_root()
         root[key] = data
-        self._flush()
+        self._record_event("process", {"key": key, "value": data})
 
     def record_synthesis(self, result: Dict[str, Any]) -> None:
         """记录 SYNTHESIZE 阶段 — 将合成结果写入顶层键（向后兼容）。 / Record SYNTHESIZE — write result to top-level keys (backward compat).
@@ -349,16 +515,21 @@ class SimulationRecorder:
             for key, value in result.items():
                 if key not in ("meta", "process", "simulation_input"):
                     self._data[key] = value
-        self._flush()
+        self._append_event("synthesis", result)
+        # 合成结果是每次模拟的最终产出，强制写入 / Synthesis is each run's final output; force the write
+        self._flush(force=True)
 
     def finalize(self, total_waves: int) -> None:
         """标记模拟完成，写入最终元信息。 / Mark simulation complete and write final metadata."""
         elapsed = time.monotonic() - self._start_time
-        self._data["meta"]["end_time"] = datetime.now().isoformat()
+        now = datetime.now().isoformat()
+        self._data["meta"]["end_time"] = now
         self._data["meta"]["elapsed_seconds"] = round(elapsed, 2)
         self._data["meta"]["status"] = "completed"
         self._data["total_waves"] = total_waves
-        self._flush()
+        self._append_event("finalize", {"total_waves": total_waves}, ts=now)
+        self._flush(force=True)
+        self.close()
         logger.info(
             f"模拟记录已完成: {self._path} "
             f"({total_waves} waves, {elapsed:.1f}s)"
@@ -367,11 +538,40 @@ class SimulationRecorder:
     def mark_failed(self, error: str) -> None:
         """标记模拟失败，记录错误信息。 / Mark simulation failed and record error info."""
         elapsed = time.monotonic() - self._start_time
-        self._data["meta"]["end_time"] = datetime.now().isoformat()
+        now = datetime.now().isoformat()
+        self._data["meta"]["end_time"] = now
         self._data["meta"]["elapsed_seconds"] = round(elapsed, 2)
         self._data["meta"]["status"] = "failed"
         self._data["meta"]["error"] = error
-        self._flush()
+        self._append_event("failed", {"error": error}, ts=now)
+        self._flush(force=True)
+        self.close()
+
+    def flush(self) -> None:
+        """写出尚未落盘的变更，并等待后台写入完成。 / Write out pending changes and wait for background writes."""
+        if self._dirty:
+            self._flush(force=True)
+        self._wait_for_writer()
+
+    def close(self) -> None:
+        """等待后台写入并关闭事件日志（finalize / mark_failed 时自动调用）。
+        / Wait for background writes and close the event log (called by finalize / mark_failed)."""
+        _OPEN_RECORDERS.discard(self)
+        self._wait_for_writer()
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.shutdown(wait=True)
+        fp, self._events_fp = self._events_fp, None
+        if fp is not None:
+            try:
+                fp.close()
+            except Exception as e:
+                logger.warning(f"事件日志关闭失败: {e}")
+
+    @property
+    def events_path(self) -> Path:
+        """追加式事件日志路径（.events.jsonl）。 / Append-only event log path (.events.jsonl)."""
+        return self._events_path
 
     # -----------------------------------------------------------------
     # 属性访问 / Property access
@@ -392,6 +592,16 @@ class SimulationRecorder:
         """压缩 Markdown 日志路径（与 JSON 同目录，.md 后缀）。 / Compact markdown log path (.md alongside .json)."""
         return self._path.with_suffix(".md")
 
+    @property
+    def resolved_output_path(self) -> str:
+        """构造时解析的 JSON 输出文件绝对路径。 / Absolute JSON output path, resolved at construction."""
+        return self._resolved_output
+
+    @property
+    def resolved_compact_log_path(self) -> str:
+        """构造时解析的压缩日志绝对路径。 / Absolute compact log path, resolved at construction."""
+        return self._resolved_compact_log
+
     # -----------------------------------------------------------------
     # 内部方法 / Internal methods
     # -----------------------------------------------------------------
@@ -402,42 +612,191 @@ class SimulationRecorder:
         *,
         waves: Optional[list] = None,
     ) -> Optional[Dict[str, Any]]:
-        """根据 wave_number 查找已有的 wave 条目。 / Find existing wave entry by wave_number."""
+        """根据 wave_number 查找已有的 wave 条目（O(1) 索引）。 / Find existing wave entry by wave_number (O(1) index)."""
         wave_list = waves if waves is not None else self._data["process"]["waves"]
-        for w in wave_list:
-            if w["wave_number"] == wave_number:
-                return w
-        return None
+        return self._wave_index.get((id(wave_list), wave_number))
 
-    def _flush(self) -> None:
+    def _index_wave_entry(self, waves: list, wave_entry: Dict[str, Any]) -> None:
+        """登记 wave 条目；同号重复时保留最早的一条（与顺序查找一致）。
+        / Index a wave entry; on duplicate numbers keep the earliest (as a linear scan would)."""
+        self._wave_index.setdefault((id(waves), wave_entry["wave_number"]), wave_entry)
+
+    def _open_events(self) -> Optional[TextIO]:
+        """以追加、行缓冲模式打开事件日志；失败仅记录日志。
+        / Open the event log for line-buffered appends; failures are only logged."""
+        try:
+            fp = open(self._events_path, "a", encoding="utf-8", buffering=1)
+            os.chmod(self._events_path, 0o600)
+            return fp
+        except Exception as e:
+            logger.warning(f"事件日志打开失败（不影响模拟流程）: {e}")
+            return None
+
+    def _append_event(self, kind: str, data: Any, ts: Optional[str] = None) -> None:
+        """向事件日志追加一行；ts 缺省时取当前时间。 / Append one line to the event log; ts defaults to now."""
+        if self._events_fp is None:
+            return
+        event = {
+            "kind": kind,
+            "ts": ts if ts is not None else datetime.now().isoformat(),
+            "run_index": self.active_ensemble_run_index,
+            "data": data,
+        }
+        try:
+            self._events_fp.write(dumps_compact(event) + "\n")
+        except Exception as e:
+            logger.warning(f"事件日志写入失败（不影响模拟流程）: {e}")
+
+    def _record_event(self, kind: str, data: Any, ts: Optional[str] = None) -> None:
+        """热路径事件：追加到事件日志，JSON 快照留待下一个里程碑。
+        / Hot-path event: append to the log and leave the JSON snapshot for the next milestone."""
+        self._append_event(kind, data, ts)
+        self._dirty = True
+
+    def _flush(self, force: bool = False, *, markdown: bool = True) -> None:
         """将当前状态写入 JSON 文件。 / Flush current state to JSON file.
 
+        距上次写入不足 MIN_FLUSH_INTERVAL 时只标记挂起，由下一次写入带出；
+        force=True 时立即写入。markdown=False 只写 JSON，Markdown 留待下一个
+        阶段边界重建（输入记录、run 开始）。
+        / Within MIN_FLUSH_INTERVAL of the last write the change is only
+        marked pending and goes out with the next write; force=True writes now.
+        markdown=False writes only the JSON and leaves the markdown for the
+        next phase boundary to rebuild (input record, run start).
+        """
+        self._markdown_pending = self._markdown_pending or markdown
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.MIN_FLUSH_INTERVAL:
+            self._dirty = True
+            return
+        self._last_flush = now
+        self._dirty = False
+        write_markdown = self._markdown_pending and not self.SKIP_MARKDOWN
+        self._markdown_pending = False
+        self._write_to_disk(markdown=write_markdown)
+
+    def _write_to_disk(self, markdown: bool = True) -> None:
+        """整份写入 JSON 与压缩日志（markdown=False 时只写 JSON）。
+        / Write the full JSON and compact log (only the JSON when markdown=False).
+
+        在事件循环线程上调用时，当前线程只负责序列化（得到一致快照），文件写入
+        交给单线程写入器按提交顺序执行，不阻塞事件循环；其他线程中直接写入。
+        / When called on the event-loop thread only serialization happens here
+        (giving a consistent snapshot); the file writes go to a single-thread
+        writer in submission order so the loop is not blocked. Other threads
+        write directly.
+        """
+        # 更新运行时长（仅在 running 状态下） / Update elapsed time (only while running)
+        if self._data["meta"]["status"] == "running":
+            elapsed = time.monotonic() - self._start_time
+            self._data["meta"]["elapsed_seconds"] = round(elapsed, 2)
+
+        if not _on_event_loop():
+            self._wait_for_writer()
+            # 直接序列化到文件，不在内存中保留整份文本 / Serialize straight into the file without holding the full text
+            self._write_json(self._dump_snapshot)
+            if markdown:
+                self._flush_markdown()
+            return
+
+        try:
+            buf = io.BytesIO()
+            self._dump_snapshot(buf)
+        except Exception as e:
+            logger.warning(f"记录器序列化失败（不影响模拟流程）: {e}")
+            return
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ripple-recorder")
+        # 尚未开始的旧快照已被新快照取代，撤回它（其 Markdown 由本次补上）；
+        # 队列中最多一个写入中、一个待写
+        # / A queued snapshot that has not started is superseded by this one, so
+        #   withdraw it (this write takes over its markdown); at most one write
+        #   is running and one is waiting
+        if self._pending is not None and self._pending.cancel():
+            markdown = markdown or self._pending_markdown
+        md: Optional[str] = None
+        if markdown:
+            try:
+                md = self._build_compact_markdown()
+            except Exception as e:
+                logger.warning(f"Markdown 日志写入失败: {e}")
+        self._pending = self._writer.submit(self._write_snapshot, buf.getvalue(), md)
+        self._pending_markdown = md is not None
+
+    def _cache_ended_run(self, run_entry: Dict[str, Any]) -> None:
+        """序列化并缓存已结束的 run 条目。 / Serialize and cache an ended run entry."""
+        try:
+            buf = io.BytesIO()
+            dump_pretty(run_entry, buf)
+        except Exception as e:
+            logger.warning(f"记录器序列化失败（不影响模拟流程）: {e}")
+            return
+        self._run_cache[id(run_entry)] = buf.getvalue()
+
+    def _dump_snapshot(self, fp: IO[bytes]) -> None:
+        """将整份数据以缩进 JSON 写入 fp，已结束的 run 取自缓存。
+        / Write the full data as indented JSON to fp, taking ended runs from the cache.
+
+        已结束的 run 先替换为占位字符串，序列化其余部分后再把占位符换成缓存
+        片段（按所在深度补缩进），输出与直接序列化整份数据逐字节一致。
+        / Ended runs are swapped for placeholder strings, the rest is
+        serialized, and each placeholder is then replaced by its cached
+        fragment (re-indented for its depth); the output is byte-identical to
+        serializing the whole data directly.
+        """
+        process = self._data["process"]
+        runs = process["ensemble_runs"]
+        if not self._run_cache or not runs:
+            dump_pretty(self._data, fp)
+            return
+        fragments: Dict[bytes, bytes] = {}
+        skeleton_runs = []
+        for i, run_entry in enumerate(runs):
+            cached = self._run_cache.get(id(run_entry))
+            if cached is None:
+                skeleton_runs.append(run_entry)
+                continue
+            placeholder = f"__ripple_run_{self._placeholder_nonce}_{i}__"
+            skeleton_runs.append(placeholder)
+            # run 条目位于 root → process → ensemble_runs 之下，深度 3
+            # / Run entries sit under root → process → ensemble_runs, depth 3
+            fragments[f'"{placeholder}"'.encode()] = cached.replace(b"\n", b"\n      ")
+        skeleton = {**self._data, "process": {**process, "ensemble_runs": skeleton_runs}}
+        buf = io.BytesIO()
+        dump_pretty(skeleton, buf)
+        content = buf.getvalue()
+        for placeholder, fragment in fragments.items():
+            content = content.replace(placeholder, fragment, 1)
+        fp.write(content)
+
+    def _write_snapshot(self, content: bytes, markdown: Optional[str]) -> None:
+        """写入已序列化的快照（在写入器线程中执行）。 / Write a serialized snapshot (runs on the writer thread)."""
+        self._write_json(lambda fp: fp.write(content))
+        if markdown is not None:
+            self._write_markdown(markdown)
+
+    def _write_json(self, write: Callable[[IO[bytes]], Any]) -> None:
+        """原子写入 JSON 文件。 / Atomically write the JSON file.
+
         使用「先写临时文件 -> 原子重命名」模式确保文件完整性。写入失败仅记录日志。
         / Uses temp file + atomic rename for file integrity. Write failures only logged.
         """
         try:
-            # 更新运行时长（仅在 running 状态下） / Update elapsed time (only while running)
-            if self._data["meta"]["status"] == "running":
-                elapsed = time.monotonic() - self._start_time
-                self._data["meta"]["elapsed_seconds"] = round(elapsed, 2)
-
-            content = json.dumps(
-                self._data,
-                ensure_ascii=False,
-                indent=2,
-                default=str,
-            )
-
             # 原子写入：先写 .tmp 再重命名，避免崩溃导致文件损坏 / Atomic write: .tmp then rename to prevent corruption
             tmp_path = self._path.with_suffix(".json.tmp")
-            tmp_path.write_text(content, encoding="utf-8")
+            with tmp_path.open("wb") as fp:
+                write(fp)
             # 设置文件权限为 0o600（仅所有者读写） / Set file permissions to 0o600 (owner read/write only)
             os.chmod(tmp_path, 0o600)
             tmp_path.replace(self._path)
         except Exception as e:
             logger.warning(f"记录器写入失败（不影响模拟流程）: {e}")
-        # 同步写入压缩 Markdown 日志 / Sync write compact markdown log
-        self._flush_markdown()
+
+    def _wait_for_writer(self) -> None:
+        """等待写入器中尚未完成的写入。 / Wait for the write still pending on the writer."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            pending.result()
 
     @staticmethod
     def _serialize_verdict(
@@ -477,6 +836,14 @@ class SimulationRecorder:
         """将当前状态写入压缩 Markdown 日志文件。 / Flush compact markdown log file."""
         try:
             md = self._build_compact_markdown()
+        except Exception as e:
+            logger.warning(f"Markdown 日志写入失败: {e}")
+            return
+        self._write_markdown(md)
+
+    def _write_markdown(self, md: str) -> None:
+        """原子写入压缩 Markdown 日志。 / Atomically write the compact markdown log."""
+        try:
             tmp = self.compact_log_path.with_suffix(".md.tmp")
             tmp.write_text(md, encoding="utf-8")
             os.chmod(tmp, 0o600)
@@ -540,16 +907,7 @@ class SimulationRecorder:
 
         if has_ensemble:
             for run_entry in ensemble_runs:
-                idx = run_entry.get("run_index", "?")
-                rid = run_entry.get("run_id", "")
-                seed_val = run_entry.get("random_seed", "")
-                st = (run_entry.get("meta") or {}).get("status", "")
-                L.append(f"## RUN {idx} {rid} seed={seed_val} {st}")
-                self._md_process(run_entry.get("process") or {}, L)
-                res = run_entry.get("result")
-                if res:
-                    self._md_synthesis(res, L)
-                L.append("")
+                L.extend(self._md_run(run_entry))
 
             # Ensemble stats
             es = self._data.get("ensemble_stats")
@@ -591,6 +949,30 @@ class SimulationRecorder:
         # Safety: ensure all items are strings (LLM output may inject dicts)
         return "\n".join(str(x) for x in L)
 
+    def _md_run(self, run_entry: Dict[str, Any]) -> List[str]:
+        """构建单个 ensemble run 段落；已结束的 run 取自缓存。
+        / Build one ensemble run section; ended runs come from the cache."""
+        cached = self._md_run_cache.get(id(run_entry))
+        if cached is not None:
+            return cached
+        L: List[str] = []
+        idx = run_entry.get("run_index", "?")
+        rid = run_entry.get("run_id", "")
+        seed_val = run_entry.get("random_seed", "")
+        st = (run_entry.get("meta") or {}).get("status", "")
+        L.append(f"## RUN {idx} {rid} seed={seed_val} {st}")
+        self._md_process(run_entry.get("process") or {}, L)
+        res = run_entry.get("result")
+        if res:
+            self._md_synthesis(res, L)
+        L.append("")
+        # run 结束后条目不再变化 / A run entry no longer changes once ended
+        if st not in ("", "running"):
+            self._md_run_cache[id(run_entry)] = L
+            for w in (run_entry.get("process") or {}).get("waves") or []:
+                self._md_wave_cache.pop(id(w), None)
+        return L
+
     def _md_process(self, process: Dict[str, Any], L: list) -> None:
         """构建 INIT/SEED/WAVES/OBSERVE/DELIBERATION 段落。"""
         init = process.get("init")
@@ -639,44 +1021,7 @@ class SimulationRecorder:
         if waves:
             L.append(f"### WAVES ({len(waves)})")
             for w in waves:
-                wn = w.get("wave_number", "?")
-                terminated = w.get("terminated", False)
-                verdict = w.get("verdict") or {}
-
-                time_el = verdict.get("simulated_time_elapsed", "")
-                hdr = f"W{wn}"
-                if time_el:
-                    hdr += f" T={time_el}"
-                if terminated:
-                    reason = verdict.get("termination_reason") or ""
-                    hdr += " STOP"
-                    if reason:
-                        hdr += f": {reason}"
-                L.append(hdr)
-
-                obs = verdict.get("global_observation", "")
-                if obs:
-                    L.append(f"  obs: {obs}")
-
-                for a in verdict.get("activated_agents") or []:
-                    aid = a.get("agent_id", "?")
-                    energy = a.get("incoming_ripple_energy", 0)
-                    reason = a.get("activation_reason", "")
-                    L.append(f"  +{aid} E={energy} {reason}")
-
-                for s in verdict.get("skipped_agents") or []:
-                    sid = s.get("agent_id", "?")
-                    reason = s.get("skip_reason", "")
-                    L.append(f"  -{sid} {reason}")
-
-                for aid, r in (w.get("agent_responses") or {}).items():
-                    rtype = r.get("response_type", "?")
-                    out_e = r.get("outgoing_energy", 0)
-                    comment = (r.get("comment") or "")[:80]
-                    line = f"  >{aid} {rtype} E={out_e}"
-                    if comment:
-                        line += f" {comment}"
-                    L.append(line)
+                L.extend(self._md_wave(w))
 
             L.append("")
 
@@ -695,6 +1040,56 @@ class SimulationRecorder:
             self._md_deliberation(delib, L)
             L.append("")
 
+    def _md_wave(self, w: Dict[str, Any]) -> List[str]:
+        """构建单个 wave 的行；已结束的 wave 取自缓存。
+        / Build the lines of one wave; ended waves come from the cache."""
+        cached = self._md_wave_cache.get(id(w))
+        if cached is not None:
+            return cached
+        L: List[str] = []
+        wn = w.get("wave_number", "?")
+        terminated = w.get("terminated", False)
+        verdict = w.get("verdict") or {}
+
+        time_el = verdict.get("simulated_time_elapsed", "")
+        hdr = f"W{wn}"
+        if time_el:
+            hdr += f" T={time_el}"
+        if terminated:
+            reason = verdict.get("termination_reason") or ""
+            hdr += " STOP"
+            if reason:
+                hdr += f": {reason}"
+        L.append(hdr)
+
+        obs = verdict.get("global_observation", "")
+        if obs:
+            L.append(f"  obs: {obs}")
+
+        for a in verdict.get("activated_agents") or []:
+            aid = a.get("agent_id", "?")
+            energy = a.get("incoming_ripple_energy", 0)
+            reason = a.get("activation_reason", "")
+            L.append(f"  +{aid} E={energy} {reason}")
+
+        for s in verdict.get("skipped_agents") or []:
+            sid = s.get("agent_id", "?")
+            reason = s.get("skip_reason", "")
+            L.append(f"  -{sid} {reason}")
+
+        for aid, r in (w.get("agent_responses") or {}).items():
+            rtype = r.get("response_type", "?")
+            out_e = r.get("outgoing_energy", 0)
+            comment = (r.get("comment") or "")[:80]
+            line = f"  >{aid} {rtype} E={out_e}"
+            if comment:
+                line += f" {comment}"
+            L.append(line)
+
+        if w.get("timestamp_end") is not None:
+            self._md_wave_cache[id(w)] = L
+        return L
+
     def _md_deliberation(self, delib: Any, L: list) -> None:
         """构建合议庭审议段落。"""
         if not isinstance(delib, dict):
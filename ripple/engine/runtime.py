@@ -11,7 +11,6 @@
 
 import asyncio
 import inspect
-import json
 import logging
 import math
 import re
@@ -26,9 +25,12 @@ from ripple.primitives.models import (
 from ripple.agents.omniscient import OmniscientAgent
 from ripple.agents.star import StarAgent
 from ripple.agents.sea import SeaAgent
+from ripple.utils.fast_json import dumps_compact
+from ripple.utils.time_utils import parse_hours as _parse_hours
 
 if TYPE_CHECKING:
     from ripple.engine.recorder import SimulationRecorder
+    from ripple.llm.cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -76,25 +78,6 @@ def _extract_int(value: Any, default: int = 0) -> int:
     return default
 
 
-def _parse_hours(s: str) -> float:
-    """解析时间字符串为小时数。 / Parse a time string like "4h", "48h", "2.5h", "1d" into hours.
-
-    无法解析时返回 0.0。 / Returns 0.0 if the string cannot be parsed.
-    """
-    if not s or not isinstance(s, str):
-        return 0.0
-    s = s.strip().lower()
-    # 匹配 "4h", "2.5h", "48h" 格式 / Match patterns like "4h", "2.5h", "48h"
-    m = re.match(r"^(\d+(?:\.\d+)?)\s*h$", s)
-    if m:
-        return float(m.group(1))
-    # 匹配 "1d", "2d" 格式 / Match patterns like "1d", "2d"
-    m = re.match(r"^(\d+(?:\.\d+)?)\s*d$", s)
-    if m:
-        return float(m.group(1)) * 24.0
-    return 0.0
-
-
 def _empty_agent_stats() -> Dict[str, Any]:
     """返回未被激活 Agent 的默认状态。 / Return default stats for an unactivated agent."""
     return {
@@ -139,6 +122,9 @@ class SimulationRuntime:
         skill_prompts: Optional[Dict[str, str]] = None,
         # v2 Phase registration: Skills can register extra phases
         extra_phases: Optional[dict] = None,
+        # 可选响应缓存，注入星 Agent（集成重放时跳过已完成调用）
+        # / Optional response cache for Star agents (skips completed calls on ensemble replay)
+        response_cache: Optional["ResponseCache"] = None,
     ):
         # v4: Build Omniscient system_prompt with skill context injection
         from ripple.prompts import SKILL_CONTEXT_SEPARATOR, SKILL_CONTEXT_END
@@ -168,6 +154,7 @@ class SimulationRuntime:
         self._skill_profile = skill_profile
         self._on_progress = on_progress
         self._recorder = recorder
+        self._response_cache = response_cache
         self._stars: Dict[str, StarAgent] = {}
         self._seas: Dict[str, SeaAgent] = {}
         self._wave_records: List[WaveRecord] = []
@@ -452,6 +439,7 @@ class SimulationRuntime:
         self._create_agents(init_result)
         # 存储拓扑以供快照使用 / Store topology for snapshot use
         self._topology = init_result.get("topology")
+        self._last_verdict_failed = False
 
         dp = init_result.get("dynamic_parameters", {})
         wave_time_window = dp.get("wave_time_window", "")
@@ -643,6 +631,14 @@ class SimulationRuntime:
             ))
 
             if not verdict.continue_propagation:
+                # 仅首个裁决即失败（没有任何 wave 完成）时才让 OBSERVE/SYNTHESIZE
+                # 跳过 LLM；之后的失败仍对已收集的 wave 做观测与合成
+                # / Only a failure on the first verdict (no wave completed) lets
+                #   OBSERVE/SYNTHESIZE skip the LLM; later failures still observe
+                #   and synthesize the waves already collected
+                self._last_verdict_failed = (
+                    verdict.failed_verdict and wave_count == 0
+                )
                 logger.info(
                     f"[{run_id}] 传播终止于 wave {wave_count}: "
                     f"{verdict.termination_reason or '全视者判定终止'}"
@@ -849,7 +845,7 @@ class SimulationRuntime:
             }
             observe_history += (
                 "\n\n===== DELIBERATE SUMMARY (DATA) =====\n\n"
-                + json.dumps(payload, ensure_ascii=False, indent=2, default=str)
+                + dumps_compact(payload)
                 + "\n\n===== END DELIBERATE SUMMARY =====\n"
             )
 
@@ -891,11 +887,26 @@ class SimulationRuntime:
             progress=self._progress("SYNTHESIZE", 0.0),
             total_waves=estimated_waves,
         ))
-        result = await self._omniscient.synthesize_result(
-            field_snapshot=self._build_snapshot(),
-            observation=observation,
-            simulation_input=simulation_input,
-        )
+        # 合成是最后一步：失败时（预算耗尽、熔断、传输错误）记录错误并保留本次
+        # 运行已产生的数据，不让整个 run 作废
+        # / Synthesis is the last step: on failure (budget exhausted, breaker
+        #   open, transport error) record the error and keep the data this run
+        #   already produced instead of discarding the whole run
+        try:
+            result = await self._omniscient.synthesize_result(
+                field_snapshot=self._build_snapshot(),
+                observation=observation,
+                simulation_input=simulation_input,
+            )
+        except Exception as exc:
+            logger.error(f"[{run_id}] 结果合成失败，保留运行数据: {exc}")
+            result = {
+                "prediction": {"degraded": True, "error": str(exc)},
+                "timeline": [],
+                "bifurcation_points": [],
+                "agent_insights": {},
+                "synthesis_error": str(exc),
+            }
 
         result["observation"] = observation
         result["total_waves"] = effective_waves
@@ -958,6 +969,7 @@ class SimulationRuntime:
                 description=sc.get("description", ""),
                 llm_caller=self._star_caller,
                 system_prompt_template=star_skill,
+                response_cache=self._response_cache,
             )
         for sc in init_result.get("sea_configs", []):
             self._seas[sc["id"]] = SeaAgent(
@@ -982,7 +994,9 @@ class SimulationRuntime:
                 f"本轮未激活任何 Agent（已注册: {list(known_ids)}）"
             )
 
-        tasks = {}
+        star_ripples = {}
+        sea_ripples: Dict[str, Dict[str, Any]] = {}
+        order: Dict[str, None] = {}
         for activation in verdict.activated_agents:
             aid = activation.agent_id
             agent = self._stars.get(aid) or self._seas.get(aid)
@@ -996,24 +1010,45 @@ class SimulationRuntime:
                 f"激活 {'Sea' if is_sea else 'Star'} Agent: {aid}, "
                 f"能量={activation.incoming_ripple_energy:.2f}"
             )
-            tasks[aid] = agent.respond(
-                ripple_content=ripple_content or self._seed_content,
-                ripple_energy=activation.incoming_ripple_energy,
-                ripple_source="omniscient_verdict",
-            )
+            ripple = {
+                "ripple_content": ripple_content or self._seed_content,
+                "ripple_energy": activation.incoming_ripple_energy,
+                "ripple_source": "omniscient_verdict",
+            }
+            order[aid] = None
+            if aid in self._stars:
+                star_ripples[aid] = ripple
+            else:
+                sea_ripples[aid] = ripple
+
+        if not order:
+            return {}
+
+        # Star 逐个并发；Sea 走有界并发批量接口 / Stars gathered directly; Seas via the bounded batch API
+        star_done, sea_done = await asyncio.gather(
+            asyncio.gather(
+                *(self._stars[aid].respond(**r) for aid, r in star_ripples.items()),
+                return_exceptions=True,
+            ),
+            # 异常原样返回，与 Star 一样记为 error / Exceptions come back as-is and are recorded as error, like Stars
+            SeaAgent.respond_batch(
+                [self._seas[aid] for aid in sea_ripples],
+                list(sea_ripples.values()),
+                return_exceptions=True,
+            ),
+        )
 
+        collected: Dict[str, Any] = dict(zip(star_ripples.keys(), star_done))
+        collected.update(zip(sea_ripples.keys(), sea_done))
         results = {}
-        if tasks:
-            done = await asyncio.gather(
-                *tasks.values(), return_exceptions=True,
-            )
-            for aid, result in zip(tasks.keys(), done):
-                if isinstance(result, Exception):
-                    logger.error(f"Agent {aid} 响应失败: {result}")
-                    results[aid] = {"response_type": "error",
-                                    "outgoing_energy": 0.0}
-                else:
-                    results[aid] = result
+        for aid in order:
+            result = collected[aid]
+            if isinstance(result, Exception):
+                logger.error("Agent %s 响应失败: %s", aid, result)
+                results[aid] = {"response_type": "error",
+                                "outgoing_energy": 0.0}
+            else:
+                results[aid] = result
 
         return results
 
@@ -1027,7 +1062,7 @@ class SimulationRuntime:
             "stars": {
                 sid: {
                     "description": s.description,
-                    "memory_count": len(s.memory),
+                    "memory_count": s.memory_count,
                     **agent_stats.get(sid, _empty_agent_stats()),
                 }
                 for sid, s in self._stars.items()
@@ -1052,6 +1087,8 @@ class SimulationRuntime:
             snapshot["simulation_horizon"] = self._simulation_horizon
         if hasattr(self, "_energy_decay_per_wave"):
             snapshot["energy_decay_per_wave"] = self._energy_decay_per_wave
+        if getattr(self, "_last_verdict_failed", False):
+            snapshot["last_verdict_failed"] = True
 
         # PMF v3+: compressed evidence pack (used by deliberation + synthesis)
         if getattr(self, "_evidence_pack", None) is not None:
@@ -2,11 +2,15 @@
 # 模型路由、调用次数控制、LLM 配置管理与适配器 / Model routing, call budget, LLM config & adapters
 
 from ripple.llm.anthropic_adapter import AnthropicAdapter
+from ripple.llm.cache import NullCache, ResponseCache
 from ripple.llm.chat_completions_adapter import ChatCompletionsAdapter
+from ripple.llm.circuit_breaker import CircuitBreaker, CircuitOpenError
 from ripple.llm.config import (
     LLMConfigLoader,
     ModelEndpointConfig,
 )
+from ripple.llm.http_pool import PooledHTTPClient
+from ripple.llm.rate_limit import CallLimiter, TokenBucket
 from ripple.llm.responses_adapter import ResponsesAPIAdapter
 from ripple.llm.router import (
     BudgetState,
@@ -19,10 +23,17 @@ from ripple.llm.router import (
 __all__ = [
     "AnthropicAdapter",
     "BudgetState",
+    "CallLimiter",
     "ChatCompletionsAdapter",
+    "CircuitBreaker",
+    "CircuitOpenError",
     "ConfigurationError",
     "LLMConfigLoader",
     "ModelEndpointConfig",
     "ModelRouter",
+    "NullCache",
+    "PooledHTTPClient",
+    "ResponseCache",
     "ResponsesAPIAdapter",
+    "TokenBucket",
 ]
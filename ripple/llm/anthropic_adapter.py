@@ -19,10 +19,12 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 import httpx
 
+from ripple.llm.http_pool import PooledHTTPClient
+
 logger = logging.getLogger(__name__)
 
 # Anthropic API 默认端点 / Default Anthropic API endpoint
@@ -52,6 +54,8 @@ class AnthropicAdapter:
         timeout: float = 120.0,
         max_retries: int = 3,
         stream: bool = True,
+        cache_system_prompt: bool = False,
+        http_pool: Optional[PooledHTTPClient] = None,
     ):
         """初始化适配器。 / Initialize adapter.
 
@@ -64,6 +68,11 @@ class AnthropicAdapter:
             timeout: 请求超时时间（秒）。 / Request timeout in seconds.
             max_retries: 最大重试次数。 / Max retry count.
             stream: 是否使用流式调用（SSE），默认 True。 / Whether to use streaming (SSE), default True.
+            cache_system_prompt: 是否为 system 提示词标记 cache_control（ephemeral），
+                默认 False（显式启用）。 / Whether to mark the system prompt with an
+                ephemeral cache_control breakpoint, default False (opt-in).
+            http_pool: 共享的连接池（可选）；传入时由调用方负责关闭。
+                / Shared connection pool (optional); when given, the caller closes it.
         """
         self._endpoint = self._resolve_endpoint(url)
         self._api_key = api_key
@@ -73,6 +82,10 @@ class AnthropicAdapter:
         self._timeout = timeout
         self._max_retries = max_retries
         self._stream = stream
+        self._cache_system_prompt = cache_system_prompt
+        # 外部传入的连接池由调用方负责关闭 / An injected pool is closed by its owner
+        self._owns_http = http_pool is None
+        self._http = http_pool if http_pool is not None else PooledHTTPClient()
 
     async def call(
         self,
@@ -99,11 +112,7 @@ class AnthropicAdapter:
         if self._stream:
             request_body["stream"] = True
 
-        headers: Dict[str, str] = {
-            "Content-Type": "application/json",
-            "x-api-key": self._api_key,
-            "anthropic-version": _ANTHROPIC_VERSION,
-        }
+        headers = self._build_headers()
 
         last_error: Optional[Exception] = None
         last_error_detail: Optional[str] = None
@@ -147,25 +156,73 @@ class AnthropicAdapter:
         raise RuntimeError(
             f"Anthropic Messages API 调用在 {self._max_retries + 1} 次尝试后仍失败: "
             f"{last_error_detail or last_error}"
-        )
+        ) from last_error
+
+    async def aclose(self) -> None:
+        """关闭自有的持久 HTTP 连接。 / Close persistent HTTP connections this adapter owns."""
+        if self._owns_http:
+            await self._http.aclose()
 
     async def _call_non_stream(
         self, headers: Dict[str, str], request_body: Dict[str, Any]
     ) -> str:
         """非流式调用。 / Non-streaming call."""
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(
-                self._endpoint, headers=headers, json=request_body,
-            )
-            response.raise_for_status()
-            result = response.json()
-            return self._extract_text(result)
+        client = self._http.get("default", self._timeout)
+        response = await client.post(
+            self._endpoint, headers=headers, json=request_body,
+        )
+        response.raise_for_status()
+        result = response.json()
+        return self._extract_text(result)
+
+    async def astream(
+        self,
+        system_prompt: str,
+        user_message: str,
+    ) -> AsyncIterator[str]:
+        """流式调用并逐块产出文本，不做重试（由调用方决定）。
+        / Stream the call and yield text chunks; no retries (left to the caller).
+
+        调用方可在收到足够内容后提前结束迭代，连接随之释放。配置关闭流式
+        （stream=False）时改为一次完整调用（含重试），整段产出。
+        / Callers may stop iterating early once they have enough; the
+        connection is released. With streaming disabled in config
+        (stream=False) this makes one complete call (with retries) and
+        yields the whole text.
+        """
+        if not self._stream:
+            yield await self.call(system_prompt, user_message)
+            return
+        request_body = self._build_request(system_prompt, user_message)
+        request_body["stream"] = True
+        async for chunk in self._iter_stream(self._build_headers(), request_body):
+            yield chunk
+
+    def _build_headers(self) -> Dict[str, str]:
+        """构建请求头。 / Build request headers."""
+        headers: Dict[str, str] = {
+            "Content-Type": "application/json",
+            "x-api-key": self._api_key,
+            "anthropic-version": _ANTHROPIC_VERSION,
+        }
+        return headers
 
     async def _call_stream(
         self, headers: Dict[str, str], request_body: Dict[str, Any]
     ) -> str:
         """流式调用（SSE）：逐 chunk 接收，拼接后返回完整文本。
         / Streaming call (SSE): receive chunks incrementally, return full text.
+        """
+        text = "".join([chunk async for chunk in self._iter_stream(headers, request_body)])
+        if not text:
+            logger.warning("Anthropic Messages API 流式响应未收到任何文本内容")
+        return text
+
+    async def _iter_stream(
+        self, headers: Dict[str, str], request_body: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """流式调用（SSE）：逐 chunk 产出增量文本。
+        / Streaming call (SSE): yield incremental text chunks.
 
         Anthropic SSE 事件类型 / SSE event types:
           event: content_block_delta  →  data: {"delta":{"type":"text_delta","text":"..."}}
@@ -174,42 +231,36 @@ class AnthropicAdapter:
         stream_timeout = httpx.Timeout(
             connect=30.0, read=self._timeout, write=30.0, pool=30.0,
         )
-        chunks: List[str] = []
-        async with httpx.AsyncClient(timeout=stream_timeout) as client:
-            async with client.stream(
-                "POST", self._endpoint, headers=headers, json=request_body,
-            ) as response:
-                if response.is_error:
-                    try:
-                        await response.aread()
-                    except httpx.HTTPError:
-                        pass
-                response.raise_for_status()
-                event_type = ""
-                async for line in response.aiter_lines():
-                    if line.startswith("event:"):
-                        event_type = line[len("event:"):].strip()
-                        continue
-                    if not line.startswith("data:"):
-                        continue
-                    if event_type == "message_stop":
-                        break
-                    payload = line[len("data:"):].strip()
-                    try:
-                        data = json.loads(payload)
-                    except json.JSONDecodeError:
-                        continue
-                    if event_type == "content_block_delta":
-                        delta = data.get("delta", {})
-                        if delta.get("type") == "text_delta":
-                            text = delta.get("text", "")
-                            if text:
-                                chunks.append(text)
-
-        text = "".join(chunks)
-        if not text:
-            logger.warning("Anthropic Messages API 流式响应未收到任何文本内容")
-        return text
+        client = self._http.get("stream", stream_timeout)
+        async with client.stream(
+            "POST", self._endpoint, headers=headers, json=request_body,
+        ) as response:
+            if response.is_error:
+                try:
+                    await response.aread()
+                except httpx.HTTPError:
+                    pass
+            response.raise_for_status()
+            event_type = ""
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event_type = line[len("event:"):].strip()
+                    continue
+                if not line.startswith("data:"):
+                    continue
+                if event_type == "message_stop":
+                    break
+                payload = line[len("data:"):].strip()
+                try:
+                    data = json.loads(payload)
+                except json.JSONDecodeError:
+                    continue
+                if event_type == "content_block_delta":
+                    delta = data.get("delta", {})
+                    if delta.get("type") == "text_delta":
+                        text = delta.get("text", "")
+                        if text:
+                            yield text
 
     @staticmethod
     def _response_error_text(response: httpx.Response) -> str:
@@ -268,7 +319,17 @@ class AnthropicAdapter:
         }
 
         if system_prompt:
-            body["system"] = system_prompt
+            if self._cache_system_prompt:
+                # Agent 的 system 提示词跨轮次保持不变，标记缓存断点以复用前缀
+                # / Agent system prompts are stable across turns; mark a cache
+                #   breakpoint so the prefix is reused
+                body["system"] = [{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }]
+            else:
+                body["system"] = system_prompt
         if self._temperature is not None:
             body["temperature"] = self._temperature
 
@@ -297,11 +358,17 @@ class AnthropicAdapter:
         return ""
 
     @classmethod
-    def from_endpoint_config(cls, config) -> AnthropicAdapter:
+    def from_endpoint_config(
+        cls, config, http_pool: Optional[PooledHTTPClient] = None,
+    ) -> AnthropicAdapter:
         """从 ModelEndpointConfig 创建适配器实例。 / Create adapter from ModelEndpointConfig.
 
         Args:
             config: ModelEndpointConfig 实例。 / ModelEndpointConfig instance.
+                config.extra 可包含 / config.extra may contain:
+                - cache_system_prompt: 为 system 提示词标记缓存断点 / Mark a cache
+                  breakpoint on the system prompt
+            http_pool: 共享的连接池（可选）。 / Shared connection pool (optional).
 
         Returns:
             AnthropicAdapter 实例。 / AnthropicAdapter instance.
@@ -317,6 +384,8 @@ class AnthropicAdapter:
                 f"ANTHROPIC_API_KEY 提供。"
             )
 
+        extra = getattr(config, "extra", None) or {}
+
         return cls(
             api_key=config.api_key,
             model=config.model_name,
@@ -326,4 +395,6 @@ class AnthropicAdapter:
             timeout=config.timeout or 120.0,
             max_retries=config.max_retries,
             stream=config.stream,
+            cache_system_prompt=bool(extra.get("cache_system_prompt", False)),
+            http_pool=http_pool,
         )
@@ -0,0 +1,82 @@
+# backoff.py
+# =============================================================================
+# Agent 层重试退避 / Agent-level retry backoff
+#
+# 职责 / Responsibilities:
+#   - 区分瞬时错误（限流 429、5xx、网络/超时）与输出解析错误
+#     / Tell transient errors (429 rate limits, 5xx, network/timeouts) apart
+#       from output parsing errors
+#   - 瞬时错误按指数退避加抖动等待后重试，使重试落在限流窗口之外；
+#     解析错误说明响应已返回，立即重试
+#     / Transient errors wait with exponential backoff plus jitter so retries
+#       land outside the throttling window; parsing errors mean the response
+#       already came back, so they retry immediately
+#   - 沿 __cause__ 链分类：适配器重试耗尽后抛出的 RuntimeError 以 httpx 错误为因
+#     / Classify along the __cause__ chain: the RuntimeError adapters raise
+#       after exhausting their retries is caused by the httpx error
+# =============================================================================
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import Iterator, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_CAP_SECONDS = 8.0
+
+# 值得退避的 HTTP 状态码 / HTTP statuses worth backing off on
+_TRANSIENT_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+
+
+def _error_chain(exc: Optional[BaseException]) -> Iterator[BaseException]:
+    """依次产出异常及其 __cause__ 链（防环）。 / Yield an exception and its __cause__ chain (cycle-safe)."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__
+
+
+def http_status_of(exc: BaseException) -> Optional[int]:
+    """异常链中第一个 HTTP 错误响应的状态码；上游未应答时为 None。
+    / Status code of the first HTTP error response in the chain; None when the provider never answered."""
+    for err in _error_chain(exc):
+        if isinstance(err, httpx.HTTPStatusError):
+            return err.response.status_code
+    return None
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """是否为限流/服务端/网络类瞬时错误（含以其为因的包装异常）。
+    / Whether the error is a transient rate-limit, server or network failure
+    (including wrappers caused by one)."""
+    for err in _error_chain(exc):
+        if isinstance(err, httpx.HTTPStatusError):
+            return err.response.status_code in _TRANSIENT_STATUS
+        if isinstance(err, (httpx.TransportError, asyncio.TimeoutError)):
+            return True
+    return False
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = BACKOFF_BASE_SECONDS,
+    cap: float = BACKOFF_CAP_SECONDS,
+) -> float:
+    """第 attempt 次失败后的等待秒数（含 0.5x-1.5x 抖动）。 / Seconds to wait after failure `attempt` (0.5x-1.5x jitter)."""
+    return min(cap, base * (2 ** attempt)) * (0.5 + random.random())
+
+
+async def backoff_before_retry(exc: BaseException, attempt: int) -> None:
+    """瞬时错误时按退避等待；其他错误立即返回。 / Sleep with backoff for transient errors; return at once otherwise."""
+    if not is_transient_error(exc):
+        return
+    delay = backoff_delay(attempt)
+    logger.debug("瞬时错误，%.2fs 后重试 / Transient error, retrying in %.2fs", delay, delay)
+    await asyncio.sleep(delay)
@@ -134,7 +134,7 @@ class BedrockAdapter:
         raise RuntimeError(
             f"Bedrock InvokeModel 调用在 {self._max_retries + 1} 次尝试后仍失败: "
             f"{last_error}"
-        )
+        ) from last_error
 
     async def _call_non_stream(self, body_json: str) -> str:
         """非流式调用。 / Non-streaming call via invoke_model."""
@@ -0,0 +1,244 @@
+# cache.py
+# =============================================================================
+# LLM 响应缓存 / LLM response caching
+#
+# 职责 / Responsibilities:
+#   - ResponseCache：按 SHA-256 键持久化到追加写 JSONL 的响应缓存，供 Agent
+#     注入使用；集成重放与崩溃恢复时跳过已完成的调用
+#     / ResponseCache: a response cache keyed by SHA-256 and persisted to an
+#       append-only JSONL file, injected into agents so ensemble replays and
+#       crash recovery skip completed calls
+#   - 可选语义命中：注入 embed_fn 后，lookup 可按调用方给定的阈值复用同一
+#     system_prompt 下、数值字段完全相同的相似 user_prompt 的响应（向量仅驻留内存）
+#     / Optional semantic hits: with an embed_fn, lookup can reuse the
+#       response of a similar user prompt under the same system_prompt and
+#       with identical numeric fields, at a caller-chosen threshold (vectors
+#       stay in memory)
+#
+# 缓存为显式启用：集成模拟依赖 LLM 输出的随机性，默认不应复用响应。
+# system_prompt 按阶段区分（INIT/RIPPLE/OBSERVE/SYNTHESIZE），因此各阶段互不串用。
+# / Caching is opt-in: ensemble runs rely on output variance, so responses
+#   are not reused by default. System prompts differ per phase (INIT/RIPPLE/
+#   OBSERVE/SYNTHESIZE), so phases never share entries.
+# =============================================================================
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import re
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, IO, List, Optional, Sequence, Tuple, Union
+
+from ripple.utils.fast_json import dumps_compact, loads
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[str], Awaitable[Sequence[float]]]
+
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _semantic_bucket(system_prompt: str, user_prompt: str) -> str:
+    """语义索引分桶：system_prompt 与 user_prompt 中全部数值共同决定。
+    / Semantic index bucket, keyed by the system_prompt plus every number in
+    the user_prompt.
+
+    评分等数值字段只差一位时向量依然高度相似，因此数值必须精确一致才比较相似度。
+    / Prompts differing only in a score still embed almost identically, so
+    numbers must match exactly before similarity is compared.
+    """
+    numbers = ",".join(_NUMBER_RE.findall(user_prompt))
+    return _digest(f"{system_prompt}\x00{numbers}")
+
+
+def _normalize(vector: Sequence[float]) -> Optional[List[float]]:
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0.0:
+        return None
+    return [v / norm for v in vector]
+
+
+def response_cache_key(system_prompt: str, user_prompt: str, model_id: str = "") -> str:
+    """计算响应缓存键。 / Compute a response cache key."""
+    payload = f"{system_prompt}\x00{user_prompt}\x00{model_id}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class NullCache:
+    """不缓存任何内容的响应缓存（默认）。 / Response cache that stores nothing (the default)."""
+
+    model_id = ""
+
+    def key(self, system_prompt: str, user_prompt: str) -> str:
+        return ""
+
+    async def get(self, key: str) -> Optional[str]:
+        return None
+
+    async def put(self, key: str, value: str) -> None:
+        return None
+
+    async def lookup(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        *,
+        similarity_threshold: Optional[float] = None,
+    ) -> Optional[str]:
+        return None
+
+    async def store(self, system_prompt: str, user_prompt: str, response: str) -> None:
+        return None
+
+
+class ResponseCache:
+    """内存字典 + 追加写 JSONL 的响应缓存。 / Response cache backed by a dict and an append-only JSONL file.
+
+    键由 `key(system_prompt, user_prompt)` 计算，包含构造时的 model_id，
+    因此每个模型使用各自的缓存实例或 model_id。path 为 None 时仅驻留内存。
+    调用方只应在响应解析成功后 `put`，避免把无效输出固化进缓存。
+    / Keys come from `key(system_prompt, user_prompt)` and include the
+    model_id given at construction, so each model uses its own instance or
+    model_id. With path=None the cache is memory-only. Callers should only
+    `put` responses that parsed successfully so invalid output is never
+    pinned in the cache.
+
+    `lookup` / `store` 在键之上按提示词工作：提供 embed_fn 且调用方传入
+    similarity_threshold 时，精确未命中的请求再与同一 system_prompt 下、
+    数值字段完全相同的已存 user_prompt 比较余弦相似度。
+    / `lookup` / `store` work on prompts on top of keys: with an embed_fn and
+    a caller-supplied similarity_threshold, exact misses are compared by
+    cosine similarity against stored user prompts under the same
+    system_prompt whose numeric fields match exactly.
+    """
+
+    # 未被 store 消费的查询向量上限 / Cap on lookup vectors not consumed by store
+    _MAX_PENDING_VECTORS = 256
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        *,
+        model_id: str = "",
+        embed_fn: Optional[EmbedFn] = None,
+    ):
+        self.model_id = model_id
+        self._path = Path(path) if path is not None else None
+        self._entries: Dict[str, str] = {}
+        self._file: Optional[IO[str]] = None
+        self._embed_fn = embed_fn
+        # 语义索引：(system, 数值字段) 摘要 → [(归一化向量, 响应)]
+        # / Semantic index: (system, numeric fields) digest → [(unit vector, response)]
+        self._vectors: Dict[str, List[Tuple[List[float], str]]] = {}
+        self._pending_vectors: Dict[str, List[float]] = {}
+        # 末行被截断时，下一次追加先补换行 / After a truncated last line, the next append starts a new line
+        self._needs_newline = False
+        self.hits = 0
+        self.misses = 0
+        self.semantic_hits = 0
+        if self._path is not None and self._path.exists():
+            self._load(self._path)
+
+    def key(self, system_prompt: str, user_prompt: str) -> str:
+        """计算本缓存的键。 / Compute this cache's key."""
+        return response_cache_key(system_prompt, user_prompt, self.model_id)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def put(self, key: str, value: str) -> None:
+        if self._entries.get(key) == value:
+            return
+        self._entries[key] = value
+        if self._path is None:
+            return
+        if self._file is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self._path.open("a", encoding="utf-8")
+        line = dumps_compact({"key": key, "response": value})
+        if self._needs_newline:
+            line = "\n" + line
+            self._needs_newline = False
+        # 逐条 flush，崩溃后已完成的调用仍可恢复 / Flush per entry so completed calls survive a crash
+        self._file.write(line + "\n")
+        self._file.flush()
+
+    async def lookup(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        *,
+        similarity_threshold: Optional[float] = None,
+    ) -> Optional[str]:
+        """按提示词查找响应（精确优先，其次语义）。 / Look up a response by prompts (exact first, then semantic)."""
+        key = self.key(system_prompt, user_prompt)
+        value = await self.get(key)
+        if value is not None or similarity_threshold is None or self._embed_fn is None:
+            return value
+
+        vector = _normalize(await self._embed_fn(user_prompt))
+        if vector is None:
+            return None
+        if len(self._pending_vectors) >= self._MAX_PENDING_VECTORS:
+            self._pending_vectors.clear()
+        self._pending_vectors[key] = vector
+
+        best: Optional[str] = None
+        best_score = similarity_threshold
+        for other, response in self._vectors.get(_semantic_bucket(system_prompt, user_prompt), ()):
+            score = sum(a * b for a, b in zip(vector, other))
+            if score >= best_score:
+                best, best_score = response, score
+        if best is not None:
+            self.semantic_hits += 1
+        return best
+
+    async def store(self, system_prompt: str, user_prompt: str, response: str) -> None:
+        """按提示词写入响应，并在启用语义命中时登记向量。 / Store a response by prompts, indexing its vector when semantic hits are enabled."""
+        key = self.key(system_prompt, user_prompt)
+        if self._entries.get(key) == response:
+            return
+        await self.put(key, response)
+        if self._embed_fn is None:
+            return
+        vector = self._pending_vectors.pop(key, None)
+        if vector is None:
+            vector = _normalize(await self._embed_fn(user_prompt))
+        if vector is not None:
+            bucket = _semantic_bucket(system_prompt, user_prompt)
+            self._vectors.setdefault(bucket, []).append((vector, response))
+
+    def close(self) -> None:
+        """关闭 JSONL 文件句柄。 / Close the JSONL file handle."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self, path: Path) -> None:
+        skipped = 0
+        line = ""
+        with path.open(encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = loads(line)
+                    self._entries[record["key"]] = record["response"]
+                except (ValueError, KeyError, TypeError):
+                    # 崩溃时可能留下半行 / A crash may leave a truncated line
+                    skipped += 1
+            self._needs_newline = bool(line) and not line.endswith("\n")
+        if skipped:
+            logger.warning("响应缓存跳过 %d 条损坏记录: %s", skipped, path)
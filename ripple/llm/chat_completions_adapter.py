@@ -28,11 +28,13 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 import httpx
 
+from ripple.llm.http_pool import PooledHTTPClient
+
 logger = logging.getLogger(__name__)
 
 # Azure 相关域名后缀（用于自动检测认证方式） / Azure domain suffixes for auth detection
@@ -64,6 +66,7 @@ class ChatCompletionsAdapter:
         max_retries: int = 3,
         api_version: Optional[str] = None,
         stream: bool = True,
+        http_pool: Optional[PooledHTTPClient] = None,
     ):
         """初始化适配器。 / Initialize adapter.
 
@@ -80,6 +83,8 @@ class ChatCompletionsAdapter:
             max_retries: 最大重试次数。 / Max retry count.
             api_version: Azure API 版本（可选）。 / Azure API version (optional).
             stream: 是否使用流式调用（SSE），默认 True。 / Whether to use streaming (SSE), default True.
+            http_pool: 共享的连接池（可选）；传入时由调用方负责关闭。
+                / Shared connection pool (optional); when given, the caller closes it.
         """
         self._endpoint = self._resolve_endpoint(url, api_version)
         self._is_azure = self._detect_azure(url)
@@ -90,6 +95,9 @@ class ChatCompletionsAdapter:
         self._timeout = timeout
         self._max_retries = max_retries
         self._stream = stream
+        # 外部传入的连接池由调用方负责关闭 / An injected pool is closed by its owner
+        self._owns_http = http_pool is None
+        self._http = http_pool if http_pool is not None else PooledHTTPClient()
 
         if self._is_azure:
             logger.info(
@@ -124,13 +132,7 @@ class ChatCompletionsAdapter:
         if self._stream:
             request_body["stream"] = True
 
-        headers: Dict[str, str] = {
-            "Content-Type": "application/json",
-        }
-        if self._is_azure:
-            headers["api-key"] = self._api_key
-        else:
-            headers["Authorization"] = f"Bearer {self._api_key}"
+        headers = self._build_headers()
 
         last_error: Optional[Exception] = None
         for attempt in range(self._max_retries + 1):
@@ -169,25 +171,75 @@ class ChatCompletionsAdapter:
         raise RuntimeError(
             f"Chat Completions API 调用在 {self._max_retries + 1} 次尝试后仍失败: "
             f"{last_error}"
-        )
+        ) from last_error
+
+    async def aclose(self) -> None:
+        """关闭自有的持久 HTTP 连接。 / Close persistent HTTP connections this adapter owns."""
+        if self._owns_http:
+            await self._http.aclose()
 
     async def _call_non_stream(
         self, headers: Dict[str, str], request_body: Dict[str, Any]
     ) -> str:
         """非流式调用。 / Non-streaming call."""
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(
-                self._endpoint, headers=headers, json=request_body,
-            )
-            response.raise_for_status()
-            result = response.json()
-            return self._extract_text(result)
+        client = self._http.get("default", self._timeout)
+        response = await client.post(
+            self._endpoint, headers=headers, json=request_body,
+        )
+        response.raise_for_status()
+        result = response.json()
+        return self._extract_text(result)
+
+    async def astream(
+        self,
+        system_prompt: str,
+        user_message: str,
+    ) -> AsyncIterator[str]:
+        """流式调用并逐块产出文本，不做重试（由调用方决定）。
+        / Stream the call and yield text chunks; no retries (left to the caller).
+
+        调用方可在收到足够内容后提前结束迭代，连接随之释放。配置关闭流式
+        （stream=False）时改为一次完整调用（含重试），整段产出。
+        / Callers may stop iterating early once they have enough; the
+        connection is released. With streaming disabled in config
+        (stream=False) this makes one complete call (with retries) and
+        yields the whole text.
+        """
+        if not self._stream:
+            yield await self.call(system_prompt, user_message)
+            return
+        request_body = self._build_request(system_prompt, user_message)
+        request_body["stream"] = True
+        async for chunk in self._iter_stream(self._build_headers(), request_body):
+            yield chunk
+
+    def _build_headers(self) -> Dict[str, str]:
+        """构建请求头。 / Build request headers."""
+        headers: Dict[str, str] = {
+            "Content-Type": "application/json",
+        }
+        if self._is_azure:
+            headers["api-key"] = self._api_key
+        else:
+            headers["Authorization"] = f"Bearer {self._api_key}"
+        return headers
 
     async def _call_stream(
         self, headers: Dict[str, str], request_body: Dict[str, Any]
     ) -> str:
         """流式调用（SSE）：逐 chunk 接收，拼接后返回完整文本。
         / Streaming call (SSE): receive chunks incrementally, return full text.
+        """
+        text = "".join([chunk async for chunk in self._iter_stream(headers, request_body)])
+        if not text:
+            logger.warning("Chat Completions API 流式响应未收到任何文本内容")
+        return text
+
+    async def _iter_stream(
+        self, headers: Dict[str, str], request_body: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """流式调用（SSE）：逐 chunk 产出增量文本。
+        / Streaming call (SSE): yield incremental text chunks.
 
         SSE 格式 / SSE format:
           data: {"choices":[{"delta":{"content":"..."}}]}
@@ -198,33 +250,27 @@ class ChatCompletionsAdapter:
         stream_timeout = httpx.Timeout(
             connect=30.0, read=self._timeout, write=30.0, pool=30.0,
         )
-        chunks: List[str] = []
-        async with httpx.AsyncClient(timeout=stream_timeout) as client:
-            async with client.stream(
-                "POST", self._endpoint, headers=headers, json=request_body,
-            ) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if not line.startswith("data:"):
-                        continue
-                    payload = line[len("data:"):].strip()
-                    if payload == "[DONE]":
-                        break
-                    try:
-                        data = json.loads(payload)
-                    except json.JSONDecodeError:
-                        continue
-                    choices = data.get("choices") or []
-                    if not choices:
-                        continue
-                    delta = choices[0].get("delta", {}).get("content")
-                    if delta:
-                        chunks.append(delta)
-
-        text = "".join(chunks)
-        if not text:
-            logger.warning("Chat Completions API 流式响应未收到任何文本内容")
-        return text
+        client = self._http.get("stream", stream_timeout)
+        async with client.stream(
+            "POST", self._endpoint, headers=headers, json=request_body,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                try:
+                    data = json.loads(payload)
+                except json.JSONDecodeError:
+                    continue
+                choices = data.get("choices") or []
+                if not choices:
+                    continue
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
 
     # =========================================================================
     # URL 与认证检测 / URL & Auth Detection
@@ -312,11 +358,14 @@ class ChatCompletionsAdapter:
         return ""
 
     @classmethod
-    def from_endpoint_config(cls, config) -> ChatCompletionsAdapter:
+    def from_endpoint_config(
+        cls, config, http_pool: Optional[PooledHTTPClient] = None,
+    ) -> ChatCompletionsAdapter:
         """从 ModelEndpointConfig 创建适配器实例。 / Create adapter from ModelEndpointConfig.
 
         Args:
             config: ModelEndpointConfig 实例。 / ModelEndpointConfig instance.
+            http_pool: 共享的连接池（可选）。 / Shared connection pool (optional).
 
         Returns:
             ChatCompletionsAdapter 实例。 / ChatCompletionsAdapter instance.
@@ -346,4 +395,5 @@ class ChatCompletionsAdapter:
             max_retries=config.max_retries,
             api_version=config.api_version,
             stream=config.stream,
+            http_pool=http_pool,
         )
@@ -0,0 +1,135 @@
+# circuit_breaker.py
+# =============================================================================
+# LLM 调用熔断器 / LLM call circuit breaker
+#
+# 职责 / Responsibilities:
+#   - 按角色统计连续的服务端故障（5xx、网络错误、超时）；窗口内达到阈值后
+#     打开熔断，冷却期内的调用立即失败，不再逐个等满超时
+#     / Count consecutive provider outages (5xx, network errors, timeouts) per
+#       role; once the threshold is hit within the window the breaker opens
+#       and calls fail immediately during the cooldown instead of each one
+#       waiting out its timeout
+#   - 冷却结束后放行一个探测调用（半开）：成功则关闭，失败则重新打开
+#     / After the cooldown one probe call is let through (half-open): success
+#       closes the breaker, failure reopens it
+#
+# 429 限流不计入故障（由退避与限流器处理）；上游以其他 HTTP 错误应答说明
+# 可达，视同成功；与上游无关的错误（解析失败等）不改变状态。错误按 __cause__
+# 链分类，适配器的包装异常同样生效。
+# / 429 rate limits do not count as outages (backoff and the limiter handle
+#   them); other HTTP errors the provider answered with show it is reachable
+#   and count as success; errors unrelated to the provider (parse failures
+#   etc.) leave the state unchanged. Errors are classified along the
+#   __cause__ chain, so adapters' wrapper exceptions count too.
+# =============================================================================
+
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from ripple.llm.backoff import http_status_of, is_transient_error
+
+
+class CircuitOpenError(RuntimeError):
+    """熔断器打开期间拒绝调用时抛出。 / Raised when a call is rejected while the breaker is open."""
+
+
+def is_outage_error(exc: BaseException) -> bool:
+    """是否为应计入熔断的上游故障（瞬时错误中排除 429）。
+    / Whether the error counts towards tripping (transient errors except 429)."""
+    if http_status_of(exc) == 429:
+        return False
+    return is_transient_error(exc)
+
+
+class CircuitBreaker:
+    """单个角色的熔断器（closed → open → half_open → closed）。
+    / Circuit breaker for one role (closed → open → half_open → closed).
+
+    Args:
+        failure_threshold: 打开熔断所需的连续故障数（None 表示禁用）。
+            / Consecutive outages that open the breaker (None disables it).
+        window_seconds: 连续故障需落在的时间窗口。 / Window the consecutive outages must fall in.
+        cooldown_seconds: 打开后拒绝调用的时长。 / How long calls are rejected once open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = 5,
+        window_seconds: float = 10.0,
+        cooldown_seconds: float = 30.0,
+    ):
+        if failure_threshold is not None and failure_threshold < 1:
+            raise ValueError(
+                f"failure_threshold 必须 >= 1 / failure_threshold must be >= 1: {failure_threshold}"
+            )
+        if window_seconds <= 0 or cooldown_seconds <= 0:
+            raise ValueError(
+                "window_seconds / cooldown_seconds 必须 > 0 / must be > 0: "
+                f"{window_seconds}, {cooldown_seconds}"
+            )
+        self.failure_threshold = failure_threshold
+        self.window_seconds = float(window_seconds)
+        self.cooldown_seconds = float(cooldown_seconds)
+        self._failures = 0
+        self._first_failure_at = 0.0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """当前状态："closed" / "open" / "half_open"。 / Current state."""
+        if self._opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self._opened_at >= self.cooldown_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """是否放行本次调用；半开时只放行一个探测调用。
+        / Whether to let this call through; half-open lets a single probe through."""
+        if self._opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self._opened_at < self.cooldown_seconds:
+            return False
+        self._probing = True
+        return True
+
+    def release(self) -> None:
+        """放行后未真正发出调用时归还探测名额。 / Return the probe slot when an allowed call was never sent."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """调用成功（或上游已正常应答）：关闭熔断并清零计数。
+        / The call succeeded (or the provider answered): close and reset."""
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self, exc: BaseException) -> None:
+        """记录一次失败；只有上游故障计数。上游以 HTTP 错误应答视同成功，
+        取消、解析失败等与上游无关的错误不改变状态。
+        / Record a failure; only outages count. An HTTP error answer from the
+        provider counts as success; cancellation, parse failures and other
+        errors unrelated to the provider leave the state unchanged."""
+        if not is_outage_error(exc):
+            if http_status_of(exc) is not None:
+                self.record_success()
+            else:
+                self._probing = False
+            return
+        now = time.monotonic()
+        if self._probing:
+            # 探测失败，重新打开 / Probe failed, reopen
+            self._probing = False
+            self._opened_at = now
+            return
+        if self.failure_threshold is None:
+            return
+        if self._failures == 0 or now - self._first_failure_at > self.window_seconds:
+            self._failures = 0
+            self._first_failure_at = now
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._opened_at = now
@@ -27,7 +27,7 @@ import logging
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -280,11 +280,31 @@ class LLMConfigLoader:
             "star": "claude-sonnet-4-20250514",
             "omniscient": "claude-sonnet-4-20250514",
         },
+        # 调用限流（可选）：未单独配置的角色共享 _default 限流；整段缺省时
+        # 由 ModelRouter 为每个角色设默认并发上限
+        # / Call rate limits (optional): roles without their own entry share
+        #   _default; when absent ModelRouter gives each role a default cap
+        "_rate_limits": {
+            "_default": {"max_concurrent": 16, "rpm": 600},
+            "sea": {"max_concurrent": 32},
+        },
+        # 熔断（可选，默认开启）：每个角色独立计数 / Circuit breaker (optional, on by default): counted per role
+        "_circuit_breaker": {
+            "failure_threshold": 5,
+            "window_seconds": 10,
+            "cooldown_seconds": 30,
+        },
+        # 轻量模型（可选）：用户提示词短于 max_prompt_chars 的调用改用更便宜的模型
+        # / Light models (optional): calls whose user prompt is shorter than
+        #   max_prompt_chars use a cheaper model
+        "_light_models": {
+            "sea": {"model_name": "claude-haiku", "max_prompt_chars": 4000},
+        },
     }
     """
 
     # 以下划线开头的键是元配置，不是角色名 / Underscore-prefixed keys are meta-config, not roles
-    _META_KEYS = {"_default", "_degradation"}
+    _META_KEYS = {"_default", "_degradation", "_rate_limits", "_circuit_breaker", "_light_models"}
 
     def __init__(
         self,
@@ -458,6 +478,62 @@ class LLMConfigLoader:
 
         return None
 
+    def get_rate_limits(self, role: str) -> Tuple[str, Dict[str, Any]]:
+        """获取角色的限流作用域与设置。 / Get the rate-limit scope and settings for a role.
+
+        从 _rate_limits 配置中查找，代码配置优先于文件配置；角色没有单独配置时
+        回退到 _rate_limits._default，作用域为 "_default"（多个角色共享）。
+        / Looks up _rate_limits, code config taking priority over file. A role
+        without its own entry falls back to _rate_limits._default under the
+        shared "_default" scope.
+
+        Returns:
+            (作用域, 设置)；未配置时设置为空字典。 / (scope, settings); settings are empty when unset.
+        """
+        for scope in (role, "_default"):
+            for cfg in (self._code_config, self._file_config):
+                limits = cfg.get("_rate_limits", {})
+                if isinstance(limits, dict) and isinstance(limits.get(scope), dict):
+                    return scope, limits[scope]
+        return "_default", {}
+
+    def get_circuit_breaker(self) -> Dict[str, Any]:
+        """获取熔断设置（_circuit_breaker），代码配置优先于文件配置；未配置时为空字典。
+        / Get circuit breaker settings (_circuit_breaker), code config taking
+        priority over file; empty when unset."""
+        for cfg in (self._code_config, self._file_config):
+            settings = cfg.get("_circuit_breaker")
+            if isinstance(settings, dict):
+                return settings
+        return {}
+
+    def get_light_model(self, role: str) -> Optional[Tuple[str, int]]:
+        """获取角色的轻量模型与提示词长度阈值。 / Get a role's light model and prompt-length threshold.
+
+        从 _light_models 配置中查找，代码配置优先于文件配置。条目可写成
+        {"model_name": ..., "max_prompt_chars": N}；缺少模型名或阈值不为正数时视为未配置。
+        / Looks up _light_models, code config taking priority over file. An
+        entry is {"model_name": ..., "max_prompt_chars": N}; a missing model
+        name or a non-positive threshold counts as unset.
+
+        Returns:
+            (模型名, 字符阈值)；未配置时为 None。 / (model name, char threshold); None when unset.
+        """
+        for cfg in (self._code_config, self._file_config):
+            light = cfg.get("_light_models", {})
+            if not isinstance(light, dict) or not isinstance(light.get(role), dict):
+                continue
+            entry = light[role]
+            model_name = entry.get("model_name") or entry.get("model")
+            try:
+                threshold = int(entry.get("max_prompt_chars", 0))
+            except (TypeError, ValueError):
+                threshold = 0
+            if model_name and threshold > 0:
+                return str(model_name), threshold
+            return None
+        return None
+
     def all_configured_roles(self) -> List[str]:
         """返回所有已配置的角色名列表（不含 _ 开头的元配置键）。 / List all configured role names (excluding _ meta keys)."""
         roles = set()
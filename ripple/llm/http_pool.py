@@ -0,0 +1,91 @@
+# http_pool.py
+# =============================================================================
+# 适配器共享的持久 HTTP 客户端 / Persistent HTTP clients shared by adapters
+#
+# 职责 / Responsibilities:
+#   - 为每个适配器保留长连接的 httpx.AsyncClient，热连接跳过 TCP/TLS 握手
+#     / Keep a long-lived httpx.AsyncClient per adapter so warm connections
+#       skip the TCP/TLS handshake
+#   - 按超时配置（非流式 / 流式）分别持有客户端，惰性创建
+#     / Hold one client per timeout profile (non-stream / stream), created lazily
+#   - 客户端按 (配置, 超时) 区分，多个超时不同的适配器可共享同一连接池
+#     / Clients are keyed by (profile, timeout) so adapters with different
+#       timeouts can share one pool
+#   - 事件循环变化时（如多次 asyncio.run）重建客户端，避免跨循环复用连接
+#     / Recreate clients when the running event loop changes (e.g. repeated
+#       asyncio.run) so connections never cross loops
+#
+# 一次模拟中全视者 INIT/RIPPLE/OBSERVE/SYNTHESIZE 与 Star/Sea 扇出调用都经过
+# 同一适配器实例（由 ModelRouter 缓存），因此连接在整个模拟内复用。
+# / Within a simulation the Omniscient INIT/RIPPLE/OBSERVE/SYNTHESIZE calls and
+#   the Star/Sea fan-out all go through the same adapter instance (cached by
+#   ModelRouter), so connections are reused for the whole run. An ensemble can
+#   pass one pool to every run's adapters so connections also outlive a run.
+# =============================================================================
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 连接池上限 / Connection pool limits
+DEFAULT_POOL_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=50,
+    keepalive_expiry=60.0,
+)
+
+
+def _timeout_key(timeout: Any) -> Any:
+    """超时配置的可哈希键（httpx.Timeout 不可哈希）。 / Hashable key for a timeout (httpx.Timeout is unhashable)."""
+    if isinstance(timeout, httpx.Timeout):
+        return (timeout.connect, timeout.read, timeout.write, timeout.pool)
+    return timeout
+
+
+class PooledHTTPClient:
+    """按超时配置缓存的持久 httpx.AsyncClient 集合。
+    / Persistent httpx.AsyncClient instances cached per timeout profile.
+
+    `get(profile, timeout)` 返回绑定当前事件循环的客户端；`aclose()` 关闭全部
+    客户端，之后再次 `get` 会重新创建。
+    / `get(profile, timeout)` returns a client bound to the running event loop;
+    `aclose()` closes all clients and a later `get` recreates them.
+    """
+
+    def __init__(self, limits: Optional[httpx.Limits] = None):
+        self._limits = limits or DEFAULT_POOL_LIMITS
+        self._clients: Dict[Tuple[str, Any], Tuple[Any, asyncio.AbstractEventLoop]] = {}
+
+    def get(self, profile: str, timeout: Any) -> Any:
+        """获取（必要时创建）指定配置与超时的客户端。 / Get (creating if needed) the client for a profile and timeout."""
+        loop = asyncio.get_running_loop()
+        key = (profile, _timeout_key(timeout))
+        entry = self._clients.get(key)
+        if entry is not None:
+            client, client_loop = entry
+            if client_loop is loop and not getattr(client, "is_closed", False):
+                return client
+            # 旧循环已结束，其连接无法在新循环中关闭，直接丢弃
+            # / The old loop is gone; its connections cannot be closed here, drop them
+            logger.debug("重建 HTTP 客户端 / Recreating HTTP client: profile=%s", profile)
+
+        client = httpx.AsyncClient(timeout=timeout, limits=self._limits)
+        self._clients[key] = (client, loop)
+        return client
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环上的全部客户端。 / Close all clients bound to the running loop."""
+        clients, self._clients = self._clients, {}
+        loop = asyncio.get_running_loop()
+        for client, client_loop in clients.values():
+            if client_loop is not loop:
+                continue
+            close = getattr(client, "aclose", None)
+            if close is not None:
+                await close()
@@ -0,0 +1,116 @@
+# rate_limit.py
+# =============================================================================
+# LLM 调用速率限制 / LLM call rate limiting
+#
+# 职责 / Responsibilities:
+#   - 令牌桶：按固定速率补充令牌，调用前取令牌，桶空时等待
+#     / Token bucket: tokens refill at a fixed rate, each call takes one and
+#       waits while the bucket is empty
+#   - 调用限流器：并发槽位（Semaphore）+ 每分钟请求数（令牌桶）
+#     / Call limiter: concurrency slots (Semaphore) + requests per minute (token bucket)
+#   - 纯 asyncio 实现（单调时钟 + 锁），不启动后台任务或线程
+#     / Pure asyncio (monotonic clock + lock); no background task or thread
+#
+# 多个模拟共享同一个桶时（如并发 Ensemble），总请求速率仍受上游限流约束。
+# / When several simulations share one bucket (e.g. a concurrent ensemble),
+#   their combined request rate still honours the provider's limits.
+# =============================================================================
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """异步令牌桶限速器。 / Async token-bucket rate limiter.
+
+    Args:
+        rate: 每秒补充的令牌数（即稳态 QPS）。 / Tokens refilled per second (steady-state QPS).
+        capacity: 桶容量（允许的突发量），默认 1。 / Bucket size (allowed burst), default 1.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"rate 必须 > 0 / rate must be > 0: {rate}")
+        self._rate = float(rate)
+        self._capacity = float(capacity) if capacity is not None else 1.0
+        if self._capacity < 1.0:
+            raise ValueError(f"capacity 必须 >= 1 / capacity must be >= 1: {capacity}")
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        """每秒补充的令牌数。 / Tokens refilled per second."""
+        return self._rate
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate,
+        )
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """取出令牌，不足时等待补充。 / Take tokens, waiting for refill when short.
+
+        锁保证等待者按到达顺序依次取令牌。 / The lock makes waiters take
+        tokens in arrival order.
+        """
+        if tokens > self._capacity:
+            raise ValueError(f"tokens 超过桶容量 / tokens exceed bucket capacity: {tokens} > {self._capacity}")
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+class CallLimiter:
+    """单个限流作用域的调用限流器：并发上限 + 每分钟请求数。
+    / Call limiter for one rate-limit scope: concurrency cap + requests per minute.
+
+    作为异步上下文管理器使用：进入时先占并发槽位再取令牌，退出时释放槽位。
+    两项均未配置时为空操作。
+    / Used as an async context manager: entering takes a concurrency slot and
+    then a token, exiting releases the slot. A no-op when neither is set.
+
+    Args:
+        max_concurrent: 同时进行的调用数上限（None 不限制）。 / Max calls in flight (None = unlimited).
+        rpm: 每分钟请求数上限（None 不限制）。 / Max requests per minute (None = unlimited).
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, rpm: Optional[float] = None):
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError(
+                f"max_concurrent 必须 >= 1 / max_concurrent must be >= 1: {max_concurrent}"
+            )
+        self.max_concurrent = max_concurrent
+        self.rpm = rpm
+        self._semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+        self._bucket = TokenBucket(rpm / 60.0) if rpm else None
+
+    @property
+    def is_unlimited(self) -> bool:
+        """是否未设置任何限制。 / Whether no limit is set."""
+        return self._semaphore is None and self._bucket is None
+
+    async def __aenter__(self) -> "CallLimiter":
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        if self._bucket is not None:
+            try:
+                await self._bucket.acquire()
+            except BaseException:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+                raise
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._semaphore is not None:
+            self._semaphore.release()
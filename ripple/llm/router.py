@@ -24,7 +24,10 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from ripple.llm.circuit_breaker import CircuitBreaker
+from ripple.llm.rate_limit import CallLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +63,8 @@ class BudgetState:
     # [P1-2] 调用尝试计数 — 包含失败请求，用于成本审计 / Attempt count including failures, for cost audit
     total_attempts: int = 0
     attempts_by_role: Dict[str, int] = field(default_factory=dict)
+    # 已准入但尚未完成的调用（并发调用时计入上限检查） / Admitted calls not yet finished (counted against the cap under concurrency)
+    in_flight: int = 0
 
     @property
     def is_unlimited(self) -> bool:
@@ -73,6 +78,13 @@ class BudgetState:
             return False
         return self.total_calls >= self.max_calls
 
+    @property
+    def has_capacity(self) -> bool:
+        """计入进行中调用后是否还能再准入一次。 / Whether one more call fits once in-flight calls are counted."""
+        if self.is_unlimited:
+            return True
+        return self.total_calls + self.in_flight < self.max_calls
+
     @property
     def remaining(self) -> int:
         """剩余可用调用次数。不限制模式下返回 -1。 / Remaining calls. Returns -1 in unlimited mode."""
@@ -133,11 +145,18 @@ class ModelRouter:
     - max_llm_calls <= 0 表示不限制 / <= 0 means unlimited
     - 未配置角色可通过 _ROLE_FALLBACKS 回退到其他角色
       / Unconfigured roles fall back via _ROLE_FALLBACKS
+    - 配置 _light_models 的角色，短提示词调用改用轻量模型
+      / Roles with a _light_models entry use the light model for short prompts
     """
 
     # 角色回退映射：未配置的角色回退到指定角色的配置 / Role fallback mapping
     _ROLE_FALLBACKS: Dict[str, str] = {"tribunal": "omniscient"}
 
+    # 未配置 _rate_limits 时每个角色各自的并发上限，避免并发扇出冲击上游
+    # / Per-role concurrency cap when _rate_limits is not configured, so
+    #   concurrent fan-out does not stampede the provider
+    DEFAULT_MAX_CONCURRENT = 8
+
     def __init__(
         self,
         llm_config: Optional[Dict[str, Any]] = None,
@@ -145,6 +164,8 @@ class ModelRouter:
         config_file: Optional[str] = None,
         stream: Optional[bool] = None,
         timeout_override: Optional[float] = None,
+        http_pool: Optional[Any] = None,
+        rate_limiter: Optional[Any] = None,
     ) -> None:
         """初始化路由器。 / Initialize router.
 
@@ -163,6 +184,10 @@ class ModelRouter:
                 / Force streaming mode (None = use per-role config default).
             timeout_override: 覆盖所有角色的 LLM 超时时间（秒），None 表示使用配置默认值。
                 / Override LLM timeout for all roles (seconds). None = use config default.
+            http_pool: 外部共享的 PooledHTTPClient（可选），由调用方负责关闭。
+                / Externally shared PooledHTTPClient (optional); the caller closes it.
+            rate_limiter: 调用前等待的限速器（可选，需提供 async acquire()）。
+                / Rate limiter awaited before each call (optional, must expose async acquire()).
         """
         from ripple.llm.config import LLMConfigLoader
 
@@ -172,9 +197,23 @@ class ModelRouter:
         self._budget = BudgetState(max_calls=max_llm_calls)
         self._stream_override = stream
         self._timeout_override = timeout_override
+        self._http_pool = http_pool
+        self._rate_limiter = rate_limiter
+        # 日志用上限文本缓存：(max_calls, 文本) / Cached limit label for logs: (max_calls, text)
+        self._limit_label: Optional[Tuple[int, str]] = None
 
         # 适配器缓存：角色 → adapter 实例 / Adapter cache: role → adapter instance
         self._model_cache: Dict[str, Any] = {}
+        # 缓存中有适配器被移除时递增，供调用方判断预绑定的适配器是否仍有效
+        # / Bumped whenever a cached adapter is dropped, so callers can tell
+        #   whether a prebound adapter is still valid
+        self._backend_epoch = 0
+        # 调用限流器：作用域 → CallLimiter；角色 → 所属作用域的限流器
+        # / Call limiters: scope → CallLimiter; role → its scope's limiter
+        self._scope_limiters: Dict[str, CallLimiter] = {}
+        self._role_limiters: Dict[str, CallLimiter] = {}
+        # 熔断器：角色 → CircuitBreaker / Circuit breakers: role → CircuitBreaker
+        self._breakers: Dict[str, CircuitBreaker] = {}
 
         summary = self._config_loader.summary()
         for role, info in summary.items():
@@ -205,6 +244,70 @@ class ModelRouter:
         """配置加载器（供外部检查配置使用）。 / Config loader (for external inspection)."""
         return self._config_loader
 
+    @property
+    def rate_limiter(self) -> Optional[Any]:
+        """调用前等待的限速器（未配置时为 None）。 / Rate limiter awaited before calls (None if unset)."""
+        return self._rate_limiter
+
+    @property
+    def limit_label(self) -> str:
+        """日志用的调用上限文本（不限制时为 "∞"），max_calls 变化时重新生成。
+        / Call-limit text for logs ("∞" when unlimited), rebuilt when max_calls changes."""
+        max_calls = self._budget.max_calls
+        cached = self._limit_label
+        if cached is None or cached[0] != max_calls:
+            cached = (max_calls, "∞" if max_calls <= 0 else str(max_calls))
+            self._limit_label = cached
+        return cached[1]
+
+    def call_limiter(self, role: str) -> CallLimiter:
+        """获取角色的调用限流器（来自 llm_config 的 _rate_limits，按作用域共享）。
+        / Get the call limiter for a role (from llm_config _rate_limits, shared per scope).
+
+        未配置限流时每个角色各用一个 DEFAULT_MAX_CONCURRENT 并发上限的限流器。
+        / Without configured limits each role gets its own limiter capped at
+        DEFAULT_MAX_CONCURRENT calls in flight.
+        """
+        limiter = self._role_limiters.get(role)
+        if limiter is None:
+            scope, settings = self._config_loader.get_rate_limits(role)
+            if not settings:
+                scope, settings = role, {"max_concurrent": self.DEFAULT_MAX_CONCURRENT}
+            limiter = self._scope_limiters.get(scope)
+            if limiter is None:
+                max_concurrent = settings.get("max_concurrent")
+                rpm = settings.get("rpm")
+                limiter = CallLimiter(
+                    max_concurrent=int(max_concurrent) if max_concurrent else None,
+                    rpm=float(rpm) if rpm else None,
+                )
+                self._scope_limiters[scope] = limiter
+                if not limiter.is_unlimited:
+                    logger.info(
+                        "LLM 调用限流: scope=%s, max_concurrent=%s, rpm=%s",
+                        scope, limiter.max_concurrent, limiter.rpm,
+                    )
+            self._role_limiters[role] = limiter
+        return limiter
+
+    def circuit_breaker(self, role: str) -> CircuitBreaker:
+        """获取角色的熔断器（设置来自 llm_config 的 _circuit_breaker）。
+        / Get the circuit breaker for a role (settings from llm_config _circuit_breaker).
+
+        enabled: false 时返回永不打开的熔断器。 / With enabled: false the breaker never opens.
+        """
+        breaker = self._breakers.get(role)
+        if breaker is None:
+            settings = self._config_loader.get_circuit_breaker()
+            enabled = settings.get("enabled", True)
+            breaker = CircuitBreaker(
+                failure_threshold=int(settings.get("failure_threshold", 5)) if enabled else None,
+                window_seconds=float(settings.get("window_seconds", 10.0)),
+                cooldown_seconds=float(settings.get("cooldown_seconds", 30.0)),
+            )
+            self._breakers[role] = breaker
+        return breaker
+
     # =========================================================================
     # 角色配置解析（含回退） / Role Config Resolution (with fallback)
     # =========================================================================
@@ -271,7 +374,13 @@ class ModelRouter:
         config = self._config_loader.resolve(role)
         return config.api_mode
 
-    def get_model_backend(self, role: str) -> Any:
+    def light_model_threshold(self, role: str) -> Optional[int]:
+        """角色轻量模型的提示词字符阈值；未配置轻量模型时为 None。
+        / Prompt-character threshold of the role's light model; None when no light model is configured."""
+        light = self._config_loader.get_light_model(role)
+        return light[1] if light is not None else None
+
+    def get_model_backend(self, role: str, *, complexity_hint: Optional[int] = None) -> Any:
         """获取角色对应的 LLM 适配器实例（带缓存）。
         / Get cached LLM adapter instance for a role.
 
@@ -283,6 +392,14 @@ class ModelRouter:
 
         统一接口 / Uniform interface: async call(system_prompt, user_message) -> str
 
+        Args:
+            role: 角色名。 / Role name.
+            complexity_hint: 本次调用的用户提示词字符数（可选）。角色配置了
+                _light_models 且提示词短于阈值时返回轻量模型的适配器；降级优先。
+                / User-prompt characters of this call (optional). When the role has
+                a _light_models entry and the prompt is under its threshold the
+                light model's adapter is returned; degradation takes precedence.
+
         Returns:
             对应的 adapter 实例。 / The adapter instance.
 
@@ -294,11 +411,23 @@ class ModelRouter:
         if self.should_degrade():
             degraded_model = self._get_degraded_model(role)
 
-        cache_key = f"_degraded_{role}" if degraded_model else role
+        light_model = None
+        if degraded_model is None and complexity_hint is not None:
+            light = self._config_loader.get_light_model(role)
+            if light is not None and complexity_hint < light[1]:
+                light_model = light[0]
+
+        if degraded_model:
+            cache_key = f"_degraded_{role}"
+        elif light_model:
+            cache_key = f"_light_{role}"
+        else:
+            cache_key = role
 
         # 降级切换时清除原缓存 / Clear original cache on degradation switch
         if degraded_model and role in self._model_cache:
             del self._model_cache[role]
+            self._backend_epoch += 1
 
         # 缓存命中 / Cache hit
         if cache_key in self._model_cache:
@@ -312,6 +441,8 @@ class ModelRouter:
         overrides: Dict[str, Any] = {}
         if degraded_model:
             overrides["model_name"] = degraded_model
+        elif light_model:
+            overrides["model_name"] = light_model
         if self._stream_override is not None:
             overrides["stream"] = self._stream_override
         if self._timeout_override is not None:
@@ -320,7 +451,7 @@ class ModelRouter:
             config = replace(config, **overrides)
 
         # 根据 api_mode 创建对应的适配器 / Create adapter by api_mode
-        adapter = self._create_adapter(config)
+        adapter = self._create_adapter(config, self._http_pool)
 
         self._model_cache[cache_key] = adapter
         logger.info(
@@ -333,21 +464,25 @@ class ModelRouter:
         return adapter
 
     @staticmethod
-    def _create_adapter(config) -> Any:
-        """根据 api_mode 创建对应的 LLM 适配器。 / Create LLM adapter by api_mode."""
+    def _create_adapter(config, http_pool: Optional[Any] = None) -> Any:
+        """根据 api_mode 创建对应的 LLM 适配器。 / Create LLM adapter by api_mode.
+
+        http_pool 仅传给基于 httpx 的适配器；Bedrock 走 boto3，不使用。
+        / http_pool only goes to httpx-based adapters; Bedrock uses boto3.
+        """
         if config.api_mode == "responses":
             from ripple.llm.responses_adapter import ResponsesAPIAdapter
-            return ResponsesAPIAdapter.from_endpoint_config(config)
+            return ResponsesAPIAdapter.from_endpoint_config(config, http_pool)
 
         if config.api_mode == "chat_completions":
             from ripple.llm.chat_completions_adapter import (
                 ChatCompletionsAdapter,
             )
-            return ChatCompletionsAdapter.from_endpoint_config(config)
+            return ChatCompletionsAdapter.from_endpoint_config(config, http_pool)
 
         if config.api_mode == "anthropic":
             from ripple.llm.anthropic_adapter import AnthropicAdapter
-            return AnthropicAdapter.from_endpoint_config(config)
+            return AnthropicAdapter.from_endpoint_config(config, http_pool)
 
         if config.api_mode == "bedrock":
             from ripple.llm.bedrock_adapter import BedrockAdapter
@@ -361,6 +496,23 @@ class ModelRouter:
     def clear_model_cache(self) -> None:
         """清除所有缓存的适配器。 / Clear all cached adapters."""
         self._model_cache.clear()
+        self._backend_epoch += 1
+
+    @property
+    def backend_epoch(self) -> int:
+        """适配器缓存的版本号，缓存项被移除时递增。 / Adapter cache version, bumped when entries are dropped."""
+        return self._backend_epoch
+
+    async def aclose(self) -> None:
+        """关闭缓存适配器持有的持久连接。 / Close persistent connections held by cached adapters."""
+        seen = set()
+        for adapter in list(self._model_cache.values()):
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            close = getattr(adapter, "aclose", None)
+            if close is not None:
+                await close()
 
     # =========================================================================
     # 调用次数控制 / Call Budget Control
@@ -385,6 +537,35 @@ class ModelRouter:
         """记录一次 LLM 调用成功。 / Record a successful LLM call."""
         self._budget.record_call(role)
 
+    def reserve_call(self, role: str) -> bool:
+        """为并发调用预占一次额度并记录尝试；额度不足时返回 False。
+        / Reserve one call for a concurrent caller and record the attempt;
+        returns False when the budget has no room.
+
+        检查与预占之间没有 await，因此同一事件循环上的并发调用不会超额准入；
+        调用结束后必须以 `finish_call` 释放。
+        / There is no await between the check and the reservation, so
+        concurrent callers on one event loop are never over-admitted. Each
+        reservation must be released with `finish_call`.
+        """
+        if not self._budget.has_capacity:
+            logger.warning(
+                "LLM 调用次数已达上限 (%d/%d，进行中 %d)",
+                self._budget.total_calls,
+                self._budget.max_calls,
+                self._budget.in_flight,
+            )
+            return False
+        self._budget.in_flight += 1
+        self._budget.record_attempt(role)
+        return True
+
+    def finish_call(self, role: str, *, succeeded: bool) -> None:
+        """释放 `reserve_call` 的预占；成功时计入调用次数。 / Release a `reserve_call` reservation, counting the call on success."""
+        self._budget.in_flight = max(0, self._budget.in_flight - 1)
+        if succeeded:
+            self._budget.record_call(role)
+
     def should_degrade(self) -> bool:
         """判断是否应该触发降级。 / Whether model degradation should be triggered.
 
@@ -12,7 +12,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Ripple:
     """涟漪 — CAS 核心抽象，统一信息传播、能量衰减、语义变异三个维度。
     / Ripple — core CAS abstraction unifying propagation, energy decay & semantic mutation.
@@ -62,7 +62,7 @@ class Meme:
     last_referenced: int  # 最后被引用的 Wave / Last referenced wave
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseVector:
     """多维相态向量。 / Multivariate phase vector."""
 
@@ -129,9 +129,11 @@ class SimulationConfig:
 # =============================================================================
 # 全视者中心制架构数据模型 / Omniscient-driven architecture data models
 # =============================================================================
+# 裁决相关模型每个 wave 按 Agent 批量创建，使用 slots 去掉实例字典
+# / Verdict models are created per agent every wave; slots drop the instance dict
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentActivation:
     """全视者裁决中的单个 Agent 激活指令。 / Single agent activation command in an Omniscient verdict."""
     agent_id: str
@@ -139,14 +141,14 @@ class AgentActivation:
     activation_reason: str
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentSkip:
     """全视者裁决中的单个 Agent 跳过记录。 / Single agent skip record in an Omniscient verdict."""
     agent_id: str
     skip_reason: str
 
 
-@dataclass
+@dataclass(slots=True)
 class OmniscientVerdict:
     """全视者每轮 wave 的裁决输出。 / Omniscient verdict for each wave."""
     wave_number: int
@@ -157,6 +159,8 @@ class OmniscientVerdict:
     skipped_agents: List[AgentSkip]
     global_observation: str
     termination_reason: Optional[str] = None
+    # 裁决本身失败（安全降级终止）时为 True / True when the verdict itself failed (safe-fallback stop)
+    failed_verdict: bool = False
 
     @property
     def activated_agent_ids(self) -> List[str]:
@@ -18,17 +18,25 @@ Each prompt is annotated with its call site and purpose for easy maintenance.
 # =============================================================================
 
 # 调用位置 / Call site: omniscient.py — _init_sub_call(), ripple_verdict(), observe(),
-#           synthesize_result() 中 JSON 解析失败时的重试前缀
+#           synthesize_result() 中 JSON 解析失败重试时，追加在原 user_prompt 之后的分隔标记
+# 用途 / Purpose: 重试提示只作为尾部后缀追加，原 user_prompt 保持逐字节不变，
+#           使服务端前缀缓存（KV cache）在重试时仍能命中
+#           / Retry hints are appended as a trailing suffix so the original
+#           user_prompt stays byte-identical and server-side prefix (KV) caches
+#           still hit on retries
+RETRY_HINT_SEPARATOR = "\n\n<<RETRY>>\n"
+
+# 调用位置 / Call site: omniscient.py — _init_sub_call() 中 JSON 解析失败时的重试提示
 # 用途 / Purpose: 告知 LLM 上一次输出格式有误，要求重新输出合法 JSON / Notify LLM that previous output was malformed and request valid JSON
-RETRY_JSON_PREFIX = (
+RETRY_JSON_HINT = (
     "上一次输出解析失败，错误: {error}\n"
-    "请重新输出，确保是合法 JSON 格式。\n\n"
+    "请重新输出，确保是合法 JSON 格式。"
 )
 
-# 调用位置 / Call site: omniscient.py — ripple_verdict(), observe() 中的简短重试前缀
+# 调用位置 / Call site: omniscient.py — ripple_verdict(), observe(), synthesize_result() 中的简短重试提示
 # 用途 / Purpose: 同上，较简短的版本 / Same as above, shorter variant
-RETRY_JSON_PREFIX_SHORT = (
-    "上一次输出解析失败: {error}\n请重新输出合法 JSON。\n\n"
+RETRY_JSON_HINT_SHORT = (
+    "上一次输出解析失败: {error}\n请重新输出合法 JSON。"
 )
 
 # v4: Skill prompt 在 system_prompt 中的注入分隔符 / Separator for skill prompt injection in system_prompt
@@ -142,6 +150,15 @@ OMNISCIENT_RIPPLE_TIME_PROGRESS = (
     "continue_propagation = false**\n\n"
 )
 
+# 调用位置 / Call site: omniscient.py — _build_ripple_prompt() 内构建可用 Agent 列表
+# 用途 / Purpose: 单个 Agent 的列表行：已激活（含激活统计）/ 尚未激活
+#       Per-agent list line: activated (with activation stats) / not yet activated
+OMNISCIENT_RIPPLE_AGENT_LINE_ACTIVE = (
+    '  - agent_id: "{sid}" ({kind}): {desc} '
+    "| 已激活{n}次, 上次能量={e:.2f}, 上次响应={r}"
+)
+OMNISCIENT_RIPPLE_AGENT_LINE_IDLE = '  - agent_id: "{sid}" ({kind}): {desc} | 尚未激活'
+
 # 调用位置 / Call site: omniscient.py — _build_ripple_prompt()
 # 用途 / Purpose: CAS 复杂自适应系统核心传播原则，指导全视者做出延续性裁决 / CAS core propagation principles guiding Omniscient's continuation verdicts
 OMNISCIENT_RIPPLE_CAS_PRINCIPLES = (
@@ -170,7 +187,7 @@ OMNISCIENT_RIPPLE_CAS_PRINCIPLES = (
     "参考上方 Agent 状态中的激活次数和能量值，做出延续性裁决。\n\n"
 )
 
-# 调用位置 / Call site: omniscient.py — _build_ripple_prompt() 中 wave_number == 0 时注入
+# 调用位置 / Call site: omniscient.py — _build_ripple_prompt() 中 wave_number == 0 时追加到 user_prompt 尾部
 # 用途 / Purpose: 首轮传播时提示全视者优先激活群体 Agent / Hint for wave 0: prioritize activating Sea (cluster) agents first
 OMNISCIENT_RIPPLE_WAVE0_HINT = (
     "## 首轮传播注意\n\n"
@@ -478,6 +495,18 @@ OMNISCIENT_INIT_TOPOLOGY_USER = (
     "## 已确定的 Agent 配置\n\n{agents_json}\n\n"
 )
 
+# --- 前缀缓存边界 / Prefix-cache boundary ---
+# 各阶段 *_SYSTEM 模板只含静态指令与 schema，跨 wave、跨重试逐字节不变；
+# 所有随运行变化的内容（wave 序号、快照、历史、首轮提示等）只出现在 *_USER
+# 模板中，且位于 system_prompt 之后。需要显式缓存标记（如 Anthropic
+# cache_control）的调用方可将整个 system_prompt 标记为可缓存前缀。
+# / Every phase *_SYSTEM template holds only static instructions and schema
+# and stays byte-identical across waves and retries. Everything that varies
+# per run (wave number, snapshot, history, first-wave hint, ...) lives in the
+# *_USER templates, after the system prompt. Callers that need explicit cache
+# markers (e.g. Anthropic cache_control) can mark the whole system_prompt as
+# the cacheable prefix.
+
 # --- RIPPLE:verdict ---
 OMNISCIENT_RIPPLE_VERDICT_SYSTEM = (
     "{cas_principles}"
@@ -519,6 +548,7 @@ OMNISCIENT_RIPPLE_VERDICT_USER = (
     "## 传播历史\n\n{propagation_history}\n\n"
     "## 可用 Agent 列表（你必须从以下 agent_id 中选择）\n\n"
     "{agent_list}\n\n"
+    "{wave0_hint}"
 )
 
 # --- OBSERVE ---
@@ -676,7 +706,8 @@ OMNISCIENT_SYNTHESIZE_ANCHORED_USER = (
 # 星 Agent (Star) 提示词 / Star Agent Prompts
 # =============================================================================
 
-# 调用位置 / Call site: star.py — _build_system_prompt()
+# 调用位置 / Call site: star.py — 模块级按 {memory_context} 拆分，__init__() / _build_system_prompt() 拼接
+#   / split at {memory_context} at module level, joined in __init__() / _build_system_prompt()
 # 用途 / Purpose: Star Agent 的系统提示词，定义 KOL 角色身份、响应类型、
 #       记忆回忆策略和 JSON 输出格式
 #       Star agent system prompt: define KOL persona, response types, memory recall strategy, and JSON output schema
@@ -708,7 +739,7 @@ STAR_USER_PROMPT = (
     "请决定你的响应。"
 )
 
-# 调用位置 / Call site: star.py — _build_system_prompt() 内记忆格式化
+# 调用位置 / Call site: star.py — _remember() 内记忆格式化（写入时格式化一次）
 # 用途 / Purpose: Star Agent 单条记忆的格式模板 / Format template for a single Star agent memory entry
 STAR_MEMORY_LINE = (
     "- 收到来自 {ripple_source} 的涟漪: "
@@ -729,6 +760,8 @@ STAR_MEMORY_HEADER = "\n\n## 你的近期记忆\n"
 # 用途 / Purpose: Sea Agent 的系统提示词，定义群体角色、响应类型、
 #       群体内部差异性（避免 LLM 从众倾向）和 JSON 输出格式
 #       Sea agent system prompt: define cluster persona, response types, intra-group diversity (counter LLM conformity bias), and JSON output schema
+#       不含记忆等逐轮变化的内容，同一 Agent 各次调用前缀一致，可命中服务端提示词缓存
+#       Holds nothing that changes per turn (memory lives in the user prompt), so the prefix is stable per agent for provider prompt caching
 SEA_SYSTEM_PROMPT = (
     "你代表的群体是：{description}\n\n"
     "你收到了一条涟漪（信息传播信号）。"
@@ -746,15 +779,15 @@ SEA_SYSTEM_PROMPT = (
     "**群体的默认行为倾向是观察和吸收，而非主动放大传播。**"
     "只有当刺激信号与群体核心关切高度契合时，"
     "才会出现大规模主动扩散。"
-    "在大多数情况下，absorb（关注但不传播）是最常见的群体反应。\n"
-    "{memory_context}\n\n"
+    "在大多数情况下，absorb（关注但不传播）是最常见的群体反应。\n\n"
     "输出严格 JSON：response_type, cluster_reaction, "
     "outgoing_energy (0-1), sentiment_shift, reasoning"
 )
 
 # 调用位置 / Call site: sea.py — _build_user_prompt()
-# 用途 / Purpose: Sea Agent 收到涟漪时的用户提示词，传递涟漪来源、能量和内容 / User prompt when Sea agent receives a ripple: convey source, energy, and content
+# 用途 / Purpose: Sea Agent 收到涟漪时的用户提示词，传递近期记忆（可为空）及涟漪来源、能量和内容 / User prompt when Sea agent receives a ripple: convey recent memory (may be empty), then source, energy, and content
 SEA_USER_PROMPT = (
+    "{memory_context}"
     "收到涟漪:\n"
     "- 来源: {source}\n"
     "- 能量: {energy}\n"
@@ -762,13 +795,13 @@ SEA_USER_PROMPT = (
     "请决定你代表的群体的集体响应。"
 )
 
-# 调用位置 / Call site: sea.py — _build_system_prompt() 内记忆格式化
+# 调用位置 / Call site: sea.py — _build_user_prompt() 内记忆格式化
 # 用途 / Purpose: Sea Agent 单条记忆的格式模板 / Format template for a single Sea agent memory entry
 SEA_MEMORY_LINE = (
     "- 收到来自 {ripple_source} 的涟漪 → "
     "群体回应: {response_type}"
 )
 
-# 调用位置 / Call site: sea.py — _build_system_prompt() 内记忆段标题
+# 调用位置 / Call site: sea.py — _build_user_prompt() 内记忆段标题
 # 用途 / Purpose: Sea Agent 记忆段的标题 / Section header for Sea agent memory block
-SEA_MEMORY_HEADER = "\n\n## 近期群体记忆\n"
+SEA_MEMORY_HEADER = "## 近期群体记忆\n"
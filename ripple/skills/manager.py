@@ -28,7 +28,7 @@ import hashlib
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -131,6 +131,8 @@ class SkillManager:
             list(search_paths) if search_paths else self._build_default_paths()
         )
         self._discovered: Dict[str, Dict[str, Any]] = {}
+        # (skill_name, skill_path) -> 已加载快照 / loaded snapshot
+        self._loaded: Dict[Tuple[str, Optional[str]], LoadedSkill] = {}
 
     def _build_default_paths(self) -> List[Path]:
         """构建默认搜索路径列表。 / Build default search path list."""
@@ -203,6 +205,7 @@ class SkillManager:
             [{"name": str, "description": str, "path": Path}, ...]
         """
         self._discovered.clear()
+        self._loaded.clear()
         results: List[Dict[str, Any]] = []
 
         for search_dir in self._search_paths:
@@ -261,7 +264,11 @@ class SkillManager:
         """加载指定 Skill。 / Load a specified skill.
 
         如果提供了 skill_path，直接从该路径加载（跳过 discover）；否则按 name 匹配。
+        同一实例按 (skill_name, skill_path) 缓存快照，重复加载不再解析文件；
+        `discover()` 会清空缓存。
         / If skill_path is given, load directly (skip discover); otherwise match by name.
+        Snapshots are cached per instance by (skill_name, skill_path), so repeated
+        loads skip re-parsing; `discover()` clears the cache.
 
         Args:
             skill_name: Skill 名称。 / Skill name.
@@ -273,6 +280,11 @@ class SkillManager:
         Raises:
             SkillValidationError: 校验失败。 / Validation failed.
         """
+        cache_key = (skill_name, str(skill_path) if skill_path is not None else None)
+        cached = self._loaded.get(cache_key)
+        if cached is not None:
+            return cached
+
         if skill_path is not None:
             skill_dir = Path(skill_path)
         else:
@@ -292,7 +304,9 @@ class SkillManager:
             )
 
         frontmatter = self._parse_frontmatter(skill_dir)
-        return self._load_skill(frontmatter, skill_dir)
+        loaded = self._load_skill(frontmatter, skill_dir)
+        self._loaded[cache_key] = loaded
+        return loaded
 
     def _load_skill(
         self,
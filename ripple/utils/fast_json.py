@@ -0,0 +1,135 @@
+# fast_json.py
+# =============================================================================
+# 热路径 JSON 编解码 / JSON encoding & decoding for hot paths
+#
+# 职责 / Responsibilities:
+#   - 为提示词构建与 LLM 输出解析提供统一的 dumps/loads
+#     / Shared dumps/loads for prompt building and LLM output parsing
+#   - 大文档可直接写入文件对象，不先构造完整字符串
+#     / Large documents can be written straight to a file object without
+#       building the full string first
+#   - 提示词载荷使用紧凑格式（无缩进/空格），减少序列化开销与 token 数
+#     / Prompt payloads use the compact form (no indent/spaces) to cut
+#       serialization cost and token count
+#   - 安装 orjson 时走 C 实现，否则回退标准库；两者格式一致，仅以下取值不同：
+#     NaN/Infinity（orjson 写 null，标准库写 NaN/Infinity 字面量）与普通
+#     Enum（orjson 写其 value，标准库 default=str 写 "Color.RED"）
+#     / Use orjson (C implementation) when installed, else the stdlib. The
+#       format is the same; only these values differ: NaN/Infinity (orjson
+#       writes null, the stdlib writes the NaN/Infinity literals) and plain
+#       Enum members (orjson writes the value, the stdlib's default=str
+#       writes "Color.RED")
+#
+# 依赖 / Dependency:
+#   orjson 为可选依赖，通过 pip install ripple[speedups] 安装。
+#   / orjson is optional; install via pip install ripple[speedups].
+# =============================================================================
+
+from __future__ import annotations
+
+import io
+import json
+from typing import IO, Any
+
+# orjson 可选导入 / Optional orjson import
+try:
+    import orjson as _orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _orjson = None  # type: ignore[assignment]
+    _HAS_ORJSON = False
+
+if _HAS_ORJSON:
+    # dataclass/datetime 交给 default=str，与标准库输出保持一致（非有限浮点数
+    # 与 Enum 仍按 orjson 规则输出，见文件头）
+    # / Route dataclasses/datetimes to default=str to match stdlib output
+    #   (non-finite floats and Enums still follow orjson rules, see header)
+    _PRETTY_OPTIONS = (
+        _orjson.OPT_INDENT_2
+        | _orjson.OPT_NON_STR_KEYS
+        | _orjson.OPT_PASSTHROUGH_DATACLASS
+        | _orjson.OPT_PASSTHROUGH_DATETIME
+    )
+    # orjson 不支持的值（超 64 位整数等）回退标准库
+    # / Values orjson rejects (e.g. >64-bit ints) fall back to the stdlib
+    _COMPACT_OPTIONS = (
+        _orjson.OPT_NON_STR_KEYS
+        | _orjson.OPT_PASSTHROUGH_DATACLASS
+        | _orjson.OPT_PASSTHROUGH_DATETIME
+    )
+    _ORJSON_ENCODE_ERRORS: tuple = (_orjson.JSONEncodeError,)
+    _ORJSON_DECODE_ERRORS: tuple = (_orjson.JSONDecodeError,)
+
+
+def dumps_pretty(obj: Any) -> str:
+    """序列化为 2 空格缩进、保留非 ASCII 字符的 JSON。 / Serialize to 2-space indented JSON keeping non-ASCII text.
+
+    与 `json.dumps(obj, ensure_ascii=False, indent=2, default=str)` 输出一致；
+    安装 orjson 时 NaN/Infinity 写为 null、普通 Enum 写为其 value。
+    / Same output as `json.dumps(obj, ensure_ascii=False, indent=2, default=str)`,
+    except that with orjson installed NaN/Infinity become null and plain Enum
+    members become their value.
+    """
+    if _HAS_ORJSON:
+        try:
+            return _orjson.dumps(obj, option=_PRETTY_OPTIONS, default=str).decode()
+        except _ORJSON_ENCODE_ERRORS:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=str)
+
+
+def dump_pretty(obj: Any, fp: IO[bytes]) -> None:
+    """将 `dumps_pretty` 的输出以 UTF-8 写入二进制文件对象。 / Write `dumps_pretty` output as UTF-8 to a binary file object.
+
+    orjson 直接产出 bytes，无需再解码/编码；标准库路径用 `json.dump` 分块写入，
+    不在内存中拼出整份文本。
+    / orjson produces bytes directly with no decode/encode round trip; the
+    stdlib path streams chunks through `json.dump` instead of building the
+    whole text in memory.
+    """
+    if _HAS_ORJSON:
+        try:
+            fp.write(_orjson.dumps(obj, option=_PRETTY_OPTIONS, default=str))
+            return
+        except _ORJSON_ENCODE_ERRORS:
+            pass
+    text_fp = io.TextIOWrapper(fp, encoding="utf-8", newline="")
+    try:
+        json.dump(obj, text_fp, ensure_ascii=False, indent=2, default=str)
+        text_fp.flush()
+    finally:
+        # 交还底层文件，由调用方关闭 / Hand the file back for the caller to close
+        text_fp.detach()
+
+
+def dumps_compact(obj: Any) -> str:
+    """序列化为无多余空白、保留非 ASCII 字符的 JSON。 / Serialize to whitespace-free JSON keeping non-ASCII text.
+
+    与 `json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)`
+    输出一致（orjson 下 NaN/Infinity 与 Enum 的差异同 `dumps_pretty`），用于
+    发给 LLM 的提示词载荷。
+    / Same output as `json.dumps(obj, ensure_ascii=False, separators=(",", ":"),
+    default=str)` (with the same orjson NaN/Infinity and Enum differences as
+    `dumps_pretty`); used for prompt payloads sent to the LLM.
+    """
+    if _HAS_ORJSON:
+        try:
+            return _orjson.dumps(obj, option=_COMPACT_OPTIONS, default=str).decode()
+        except _ORJSON_ENCODE_ERRORS:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def loads(text: str | bytes) -> Any:
+    """解析 JSON 文本。失败时抛出 json.JSONDecodeError。 / Parse JSON text; raises json.JSONDecodeError on failure.
+
+    orjson 拒绝的输入（如 NaN 字面量）交给标准库再试一次，保持宽松语义。
+    / Input orjson rejects (e.g. NaN literals) is retried with the stdlib to
+    keep its lenient semantics.
+    """
+    if _HAS_ORJSON:
+        try:
+            return _orjson.loads(text)
+        except _ORJSON_DECODE_ERRORS:
+            pass
+    return json.loads(text)
@@ -4,12 +4,145 @@ Handles common LLM response patterns: plain JSON, markdown code blocks,
 JSON with surrounding text.
 """
 
-import json
 import re
 from typing import Any, Dict
 
 import yaml
 
+from ripple.utils.fast_json import loads
+
+
+# 以 ``` 开头的整段输出：去掉首行围栏标记，取到闭合围栏（缺失时取到末尾）
+# / Output starting with ```: drop the opening fence line and keep everything
+#   up to the closing fence (or the end when it is missing)
+_LEADING_FENCE_RE = re.compile(r"\A```[^\n]*\n(.*?)(?:\n[ \t]*```|\Z)", re.DOTALL)
+
+
+def strip_code_fence(text: str) -> str:
+    """去掉包裹整段输出的 markdown 代码围栏。 / Strip a markdown code fence wrapping the whole output.
+
+    不以 ``` 开头的文本原样返回。 / Text not starting with ``` is returned unchanged.
+    """
+    if not text.startswith("```"):
+        return text
+    match = _LEADING_FENCE_RE.match(text)
+    return match.group(1) if match else ""
+
+
+# 流式扫描只需关注的字符 / The only characters the stream scanner cares about
+_STREAM_TOKEN_RE = re.compile(r'[\\"{}\[\]]')
+
+
+class JsonStreamAccumulator:
+    """增量累积流式 LLM 输出，在顶层 JSON 值闭合时报告完成。
+    / Accumulate streamed LLM output and report when the top-level JSON value closes.
+
+    允许前导空白与一行 ``` 围栏。首个有效字符不是 `{` 或 `[` 时立即抛出
+    ValueError，调用方可提前放弃本次流并重试。每个字符只扫描一次。
+    / Leading whitespace and one ``` fence line are allowed. If the first
+    significant character is not `{` or `[`, ValueError is raised at once so
+    the caller can abandon the stream and retry early. Each character is
+    scanned once.
+    """
+
+    __slots__ = ("_buffer", "_pos", "_start", "_end", "_depth", "_in_string", "_escape")
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._start: int | None = None
+        self._end: int | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def complete(self) -> bool:
+        """顶层 JSON 值是否已闭合。 / Whether the top-level JSON value has closed."""
+        return self._end is not None
+
+    @property
+    def text(self) -> str:
+        """闭合时为 JSON 文本，否则为已接收的全部输出。 / The JSON text once closed, else everything received."""
+        if self._end is not None:
+            return self._buffer[self._start:self._end]
+        return self._buffer
+
+    def feed(self, chunk: str) -> bool:
+        """追加一块输出，返回顶层 JSON 值是否已闭合。 / Append a chunk; return whether the top-level value has closed."""
+        if self._end is not None:
+            return True
+        self._buffer += chunk
+        if self._start is None and not self._find_start():
+            return False
+        self._scan()
+        return self._end is not None
+
+    def _find_start(self) -> bool:
+        buffer = self._buffer
+        pos = self._pos
+        length = len(buffer)
+        while pos < length and buffer[pos].isspace():
+            pos += 1
+        rest = buffer[pos:pos + 3]
+        if len(rest) < 3 and "```".startswith(rest):
+            # 围栏标记尚未接收完整 / Fence marker not fully received yet
+            self._pos = pos
+            return False
+        if rest == "```":
+            newline = buffer.find("\n", pos)
+            if newline < 0:
+                self._pos = pos
+                return False
+            pos = newline + 1
+            while pos < length and buffer[pos].isspace():
+                pos += 1
+            if pos >= length:
+                self._pos = pos
+                return False
+        if buffer[pos] not in "{[":
+            raise ValueError(
+                f"LLM 输出不是 JSON 对象，首字符为 {buffer[pos]!r} / "
+                f"LLM output is not a JSON object"
+            )
+        self._start = self._pos = pos
+        return True
+
+    def _scan(self) -> None:
+        buffer = self._buffer
+        length = len(buffer)
+        search = _STREAM_TOKEN_RE.search
+        in_string, escape, depth = self._in_string, self._escape, self._depth
+        pos = self._pos
+        while pos < length:
+            if escape:
+                # 上一块以反斜杠结尾，跳过被转义的字符 / Previous chunk ended in a backslash; skip the escaped char
+                escape = False
+                pos += 1
+                continue
+            match = search(buffer, pos)
+            if match is None:
+                pos = length
+                break
+            index = match.start()
+            char = buffer[index]
+            pos = index + 1
+            if in_string:
+                if char == "\\":
+                    escape = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth == 0:
+                    self._end = pos
+                    break
+        self._in_string, self._escape, self._depth, self._pos = in_string, escape, depth, pos
+
 
 def _try_parse_mapping(text: str) -> Dict[str, Any] | None:
     """尝试将文本解析为字典。 / Try parsing a text blob into a mapping.
@@ -19,7 +152,7 @@ def _try_parse_mapping(text: str) -> Dict[str, Any] | None:
     / First attempt strict JSON, then fall back to YAML-compatible parsing to
     absorb common LLM noise such as trailing commas and raw newlines.
     """
-    for loader in (json.loads, yaml.safe_load):
+    for loader in (loads, yaml.safe_load):
         try:
             parsed = loader(text)
         except Exception:
@@ -135,3 +268,70 @@ def parse_json_from_llm(raw: str) -> Dict[str, Any]:
             return result
 
     raise ValueError(f"No valid JSON found in LLM output: {text[:200]}")
+
+
+def parse_partial_json(raw: str) -> Dict[str, Any]:
+    """解析被截断的 JSON 对象（如输出 token 耗尽）。 / Parse a truncated JSON object (e.g. output tokens ran out).
+
+    从首个 `{` 扫描：先补齐未闭合的字符串与括号；仍无法解析时退回到最后一个
+    完整成员之后（最近的逗号处）再补齐。只用严格 JSON 解析，不走 YAML 回退。
+    / Scans from the first `{`: first closes any open string and brackets;
+    if that still fails, cuts back to after the last complete member (the
+    latest comma) and closes from there. Strict JSON only, no YAML fallback.
+
+    Raises:
+        ValueError: 无法恢复出对象。 / No object could be recovered.
+    """
+    start = raw.find("{") if raw else -1
+    if start < 0:
+        raise ValueError("No JSON object start found")
+
+    closers: list[str] = []
+    in_string = False
+    escape = False
+    last_cut: tuple[int, str] | None = None
+    end = len(raw)
+    for pos in range(start, len(raw)):
+        char = raw[pos]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char == "{":
+            closers.append("}")
+        elif char == "[":
+            closers.append("]")
+        elif char in "}]":
+            if closers:
+                closers.pop()
+            if not closers:
+                end = pos + 1
+                break
+        elif char == ",":
+            last_cut = (pos, "".join(reversed(closers)))
+
+    candidates: list[str] = []
+    if closers:
+        tail = raw[start:end]
+        if escape:
+            tail = tail[:-1]
+        candidates.append(tail + ('"' if in_string else "") + "".join(reversed(closers)))
+        if last_cut is not None:
+            candidates.append(raw[start:last_cut[0]] + last_cut[1])
+    else:
+        candidates.append(raw[start:end])
+
+    for candidate in candidates:
+        try:
+            parsed = loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+    raise ValueError(f"No recoverable JSON object in LLM output: {raw[:200]}")
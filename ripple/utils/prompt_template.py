@@ -0,0 +1,71 @@
+"""预编译提示词模板。 / Precompiled prompt templates.
+
+热路径上的提示词模板（每个 wave / 每个 Agent 调用都会渲染）在导入时解析一次：
+字段集合预先校验并记录，渲染时直接调用 str.format_map，不再逐次构造参数。
+/ Hot-path prompt templates (rendered on every wave / agent call) are parsed
+once at import: the field set is validated and recorded up front, and
+rendering calls str.format_map directly without rebuilding arguments.
+
+只含命名字段（可带转换/格式说明，如 `{e:.2f}`）的模板走 format_map；含位置
+字段的模板回退到 str.format。
+/ Templates with only named fields (optionally with conversion/format spec,
+e.g. `{e:.2f}`) use format_map; templates with positional fields fall back to
+str.format.
+"""
+
+from string import Formatter
+from typing import Any, Callable, List
+
+
+class CompiledTemplate:
+    """预解析的 str.format 模板。 / A pre-parsed str.format template.
+
+    `format(**kwargs)` 的输出与 `template.format(**kwargs)` 一致，多余的关键字
+    参数被忽略，缺失字段时抛出 KeyError。`fields` 为模板引用的顶层字段名
+    （按首次出现顺序）。
+    / `format(**kwargs)` renders exactly like `template.format(**kwargs)`;
+    extra keyword arguments are ignored and a missing field raises KeyError.
+    `fields` lists the top-level field names the template references (in
+    first-seen order).
+    """
+
+    __slots__ = ("template", "fields", "format")
+
+    def __init__(self, template: str):
+        self.template = template
+        names = _field_names(template)
+        if any(name == "" or name.isdigit() for name in names):
+            # 位置字段无法用 format_map 渲染 / Positional fields cannot render through format_map
+            self.fields: List[str] = []
+            self.format: Callable[..., str] = template.format
+            return
+        self.fields = list(dict.fromkeys(names))
+        format_map = template.format_map
+
+        def render(**kwargs: Any) -> str:
+            return format_map(kwargs)
+
+        self.format = render
+
+
+def compile_template(template: str) -> CompiledTemplate:
+    """解析并校验 str.format 模板。 / Parse and validate a str.format template.
+
+    Raises:
+        ValueError: 模板格式不合法。 / The template is malformed.
+    """
+    return CompiledTemplate(template)
+
+
+def _field_names(template: str) -> List[str]:
+    """模板中全部替换字段的顶层名称（含嵌套格式说明中的字段）。
+    / Top-level names of every replacement field, including those nested in specs."""
+    names: List[str] = []
+    for _, name, spec, _ in Formatter().parse(template):
+        if name is None:
+            continue
+        # `{item[0]}` / `{obj.attr}` 取首段作为参数名 / Use the leading part as the argument name
+        names.append(name.split(".", 1)[0].split("[", 1)[0])
+        if spec and "{" in spec:
+            names.extend(_field_names(spec))
+    return names
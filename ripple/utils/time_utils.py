@@ -0,0 +1,33 @@
+"""时间字符串解析工具。 / Time string parsing helpers.
+
+放在无依赖的叶子模块中，供 engine 与 agents 共同导入而不产生循环依赖。
+/ Kept in a dependency-free leaf module so both engine and agents can import
+it without an import cycle.
+"""
+
+from functools import lru_cache
+import re
+
+# 匹配 "4h", "2.5h", "48h" 或 "1d", "2d" 格式 / Match "4h", "2.5h", "48h" or "1d", "2d"
+_DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([hd])$")
+
+
+def parse_hours(s: str) -> float:
+    """解析时间字符串为小时数。 / Parse a time string like "4h", "48h", "2.5h", "1d" into hours.
+
+    无法解析时返回 0.0。同一字符串在各 wave 间反复出现，结果按字符串缓存。
+    / Returns 0.0 if the string cannot be parsed. The same strings recur on
+    every wave, so results are cached per string.
+    """
+    if not s or not isinstance(s, str):
+        return 0.0
+    return _parse_hours_cached(s)
+
+
+@lru_cache(maxsize=128)
+def _parse_hours_cached(s: str) -> float:
+    m = _DURATION_RE.match(s.strip().lower())
+    if not m:
+        return 0.0
+    value = float(m.group(1))
+    return value * 24.0 if m.group(2) == "d" else value
@@ -5,6 +5,7 @@ import json
 from unittest.mock import AsyncMock, MagicMock
 from ripple.agents.omniscient import OmniscientAgent
 from ripple.primitives.models import OmniscientVerdict
+from ripple.prompts import RETRY_HINT_SEPARATOR
 
 
 class TestOmniscientInit:
@@ -151,6 +152,70 @@ class TestOmniscientInit:
         assert mock_llm_caller.call_count == 4  # 1 次重试 + 3 次成功 / 1 retry + 3 successful
         assert len(result["star_configs"]) >= 1
 
+    @pytest.mark.asyncio
+    async def test_init_retry_keeps_user_prompt_prefix(self):
+        """重试提示应追加在原 user_prompt 之后，保持前缀逐字节一致。 / Retry hint is appended after the original user_prompt, keeping the prefix byte-identical."""
+        mock_llm_caller = AsyncMock()
+        mock_llm_caller.side_effect = [
+            "这不是JSON",
+            json.dumps({
+                "wave_time_window": "2h",
+                "wave_time_window_reasoning": "test",
+                "energy_decay_per_wave": 0.1,
+                "platform_characteristics": "test",
+            }),
+            json.dumps({
+                "star_configs": [{"id": "star_1", "description": "test"}],
+                "sea_configs": [{"id": "sea_1", "description": "test"}],
+            }),
+            json.dumps({
+                "topology": {"edges": []},
+                "seed_ripple": {"content": "test", "initial_energy": 0.5},
+            }),
+        ]
+
+        agent = OmniscientAgent(llm_caller=mock_llm_caller)
+        await agent.init(
+            skill_profile="test",
+            simulation_input={"event": {"description": "test"}, "skill": "test"},
+        )
+
+        first = mock_llm_caller.call_args_list[0].kwargs
+        retry = mock_llm_caller.call_args_list[1].kwargs
+        assert retry["system_prompt"] == first["system_prompt"]
+        assert retry["user_prompt"].startswith(first["user_prompt"])
+        assert "<<RETRY>>" in retry["user_prompt"]
+
+
+    @pytest.mark.asyncio
+    async def test_init_steps_can_run_individually(self):
+        """INIT 分步接口应可单独调用，且每步只发起一次 LLM 调用。 / Step-wise INIT API runs each step with one LLM call."""
+        mock_llm_caller = AsyncMock()
+        mock_llm_caller.side_effect = [
+            json.dumps({"wave_time_window": "2h"}),
+            json.dumps({
+                "star_configs": [{"id": "star_1", "description": "test"}],
+                "sea_configs": [{"id": "sea_1", "description": "test"}],
+            }),
+            json.dumps({
+                "topology": {"edges": []},
+                "seed_ripple": {"content": "test", "initial_energy": 0.5},
+            }),
+        ]
+        sim_input = {"event": {"description": "test"}, "skill": "test"}
+
+        agent = OmniscientAgent(llm_caller=mock_llm_caller)
+        dp = await agent.init_dynamics("test", sim_input)
+        agents = await agent.init_agents("test", sim_input, dp)
+        topo = await agent.init_topology("test", sim_input, dp, agents)
+
+        assert dp["wave_time_window"] == "2h"
+        assert agents["sea_configs"][0]["id"] == "sea_1"
+        assert "seed_ripple" in topo
+        assert mock_llm_caller.call_count == 3
+        # 第 2 步应看到第 1 步结果 / Step 2 sees step 1 output
+        assert "2h" in mock_llm_caller.call_args_list[1].kwargs["user_prompt"]
+
 
 class TestOmniscientRippleVerdict:
     @pytest.mark.asyncio
@@ -246,6 +311,126 @@ class TestOmniscientRippleVerdict:
         assert "36.0h" in prompt  # remaining = 48 - 12
 
 
+    @pytest.mark.asyncio
+    async def test_ripple_verdict_failure_sets_failed_flag(self):
+        """裁决多次解析失败时应安全终止并标记 failed_verdict。 / Repeated parse failures stop safely with failed_verdict set."""
+        mock_llm_caller = AsyncMock(return_value="not json")
+        agent = OmniscientAgent(llm_caller=mock_llm_caller, max_retries=1)
+        verdict = await agent.ripple_verdict(
+            field_snapshot={}, wave_number=2, propagation_history="",
+        )
+
+        assert verdict.continue_propagation is False
+        assert verdict.failed_verdict is True
+        assert mock_llm_caller.call_count == 2
+
+
+    @pytest.mark.asyncio
+    async def test_ripple_verdict_streams_and_stops_at_closed_json(self):
+        """流式调用器在顶层 JSON 闭合后即停止接收。 / A streaming caller stops being read once the top-level JSON closes."""
+        verdict_json = json.dumps({
+            "wave_number": 1,
+            "simulated_time_elapsed": "4h",
+            "simulated_time_remaining": "44h",
+            "continue_propagation": True,
+            "activated_agents": [],
+            "skipped_agents": [],
+            "global_observation": "ok",
+        })
+        consumed = []
+
+        async def caller(*, system_prompt="", user_prompt=""):
+            raise AssertionError("非流式路径不应被调用 / non-streaming path must not run")
+
+        async def astream(*, system_prompt="", user_prompt=""):
+            for chunk in ("```json\n", verdict_json[:20], verdict_json[20:], "\n```", "EXTRA"):
+                consumed.append(chunk)
+                yield chunk
+
+        caller.astream = astream
+        agent = OmniscientAgent(llm_caller=caller)
+        verdict = await agent.ripple_verdict(
+            field_snapshot={}, wave_number=1, propagation_history="",
+        )
+
+        assert verdict.continue_propagation is True
+        assert consumed[-1] == verdict_json[20:]
+
+    @pytest.mark.asyncio
+    async def test_ripple_verdict_stream_rejects_non_json_early(self):
+        """流式输出开头不是 JSON 时立即重试。 / Non-JSON stream output triggers a retry immediately."""
+        attempts = []
+
+        async def caller(*, system_prompt="", user_prompt=""):
+            raise AssertionError("非流式路径不应被调用 / non-streaming path must not run")
+
+        async def astream(*, system_prompt="", user_prompt=""):
+            attempts.append(user_prompt)
+            yield "抱歉，"
+            yield "我无法完成"
+
+        caller.astream = astream
+        agent = OmniscientAgent(llm_caller=caller, max_retries=1)
+        verdict = await agent.ripple_verdict(
+            field_snapshot={}, wave_number=2, propagation_history="",
+        )
+
+        assert verdict.failed_verdict is True
+        assert len(attempts) == 2
+        assert RETRY_HINT_SEPARATOR in attempts[1]
+
+
+    @pytest.mark.asyncio
+    async def test_ripple_verdict_schema_violation_triggers_retry(self):
+        """激活项缺少必要字段时应重试。 / An activation missing required fields triggers a retry."""
+        good = {
+            "wave_number": 1,
+            "simulated_time_elapsed": 4,
+            "continue_propagation": True,
+            "activated_agents": [
+                {"agent_id": "sea_1", "incoming_ripple_energy": {"value": 0.4},
+                 "activation_reason": "兴趣匹配"},
+            ],
+        }
+        mock_llm_caller = AsyncMock(side_effect=[
+            json.dumps({"activated_agents": [{"agent_id": "sea_1"}]}),
+            json.dumps(good),
+        ])
+        agent = OmniscientAgent(llm_caller=mock_llm_caller)
+        verdict = await agent.ripple_verdict(
+            field_snapshot={}, wave_number=1, propagation_history="",
+        )
+
+        assert mock_llm_caller.call_count == 2
+        assert verdict.failed_verdict is False
+        assert verdict.simulated_time_elapsed == "4"
+        assert verdict.activated_agents[0].incoming_ripple_energy == 0.4
+
+    @pytest.mark.asyncio
+    async def test_ripple_verdict_lenient_fallback_accepts_loose_shape(self):
+        """结构校验不通过但宽松解析可接受的裁决不应重试。
+        / A verdict the schema rejects but the lenient parse accepts is not retried."""
+        loose = {
+            "wave_number": 1,
+            "simulated_time_elapsed": "2h",
+            "continue_propagation": True,
+            "global_observation": {"summary": "x"},
+            "activated_agents": [
+                {"agent_id": "sea_1", "incoming_ripple_energy": 0.3,
+                 "activation_reason": "兴趣匹配"},
+            ],
+        }
+        mock_llm_caller = AsyncMock(return_value=json.dumps(loose))
+        agent = OmniscientAgent(llm_caller=mock_llm_caller)
+        verdict = await agent.ripple_verdict(
+            field_snapshot={}, wave_number=1, propagation_history="",
+        )
+
+        assert mock_llm_caller.call_count == 1
+        assert verdict.failed_verdict is False
+        assert verdict.activated_agents[0].agent_id == "sea_1"
+
+
 class TestOmniscientObserve:
     @pytest.mark.asyncio
     async def test_observe_detects_emergence(self):
@@ -300,6 +485,19 @@ class TestOmniscientObserve:
         assert "explosion" in obs["phase_vector"]["heat"]
 
 
+    @pytest.mark.asyncio
+    async def test_observe_skips_llm_after_failed_verdict(self):
+        """裁决失败后 OBSERVE 不应调用 LLM。 / OBSERVE should not call the LLM after a failed verdict."""
+        mock_llm_caller = AsyncMock()
+        agent = OmniscientAgent(llm_caller=mock_llm_caller)
+        obs = await agent.observe(
+            field_snapshot={"last_verdict_failed": True}, full_history="",
+        )
+
+        assert mock_llm_caller.call_count == 0
+        assert obs["phase_vector"]["heat"] == "unknown"
+
+
 class TestOmniscientSynthesizeResult:
     @pytest.mark.asyncio
     async def test_synthesize_result(self):
@@ -324,6 +522,22 @@ class TestOmniscientSynthesizeResult:
         assert len(result["timeline"]) == 1
 
 
+    @pytest.mark.asyncio
+    async def test_synthesize_skips_llm_after_failed_verdict(self):
+        """裁决失败后 SYNTHESIZE 应直接返回降级结果。 / SYNTHESIZE returns a degraded result after a failed verdict."""
+        mock_llm_caller = AsyncMock()
+        agent = OmniscientAgent(llm_caller=mock_llm_caller)
+        result = await agent.synthesize_result(
+            field_snapshot={"last_verdict_failed": True},
+            observation={},
+            simulation_input={"event": {"description": "test"}},
+        )
+
+        assert mock_llm_caller.call_count == 0
+        assert result["prediction"]["degraded"] is True
+        assert result["timeline"] == []
+
+
 class TestOmniscientObservePrompt:
     @pytest.mark.asyncio
     async def test_observe_prompt_constrains_heat_values(self):
@@ -596,6 +810,18 @@ class TestOmniscientWave0Hint:
         prompt = calls[0]
         assert "首轮传播注意" not in prompt
 
+    def test_ripple_system_prompt_is_static_across_waves(self):
+        """RIPPLE system_prompt 应跨 wave 不变，首轮提示位于 user_prompt 尾部。 / RIPPLE system_prompt is wave-invariant; the first-wave hint sits at the user_prompt tail."""
+        agent = OmniscientAgent(llm_caller=AsyncMock())
+        snapshot = {"stars": {}, "seas": {"sea_1": {"description": "群体"}}}
+        sys0, user0 = agent._build_ripple_prompt(snapshot, 0, "history")
+        sys1, user1 = agent._build_ripple_prompt(snapshot, 1, "history")
+
+        assert sys0 == sys1
+        assert "首轮传播注意" not in sys0
+        assert "## 首轮传播注意" in user0
+        assert user0.index("## 首轮传播注意") > user0.index("sea_1")
+
 
 class TestOmniscientSynthDualTemplate:
     @pytest.mark.asyncio
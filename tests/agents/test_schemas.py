@@ -0,0 +1,42 @@
+# tests/agents/test_schemas.py
+# 全视者输出校验模型测试 / Omniscient output schema tests
+from collections import OrderedDict
+
+import pytest
+
+from ripple.agents.schemas import VERDICT_ADAPTER, _safe_float
+
+
+class TestSafeFloat:
+    @pytest.mark.parametrize("value, expected", [
+        (0.25, 0.25),
+        (1, 1.0),
+        (True, 1.0),
+        (False, 0.0),
+        ("0.5", 0.5),
+        ("high", 0.0),
+        ({"value": 0.3}, 0.3),
+        ({"score": 2}, 2.0),
+        ({"energy": True}, 1.0),
+        ({"label": 0.9}, 0.0),
+        (OrderedDict(energy=0.7), 0.7),
+        (None, 0.0),
+        ([0.5], 0.0),
+    ])
+    def test_conversion(self, value, expected):
+        result = _safe_float(value)
+        assert result == expected
+        assert type(result) is float
+
+    def test_default_is_returned_for_unparseable(self):
+        assert _safe_float("n/a", default=0.5) == 0.5
+
+
+class TestVerdictAdapter:
+    def test_accepts_numeric_text_fields(self):
+        data = VERDICT_ADAPTER.validate_json('{"simulated_time_elapsed": 4}')
+        assert data["simulated_time_elapsed"] == "4"
+
+    def test_rejects_activation_without_reason(self):
+        with pytest.raises(ValueError):
+            VERDICT_ADAPTER.validate_json('{"activated_agents": [{"agent_id": "a"}]}')
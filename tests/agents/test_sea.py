@@ -142,3 +142,194 @@ class TestSeaAgent:
         system_prompt = calls[0]["system"]
         assert "默认" in system_prompt or "观察" in system_prompt
         assert "吸收" in system_prompt or "absorb" in system_prompt
+
+    @pytest.mark.asyncio
+    async def test_memory_keeps_sliding_window(self):
+        """记忆只保留最近 memory_window 条。 / Memory keeps only the latest memory_window entries."""
+        mock_llm = AsyncMock()
+        mock_llm.return_value = json.dumps({
+            "response_type": "absorb",
+            "cluster_reaction": "",
+            "outgoing_energy": 0.2,
+            "sentiment_shift": "",
+            "reasoning": "",
+        })
+
+        sea = SeaAgent(
+            agent_id="sea_1", description="test group",
+            llm_caller=mock_llm, memory_window=2,
+        )
+        for source in ("a", "b", "c"):
+            await sea.respond(
+                ripple_content="test", ripple_energy=0.5, ripple_source=source,
+            )
+
+        assert len(sea.memory) == 2
+        assert [m["ripple_source"] for m in sea.memory] == ["b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_respond_batch_bounds_concurrency_and_keeps_order(self):
+        """批量响应受并发上限约束且按输入顺序返回。 / Batch respond honors the concurrency cap and input order."""
+        import asyncio
+
+        active = 0
+        peak = 0
+
+        def make_caller(energy):
+            async def caller(*, system_prompt="", user_prompt=""):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                return json.dumps({
+                    "response_type": "amplify",
+                    "outgoing_energy": energy,
+                })
+            return caller
+
+        seas = [
+            SeaAgent(
+                agent_id=f"sea_{i}", description="group",
+                llm_caller=make_caller(i / 10), max_retries=0,
+            )
+            for i in range(6)
+        ]
+        ripples = [
+            {"ripple_content": "c", "ripple_energy": 0.5, "ripple_source": "s"}
+            for _ in seas
+        ]
+
+        results = await SeaAgent.respond_batch(seas, ripples, concurrency=2)
+
+        assert peak == 2
+        assert [r["outgoing_energy"] for r in results] == [i / 10 for i in range(6)]
+
+    @pytest.mark.asyncio
+    async def test_respond_batch_maps_errors_to_fallback(self, monkeypatch):
+        """单个 Agent 异常降级为 ignore。 / A failing agent degrades to ignore."""
+        ok = SeaAgent(
+            agent_id="ok", description="group",
+            llm_caller=AsyncMock(return_value=json.dumps({
+                "response_type": "absorb", "outgoing_energy": 0.3,
+            })),
+        )
+        broken = SeaAgent(
+            agent_id="broken", description="group", llm_caller=AsyncMock(),
+        )
+        monkeypatch.setattr(broken, "respond", AsyncMock(side_effect=RuntimeError("boom")))
+        ripple = {"ripple_content": "c", "ripple_energy": 0.5, "ripple_source": "s"}
+
+        results = await SeaAgent.respond_batch([ok, broken], [ripple, ripple])
+
+        assert results[0]["response_type"] == "absorb"
+        assert results[1]["response_type"] == "ignore"
+        assert results[1]["outgoing_energy"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_memory_goes_to_user_prompt_and_system_stays_static(self):
+        """记忆进入用户提示词，system 提示词各轮不变。 / Memory goes to the user prompt; the system prompt is static."""
+        calls = []
+
+        async def tracking_caller(*, system_prompt="", user_prompt=""):
+            calls.append({"system": system_prompt, "user": user_prompt})
+            return json.dumps({"response_type": "absorb", "outgoing_energy": 0.2})
+
+        sea = SeaAgent(
+            agent_id="sea_test", description="测试群体",
+            llm_caller=tracking_caller, system_prompt_template="[skill]\n",
+        )
+        for source in ("star_a", "star_b"):
+            await sea.respond(
+                ripple_content="c", ripple_energy=0.5, ripple_source=source,
+            )
+
+        assert calls[0]["system"] == calls[1]["system"]
+        assert calls[0]["system"].startswith("[skill]\n")
+        assert "近期群体记忆" not in calls[0]["user"]
+        assert "近期群体记忆" in calls[1]["user"]
+        assert "star_a" in calls[1]["user"]
+        assert calls[1]["user"].index("star_a") < calls[1]["user"].index("收到涟漪")
+
+    @pytest.mark.asyncio
+    async def test_low_energy_ripple_skips_llm(self):
+        """低于激活阈值的涟漪不调用 LLM。 / Ripples below the activation threshold skip the LLM."""
+        mock_llm = AsyncMock()
+        sea = SeaAgent(
+            agent_id="sea_1", description="group", llm_caller=mock_llm, ignore_threshold=0.1,
+        )
+
+        response = await sea.respond(
+            ripple_content="c", ripple_energy=0.05, ripple_source="s",
+        )
+
+        assert response["response_type"] == "ignore"
+        assert response["outgoing_energy"] == 0.0
+        mock_llm.assert_not_called()
+        assert len(sea.memory) == 0
+
+    @pytest.mark.asyncio
+    async def test_low_energy_ripple_calls_llm_by_default(self):
+        """默认不设激活阈值，弱涟漪仍由 LLM 判断。 / With no threshold by default, weak ripples still go to the LLM."""
+        mock_llm = AsyncMock(return_value=json.dumps({
+            "response_type": "absorb", "outgoing_energy": 0.01,
+        }))
+        sea = SeaAgent(agent_id="sea_1", description="group", llm_caller=mock_llm)
+
+        response = await sea.respond(
+            ripple_content="c", ripple_energy=0.05, ripple_source="s",
+        )
+
+        assert response["response_type"] == "absorb"
+        mock_llm.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_repeated_ignored_ripple_reuses_memory(self):
+        """重复且曾被忽略的涟漪复用历史响应。 / A repeated, previously ignored ripple reuses the stored response."""
+        mock_llm = AsyncMock(return_value=json.dumps({
+            "response_type": "ignore",
+            "cluster_reaction": "无人关注",
+            "outgoing_energy": 0.0,
+        }))
+        sea = SeaAgent(
+            agent_id="sea_1", description="group", llm_caller=mock_llm,
+            reuse_ignored_responses=True,
+        )
+
+        first = await sea.respond(ripple_content="c", ripple_energy=0.5, ripple_source="s")
+        second = await sea.respond(ripple_content="c", ripple_energy=0.4, ripple_source="s")
+        await sea.respond(ripple_content="other", ripple_energy=0.5, ripple_source="s")
+
+        assert second == first
+        assert mock_llm.await_count == 2
+        # 复用的重复曝光仍写入记忆 / The reused repeat exposure is still remembered
+        assert [m["ripple_energy"] for m in sea.memory] == [0.5, 0.4, 0.5]
+
+    @pytest.mark.asyncio
+    async def test_repeated_ripple_at_higher_energy_calls_llm(self):
+        """重复涟漪能量更高时重新调用 LLM。 / A repeated ripple at higher energy calls the LLM again."""
+        mock_llm = AsyncMock(return_value=json.dumps({
+            "response_type": "ignore", "outgoing_energy": 0.0,
+        }))
+        sea = SeaAgent(
+            agent_id="sea_1", description="group", llm_caller=mock_llm,
+            reuse_ignored_responses=True,
+        )
+
+        await sea.respond(ripple_content="c", ripple_energy=0.2, ripple_source="s")
+        await sea.respond(ripple_content="c", ripple_energy=0.8, ripple_source="s")
+
+        assert mock_llm.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_repeated_ripple_calls_llm_by_default(self):
+        """默认不复用历史响应。 / Responses are not reused by default."""
+        mock_llm = AsyncMock(return_value=json.dumps({
+            "response_type": "ignore", "outgoing_energy": 0.0,
+        }))
+        sea = SeaAgent(agent_id="sea_1", description="group", llm_caller=mock_llm)
+
+        await sea.respond(ripple_content="c", ripple_energy=0.5, ripple_source="s")
+        await sea.respond(ripple_content="c", ripple_energy=0.5, ripple_source="s")
+
+        assert mock_llm.await_count == 2
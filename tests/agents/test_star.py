@@ -3,7 +3,8 @@
 import pytest
 import json
 from unittest.mock import AsyncMock
-from ripple.agents.star import StarAgent
+from ripple.agents.star import FALLBACK_RESPONSE, StarAgent
+from ripple.llm.cache import ResponseCache
 
 
 class TestStarAgent:
@@ -102,3 +103,75 @@ class TestStarAgent:
 
         assert response["response_type"] == "ignore"
         assert response["outgoing_energy"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_response_cache_skips_identical_call(self):
+        """相同提示词命中响应缓存，不再调用 LLM。 / Identical prompts hit the response cache without an LLM call."""
+        mock_llm = AsyncMock(return_value=json.dumps({
+            "response_type": "comment", "response_content": "好",
+            "outgoing_energy": 0.4, "reasoning": "r",
+        }))
+        cache = ResponseCache()
+        kwargs = dict(ripple_content="test", ripple_energy=0.5, ripple_source="sea_a")
+
+        first = await StarAgent("star_1", "test", mock_llm, response_cache=cache).respond(**kwargs)
+        second = await StarAgent("star_1", "test", mock_llm, response_cache=cache).respond(**kwargs)
+
+        assert first == second
+        assert mock_llm.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_is_read_only_and_returned_as_copy(self):
+        """降级响应只读；返回值是可修改、可序列化的副本。 / The fallback is read-only; callers get a mutable, serializable copy."""
+        star = StarAgent("star_1", "test", AsyncMock(return_value="not json"))
+        response = await star.respond(ripple_content="test", ripple_energy=0.5, ripple_source="sea_a")
+        assert response == dict(FALLBACK_RESPONSE)
+        response["outgoing_energy"] = 1.0
+        json.dumps(response)
+        with pytest.raises(TypeError):
+            FALLBACK_RESPONSE["outgoing_energy"] = 1.0  # type: ignore[index]
+        assert star.memory[-1]["my_response"] is FALLBACK_RESPONSE
+
+    @pytest.mark.asyncio
+    async def test_unparseable_response_is_not_cached(self):
+        """解析失败的输出不写入缓存。 / Unparseable output is never cached."""
+        mock_llm = AsyncMock(return_value="not json")
+        cache = ResponseCache()
+        star = StarAgent("star_1", "test", mock_llm, response_cache=cache)
+        await star.respond(ripple_content="test", ripple_energy=0.5, ripple_source="sea_a")
+        assert len(cache) == 0
+
+    def test_parse_response_strips_code_fence(self):
+        """围栏包裹的 JSON 与裸 JSON 解析一致。 / Fenced JSON parses the same as bare JSON."""
+        star = StarAgent(agent_id="star_1", description="test", llm_caller=AsyncMock())
+        body = json.dumps({"response_type": "create", "outgoing_energy": 0.6})
+        assert star._parse_response(f"```json\n{body}\n```") == star._parse_response(body)
+        assert star._parse_response(f"```\n{body}\n```  ")["response_type"] == "create"
+
+    @pytest.mark.parametrize("raw, expected", [
+        (-0.5, 0.0), (0.4, 0.4), (1.7, 1.0), ("0.25", 0.25), (float("nan"), 1.0),
+    ])
+    def test_parse_response_clamps_energy(self, raw, expected):
+        """能量钳制到 [0, 1]。 / Energy is clamped to [0, 1]."""
+        star = StarAgent(agent_id="star_1", description="test", llm_caller=AsyncMock())
+        body = json.dumps({"response_type": "comment", "outgoing_energy": raw})
+        assert star._parse_response(body)["outgoing_energy"] == expected
+
+    @pytest.mark.asyncio
+    async def test_memory_window_is_bounded_by_default(self):
+        """默认只保留近期窗口，计数仍累计。 / Only the recent window is kept by default; the count keeps growing."""
+        mock_llm = AsyncMock(return_value=json.dumps({"response_type": "ignore"}))
+        star = StarAgent(agent_id="star_1", description="test", llm_caller=mock_llm)
+        full = StarAgent(
+            agent_id="star_2", description="test", llm_caller=mock_llm,
+            keep_full_history=True,
+        )
+        for i in range(8):
+            await star.respond(ripple_content=f"r{i}", ripple_energy=0.5, ripple_source="sea_a")
+            await full.respond(ripple_content=f"r{i}", ripple_energy=0.5, ripple_source="sea_a")
+
+        assert len(star.memory) == 5
+        assert star.memory[0]["ripple_content"] == "r3"
+        assert star.memory_count == full.memory_count == 8
+        assert len(full.memory) == 8
+        assert star._build_system_prompt() == full._build_system_prompt()
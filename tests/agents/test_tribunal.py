@@ -1,10 +1,12 @@
 """Tests for TribunalAgent."""
 
+import asyncio
 import json
 import pytest
 from unittest.mock import AsyncMock
 
-from ripple.agents.tribunal import TribunalAgent
+from ripple.agents.tribunal import TribunalAgent, evaluate_panel, revise_panel
+from ripple.llm.cache import ResponseCache
 from ripple.primitives.pmf_models import TribunalOpinion
 
 
@@ -70,6 +72,36 @@ class TestTribunalAgentEvaluate:
         assert opinion.scores["demand_resonance"] == 3
         assert "第一行 第二行" in opinion.narrative
 
+    @pytest.mark.asyncio
+    async def test_truncated_output_is_repaired_without_recall(self, agent, mock_llm_caller):
+        """截断但评分完整的输出本地修复，不再调用 LLM。 / Truncated output with complete scores is repaired locally."""
+        mock_llm_caller.return_value = (
+            '{"scores": {"demand_resonance": 4}, "narrative": "Strong pull from'
+        )
+        opinion = await agent.evaluate(
+            evidence="Evidence text",
+            dimensions=["demand_resonance"],
+            rubric="rubric text",
+        )
+        assert opinion.scores == {"demand_resonance": 4}
+        assert opinion.narrative == "Strong pull from"
+        assert mock_llm_caller.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_truncated_scores_still_retry(self, agent, mock_llm_caller):
+        """截断在评分中间时仍重新调用。 / Truncation inside the scores still re-calls the LLM."""
+        mock_llm_caller.side_effect = [
+            '{"scores": {"demand_resonance": 4, "propagation_pot',
+            json.dumps({"scores": {"demand_resonance": 4, "propagation_potential": 2}}),
+        ]
+        opinion = await agent.evaluate(
+            evidence="Evidence text",
+            dimensions=["demand_resonance", "propagation_potential"],
+            rubric="rubric text",
+        )
+        assert opinion.scores["propagation_potential"] == 2
+        assert mock_llm_caller.await_count == 2
+
 
 class TestTribunalAgentChallenge:
     @pytest.mark.asyncio
@@ -131,3 +163,149 @@ class TestTribunalAgentPromptStratification:
         )
         call_kwargs = mock_llm_caller.call_args
         assert call_kwargs.kwargs["system_prompt"] == "SYSTEM_MARKER"
+
+
+    @pytest.mark.asyncio
+    async def test_prebound_rubric_matches_explicit_arguments(self, mock_llm_caller):
+        mock_llm_caller.return_value = json.dumps({"scores": {"d": 3}, "narrative": "ok"})
+        agent = TribunalAgent(role="Analyst", perspective="p", expertise="e", llm_caller=mock_llm_caller)
+        with pytest.raises(ValueError):
+            await agent.evaluate("e")
+
+        await agent.evaluate("e", ["d"], "r")
+        explicit_prompt = mock_llm_caller.call_args.kwargs["user_prompt"]
+        agent.prebind_rubric(["d"], "r")
+        opinion = await agent.evaluate("e")
+        assert mock_llm_caller.call_args.kwargs["user_prompt"] == explicit_prompt
+        assert opinion.scores == {"d": 3}
+
+
+class TestTribunalResponseCache:
+    @pytest.mark.asyncio
+    async def test_repeated_evaluation_hits_cache(self, mock_llm_caller):
+        mock_llm_caller.return_value = json.dumps({"scores": {"demand": 4}, "narrative": "ok"})
+        agent = TribunalAgent(
+            role="MarketAnalyst", perspective="p", expertise="e",
+            llm_caller=mock_llm_caller, response_cache=ResponseCache(),
+        )
+        first = await agent.evaluate("evidence", ["demand"], "rubric")
+        second = await agent.evaluate("evidence", ["demand"], "rubric")
+        assert first.scores == second.scores == {"demand": 4}
+        assert mock_llm_caller.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_reworded_challenge_hits_semantic_cache(self, mock_llm_caller):
+        mock_llm_caller.return_value = json.dumps({"challenge": "Market too small"})
+
+        async def embed(text):
+            return [1.0, 0.0]
+
+        agent = TribunalAgent(
+            role="DevilsAdvocate", perspective="p", expertise="e",
+            llm_caller=mock_llm_caller, response_cache=ResponseCache(embed_fn=embed),
+        )
+        opinion = TribunalOpinion(member_role="A", scores={"demand": 4}, narrative="Strong demand", round_number=0)
+        reworded = TribunalOpinion(member_role="A", scores={"demand": 4}, narrative="Strong  demand.", round_number=1)
+
+        assert await agent.challenge(opinion) == "Market too small"
+        assert await agent.challenge(reworded) == "Market too small"
+        assert mock_llm_caller.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_challenge_with_different_scores_misses_semantic_cache(self, mock_llm_caller):
+        mock_llm_caller.return_value = json.dumps({"challenge": "Market too small"})
+
+        async def embed(text):
+            return [1.0, 0.0]
+
+        agent = TribunalAgent(
+            role="DevilsAdvocate", perspective="p", expertise="e",
+            llm_caller=mock_llm_caller, response_cache=ResponseCache(embed_fn=embed),
+        )
+        strong = TribunalOpinion(member_role="A", scores={"demand": 4}, narrative="Strong demand", round_number=0)
+        weak = TribunalOpinion(member_role="A", scores={"demand": 2}, narrative="Strong demand", round_number=0)
+
+        await agent.challenge(strong)
+        await agent.challenge(weak)
+        assert mock_llm_caller.await_count == 2
+
+
+class TestPanelFanOut:
+    @staticmethod
+    def _tracking_caller(reply):
+        state = {"in_flight": 0, "peak": 0}
+
+        async def caller(*, system_prompt="", user_prompt=""):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return reply
+
+        return caller, state
+
+    @staticmethod
+    def _panel(caller, n=3):
+        return [
+            TribunalAgent(role=f"R{i}", perspective="p", expertise="e", llm_caller=caller)
+            for i in range(n)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_evaluate_panel_runs_members_concurrently_in_order(self):
+        caller, state = self._tracking_caller(json.dumps({"scores": {"demand": 4}, "narrative": "n"}))
+        opinions = await evaluate_panel(
+            self._panel(caller), evidence="e", dimensions=["demand"], rubric="r",
+        )
+        assert [o.member_role for o in opinions] == ["R0", "R1", "R2"]
+        assert state["peak"] == 3
+
+    @pytest.mark.asyncio
+    async def test_revise_panel_respects_shared_semaphore(self):
+        caller, state = self._tracking_caller(json.dumps({"scores": {"demand": 3}, "narrative": "n"}))
+        members = self._panel(caller)
+        original = TribunalOpinion(member_role="x", scores={"demand": 4}, narrative="n", round_number=0)
+        revised = await revise_panel(
+            [(m, original, ["c"]) for m in members],
+            round_number=1,
+            semaphore=asyncio.Semaphore(1),
+        )
+        assert [o.member_role for o in revised] == ["R0", "R1", "R2"]
+        assert all(o.round_number == 1 for o in revised)
+        assert state["peak"] == 1
+
+
+class TestTransientRetry:
+    @pytest.mark.asyncio
+    async def test_rate_limited_evaluate_backs_off_then_succeeds(self, monkeypatch):
+        import httpx
+        from ripple.llm import backoff
+
+        slept = []
+
+        async def fake_sleep(delay):
+            slept.append(delay)
+
+        monkeypatch.setattr(backoff.asyncio, "sleep", fake_sleep)
+        request = httpx.Request("POST", "https://example.invalid")
+        rate_limited = httpx.HTTPStatusError(
+            "429", request=request, response=httpx.Response(429, request=request),
+        )
+        caller = AsyncMock(side_effect=[
+            rate_limited,
+            json.dumps({"scores": {"demand": 5}, "narrative": "ok"}),
+        ])
+        agent = TribunalAgent(role="R", perspective="p", expertise="e", llm_caller=caller)
+
+        opinion = await agent.evaluate("evidence", ["demand"], "rubric")
+
+        assert opinion.scores == {"demand": 5}
+        assert len(slept) == 1
+
+    @pytest.mark.asyncio
+    async def test_non_transient_call_error_propagates(self):
+        caller = AsyncMock(side_effect=RuntimeError("LLM 调用次数已达上限"))
+        agent = TribunalAgent(role="R", perspective="p", expertise="e", llm_caller=caller)
+        with pytest.raises(RuntimeError):
+            await agent.evaluate("evidence", ["demand"], "rubric")
+        assert caller.await_count == 1
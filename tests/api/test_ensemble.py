@@ -1,6 +1,8 @@
 # tests/api/test_ensemble.py
 """Tests for ensemble runner and statistical aggregation."""
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, patch
 
@@ -8,8 +10,11 @@ from ripple.api.ensemble import (
     compute_fleiss_kappa,
     compute_median_iqr,
     aggregate_ordinal_scores,
+    build_ratings_matrix,
     EnsembleRunner,
 )
+from ripple.llm.http_pool import PooledHTTPClient
+from ripple.llm.rate_limit import TokenBucket
 
 
 class TestStatisticalUtils:
@@ -23,6 +28,11 @@ class TestStatisticalUtils:
         assert median == 2.5
         assert iqr == 2  # Q3(3.5) - Q1(1.5) = 2
 
+    def test_compute_median_iqr_unsorted_odd_includes_median(self):
+        median, iqr = compute_median_iqr([7, 3, 1, 6, 2, 5, 4])
+        assert median == 4
+        assert iqr == 3  # Q3(5.5) - Q1(2.5) = 3
+
     def test_compute_median_iqr_single(self):
         median, iqr = compute_median_iqr([4])
         assert median == 4
@@ -42,6 +52,13 @@ class TestStatisticalUtils:
         kappa = compute_fleiss_kappa(ratings)
         assert kappa < 0.1
 
+    def test_fleiss_kappa_unanimous_items_across_categories(self):
+        # 每个条目全票一致（类别各不相同）/ Every item unanimous, in different categories
+        assert compute_fleiss_kappa([[3, 0, 0], [0, 3, 0], [0, 0, 3]]) == 1.0
+
+    def test_fleiss_kappa_malformed_rows_return_zero(self):
+        assert compute_fleiss_kappa([[3, 0, 0], [1, 1, 0]]) == 0.0
+
     def test_fleiss_kappa_multi_item(self):
         # 3 items, 3 raters each, 3 categories.
         # Item 1: all agree on cat 0. Item 2: split. Item 3: all agree on cat 1.
@@ -78,3 +95,125 @@ class TestEnsembleRunner:
         results = await runner.run(event="test product", skill="pmf-validation")
         assert len(results) == 3
         assert mock_simulate.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runner_overlaps_runs_and_keeps_seed_order(self):
+        in_flight = 0
+        peak = 0
+
+        async def fake_simulate(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 * (4 - kwargs["random_seed"]))
+            in_flight -= 1
+            return {"seed": kwargs["random_seed"]}
+
+        runner = EnsembleRunner(
+            simulate_fn=fake_simulate, concurrent=True, max_concurrency=2,
+        )
+        results = await runner.run(seeds=[1, 2, 3])
+        assert [r["seed"] for r in results] == [1, 2, 3]
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runner_drops_failed_runs(self):
+        async def fake_simulate(**kwargs):
+            if kwargs["random_seed"] == 2:
+                raise RuntimeError("boom")
+            return {"seed": kwargs["random_seed"]}
+
+        runner = EnsembleRunner(simulate_fn=fake_simulate, concurrent=True)
+        results = await runner.run(seeds=[1, 2, 3])
+        assert [r["seed"] for r in results] == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_shared_connections_inject_one_pool_and_close_it(self):
+        pools = []
+
+        async def fake_simulate(**kwargs):
+            pools.append(kwargs["http_pool"])
+            assert "rate_limiter" not in kwargs
+            return {"seed": kwargs["random_seed"]}
+
+        runner = EnsembleRunner(
+            simulate_fn=fake_simulate, concurrent=True, share_connections=True,
+        )
+        with patch.object(PooledHTTPClient, "aclose", AsyncMock()) as closed:
+            await runner.run(seeds=[1, 2, 3])
+        assert len(pools) == 3
+        assert all(p is pools[0] for p in pools)
+        closed.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_external_pool_and_qps_limiter_are_shared(self):
+        pool = PooledHTTPClient()
+        seen = []
+
+        async def fake_simulate(**kwargs):
+            seen.append((kwargs["http_pool"], kwargs["rate_limiter"]))
+            return {}
+
+        runner = EnsembleRunner(
+            simulate_fn=fake_simulate, num_runs=2, http_pool=pool, qps=5.0,
+        )
+        with patch.object(PooledHTTPClient, "aclose", AsyncMock()) as closed:
+            await runner.run()
+        assert all(p is pool for p, _ in seen)
+        assert isinstance(seen[0][1], TokenBucket)
+        assert seen[0][1] is seen[1][1]
+        # 外部连接池由调用方关闭 / The caller owns an injected pool
+        closed.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_resumes_completed_runs(self, tmp_path):
+        path = tmp_path / "ensemble.jsonl"
+        calls = []
+
+        async def flaky_simulate(**kwargs):
+            calls.append(kwargs["random_seed"])
+            if kwargs["random_seed"] == 2:
+                raise RuntimeError("crash")
+            return {"seed": kwargs["random_seed"]}
+
+        runner = EnsembleRunner(simulate_fn=flaky_simulate)
+        first = await runner.run(seeds=[1, 2, 3], output_jsonl=str(path))
+        assert [r["seed"] for r in first] == [1, 3]
+        # 模拟崩溃留下的半行 / A truncated line left by a crash
+        with path.open("a", encoding="utf-8") as fh:
+            fh.write('{"seed": 9, "_run"')
+
+        async def ok_simulate(**kwargs):
+            calls.append(kwargs["random_seed"])
+            return {"seed": kwargs["random_seed"]}
+
+        runner = EnsembleRunner(simulate_fn=ok_simulate, concurrent=True)
+        second = await runner.run(seeds=[1, 2, 3], output_jsonl=str(path))
+        assert [r["seed"] for r in second] == [1, 2, 3]
+        assert calls == [1, 2, 3, 2]
+        assert all("_seed" not in r and "_run" not in r for r in second)
+
+        # 截断行之后追加的记录仍可读回 / The record appended after the truncated line still loads
+        third = await runner.run(seeds=[1, 2, 3], output_jsonl=str(path))
+        assert [r["seed"] for r in third] == [1, 2, 3]
+        assert calls == [1, 2, 3, 2]
+
+
+class TestBuildRatingsMatrix:
+    def test_counts_runs_per_category(self):
+        runs = [{"demand": 4, "risk": 2}, {"demand": "4", "risk": 3}, {"demand": 5, "risk": 3}]
+        assert build_ratings_matrix(runs, ["demand", "risk"]) == [
+            [0, 0, 0, 2, 1],
+            [0, 1, 2, 0, 0],
+        ]
+
+    def test_skips_dimensions_with_invalid_scores(self):
+        runs = [{"a": 1, "b": 6, "c": "x"}, {"a": 2, "b": 3, "c": 2}]
+        assert build_ratings_matrix(runs, ["a", "b", "c", "d"]) == [[1, 1, 0, 0, 0]]
+
+    def test_fast_and_coercing_paths_agree(self):
+        runs = [{"a": 3, "b": 4.0, "c": [1]}, {"a": 3, "b": True, "c": 2}, {"a": 5, "b": 4.7, "c": 2}]
+        assert build_ratings_matrix(runs, ["a", "b", "c"]) == [
+            [0, 0, 2, 0, 1],
+            [1, 0, 0, 2, 0],
+        ]
@@ -5,6 +5,9 @@ Verifies:
 - ensemble aggregation is attached to the returned result
 """
 
+import asyncio
+import threading
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -35,6 +38,7 @@ class TestSimulateEnsembleAggregation:
             MockSM.return_value.load.return_value = mock_skill
 
             mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
             mock_router.check_budget.return_value = True
             mock_router.budget = MagicMock(max_calls=200)
             mock_router.get_model_backend.return_value = AsyncMock(
@@ -81,3 +85,153 @@ class TestSimulateEnsembleAggregation:
             assert recorder.begin_ensemble_run.call_count == 3
             assert recorder.end_ensemble_run.call_count == 3
 
+
+    @pytest.mark.asyncio
+    async def test_ensemble_runs_overlap_and_stop_on_budget(self):
+        with patch("ripple.api.simulate.SkillManager") as MockSM, \
+             patch("ripple.api.simulate.ModelRouter") as MockRouter, \
+             patch("ripple.api.simulate.SimulationRuntime") as MockRuntime, \
+             patch("ripple.api.simulate.SimulationRecorder") as MockRecorder, \
+             patch("ripple.api.simulate.ENSEMBLE_CONCURRENCY", 2):
+
+            mock_skill = MagicMock()
+            mock_skill.name = "pmf-validation"
+            mock_skill.platform_profiles = {}
+            mock_skill.channel_profiles = {}
+            mock_skill.prompts = {"tribunal": "tribunal prompt"}
+            mock_skill.rubrics = {}
+            MockSM.return_value.load.return_value = mock_skill
+
+            mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
+            mock_router.budget = MagicMock(max_calls=200)
+            MockRouter.return_value = mock_router
+
+            in_flight = 0
+            peak = 0
+            started = []
+
+            async def fake_run(inp, run_id):
+                nonlocal in_flight, peak
+                started.append(run_id)
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                if run_id.endswith("r2"):
+                    raise RuntimeError("LLM 调用次数已达上限（角色: star）")
+                return {"total_waves": 1, "grade": "A"}
+
+            MockRuntime.return_value.run = fake_run
+
+            result = await simulate(
+                event={"description": "test"},
+                skill="pmf-validation",
+                ensemble_runs=4,
+            )
+
+            # 前两个 run 并发；预算耗尽后尚未开始的 run 被跳过
+            # / The first two runs overlap; runs not yet started are skipped once the budget is gone
+            assert peak == 2
+            assert len(started) == 2
+            assert result["ensemble_runs_completed"] == 1
+            recorder = MockRecorder.return_value
+            assert recorder.begin_ensemble_run.call_count == 2
+            assert recorder.end_ensemble_run.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_recorder_flushes_run_off_event_loop(self):
+        with patch("ripple.api.simulate.SkillManager") as MockSM, \
+             patch("ripple.api.simulate.ModelRouter") as MockRouter, \
+             patch("ripple.api.simulate.SimulationRuntime") as MockRuntime, \
+             patch("ripple.api.simulate.SimulationRecorder") as MockRecorder:
+
+            mock_skill = MagicMock()
+            mock_skill.name = "pmf-validation"
+            mock_skill.platform_profiles = {}
+            mock_skill.channel_profiles = {}
+            mock_skill.prompts = {"tribunal": "tribunal prompt"}
+            mock_skill.rubrics = {}
+            MockSM.return_value.load.return_value = mock_skill
+
+            mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
+            mock_router.budget = MagicMock(max_calls=200)
+            MockRouter.return_value = mock_router
+
+            MockRuntime.return_value.run = AsyncMock(
+                return_value={"total_waves": 1, "grade": "A"}
+            )
+
+            threads = {}
+            recorder = MockRecorder.return_value
+            for name in (
+                "record_simulation_input", "begin_ensemble_run",
+                "record_synthesis", "finalize",
+            ):
+                getattr(recorder, name).side_effect = (
+                    lambda *a, _n=name, **k: threads.setdefault(_n, threading.get_ident())
+                )
+
+            await simulate(
+                event={"description": "test"},
+                skill="pmf-validation",
+                ensemble_runs=2,
+            )
+
+            loop_thread = threading.get_ident()
+            # 运行前后的落盘进入工作线程；运行边界留在事件循环上串行
+            # / Writes before/after the runs go to a worker thread; run boundaries stay on the loop
+            assert threads["record_simulation_input"] != loop_thread
+            assert threads["record_synthesis"] != loop_thread
+            assert threads["finalize"] != loop_thread
+            assert threads["begin_ensemble_run"] == loop_thread
+
+
+    @pytest.mark.asyncio
+    async def test_ensemble_runs_serially_by_default_and_keep_finished_runs(self):
+        with patch("ripple.api.simulate.SkillManager") as MockSM, \
+             patch("ripple.api.simulate.ModelRouter") as MockRouter, \
+             patch("ripple.api.simulate.SimulationRuntime") as MockRuntime, \
+             patch("ripple.api.simulate.SimulationRecorder"):
+
+            mock_skill = MagicMock()
+            mock_skill.name = "pmf-validation"
+            mock_skill.platform_profiles = {}
+            mock_skill.channel_profiles = {}
+            mock_skill.prompts = {"tribunal": "tribunal prompt"}
+            mock_skill.rubrics = {}
+            MockSM.return_value.load.return_value = mock_skill
+
+            mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
+            mock_router.budget = MagicMock(max_calls=200)
+            MockRouter.return_value = mock_router
+
+            in_flight = 0
+            peak = 0
+            started = []
+
+            async def fake_run(inp, run_id):
+                nonlocal in_flight, peak
+                started.append(run_id)
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                if run_id.endswith("r3"):
+                    raise RuntimeError("LLM 调用次数已达上限（角色: star）")
+                return {"total_waves": 1, "grade": "A"}
+
+            MockRuntime.return_value.run = fake_run
+
+            result = await simulate(
+                event={"description": "test"},
+                skill="pmf-validation",
+                ensemble_runs=4,
+            )
+
+            # 串行：预算耗尽前完成的 run 全部保留 / Serial: runs finished before exhaustion are all kept
+            assert peak == 1
+            assert [r[-2:] for r in started] == ["r1", "r2", "r3"]
+            assert result["ensemble_runs_completed"] == 2
@@ -26,6 +26,7 @@ class TestSimulateChannelParam:
             MockSM.return_value.load.return_value = mock_skill
 
             mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
             mock_router.check_budget.return_value = True
             mock_router.budget = MagicMock(max_calls=200)
             mock_router.get_model_backend.return_value = AsyncMock(
@@ -65,6 +66,7 @@ class TestSimulateChannelParam:
             MockSM.return_value.load.return_value = mock_skill
 
             mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
             mock_router.check_budget.return_value = True
             mock_router.budget = MagicMock(max_calls=200)
             mock_router.get_model_backend.return_value = AsyncMock(
@@ -95,6 +97,7 @@ class TestSimulateChannelParam:
             MockSM.return_value.load.return_value = mock_skill
 
             mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
             mock_router.check_budget.return_value = True
             mock_router.budget = MagicMock(max_calls=200)
             mock_router.get_model_backend.return_value = AsyncMock(
@@ -133,6 +136,7 @@ class TestCrossEnsembleBudgetControl:
             MockSM.return_value.load.return_value = mock_skill
 
             mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
             mock_router.check_budget.return_value = True
             mock_router.budget = MagicMock(max_calls=100)
             MockRouter.return_value = mock_router
@@ -151,6 +155,80 @@ class TestCrossEnsembleBudgetControl:
             assert isinstance(result, dict)
 
 
+class TestSharedRouterAndSkillManager:
+    @pytest.mark.asyncio
+    async def test_injected_router_and_skill_manager_are_reused(self):
+        """传入的 router / skill_manager 直接复用，且不由 simulate() 关闭。"""
+        with patch("ripple.api.simulate.SkillManager") as MockSM, \
+             patch("ripple.api.simulate.ModelRouter") as MockRouter, \
+             patch("ripple.api.simulate.SimulationRuntime") as MockRuntime, \
+             patch("ripple.api.simulate.SimulationRecorder"):
+
+            mock_skill = MagicMock()
+            mock_skill.name = "pmf-validation"
+            mock_skill.prompts = {"omniscient": "p"}
+            mock_skill.platform_profiles = {}
+            mock_skill.channel_profiles = {}
+            skill_manager = MagicMock()
+            skill_manager.load.return_value = mock_skill
+
+            router = MagicMock()
+            router.aclose = AsyncMock()
+            router.budget = MagicMock(max_calls=50, total_calls=0)
+
+            mock_runtime = AsyncMock()
+            mock_runtime.run.return_value = {"total_waves": 3}
+            MockRuntime.return_value = mock_runtime
+
+            for _ in range(2):
+                result = await simulate(
+                    event={"description": "test"},
+                    skill="pmf-validation",
+                    max_llm_calls=999,
+                    router=router,
+                    skill_manager=skill_manager,
+                )
+
+            MockSM.assert_not_called()
+            MockRouter.assert_not_called()
+            assert skill_manager.load.call_count == 2
+            router.aclose.assert_not_awaited()
+            assert result["llm_budget"]["max_calls"] == 50
+
+    @pytest.mark.asyncio
+    async def test_response_cache_reaches_runtime(self):
+        """传入的 response_cache 注入运行时。 / An injected response_cache reaches the runtime."""
+        from ripple.llm.cache import ResponseCache
+
+        with patch("ripple.api.simulate.ModelRouter") as MockRouter, \
+             patch("ripple.api.simulate.SimulationRuntime") as MockRuntime, \
+             patch("ripple.api.simulate.SimulationRecorder"):
+
+            mock_skill = MagicMock()
+            mock_skill.name = "pmf-validation"
+            mock_skill.prompts = {"omniscient": "p"}
+            mock_skill.platform_profiles = {}
+            mock_skill.channel_profiles = {}
+            skill_manager = MagicMock()
+            skill_manager.load.return_value = mock_skill
+
+            MockRouter.return_value.aclose = AsyncMock()
+            MockRouter.return_value.budget = MagicMock(max_calls=50, total_calls=0)
+            mock_runtime = AsyncMock()
+            mock_runtime.run.return_value = {"total_waves": 1}
+            MockRuntime.return_value = mock_runtime
+
+            cache = ResponseCache()
+            await simulate(
+                event={"description": "test"},
+                skill="pmf-validation",
+                skill_manager=skill_manager,
+                response_cache=cache,
+            )
+
+            assert MockRuntime.call_args.kwargs["response_cache"] is cache
+
+
 class TestModelRouterTribunalFallback:
     def test_tribunal_fallback_to_omniscient(self):
         """When tribunal role not configured, should fall back to omniscient."""
@@ -184,6 +262,38 @@ class TestVariantIsolationProtocol:
         unique_orders = set(tuple(o) for o in orders)
         assert len(unique_orders) > 1
 
+    @pytest.mark.asyncio
+    async def test_simulate_variants_runs_every_pair_with_bounded_concurrency(self):
+        import asyncio
+
+        from ripple.api.variant_isolation import simulate_variants
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_simulate(*, event, random_seed, skill):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if event == "B" and random_seed == 8:
+                raise RuntimeError("boom")
+            return {"event": event, "seed": random_seed, "skill": skill}
+
+        results = await simulate_variants(
+            fake_simulate,
+            {"A": {"event": "A"}, "B": {"event": "B"}},
+            base_seed=7,
+            runs=2,
+            max_parallel_sims=3,
+            skill="pmf-validation",
+        )
+        assert list(results) == [("A", 0), ("A", 1), ("B", 0)]
+        assert results[("A", 1)] == {"event": "A", "seed": 8, "skill": "pmf-validation"}
+        assert results[("B", 0)]["seed"] == 7
+        assert peak == 3
+
 
 class TestSocialMediaDeliberateRegistration:
     @pytest.mark.asyncio
@@ -210,6 +320,7 @@ class TestSocialMediaDeliberateRegistration:
             MockSM.return_value.load.return_value = mock_skill
 
             mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
             mock_router.check_budget.return_value = True
             mock_router.budget = MagicMock(max_calls=200)
             mock_router.get_model_backend.return_value = AsyncMock(
@@ -258,6 +369,7 @@ class TestSocialMediaDeliberateRegistration:
             MockSM.return_value.load.return_value = mock_skill
 
             mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
             mock_router.check_budget.return_value = True
             mock_router.budget = MagicMock(max_calls=200)
             mock_router.get_model_backend.return_value = AsyncMock(
@@ -7,7 +7,7 @@ import tempfile
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
-from ripple.api.simulate import simulate
+from ripple.api.simulate import _redact_simulation_input, simulate
 
 
 class TestInputRedaction:
@@ -27,6 +27,7 @@ class TestInputRedaction:
             MockSM.return_value.load.return_value = mock_skill
 
             mock_router = MagicMock()
+            mock_router.aclose = AsyncMock()
             mock_router.check_budget.return_value = True
             mock_router.budget = MagicMock(max_calls=200)
             mock_router.get_model_backend.return_value = AsyncMock(
@@ -56,6 +57,50 @@ class TestInputRedaction:
                 # Should contain product_type but not full description
                 assert "proprietary formula" not in json.dumps(recorded_input)
 
+    def test_redaction_preserves_structure_and_safe_keys(self):
+        source = {
+            "skill": "pmf-validation",
+            "event": {
+                "name": "Widget",
+                "description": "secret",
+                "price": 42,
+                "tags": ["a", {"note": "b", "product_type": "saas"}],
+            },
+            "historical": [{"text": "x", "score": 0.5}, ["y", None]],
+            "platform": {"raw": "kept as-is"},
+        }
+        assert _redact_simulation_input(source) == {
+            "skill": "pmf-validation",
+            "event": {
+                "name": "Widget",
+                "description": "[REDACTED]",
+                "price": 42,
+                "tags": ["[REDACTED]", {"note": "[REDACTED]", "product_type": "saas"}],
+            },
+            "historical": [{"text": "[REDACTED]", "score": 0.5}, ["[REDACTED]", None]],
+            "platform": {"raw": "kept as-is"},
+        }
+        assert source["event"]["description"] == "secret"
+
+    def test_large_historical_is_redacted_wholesale(self):
+        historical = [{"text": f"record {i}", "score": i} for i in range(100)]
+        redacted = _redact_simulation_input({"skill": "s", "historical": historical})
+        assert redacted == {"skill": "s", "historical": ["[REDACTED x100]"]}
+
+        small = historical[:3]
+        redacted = _redact_simulation_input({"historical": small})
+        assert redacted["historical"][0] == {"text": "[REDACTED]", "score": 0}
+
+    def test_redaction_handles_deep_nesting(self):
+        deep: dict = {"leaf": "secret"}
+        for _ in range(5000):
+            deep = {"child": deep}
+        redacted = _redact_simulation_input({"event": deep})
+        node = redacted["event"]
+        while "child" in node:
+            node = node["child"]
+        assert node == {"leaf": "[REDACTED]"}
+
 
 class TestOutputFilePermissions:
     def test_recorder_sets_file_permissions(self):
@@ -1,5 +1,6 @@
 """Tests for deliberation orchestration."""
 
+import asyncio
 import json
 import pytest
 from unittest.mock import AsyncMock
@@ -43,6 +44,31 @@ class TestDeliberationOrchestrator:
         assert isinstance(records[0], DeliberationRecord)
         assert len(records[0].opinions) == 2  # Two members
 
+    @pytest.mark.asyncio
+    async def test_evidence_serialized_compactly_once(self, monkeypatch, mock_tribunal_caller, members):
+        import ripple.engine.deliberation as deliberation_module
+
+        calls = []
+        original = deliberation_module.dumps_compact
+
+        def counting_dumps(obj):
+            calls.append(obj)
+            return original(obj)
+
+        monkeypatch.setattr(deliberation_module, "dumps_compact", counting_dumps)
+        orch = DeliberationOrchestrator(
+            members=members,
+            llm_caller=mock_tribunal_caller,
+            dimensions=["demand_resonance", "propagation_potential"],
+            rubric="1=low, 5=high",
+            max_rounds=3,
+        )
+        pack = {"summary": "证据", "key_signals": []}
+        await orch.run(evidence_pack=pack)
+        assert calls == [pack]
+        prompt = mock_tribunal_caller.call_args_list[0].kwargs["user_prompt"]
+        assert '{"summary":"证据","key_signals":[]}' in prompt
+
     @pytest.mark.asyncio
     async def test_convergence_dual_gate_threshold(self, mock_tribunal_caller, members):
         """Threshold convergence: all dims change ≤1 for 2 consecutive rounds."""
@@ -127,3 +153,120 @@ class TestDeliberationOrchestrator:
         )
         records = await orch.run(evidence_pack={"summary": "Evidence", "key_signals": []})
         assert len(records[1].challenges) == len(members)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("parallel, expected_peak", [(True, 2), (False, 1)])
+    async def test_parallel_members_overlap_calls(self, members, parallel, expected_peak):
+        """并行模式下同轮评审员的调用重叠。 / Members' calls overlap within a round in parallel mode."""
+        in_flight = 0
+        peak = 0
+
+        async def caller(*, system_prompt="", user_prompt=""):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+            if "challenge" in user_prompt.rsplit("Respond with JSON", 1)[-1]:
+                return json.dumps({"challenge": "Why?"})
+            return json.dumps({"scores": {"demand_resonance": 3}, "narrative": "ok"})
+
+        orch = DeliberationOrchestrator(
+            members=members,
+            llm_caller=caller,
+            dimensions=["demand_resonance"],
+            rubric="1=low, 5=high",
+            max_rounds=2,
+            parallel_members=parallel,
+        )
+        records = await orch.run(evidence_pack={"summary": "Evidence", "key_signals": []})
+        assert [c["challenge"] for c in records[1].challenges] == ["Why?", "Why?"]
+        assert peak == expected_peak
+
+    @pytest.mark.asyncio
+    async def test_revise_routes_challenges_to_their_targets(self, monkeypatch, mock_tribunal_caller):
+        trio = [
+            TribunalMember(role="A", perspective="p", expertise="e"),
+            TribunalMember(role="B", perspective="p", expertise="e"),
+            TribunalMember(role="C", perspective="p", expertise="e"),
+        ]
+        orch = DeliberationOrchestrator(
+            members=trio,
+            llm_caller=mock_tribunal_caller,
+            dimensions=["demand_resonance"],
+            rubric="1=low, 5=high",
+        )
+        captured = []
+
+        async def fake_revise_panel(items, *, round_number, semaphore=None):
+            captured.extend((agent.role, received) for agent, _, received in items)
+            return [opinion for _, opinion, _ in items]
+
+        monkeypatch.setattr("ripple.engine.deliberation.revise_panel", fake_revise_panel)
+        opinions = [
+            TribunalOpinion(member_role=m.role, scores={"demand_resonance": 3}, narrative="", round_number=0)
+            for m in trio
+        ]
+        challenges = [
+            {"challenger": "A", "target": "B", "challenge": "a->b"},
+            {"challenger": "B", "target": "A", "challenge": "b->a"},
+            {"challenger": "C", "target": "B", "challenge": "c->b"},
+        ]
+        await orch._revise_all(opinions, challenges, round_number=1)
+        assert captured == [
+            ("A", ["b->a"]),
+            ("B", ["a->b", "c->b"]),
+            # 无人质询时收到全部质询作参考 / Unchallenged members see every challenge
+            ("C", ["a->b", "b->a", "c->b"]),
+        ]
+
+    def test_split_consensus_partitions_dimensions(self, mock_tribunal_caller, members):
+        dims = ["demand_resonance", "propagation_potential", "competitive_differentiation"]
+        orch = DeliberationOrchestrator(
+            members=members,
+            llm_caller=mock_tribunal_caller,
+            dimensions=dims,
+            rubric="1=low, 5=high",
+        )
+        opinions = [
+            TribunalOpinion(member_role="MarketAnalyst", scores={"demand_resonance": 4, "propagation_potential": 1},
+                            narrative="", round_number=0),
+            TribunalOpinion(member_role="DevilsAdvocate", scores={"demand_resonance": 3, "propagation_potential": 4},
+                            narrative="", round_number=0),
+        ]
+        assert orch._split_consensus(opinions) == (
+            ["demand_resonance", "competitive_differentiation"],
+            ["propagation_potential"],
+        )
+        assert orch._find_consensus(opinions) == ["demand_resonance", "competitive_differentiation"]
+        assert orch._find_dissent(opinions) == ["propagation_potential"]
+        assert orch._split_consensus([]) == ([], [])
+
+    def test_max_gap_opponents_match_pairwise_scan(self, mock_tribunal_caller):
+        import random
+
+        dims = ["a", "b", "c"]
+        rng = random.Random(7)
+        panel = [TribunalMember(role=f"M{i}", perspective="p", expertise="e") for i in range(5)]
+        orch = DeliberationOrchestrator(
+            members=panel, llm_caller=mock_tribunal_caller, dimensions=dims, rubric="r",
+        )
+        for _ in range(50):
+            opinions = [
+                TribunalOpinion(
+                    member_role=m.role,
+                    scores={d: rng.randint(1, 5) for d in dims if rng.random() > 0.1},
+                    narrative="",
+                    round_number=0,
+                )
+                for m in panel
+            ]
+            expected = []
+            for i, mine in enumerate(opinions):
+                gaps = [
+                    (sum(abs(mine.scores.get(d, 0) - other.scores.get(d, 0)) for d in dims), -j)
+                    for j, other in enumerate(opinions) if j != i
+                ]
+                expected.append(-max(gaps)[1])
+            assert orch._find_max_gap_opponents(opinions) == expected
+        assert orch._find_max_gap_opponents(opinions[:1]) == [-1]
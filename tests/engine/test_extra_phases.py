@@ -173,6 +173,8 @@ class TestExtraPhaseExecution:
             assert captured.get("evidence_pack", {}).get("full_records_ref") == "#/process/waves"
 
             # Recorder contains process.deliberation with stable JSON Pointer target
+            # (record_process 不写文件，先 flush / record_process does not write the file; flush first)
+            recorder.flush()
             data = json.loads(out.read_text(encoding="utf-8"))
             assert "deliberation" in data["process"]
             assert data["process"]["deliberation"]["ok"] is True
@@ -1,6 +1,11 @@
 """Tests for ensemble run boundary recording in SimulationRecorder."""
 
+import asyncio
 import json
+import threading
+from pathlib import Path
+
+import pytest
 
 from ripple.engine.recorder import SimulationRecorder
 from ripple.version import get_version
@@ -61,6 +66,8 @@ def test_recorder_ensemble_runs_are_isolated(tmp_path):
     assert runs[1]["random_seed"] == 2
     assert len(runs[1]["process"]["waves"]) == 1
     assert runs[1]["process"]["waves"][0]["pre_snapshot"]["pre"] == 2
+    assert runs[0]["process"]["waves"][0]["post_snapshot"]["post"] == 1
+    assert runs[1]["process"]["waves"][0]["post_snapshot"]["post"] == 2
 
 
 def test_recorder_meta_engine_version_matches_runtime_version(tmp_path):
@@ -70,3 +77,327 @@ def test_recorder_meta_engine_version_matches_runtime_version(tmp_path):
     data = json.loads(out.read_text(encoding="utf-8"))
 
     assert data["meta"]["engine_version"] == get_version()
+
+
+def test_recorder_resolves_output_paths_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    recorder = SimulationRecorder(output_path=Path("out.json"), run_id="r0")
+    assert recorder.resolved_output_path == str((tmp_path / "out.json").resolve())
+    assert recorder.resolved_compact_log_path == str((tmp_path / "out.md").resolve())
+
+
+@pytest.mark.asyncio
+async def test_recorder_concurrent_ensemble_runs_stay_isolated(tmp_path):
+    out = tmp_path / "concurrent.json"
+    recorder = SimulationRecorder(output_path=out, run_id="rc")
+
+    async def run(index: int):
+        recorder.begin_ensemble_run(run_index=index, run_id=f"rcr{index + 1}", random_seed=index)
+        await asyncio.sleep(0)
+        recorder.record_wave_start(0, {"pre": index})
+        await asyncio.sleep(0)
+        assert recorder.active_ensemble_run_index == index
+        recorder.end_ensemble_run()
+
+    await asyncio.gather(run(0), run(1))
+    assert recorder.active_ensemble_run_index is None
+
+    recorder.flush()
+    runs = json.loads(out.read_text(encoding="utf-8"))["process"]["ensemble_runs"]
+    for entry in runs:
+        waves = entry["process"]["waves"]
+        assert [w["pre_snapshot"]["pre"] for w in waves] == [entry["run_index"]]
+        assert entry["meta"]["status"] == "completed"
+
+
+def test_recorder_coalesces_writes_within_interval(tmp_path, monkeypatch):
+    out = tmp_path / "coalesce.json"
+    recorder = SimulationRecorder(output_path=out, run_id="rw")
+    writes = []
+    monkeypatch.setattr(recorder, "_write_to_disk", lambda **_: writes.append(1))
+    monkeypatch.setattr(SimulationRecorder, "MIN_FLUSH_INTERVAL", 60.0)
+
+    recorder.record_seed("seed", 1.0)
+    recorder.record_wave_start(0, {"pre": 1})
+    recorder.record_observation("obs")
+    assert writes == []
+
+    recorder.flush()
+    assert writes == [1]
+    recorder.flush()  # 没有挂起的变更 / Nothing pending
+    assert writes == [1]
+
+    recorder.record_observation("again")
+    recorder.finalize(1)
+    assert writes == [1, 1]
+
+
+def test_recorder_pending_changes_flushed_at_exit(tmp_path, monkeypatch):
+    from ripple.engine import recorder as recorder_module
+
+    monkeypatch.setattr(SimulationRecorder, "MIN_FLUSH_INTERVAL", 60.0)
+    out = tmp_path / "atexit.json"
+    recorder = SimulationRecorder(output_path=out, run_id="ax")
+    recorder.record_observation("pending")
+    assert json.loads(out.read_text(encoding="utf-8"))["process"]["observation"] is None
+
+    recorder_module._flush_open_recorders()
+    assert json.loads(out.read_text(encoding="utf-8"))["process"]["observation"] is not None
+
+    recorder.finalize(0)
+    assert recorder not in recorder_module._OPEN_RECORDERS
+
+
+def test_recorder_appends_hot_path_events_without_rewriting(tmp_path, monkeypatch):
+    out = tmp_path / "events.json"
+    recorder = SimulationRecorder(output_path=out, run_id="ev")
+    writes = []
+    monkeypatch.setattr(recorder, "_write_to_disk", lambda **_: writes.append(1))
+    monkeypatch.setattr(SimulationRecorder, "MIN_FLUSH_INTERVAL", 0.0)
+
+    recorder.record_seed("seed", 1.0)
+    recorder.record_wave_start(0, {"pre": 1})
+    recorder.begin_ensemble_run(run_index=0, run_id="evr1", random_seed=7)
+    recorder.record_observation("obs")
+    recorder.end_ensemble_run()
+    assert writes == [1, 1]  # run 开始与结束 / run begin and end
+
+    recorder.finalize(1)
+    assert writes == [1, 1, 1]
+    assert recorder.events_path == tmp_path / "events.events.jsonl"
+    assert (recorder.events_path.stat().st_mode & 0o777) == 0o600
+
+    events = [json.loads(line) for line in recorder.events_path.read_text(encoding="utf-8").splitlines()]
+    assert [e["kind"] for e in events] == [
+        "seed", "wave_start", "run_begin", "observation", "run_end", "finalize",
+    ]
+    assert [e["run_index"] for e in events] == [None, None, 0, 0, 0, None]
+    assert events[1]["data"]["pre_snapshot"] == {"pre": 1}
+    assert recorder._events_fp is None
+
+
+def test_recorder_wave_end_logs_delta_and_keeps_json_current(tmp_path, monkeypatch):
+    out = tmp_path / "delta.json"
+    monkeypatch.setattr(SimulationRecorder, "MIN_FLUSH_INTERVAL", 0.0)
+    recorder = SimulationRecorder(output_path=out, run_id="dl")
+
+    recorder.record_wave_start(0, {"pre": 1})
+    verdict = OmniscientVerdict(
+        wave_number=0,
+        simulated_time_elapsed="0h",
+        simulated_time_remaining="0h",
+        continue_propagation=False,
+        activated_agents=[],
+        skipped_agents=[],
+        global_observation="v",
+    )
+    recorder.record_wave_end(
+        0, verdict=verdict, agent_responses={"s1": {"ok": True}}, post_snapshot={"post": 2},
+    )
+
+    events = [json.loads(line) for line in recorder.events_path.read_text(encoding="utf-8").splitlines()]
+    wave_end = events[-1]
+    assert wave_end["kind"] == "wave_end"
+    assert "pre_snapshot" not in wave_end["data"]
+    assert wave_end["data"]["post_snapshot"] == {"post": 2}
+    assert wave_end["data"]["agent_responses"] == {"s1": {"ok": True}}
+
+    on_disk = json.loads(out.read_text(encoding="utf-8"))
+    assert on_disk["process"]["waves"][0]["post_snapshot"] == {"post": 2}
+    recorder.close()
+
+
+@pytest.mark.asyncio
+async def test_recorder_writes_off_event_loop_thread(tmp_path, monkeypatch):
+    out = tmp_path / "writer.json"
+    recorder = SimulationRecorder(output_path=out, run_id="wt")
+    write_threads = []
+    original = recorder._write_json
+
+    def _tracking_write(write):
+        write_threads.append(threading.get_ident())
+        original(write)
+
+    monkeypatch.setattr(recorder, "_write_json", _tracking_write)
+    recorder.record_synthesis({"prediction": {"impact": "high"}})
+    recorder.flush()
+
+    assert write_threads and threading.get_ident() not in write_threads
+    assert json.loads(out.read_text(encoding="utf-8"))["prediction"] == {"impact": "high"}
+    recorder.close()
+
+
+@pytest.mark.asyncio
+async def test_recorder_coalesces_queued_background_writes(tmp_path, monkeypatch):
+    out = tmp_path / "queued.json"
+    recorder = SimulationRecorder(output_path=out, run_id="qw")
+    started, release = threading.Event(), threading.Event()
+    written = []
+    original = recorder._write_snapshot
+
+    def _blocking_write(content, markdown):
+        started.set()
+        release.wait(5)
+        written.append(json.loads(content)["process"]["observation"]["content"])
+        original(content, markdown)
+
+    monkeypatch.setattr(recorder, "_write_snapshot", _blocking_write)
+    for text in ("first", "second", "third"):
+        recorder.record_observation(text)
+        recorder._flush(force=True)
+        started.wait(5)
+    release.set()
+    recorder.flush()
+
+    # 第二份快照在排队时被第三份取代 / The second snapshot was superseded while queued
+    assert written == ["first", "third"]
+    assert json.loads(out.read_text(encoding="utf-8"))["process"]["observation"]["content"] == "third"
+    recorder.close()
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_recorder_splices_cached_ended_runs(tmp_path, monkeypatch, use_orjson):
+    from ripple.utils import fast_json
+
+    if use_orjson and not fast_json._HAS_ORJSON:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(fast_json, "_HAS_ORJSON", use_orjson)
+    out = tmp_path / "spliced.json"
+    recorder = SimulationRecorder(output_path=out, run_id="sp")
+    for i in range(3):
+        recorder.begin_ensemble_run(run_index=i, run_id=f"sp{i}", random_seed=i)
+        recorder.record_seed("种子\nline", 1.5)
+        recorder.record_wave_start(0, {"nested": [1, {}], "empty": []})
+        if i < 2:
+            recorder.end_ensemble_run()
+    recorder.flush()
+
+    assert len(recorder._run_cache) == 2
+    assert out.read_text(encoding="utf-8") == fast_json.dumps_pretty(recorder.data)
+    recorder.close()
+
+
+def test_recorder_rebuilds_markdown_only_at_phase_boundaries(tmp_path, monkeypatch):
+    monkeypatch.setattr(SimulationRecorder, "MIN_FLUSH_INTERVAL", 0.0)
+    out = tmp_path / "md.json"
+    recorder = SimulationRecorder(output_path=out, run_id="md")
+    builds = []
+    original = recorder._build_compact_markdown
+    monkeypatch.setattr(
+        recorder, "_build_compact_markdown", lambda: builds.append(1) or original(),
+    )
+
+    recorder.record_simulation_input({"event": "launch"})
+    recorder.begin_ensemble_run(run_index=0, run_id="md0", random_seed=1)
+    assert builds == []
+    assert json.loads(out.read_text(encoding="utf-8"))["process"]["ensemble_runs"]
+
+    recorder.end_ensemble_run()
+    assert builds == [1]
+    recorder.finalize(0)
+    assert builds == [1, 1]
+    assert recorder.compact_log_path.exists()
+
+
+def test_recorder_skip_markdown(tmp_path, monkeypatch):
+    monkeypatch.setattr(SimulationRecorder, "SKIP_MARKDOWN", True)
+    out = tmp_path / "nomd.json"
+    recorder = SimulationRecorder(output_path=out, run_id="nomd")
+    recorder.finalize(0)
+
+    assert out.exists()
+    assert not recorder.compact_log_path.exists()
+
+
+def test_recorder_wave_end_finds_entries_by_number(tmp_path):
+    recorder = SimulationRecorder(output_path=tmp_path / "index.json", run_id="wi")
+    verdict = OmniscientVerdict(
+        wave_number=0,
+        simulated_time_elapsed="0h",
+        simulated_time_remaining="1h",
+        continue_propagation=True,
+        activated_agents=[],
+        skipped_agents=[],
+        global_observation="",
+    )
+    for n in range(5):
+        recorder.record_wave_start(n, {"pre": n})
+    recorder.record_wave_end(3, verdict=verdict, agent_responses={}, post_snapshot={"post": 3})
+    # 缺少 start 记录时补建条目，之后可被再次找到 / A missing start creates an entry that is found afterwards
+    recorder.record_wave_end(9, verdict=verdict, agent_responses={}, post_snapshot={"post": 9})
+    recorder.record_wave_end(9, verdict=verdict, agent_responses={}, post_snapshot={"post": 10})
+
+    waves = recorder.data["process"]["waves"]
+    assert [w["wave_number"] for w in waves] == [0, 1, 2, 3, 4, 9]
+    assert waves[3]["post_snapshot"] == {"post": 3}
+    assert waves[5]["post_snapshot"] == {"post": 10}
+    assert waves[0]["post_snapshot"] is None
+    recorder.close()
+
+
+def test_recorder_shares_unchanged_snapshot_between_waves(tmp_path):
+    recorder = SimulationRecorder(output_path=tmp_path / "share.json", run_id="ss")
+    verdict = OmniscientVerdict(
+        wave_number=0,
+        simulated_time_elapsed="0h",
+        simulated_time_remaining="1h",
+        continue_propagation=True,
+        activated_agents=[],
+        skipped_agents=[],
+        global_observation="",
+    )
+    recorder.record_wave_start(0, {"stars": {"s1": 1}})
+    recorder.record_wave_end(0, verdict=verdict, agent_responses={}, post_snapshot={"stars": {"s1": 2}})
+    recorder.record_wave_start(1, {"stars": {"s1": 2}})
+    recorder.record_wave_end(1, verdict=verdict, agent_responses={}, post_snapshot={"stars": {"s1": 3}})
+    recorder.record_wave_start(2, {"stars": {"s1": 4}})
+
+    waves = recorder.data["process"]["waves"]
+    assert waves[1]["pre_snapshot"] is waves[0]["post_snapshot"]
+    assert waves[2]["pre_snapshot"] == {"stars": {"s1": 4}}
+    assert waves[2]["pre_snapshot"] is not waves[1]["post_snapshot"]
+    recorder.flush()
+    data = json.loads((tmp_path / "share.json").read_text(encoding="utf-8"))
+    assert data["process"]["waves"][1]["pre_snapshot"] == {"stars": {"s1": 2}}
+    recorder.close()
+
+
+def test_recorder_markdown_reuses_ended_fragments(tmp_path):
+    recorder = SimulationRecorder(output_path=tmp_path / "mdcache.json", run_id="mc")
+
+    def _verdict(observation):
+        return OmniscientVerdict(
+            wave_number=0,
+            simulated_time_elapsed="1h",
+            simulated_time_remaining="1h",
+            continue_propagation=True,
+            activated_agents=[],
+            skipped_agents=[],
+            global_observation=observation,
+        )
+
+    def _fresh_markdown():
+        saved = recorder._md_wave_cache, recorder._md_run_cache
+        recorder._md_wave_cache, recorder._md_run_cache = {}, {}
+        try:
+            return recorder._build_compact_markdown()
+        finally:
+            recorder._md_wave_cache, recorder._md_run_cache = saved
+
+    recorder.begin_ensemble_run(run_index=0, run_id="mc0", random_seed=1)
+    recorder.record_wave_start(0, {"pre": 0})
+    recorder.record_wave_end(0, verdict=_verdict("first"), agent_responses={}, post_snapshot={})
+    recorder.record_wave_start(1, {"pre": 1})
+    assert recorder._build_compact_markdown() == _fresh_markdown()
+    assert len(recorder._md_wave_cache) == 1
+
+    # 再次结束同一 wave 使其缓存失效 / Ending the same wave again invalidates its cache
+    recorder.record_wave_end(0, verdict=_verdict("second"), agent_responses={}, post_snapshot={})
+    assert "obs: second" in recorder._build_compact_markdown()
+
+    recorder.end_ensemble_run()
+    recorder.begin_ensemble_run(run_index=1, run_id="mc1", random_seed=2)
+    recorder.record_seed("seed", 1.0)
+    assert recorder._build_compact_markdown() == _fresh_markdown()
+    assert len(recorder._md_run_cache) == 1
+    recorder.close()
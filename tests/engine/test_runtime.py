@@ -1032,3 +1032,143 @@ class TestObservationInResult:
 
         assert "observation" in result
         assert result["observation"]["phase_vector"]["heat"] == "growth"
+
+
+class TestActivateAgentsErrors:
+    @pytest.mark.asyncio
+    async def test_failing_sea_agent_is_recorded_as_error(self):
+        """Sea Agent 抛出异常时记为 error，而不是 ignore。 / A raising Sea agent is recorded as error, not ignore."""
+        from ripple.agents.sea import SeaAgent
+        from ripple.primitives.models import AgentActivation, OmniscientVerdict
+
+        runtime = SimulationRuntime(
+            omniscient_caller=AsyncMock(),
+            star_caller=AsyncMock(),
+            sea_caller=AsyncMock(),
+        )
+        runtime._seas["sea_1"] = SeaAgent(agent_id="sea_1", description="g", llm_caller=AsyncMock())
+        verdict = OmniscientVerdict(
+            wave_number=0,
+            simulated_time_elapsed="0h",
+            simulated_time_remaining="4h",
+            continue_propagation=True,
+            activated_agents=[AgentActivation("sea_1", 0.5, "test")],
+            skipped_agents=[],
+            global_observation="test",
+        )
+
+        with patch.object(SeaAgent, "respond", AsyncMock(side_effect=RuntimeError("boom"))):
+            results = await runtime._activate_agents(verdict, ripple_content="c")
+
+        assert results == {"sea_1": {"response_type": "error", "outgoing_energy": 0.0}}
+
+
+class TestSynthesisFailure:
+    @pytest.mark.asyncio
+    async def test_synthesis_error_keeps_run_data(self):
+        """合成阶段出错时记录错误并返回已有运行数据。 / A synthesis error is recorded and the run data is still returned."""
+        init_dynamics = json.dumps({"wave_time_window": "2h", "energy_decay_per_wave": 0.15})
+        init_agents = json.dumps({
+            "star_configs": [{"id": "star_1", "description": "KOL"}],
+            "sea_configs": [{"id": "sea_1", "description": "用户"}],
+        })
+        init_topology = json.dumps({
+            "topology": {"edges": [{"from": "star_1", "to": "sea_1", "weight": 0.5}]},
+            "seed_ripple": {"content": "测试内容", "initial_energy": 0.6},
+        })
+        wave0 = json.dumps({
+            "wave_number": 0,
+            "simulated_time_elapsed": "2h",
+            "simulated_time_remaining": "0h",
+            "continue_propagation": False,
+            "termination_reason": "结束",
+            "activated_agents": [],
+            "skipped_agents": [],
+            "global_observation": "终止",
+        })
+        observe = json.dumps({
+            "phase_vector": {"heat": "growth", "sentiment": "unified", "coherence": "ordered"},
+            "phase_transition_detected": False,
+            "emergence_events": [],
+            "topology_recommendations": [],
+        })
+        omniscient_caller = AsyncMock(side_effect=[
+            init_dynamics, init_agents, init_topology, wave0, observe,
+            RuntimeError("LLM 调用次数已达上限"),
+        ])
+        recorder = MagicMock()
+        runtime = SimulationRuntime(
+            omniscient_caller=omniscient_caller,
+            agent_caller=AsyncMock(),
+            recorder=recorder,
+        )
+
+        result = await runtime.run({"event": {"description": "测试事件"}, "simulation_horizon": "2h"})
+
+        assert result["synthesis_error"] == "LLM 调用次数已达上限"
+        assert result["prediction"]["degraded"] is True
+        assert result["observation"]["phase_vector"]["heat"] == "growth"
+        recorder.record_synthesis.assert_called_once_with(result)
+
+
+class TestLateVerdictFailure:
+    @pytest.mark.asyncio
+    async def test_late_verdict_failure_still_observes_and_synthesizes(self):
+        """第 3 个裁决失败时仍对已完成的 wave 做 OBSERVE 与合成。
+        / A verdict failing at wave 3 still observes and synthesizes the completed waves."""
+        init_dynamics = json.dumps({"wave_time_window": "2h", "energy_decay_per_wave": 0.15})
+        init_agents = json.dumps({
+            "star_configs": [{"id": "star_1", "description": "KOL"}],
+            "sea_configs": [{"id": "sea_1", "description": "用户"}],
+        })
+        init_topology = json.dumps({
+            "topology": {"edges": [{"from": "star_1", "to": "sea_1", "weight": 0.5}]},
+            "seed_ripple": {"content": "测试内容", "initial_energy": 0.6},
+        })
+
+        def wave(n):
+            return json.dumps({
+                "wave_number": n,
+                "simulated_time_elapsed": f"{2 * (n + 1)}h",
+                "simulated_time_remaining": "10h",
+                "continue_propagation": True,
+                "activated_agents": [
+                    {"agent_id": "sea_1", "incoming_ripple_energy": 0.5,
+                     "activation_reason": "兴趣匹配"},
+                ],
+                "skipped_agents": [],
+                "global_observation": "传播中",
+            })
+
+        observe = json.dumps({
+            "phase_vector": {"heat": "growth", "sentiment": "unified", "coherence": "ordered"},
+            "phase_transition_detected": False,
+            "emergence_events": [],
+            "topology_recommendations": [],
+        })
+        synth = json.dumps({
+            "prediction": {"impact": "test", "verdict": "growth"},
+            "timeline": [],
+            "bifurcation_points": [],
+            "agent_insights": {},
+        })
+        # 第 3 个裁决 3 次尝试（max_retries=2）均无法解析
+        # / The third verdict is unparseable on all 3 attempts (max_retries=2)
+        omniscient_caller = AsyncMock(side_effect=[
+            init_dynamics, init_agents, init_topology, wave(0), wave(1),
+            "not json", "not json", "not json", observe, synth,
+        ])
+        agent_caller = AsyncMock(return_value=json.dumps(
+            {"response_type": "comment", "outgoing_energy": 0.2},
+        ))
+        runtime = SimulationRuntime(
+            omniscient_caller=omniscient_caller,
+            agent_caller=agent_caller,
+        )
+
+        result = await runtime.run({"event": {"description": "测试事件"}, "simulation_horizon": "12h"})
+
+        assert omniscient_caller.call_count == 10
+        assert result["total_waves"] == 2
+        assert result["observation"]["phase_vector"]["heat"] == "growth"
+        assert result["prediction"] == {"impact": "test", "verdict": "growth"}
@@ -57,6 +57,19 @@ class TestBuildRequest:
         assert body["messages"] == [{"role": "user", "content": "Hello"}]
         assert body["max_tokens"] == 4096
 
+    def test_cached_system_block_when_enabled(self):
+        adapter = AnthropicAdapter(
+            api_key="test-key",
+            model="claude-sonnet-4-20250514",
+            cache_system_prompt=True,
+        )
+        body = adapter._build_request("You are a helper.", "Hello")
+        assert body["system"] == [{
+            "type": "text",
+            "text": "You are a helper.",
+            "cache_control": {"type": "ephemeral"},
+        }]
+
     def test_omits_system_when_empty(self):
         adapter = AnthropicAdapter(
             api_key="test-key",
@@ -211,6 +224,23 @@ class TestFromEndpointConfig:
         assert adapter._model == "claude-sonnet-4-20250514"
         assert adapter._endpoint == "https://api.anthropic.com/v1/messages"
         assert adapter._temperature == 0.5
+        assert adapter._cache_system_prompt is False
+
+    def test_extra_enables_system_prompt_cache(self):
+        class FakeConfig:
+            url = None
+            api_key = "sk-ant-test"
+            model_name = "claude-sonnet-4-20250514"
+            model_platform = "anthropic"
+            temperature = 0.5
+            max_tokens = 2048
+            timeout = 60.0
+            max_retries = 2
+            stream = True
+            extra = {"cache_system_prompt": True}
+
+        adapter = AnthropicAdapter.from_endpoint_config(FakeConfig())
+        assert adapter._cache_system_prompt is True
 
     def test_creates_adapter_with_custom_url(self):
         class FakeConfig:
@@ -0,0 +1,111 @@
+# test_backoff.py
+# =============================================================================
+# Agent 层重试退避单元测试 / Agent-level retry backoff unit tests
+# =============================================================================
+
+import json
+
+import httpx
+import pytest
+
+from ripple.llm import backoff
+from ripple.llm.backoff import backoff_delay, http_status_of, is_transient_error
+from ripple.llm.chat_completions_adapter import ChatCompletionsAdapter
+from ripple.llm.http_pool import PooledHTTPClient
+
+
+def _status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://example.invalid")
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(code, request=request),
+    )
+
+
+class _StatusPool(PooledHTTPClient):
+    """所有请求都返回固定状态码的连接池。 / Pool whose clients answer every request with one status."""
+
+    def __init__(self, status: int):
+        super().__init__()
+        self._status = status
+
+    def get(self, profile, timeout):
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(self._status)),
+        )
+
+
+async def _adapter_error(status: int) -> BaseException:
+    """真实适配器重试耗尽后抛出的异常。 / The exception a real adapter raises after exhausting retries."""
+    adapter = ChatCompletionsAdapter(
+        url="https://example.invalid/v1", api_key="k", model="m",
+        stream=False, max_retries=0, http_pool=_StatusPool(status),
+    )
+    with pytest.raises(RuntimeError) as info:
+        await adapter.call("sys", "user")
+    return info.value
+
+
+class TestClassification:
+    @pytest.mark.parametrize("code", [429, 500, 503, 529])
+    def test_rate_limit_and_server_errors_are_transient(self, code):
+        assert is_transient_error(_status_error(code))
+
+    def test_client_errors_and_parse_errors_are_not_transient(self):
+        assert not is_transient_error(_status_error(400))
+        assert not is_transient_error(json.JSONDecodeError("bad", "x", 0))
+        assert not is_transient_error(RuntimeError("LLM 调用次数已达上限"))
+
+    def test_network_errors_are_transient(self):
+        assert is_transient_error(httpx.ConnectError("refused"))
+
+    @pytest.mark.asyncio
+    async def test_real_adapter_errors_are_classified_by_cause(self):
+        rate_limited = await _adapter_error(429)
+        assert type(rate_limited) is RuntimeError
+        assert is_transient_error(rate_limited)
+        assert http_status_of(rate_limited) == 429
+        assert is_transient_error(await _adapter_error(503))
+        assert not is_transient_error(await _adapter_error(401))
+
+
+class TestBackoffDelay:
+    def test_delay_grows_and_is_capped_with_jitter(self):
+        for attempt in range(10):
+            delay = backoff_delay(attempt, base=0.5, cap=8.0)
+            nominal = min(8.0, 0.5 * 2 ** attempt)
+            assert 0.5 * nominal <= delay <= 1.5 * nominal
+
+    @pytest.mark.asyncio
+    async def test_parse_errors_do_not_sleep(self, monkeypatch):
+        slept = []
+
+        async def fake_sleep(delay):
+            slept.append(delay)
+
+        monkeypatch.setattr(backoff.asyncio, "sleep", fake_sleep)
+        await backoff.backoff_before_retry(ValueError("bad json"), 0)
+        await backoff.backoff_before_retry(_status_error(429), 1)
+        assert len(slept) == 1 and slept[0] >= 0.5
+
+    @pytest.mark.asyncio
+    async def test_star_backs_off_on_real_adapter_rate_limit(self, monkeypatch):
+        from ripple.agents.star import StarAgent
+
+        slept = []
+
+        async def fake_sleep(delay):
+            slept.append(delay)
+
+        monkeypatch.setattr(backoff.asyncio, "sleep", fake_sleep)
+        adapter = ChatCompletionsAdapter(
+            url="https://example.invalid/v1", api_key="k", model="m",
+            stream=False, max_retries=0, http_pool=_StatusPool(429),
+        )
+
+        async def llm_caller(*, system_prompt="", user_prompt=""):
+            return await adapter.call(system_prompt, user_prompt)
+
+        star = StarAgent("star_1", "test", llm_caller, max_retries=1)
+        response = await star.respond(ripple_content="c", ripple_energy=0.5, ripple_source="s")
+        assert response["response_type"] == "ignore"
+        assert len(slept) == 1
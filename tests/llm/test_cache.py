@@ -0,0 +1,84 @@
+# test_cache.py
+# =============================================================================
+# LLM 响应缓存单元测试 / LLM response cache unit tests
+# - JSONL 持久化响应缓存 / JSONL-persisted response cache
+# - 语义命中 / Semantic hits
+# =============================================================================
+
+import pytest
+
+from ripple.llm.cache import NullCache, ResponseCache
+
+
+class TestResponseCache:
+    """持久化响应缓存测试。 / Persistent response cache tests."""
+
+    @pytest.mark.asyncio
+    async def test_entries_survive_reload(self, tmp_path):
+        path = tmp_path / "cache.jsonl"
+        cache = ResponseCache(path, model_id="m1")
+        key = cache.key("sys", "user")
+        assert await cache.get(key) is None
+        await cache.put(key, "响应")
+        cache.close()
+
+        reloaded = ResponseCache(path, model_id="m1")
+        assert await reloaded.get(key) == "响应"
+        assert reloaded.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_key_includes_model_id(self):
+        assert ResponseCache(model_id="a").key("s", "u") != ResponseCache(model_id="b").key("s", "u")
+
+    @pytest.mark.asyncio
+    async def test_truncated_line_is_skipped(self, tmp_path):
+        path = tmp_path / "cache.jsonl"
+        path.write_text('{"key": "k1", "response": "r1"}\n{"key": "k2", "resp', encoding="utf-8")
+        cache = ResponseCache(path)
+        assert await cache.get("k1") == "r1"
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_append_after_truncated_line_starts_new_line(self, tmp_path):
+        path = tmp_path / "cache.jsonl"
+        path.write_text('{"key": "k1", "response": "r1"}\n{"key": "k2", "resp', encoding="utf-8")
+        cache = ResponseCache(path)
+        await cache.put("k3", "r3")
+        cache.close()
+
+        reloaded = ResponseCache(path)
+        assert await reloaded.get("k1") == "r1"
+        assert await reloaded.get("k3") == "r3"
+        assert len(reloaded) == 2
+
+    @pytest.mark.asyncio
+    async def test_null_cache_stores_nothing(self):
+        cache = NullCache()
+        await cache.put(cache.key("s", "u"), "r")
+        assert await cache.get(cache.key("s", "u")) is None
+
+    @pytest.mark.asyncio
+    async def test_semantic_lookup_requires_threshold(self):
+        async def embed(text):
+            return [1.0, 0.0] if "evidence" in text else [0.0, 1.0]
+
+        cache = ResponseCache(embed_fn=embed)
+        await cache.store("sys", "evidence v1", "resp")
+
+        assert await cache.lookup("sys", "evidence  v1 ") is None
+        assert await cache.lookup("sys", "evidence  v1 ", similarity_threshold=0.95) == "resp"
+        assert await cache.lookup("other", "evidence v1", similarity_threshold=0.95) is None
+        assert await cache.lookup("sys", "unrelated", similarity_threshold=0.95) is None
+        assert cache.semantic_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_semantic_lookup_requires_identical_numbers(self):
+        async def embed(text):
+            return [1.0, 0.0]
+
+        cache = ResponseCache(embed_fn=embed)
+        await cache.store("sys", "Scores: {\"demand\":4}", "resp")
+
+        assert await cache.lookup("sys", "Scores: {\"demand\": 4}", similarity_threshold=0.95) == "resp"
+        assert await cache.lookup("sys", "Scores: {\"demand\":3}", similarity_threshold=0.95) is None
+        assert await cache.lookup("sys", "Scores: {\"demand\":4.5}", similarity_threshold=0.95) is None
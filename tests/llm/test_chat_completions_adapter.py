@@ -261,3 +261,200 @@ class TestStreaming:
         )
 
         assert result == "Hello world"
+
+
+class TestConnectionPooling:
+    """持久连接复用测试。 / Persistent connection reuse tests."""
+
+    @pytest.mark.asyncio
+    async def test_non_stream_calls_reuse_one_client(self, monkeypatch):
+        created = []
+
+        class _FakeResponse:
+            def raise_for_status(self):
+                return None
+
+            def json(self):
+                return {"choices": [{"message": {"content": "ok"}}]}
+
+        class _FakeClient:
+            def __init__(self, *args, **kwargs):
+                self.kwargs = kwargs
+                self.is_closed = False
+                created.append(self)
+
+            async def post(self, url, headers=None, json=None):
+                return _FakeResponse()
+
+            async def aclose(self):
+                self.is_closed = True
+
+        monkeypatch.setattr(
+            chat_completions_adapter_module.httpx,
+            "AsyncClient",
+            _FakeClient,
+        )
+
+        adapter = ChatCompletionsAdapter(
+            url="https://api.openai.com/v1",
+            api_key="test-key",
+            model="gpt-4o",
+            stream=False,
+        )
+
+        assert await adapter.call("sys", "u1") == "ok"
+        assert await adapter.call("sys", "u2") == "ok"
+        assert len(created) == 1
+        assert created[0].kwargs["limits"].max_keepalive_connections == 50
+
+        await adapter.aclose()
+        assert created[0].is_closed
+
+        # 关闭后再次调用会新建客户端 / A call after close creates a new client
+        assert await adapter.call("sys", "u3") == "ok"
+        assert len(created) == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_pool_is_reused_and_left_open(self, monkeypatch):
+        from ripple.llm.http_pool import PooledHTTPClient
+
+        created = []
+
+        class _FakeResponse:
+            def raise_for_status(self):
+                return None
+
+            def json(self):
+                return {"choices": [{"message": {"content": "ok"}}]}
+
+        class _FakeClient:
+            def __init__(self, *args, **kwargs):
+                self.is_closed = False
+                created.append(self)
+
+            async def post(self, url, headers=None, json=None):
+                return _FakeResponse()
+
+            async def aclose(self):
+                self.is_closed = True
+
+        monkeypatch.setattr(
+            chat_completions_adapter_module.httpx, "AsyncClient", _FakeClient,
+        )
+
+        pool = PooledHTTPClient()
+        adapters = [
+            ChatCompletionsAdapter(
+                url="https://api.openai.com/v1", api_key="k", model="gpt-4o",
+                stream=False, http_pool=pool,
+            )
+            for _ in range(2)
+        ]
+        for adapter in adapters:
+            assert await adapter.call("sys", "u") == "ok"
+            await adapter.aclose()
+        # 两个适配器共用一个客户端，且关闭适配器不关闭共享池
+        # / Both adapters share one client and closing them leaves the pool open
+        assert len(created) == 1
+        assert not created[0].is_closed
+
+        # 超时不同的适配器在同一池中获得独立客户端
+        # / An adapter with a different timeout gets its own client from the pool
+        other = ChatCompletionsAdapter(
+            url="https://api.openai.com/v1", api_key="k", model="gpt-4o",
+            stream=False, timeout=30.0, http_pool=pool,
+        )
+        assert await other.call("sys", "u") == "ok"
+        assert len(created) == 2
+
+        await pool.aclose()
+        assert all(c.is_closed for c in created)
+
+    @pytest.mark.asyncio
+    async def test_astream_yields_deltas(self, monkeypatch):
+        class _FakeResponse:
+            def raise_for_status(self):
+                return None
+
+            async def aiter_lines(self):
+                for line in (
+                    'data: {"choices":[{"delta":{"content":"{\\"a\\""}}]}',
+                    'data: {"choices":[{"delta":{"content":": 1}"}}]}',
+                    "data: [DONE]",
+                ):
+                    yield line
+
+        class _FakeStreamContext:
+            async def __aenter__(self):
+                return _FakeResponse()
+
+            async def __aexit__(self, exc_type, exc, tb):
+                return False
+
+        bodies = []
+
+        class _FakeClient:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def stream(self, method, url, headers=None, json=None):
+                bodies.append(json)
+                return _FakeStreamContext()
+
+        monkeypatch.setattr(
+            chat_completions_adapter_module.httpx,
+            "AsyncClient",
+            _FakeClient,
+        )
+
+        adapter = ChatCompletionsAdapter(
+            url="https://api.openai.com/v1",
+            api_key="test-key",
+            model="gpt-4o",
+            stream=True,
+        )
+        chunks = [c async for c in adapter.astream("sys", "hi")]
+
+        assert chunks == ['{"a"', ": 1}"]
+        assert bodies[0]["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_astream_honours_stream_false(self, monkeypatch):
+        """配置关闭流式时 astream 发起一次非流式请求。 / With streaming disabled, astream makes one non-streaming request."""
+        bodies = []
+
+        class _FakeResponse:
+            def raise_for_status(self):
+                return None
+
+            def json(self):
+                return {"choices": [{"message": {"content": '{"a": 1}'}}]}
+
+        class _FakeClient:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            async def post(self, url, headers=None, json=None):
+                bodies.append(json)
+                return _FakeResponse()
+
+            def stream(self, method, url, headers=None, json=None):
+                raise AssertionError("不应发起流式请求 / must not stream")
+
+        monkeypatch.setattr(
+            chat_completions_adapter_module.httpx,
+            "AsyncClient",
+            _FakeClient,
+        )
+
+        adapter = ChatCompletionsAdapter(
+            url="https://api.openai.com/v1",
+            api_key="test-key",
+            model="gpt-4o",
+            stream=False,
+        )
+        chunks = [c async for c in adapter.astream("sys", "hi")]
+
+        assert chunks == ['{"a": 1}']
+        assert len(bodies) == 1
+        assert "stream" not in bodies[0]
@@ -0,0 +1,145 @@
+# test_circuit_breaker.py
+# =============================================================================
+# LLM 调用熔断器单元测试 / LLM call circuit breaker unit tests
+# =============================================================================
+
+import asyncio
+
+import httpx
+import pytest
+
+from ripple.llm import circuit_breaker as cb_module
+from ripple.llm.chat_completions_adapter import ChatCompletionsAdapter
+from ripple.llm.circuit_breaker import CircuitBreaker, is_outage_error
+from ripple.llm.http_pool import PooledHTTPClient
+
+
+def _status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.example.invalid/v1")
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(code, request=request),
+    )
+
+
+class _MockPool(PooledHTTPClient):
+    """所有请求都返回固定状态码的连接池。 / Pool whose clients answer every request with one status."""
+
+    def __init__(self, status: int):
+        super().__init__()
+        self._status = status
+
+    def get(self, profile, timeout):
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(self._status)),
+        )
+
+
+async def _adapter_error(status: int) -> BaseException:
+    """真实适配器重试耗尽后抛出的异常。 / The exception a real adapter raises after exhausting retries."""
+    adapter = ChatCompletionsAdapter(
+        url="https://api.example.invalid/v1", api_key="k", model="m",
+        stream=False, max_retries=0, http_pool=_MockPool(status),
+    )
+    with pytest.raises(RuntimeError) as info:
+        await adapter.call("sys", "user")
+    return info.value
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(cb_module.time, "monotonic", c)
+    return c
+
+
+class TestOutageClassification:
+    def test_5xx_and_timeouts_count_but_429_does_not(self):
+        assert is_outage_error(_status_error(503))
+        assert is_outage_error(httpx.ReadTimeout("slow"))
+        assert not is_outage_error(_status_error(429))
+        assert not is_outage_error(_status_error(400))
+        assert not is_outage_error(ValueError("bad json"))
+
+    @pytest.mark.asyncio
+    async def test_adapter_wrapped_errors_are_classified_by_cause(self):
+        assert is_outage_error(await _adapter_error(503))
+        assert not is_outage_error(await _adapter_error(429))
+        assert not is_outage_error(await _adapter_error(400))
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_fails_fast(self, clock):
+        breaker = CircuitBreaker(failure_threshold=3, window_seconds=10, cooldown_seconds=30)
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record_failure(_status_error(502))
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+    @pytest.mark.asyncio
+    async def test_opens_on_consecutive_adapter_outages(self, clock):
+        breaker = CircuitBreaker(failure_threshold=5, window_seconds=10, cooldown_seconds=30)
+        error = await _adapter_error(503)
+        for _ in range(5):
+            breaker.record_failure(error)
+        assert breaker.state == "open"
+
+    def test_unrelated_errors_do_not_reset_the_count(self, clock):
+        breaker = CircuitBreaker(failure_threshold=2, window_seconds=10, cooldown_seconds=30)
+        breaker.record_failure(_status_error(503))
+        breaker.record_failure(ValueError("bad json"))
+        breaker.record_failure(_status_error(503))
+        assert breaker.state == "open"
+
+    def test_provider_answer_resets_the_count(self, clock):
+        breaker = CircuitBreaker(failure_threshold=2, window_seconds=10, cooldown_seconds=30)
+        breaker.record_failure(_status_error(503))
+        breaker.record_failure(_status_error(400))
+        breaker.record_failure(_status_error(503))
+        assert breaker.state == "closed"
+
+    def test_failures_outside_window_do_not_accumulate(self, clock):
+        breaker = CircuitBreaker(failure_threshold=2, window_seconds=10, cooldown_seconds=30)
+        breaker.record_failure(_status_error(500))
+        clock.now += 11
+        breaker.record_failure(_status_error(500))
+        assert breaker.state == "closed"
+
+    def test_half_open_probe_closes_or_reopens(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, window_seconds=10, cooldown_seconds=30)
+        breaker.record_failure(_status_error(500))
+        clock.now += 31
+        assert breaker.allow()
+        # 探测进行中，其他调用仍被拒绝 / Other calls are rejected while the probe runs
+        assert not breaker.allow()
+        breaker.record_failure(httpx.ConnectError("down"))
+        assert breaker.state == "open"
+
+        clock.now += 31
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.allow()
+
+    def test_cancellation_releases_probe_without_closing(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, window_seconds=10, cooldown_seconds=30)
+        breaker.record_failure(_status_error(500))
+        clock.now += 31
+        assert breaker.allow()
+        breaker.record_failure(asyncio.CancelledError())
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+
+    def test_disabled_breaker_never_opens(self):
+        breaker = CircuitBreaker(failure_threshold=None)
+        for _ in range(20):
+            breaker.record_failure(_status_error(503))
+        assert breaker.allow()
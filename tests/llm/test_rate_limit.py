@@ -0,0 +1,76 @@
+# test_rate_limit.py
+# =============================================================================
+# 令牌桶与调用限流器单元测试 / Token-bucket and call limiter unit tests
+# =============================================================================
+
+import asyncio
+import time
+
+import pytest
+
+from ripple.llm.rate_limit import CallLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    @pytest.mark.asyncio
+    async def test_burst_up_to_capacity_then_waits(self):
+        bucket = TokenBucket(rate=50.0, capacity=2)
+        start = time.monotonic()
+        await bucket.acquire()
+        await bucket.acquire()
+        assert time.monotonic() - start < 0.02
+        await bucket.acquire()
+        # 第三个令牌需等待约 1/50 秒补充 / The third token waits ~1/50 s for refill
+        assert time.monotonic() - start >= 0.015
+
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_are_spaced_by_rate(self):
+        bucket = TokenBucket(rate=100.0)
+        stamps = []
+
+        async def take():
+            await bucket.acquire()
+            stamps.append(time.monotonic())
+
+        await asyncio.gather(*(take() for _ in range(4)))
+        gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+        assert all(gap >= 0.008 for gap in gaps)
+
+    @pytest.mark.asyncio
+    async def test_acquire_more_than_capacity_raises(self):
+        with pytest.raises(ValueError):
+            await TokenBucket(rate=1.0).acquire(2)
+
+
+class TestCallLimiter:
+    def test_rejects_zero_concurrency(self):
+        with pytest.raises(ValueError):
+            CallLimiter(max_concurrent=0)
+
+    @pytest.mark.asyncio
+    async def test_caps_calls_in_flight(self):
+        limiter = CallLimiter(max_concurrent=2)
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with limiter:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.005)
+                in_flight -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_unlimited_is_a_no_op(self):
+        limiter = CallLimiter()
+        assert limiter.is_unlimited
+        async with limiter:
+            pass
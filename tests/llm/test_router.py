@@ -0,0 +1,346 @@
+# test_router.py
+# =============================================================================
+# ModelRouter 调用预算单元测试 / ModelRouter call budget unit tests
+# =============================================================================
+
+import asyncio
+
+import pytest
+
+from ripple.api.simulate import _make_llm_caller
+from ripple.llm.router import ModelRouter
+
+
+def _router(max_llm_calls: int, **extra_config) -> ModelRouter:
+    return ModelRouter(
+        llm_config={
+            "star": {
+                "model_platform": "openai",
+                "model_name": "gpt-4o",
+                "api_key": "test-key",
+                "url": "https://api.example.invalid/v1",
+            },
+            **extra_config,
+        },
+        max_llm_calls=max_llm_calls,
+    )
+
+
+class TestBudgetReservation:
+    def test_in_flight_calls_count_against_the_cap(self):
+        router = _router(2)
+        assert router.reserve_call("star")
+        assert router.reserve_call("star")
+        assert not router.reserve_call("star")
+
+        router.finish_call("star", succeeded=False)
+        assert router.budget.in_flight == 1
+        assert router.reserve_call("star")
+        router.finish_call("star", succeeded=True)
+        router.finish_call("star", succeeded=True)
+        assert router.budget.total_calls == 2
+        assert router.budget.total_attempts == 3
+        assert router.budget.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_never_overshoot(self):
+        router = _router(3)
+
+        class _SlowAdapter:
+            async def call(self, system_prompt, user_prompt):
+                await asyncio.sleep(0.01)
+                return "ok"
+
+        router._model_cache["star"] = _SlowAdapter()
+        router.get_model_backend = lambda role: router._model_cache[role]
+        caller = _make_llm_caller(router, "star")
+
+        outcomes = await asyncio.gather(
+            *(caller(system_prompt="s", user_prompt=str(i)) for i in range(5)),
+            return_exceptions=True,
+        )
+        assert [o for o in outcomes if o == "ok"] == ["ok"] * 3
+        assert sum(isinstance(o, RuntimeError) for o in outcomes) == 2
+        assert router.budget.total_calls == 3
+        assert router.budget.in_flight == 0
+
+
+class TestLimitLabel:
+    def test_label_tracks_max_calls(self):
+        router = _router(5)
+        assert router.limit_label == "5"
+        router.budget.max_calls = 7
+        assert router.limit_label == "7"
+        router.budget.max_calls = 0
+        assert router.limit_label == "∞"
+
+
+class TestPreboundAdapter:
+    @pytest.mark.asyncio
+    async def test_adapter_resolved_once_until_cache_cleared(self):
+        router = _router(100)
+
+        class _Adapter:
+            async def call(self, system_prompt, user_prompt):
+                return "ok"
+
+        lookups = []
+
+        def _get_backend(role):
+            lookups.append(role)
+            return _Adapter()
+
+        router.get_model_backend = _get_backend
+        caller = _make_llm_caller(router, "star")
+
+        for _ in range(3):
+            assert await caller(system_prompt="s", user_prompt="u") == "ok"
+        assert lookups == ["star"]
+
+        router.clear_model_cache()
+        await caller(system_prompt="s", user_prompt="u")
+        assert lookups == ["star", "star"]
+
+    @pytest.mark.asyncio
+    async def test_degradation_goes_back_through_router(self):
+        router = _router(10)
+
+        class _Adapter:
+            async def call(self, system_prompt, user_prompt):
+                return "ok"
+
+        lookups = []
+        router.get_model_backend = lambda role: lookups.append(role) or _Adapter()
+        caller = _make_llm_caller(router, "star")
+
+        await caller(system_prompt="s", user_prompt="u")
+        router.budget.total_calls = 8  # 80% → 降级 / degradation active
+        await caller(system_prompt="s", user_prompt="u")
+        await caller(system_prompt="s", user_prompt="u")
+        assert len(lookups) == 3
+
+
+class TestCallLimits:
+    def test_roles_share_default_scope_unless_configured(self):
+        router = _router(
+            10,
+            _rate_limits={
+                "_default": {"max_concurrent": 4, "rpm": 600},
+                "sea": {"max_concurrent": 8},
+            },
+        )
+        assert router.call_limiter("star") is router.call_limiter("omniscient")
+        assert router.call_limiter("star").max_concurrent == 4
+        assert router.call_limiter("sea").max_concurrent == 8
+        assert router.call_limiter("sea").rpm is None
+
+    def test_unconfigured_roles_get_their_own_default_cap(self):
+        router = _router(10)
+        star, sea = router.call_limiter("star"), router.call_limiter("sea")
+        assert star is not sea
+        assert star.max_concurrent == ModelRouter.DEFAULT_MAX_CONCURRENT
+        assert star.rpm is None
+
+    def test_explicit_empty_limits_disable_the_cap(self):
+        router = _router(10, _rate_limits={"_default": {"max_concurrent": None}})
+        assert router.call_limiter("star").is_unlimited
+
+    @pytest.mark.asyncio
+    async def test_caller_respects_max_concurrent(self):
+        router = _router(0, _rate_limits={"star": {"max_concurrent": 2}})
+        in_flight = 0
+        peak = 0
+
+        class _SlowAdapter:
+            async def call(self, system_prompt, user_prompt):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.005)
+                in_flight -= 1
+                return "ok"
+
+        router.get_model_backend = lambda role: _SlowAdapter()
+        caller = _make_llm_caller(router, "star")
+        await asyncio.gather(
+            *(caller(system_prompt="s", user_prompt=str(i)) for i in range(6))
+        )
+        assert peak == 2
+
+
+class TestCircuitBreakerIntegration:
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast_without_spending_budget(self):
+        import httpx
+
+        from ripple.llm.circuit_breaker import CircuitOpenError
+
+        router = _router(
+            10, _circuit_breaker={"failure_threshold": 2, "cooldown_seconds": 60},
+        )
+        calls = 0
+
+        class _DownAdapter:
+            async def call(self, system_prompt, user_prompt):
+                nonlocal calls
+                calls += 1
+                raise httpx.ConnectError("provider down")
+
+        router.get_model_backend = lambda role: _DownAdapter()
+        caller = _make_llm_caller(router, "star")
+
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await caller(system_prompt="s", user_prompt="u")
+        assert calls == 2
+        attempts = router.budget.total_attempts
+
+        with pytest.raises(CircuitOpenError):
+            await caller(system_prompt="s", user_prompt="u")
+        assert calls == 2
+        assert router.budget.total_attempts == attempts
+        assert router.budget.in_flight == 0
+        # 其他角色不受影响 / Other roles are unaffected
+        assert router.circuit_breaker("sea").allow()
+
+
+class TestLightModels:
+    def test_short_prompts_route_to_light_model(self):
+        router = _router(
+            10, _light_models={"star": {"model_name": "gpt-4o-mini", "max_prompt_chars": 100}},
+        )
+        assert router.light_model_threshold("star") == 100
+        assert router.light_model_threshold("sea") is None
+
+        light = router.get_model_backend("star", complexity_hint=50)
+        assert light._model == "gpt-4o-mini"
+        assert router.get_model_backend("star", complexity_hint=100)._model == "gpt-4o"
+        assert router.get_model_backend("star")._model == "gpt-4o"
+        assert router.get_model_backend("star", complexity_hint=10) is light
+
+    def test_degradation_takes_precedence(self):
+        router = _router(
+            10,
+            _light_models={"star": {"model_name": "gpt-4o-mini", "max_prompt_chars": 100}},
+            _degradation={"star": "gpt-4o-degraded"},
+        )
+        router.budget.total_calls = 8
+        assert router.get_model_backend("star", complexity_hint=10)._model == "gpt-4o-degraded"
+
+    def test_invalid_entry_is_ignored(self):
+        router = _router(10, _light_models={"star": {"model_name": "gpt-4o-mini"}})
+        assert router.light_model_threshold("star") is None
+
+    @pytest.mark.asyncio
+    async def test_caller_prebinds_each_tier(self):
+        router = _router(
+            10, _light_models={"star": {"model_name": "gpt-4o-mini", "max_prompt_chars": 5}},
+        )
+
+        class _Adapter:
+            def __init__(self, name):
+                self.name = name
+
+            async def call(self, system_prompt, user_prompt):
+                return self.name
+
+        lookups = []
+
+        def _get_backend(role, *, complexity_hint=None):
+            lookups.append(complexity_hint)
+            return _Adapter("light" if complexity_hint < 5 else "full")
+
+        router.get_model_backend = _get_backend
+        caller = _make_llm_caller(router, "star")
+
+        assert await caller(system_prompt="s", user_prompt="hi") == "light"
+        assert await caller(system_prompt="s", user_prompt="a longer prompt") == "full"
+        assert await caller(system_prompt="s", user_prompt="yo") == "light"
+        assert await caller(system_prompt="s", user_prompt="another long one") == "full"
+        assert lookups == [2, 15]
+
+
+class TestSingleRetryLayer:
+    @pytest.mark.asyncio
+    async def test_adapter_retries_are_not_multiplied_by_the_caller(self):
+        import httpx
+
+        from ripple.llm.chat_completions_adapter import ChatCompletionsAdapter
+        from ripple.llm.http_pool import PooledHTTPClient
+
+        requests = []
+
+        class _UnavailablePool(PooledHTTPClient):
+            def get(self, profile, timeout):
+                def _handler(request):
+                    requests.append(request)
+                    return httpx.Response(503)
+
+                return httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+
+        router = _router(10)
+        adapter = ChatCompletionsAdapter(
+            url="https://api.example.invalid/v1", api_key="k", model="m",
+            stream=False, max_retries=2, http_pool=_UnavailablePool(),
+        )
+        router.get_model_backend = lambda role: adapter
+        caller = _make_llm_caller(router, "star")
+
+        with pytest.raises(RuntimeError):
+            await caller(system_prompt="s", user_prompt="u")
+        # 只有适配器的 max_retries 一层重试 / Only the adapter's max_retries layer retries
+        assert len(requests) == 3
+        assert router.budget.total_attempts == 1
+        assert router.budget.in_flight == 0
+
+
+class TestStreamFallback:
+    @staticmethod
+    def _adapter(fail_after: int):
+        class _FlakyStreamAdapter:
+            def __init__(self):
+                self.calls = 0
+
+            async def call(self, system_prompt, user_prompt):
+                self.calls += 1
+                return "full"
+
+            async def astream(self, system_prompt, user_prompt):
+                for i, chunk in enumerate(("a", "b", "c")):
+                    if i == fail_after:
+                        raise ConnectionError("reset")
+                    yield chunk
+
+        return _FlakyStreamAdapter()
+
+    @pytest.mark.asyncio
+    async def test_failure_before_any_chunk_falls_back_within_one_reservation(self):
+        router = _router(10)
+        adapter = self._adapter(fail_after=0)
+        router.get_model_backend = lambda role: adapter
+        caller = _make_llm_caller(router, "star")
+
+        chunks = [c async for c in caller.astream(system_prompt="s", user_prompt="u")]
+
+        assert chunks == ["full"]
+        assert adapter.calls == 1
+        assert router.budget.total_attempts == 1
+        assert router.budget.total_calls == 1
+        assert router.budget.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_after_a_chunk_is_raised_without_second_call(self):
+        router = _router(10)
+        adapter = self._adapter(fail_after=1)
+        router.get_model_backend = lambda role: adapter
+        caller = _make_llm_caller(router, "star")
+
+        chunks = []
+        with pytest.raises(ConnectionError):
+            async for chunk in caller.astream(system_prompt="s", user_prompt="u"):
+                chunks.append(chunk)
+
+        assert chunks == ["a"]
+        assert adapter.calls == 0
+        assert router.budget.total_attempts == 1
+        assert router.budget.in_flight == 0
@@ -154,6 +154,14 @@ class TestOmniscientVerdict:
         )
         assert verdict.activated_agent_ids == ["sea_a", "star_b"]
 
+    def test_verdict_models_use_slots(self):
+        activation = AgentActivation(agent_id="sea_a", incoming_ripple_energy=0.5,
+                                     activation_reason="test")
+        assert not hasattr(activation, "__dict__")
+        assert "__slots__" in vars(OmniscientVerdict)
+        with pytest.raises(AttributeError):
+            activation.extra = 1
+
 
 class TestWaveRecord:
     def test_create_wave_record(self):
@@ -204,6 +204,27 @@ class TestSkillManager:
         assert "star" in skill.prompts
         assert "sea" in skill.prompts
 
+    def test_repeated_load_reuses_snapshot(self, tmp_path):
+        """同一实例重复加载命中缓存，discover() 后重新解析。 / Repeated loads hit the cache; discover() re-parses."""
+        skill_dir = tmp_path / "skills" / "cached-skill"
+        (skill_dir / "prompts").mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text(
+            "---\n"
+            "name: cached-skill\n"
+            "prompts:\n"
+            "  star: prompts/star.md\n"
+            "---\n"
+        )
+        (skill_dir / "prompts" / "star.md").write_text("star")
+
+        manager = SkillManager(search_paths=[tmp_path / "skills"])
+        first = manager.load("cached-skill")
+        assert manager.load("cached-skill") is first
+        assert manager.load("cached-skill", skill_path=skill_dir) is not first
+
+        manager.discover()
+        assert manager.load("cached-skill") is not first
+
     def test_prompts_loaded_from_top_level(self, tmp_path):
         """Skill 的 prompts 从顶层字段加载，而非 domain_protocol。 / Skill prompts load from top-level, not domain_protocol."""
         skill_dir = tmp_path / "skills" / "test-skill"
@@ -0,0 +1,104 @@
+# test_fast_json.py
+# =============================================================================
+# fast_json 单元测试 / fast_json unit tests
+# - 输出与标准库一致 / Output matches the stdlib
+# - 标准库回退路径 / Stdlib fallback path
+# - orjson 与标准库对非有限浮点数的差异 / orjson vs stdlib on non-finite floats
+# =============================================================================
+
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytest
+
+import ripple.utils.fast_json as fast_json_module
+from ripple.utils.fast_json import dump_pretty, dumps_compact, dumps_pretty, loads
+
+
+@dataclass
+class _Point:
+    x: int
+
+
+SAMPLE = {
+    "event": {"description": "一条美妆笔记", "tags": ["美妆", "护肤"]},
+    "energy": 0.15,
+    "count": 3,
+    "flag": True,
+    "nothing": None,
+    "empty": {},
+    "items": [],
+    1: "int key",
+    "when": datetime(2025, 1, 2, 3, 4, 5),
+    "point": _Point(1),
+    "huge": 2 ** 70,
+}
+
+
+class TestDumpsPretty:
+    """dumps_pretty 测试。 / dumps_pretty tests."""
+
+    def test_matches_stdlib_output(self):
+        expected = json.dumps(SAMPLE, ensure_ascii=False, indent=2, default=str)
+        assert dumps_pretty(SAMPLE) == expected
+
+    def test_stdlib_fallback(self, monkeypatch):
+        monkeypatch.setattr(fast_json_module, "_HAS_ORJSON", False)
+        expected = json.dumps(SAMPLE, ensure_ascii=False, indent=2, default=str)
+        assert dumps_pretty(SAMPLE) == expected
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_dump_to_file_matches_dumps(self, monkeypatch, has_orjson):
+        if has_orjson and not fast_json_module._HAS_ORJSON:
+            pytest.skip("orjson 未安装 / orjson not installed")
+        monkeypatch.setattr(fast_json_module, "_HAS_ORJSON", has_orjson)
+        buf = io.BytesIO()
+        dump_pretty(SAMPLE, buf)
+        assert not buf.closed
+        assert buf.getvalue().decode("utf-8") == dumps_pretty(SAMPLE)
+
+
+class TestDumpsCompact:
+    """dumps_compact 测试。 / dumps_compact tests."""
+
+    @pytest.mark.parametrize("obj", [SAMPLE, {k: v for k, v in SAMPLE.items() if k != "huge"}])
+    def test_matches_stdlib_output(self, obj):
+        expected = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+        assert dumps_compact(obj) == expected
+
+    def test_stdlib_fallback(self, monkeypatch):
+        monkeypatch.setattr(fast_json_module, "_HAS_ORJSON", False)
+        expected = json.dumps(SAMPLE, ensure_ascii=False, separators=(",", ":"), default=str)
+        assert dumps_compact(SAMPLE) == expected
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_non_finite_floats(self, monkeypatch, has_orjson):
+        """NaN：orjson 写 null，标准库写 NaN 字面量。 / NaN: orjson writes null, the stdlib the NaN literal."""
+        if has_orjson and not fast_json_module._HAS_ORJSON:
+            pytest.skip("orjson 未安装 / orjson not installed")
+        monkeypatch.setattr(fast_json_module, "_HAS_ORJSON", has_orjson)
+        obj = {"a": float("nan")}
+        expected = '{"a":null}' if has_orjson else '{"a":NaN}'
+        assert dumps_compact(obj) == expected
+        assert ("null" in dumps_pretty(obj)) is has_orjson
+        # 两种输出都能被 loads 读回 / Both outputs load back through loads
+        assert "a" in loads(dumps_compact(obj))
+
+    def test_shorter_than_pretty(self):
+        assert len(dumps_compact(SAMPLE)) < len(dumps_pretty(SAMPLE))
+
+
+class TestLoads:
+    """loads 测试。 / loads tests."""
+
+    def test_parses_unicode_object(self):
+        assert loads('{"内容": "测试", "n": 1}') == {"内容": "测试", "n": 1}
+
+    def test_accepts_nan_like_stdlib(self):
+        assert loads('{"x": NaN}')["x"] != loads('{"x": NaN}')["x"]
+
+    def test_raises_json_decode_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            loads("not json")
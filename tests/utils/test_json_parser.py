@@ -1,7 +1,15 @@
 """Tests for unified JSON parsing from LLM output."""
 
+import json
+
 import pytest
-from ripple.utils.json_parser import parse_json_from_llm
+
+from ripple.utils.json_parser import (
+    JsonStreamAccumulator,
+    parse_json_from_llm,
+    parse_partial_json,
+    strip_code_fence,
+)
 
 
 class TestParseJsonFromLlm:
@@ -24,3 +32,67 @@ class TestParseJsonFromLlm:
     def test_empty_string_raises(self):
         with pytest.raises(ValueError):
             parse_json_from_llm("")
+
+
+class TestParsePartialJson:
+    @pytest.mark.parametrize("raw, expected", [
+        ('{"a": 1, "b": "cut off', {"a": 1, "b": "cut off"}),
+        ('```json\n{"a": {"x": 1}, "b": [1, 2', {"a": {"x": 1}, "b": [1, 2]}),
+        ('{"a": 1, "b": ', {"a": 1}),
+        ('{"a": 1, "b": tr', {"a": 1}),
+        ('Sure: {"a": "x\\', {"a": "x"}),
+        ('{"a": 1} trailing', {"a": 1}),
+    ])
+    def test_recovers_truncated_objects(self, raw, expected):
+        assert parse_partial_json(raw) == expected
+
+    @pytest.mark.parametrize("raw", ["", "no json here", '{"a'])
+    def test_unrecoverable_raises(self, raw):
+        with pytest.raises(ValueError):
+            parse_partial_json(raw)
+
+
+class TestStripCodeFence:
+    def test_unfenced_text_unchanged(self):
+        assert strip_code_fence('{"key": 1}') == '{"key": 1}'
+
+    def test_json_fence(self):
+        assert strip_code_fence('```json\n{"key": 1}\n```') == '{"key": 1}'
+
+    def test_indented_closing_fence(self):
+        assert strip_code_fence('```\n{"key": 1}\n  ```') == '{"key": 1}'
+
+    def test_missing_closing_fence_keeps_rest(self):
+        assert strip_code_fence('```json\n{"key": 1}') == '{"key": 1}'
+
+    def test_multiline_body_preserved(self):
+        body = '{\n  "a": 1,\n  "b": [1, 2]\n}'
+        assert strip_code_fence("```json\n" + body + "\n```\ntrailing") == body
+
+
+class TestJsonStreamAccumulator:
+    @staticmethod
+    def _feed_in_chunks(text, size):
+        acc = JsonStreamAccumulator()
+        for i in range(0, len(text), size):
+            if acc.feed(text[i:i + size]):
+                break
+        return acc
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7])
+    def test_closes_at_top_level_despite_tricky_strings(self, size):
+        doc = {"a": 'x\\"}{[', "b": [1, {"c": "\\"}], "d": "中文}"}
+        text = "```json\n" + json.dumps(doc, ensure_ascii=False) + "\n```\ntrailing"
+        acc = self._feed_in_chunks(text, size)
+        assert acc.complete
+        assert json.loads(acc.text) == doc
+
+    def test_incomplete_returns_raw_buffer(self):
+        acc = JsonStreamAccumulator()
+        assert acc.feed('{"a": [1, ') is False
+        assert acc.text == '{"a": [1, '
+
+    def test_non_json_start_raises_early(self):
+        acc = JsonStreamAccumulator()
+        with pytest.raises(ValueError):
+            acc.feed("Sure, here is the JSON: {")
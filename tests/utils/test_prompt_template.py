@@ -0,0 +1,61 @@
+"""Tests for precompiled prompt templates."""
+
+import pytest
+
+from ripple import prompts
+from ripple.utils.prompt_template import compile_template
+
+
+class TestCompileTemplate:
+    @pytest.mark.parametrize("name", [
+        "OMNISCIENT_RIPPLE_VERDICT_USER",
+        "OMNISCIENT_OBSERVE_USER",
+        "OMNISCIENT_SYNTHESIZE_RELATIVE_USER",
+        "OMNISCIENT_SYNTHESIZE_ANCHORED_USER",
+        "OMNISCIENT_RIPPLE_AGENT_LINE_ACTIVE",
+        "SEA_USER_PROMPT",
+    ])
+    def test_matches_str_format_for_repo_templates(self, name):
+        template = getattr(prompts, name)
+        compiled = compile_template(template)
+        values = {field: f"<{field}>" for field in compiled.fields}
+        if "e" in values:
+            values["e"] = 0.456
+        assert compiled.format(**values) == template.format(**values)
+
+    def test_escaped_braces_and_repeated_fields(self):
+        compiled = compile_template('{{"wave": {n}}} {n}')
+        assert compiled.format(n=3) == '{"wave": 3} 3'
+        assert compiled.fields == ["n"]
+
+    def test_conversion_and_spec(self):
+        compiled = compile_template("{x!r}|{y:.2f}")
+        assert compiled.format(x="a", y=1) == "'a'|1.00"
+
+    def test_extra_kwargs_ignored(self):
+        assert compile_template("{a}").format(a=1, b=2) == "1"
+
+    def test_missing_field_raises(self):
+        with pytest.raises(KeyError):
+            compile_template("{a}{b}").format(a=1)
+
+    def test_nested_spec_and_index_access(self):
+        compiled = compile_template("{w:>{n}}|{item[0]}")
+        assert compiled.fields == ["w", "n", "item"]
+        assert compiled.format(w="y", n=3, item=["z"]) == "  y|z"
+
+    def test_positional_fields_fall_back_to_str_format(self):
+        compiled = compile_template("{0}-{w}")
+        assert compiled.fields == []
+        assert compiled.format("x", w="y") == "x-y"
+
+    def test_malformed_template_rejected_at_compile_time(self):
+        with pytest.raises(ValueError):
+            compile_template("{unclosed")
+
+    def test_field_values_are_not_evaluated(self):
+        compiled = compile_template("{a}")
+        assert compiled.format(a="{__import__('os')}") == "{__import__('os')}"
+
+    def test_template_without_fields(self):
+        assert compile_template("plain {{text}}").format() == "plain {text}"